@@ -2,6 +2,8 @@
 from .book import Book
 from .member import Member
 from .loan import Loan
+from .loan_id_generator import LoanIdGenerator
 from .library_service import LibraryService
+from .persistent_library_service import PersistentLibraryService
 
-__all__ = ['Book', 'Member', 'Loan', 'LibraryService']
+__all__ = ['Book', 'Member', 'Loan', 'LoanIdGenerator', 'LibraryService', 'PersistentLibraryService']
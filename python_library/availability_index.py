@@ -0,0 +1,61 @@
+from typing import Dict, Iterator, List, Optional
+
+
+class AvailabilityIndex:
+    """
+    Set of available book ids with O(1) add/discard and O(k) paging.
+
+    Ids live in a dense list plus an id -> position map; discarding moves the
+    last id into the freed slot. Unlike a dict used as an ordered set, there
+    are no deleted entries to skip, so any page costs O(page size) however
+    many books have been borrowed. The order is insertion order until the
+    first discard, and arbitrary after that.
+    """
+
+    __slots__ = ('_ids', '_positions')
+
+    PAGE_SIZE = 1024
+
+    def __init__(self):
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+
+    def add(self, book_id: str) -> None:
+        if book_id not in self._positions:
+            self._positions[book_id] = len(self._ids)
+            self._ids.append(book_id)
+
+    def discard(self, book_id: str) -> None:
+        position = self._positions.pop(book_id, None)
+        if position is None:
+            return
+        last = self._ids.pop()
+        if position < len(self._ids):
+            self._ids[position] = last
+            self._positions[last] = position
+
+    def page(self, offset: int = 0, limit: Optional[int] = None) -> List[str]:
+        stop = offset + limit if limit is not None else None
+        return self._ids[offset:stop]
+
+    def iter_pages(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[str]:
+        """Stream ids page by page; changes made while streaming may skip or repeat ids"""
+        position, remaining = offset, limit
+        while remaining is None or remaining > 0:
+            size = self.PAGE_SIZE if remaining is None else min(self.PAGE_SIZE, remaining)
+            page = self._ids[position:position + size]
+            yield from page
+            if len(page) < size:
+                return
+            position += size
+            if remaining is not None:
+                remaining -= size
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, book_id: str) -> bool:
+        return book_id in self._positions
+
+    def __iter__(self) -> Iterator[str]:
+        return self.iter_pages()
@@ -0,0 +1,3 @@
+# Library Management System - Benchmarks
+# Each module can be run directly, e.g.:
+#   python -m python_library.benchmarks.bench_library_service
@@ -0,0 +1,103 @@
+"""
+Bytes per entity for dict-based objects, __slots__ objects and the columnar store.
+
+    python -m python_library.benchmarks.bench_entity_memory --count 1000000
+"""
+import argparse
+import gc
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable
+
+from .common import print_table
+from ..book import Book
+from ..columnar_store import ColumnarBookStore, ColumnarLoanStore, ColumnarMemberStore
+from ..loan import Loan
+from ..member import Member
+
+
+class DictBook:
+    """Book as it was before __slots__: attributes live in a per-instance __dict__"""
+
+    def __init__(self, book_id, title, author):
+        self.id = book_id
+        self.title = title
+        self.author = author
+        self.available = True
+
+
+class DictMember:
+    def __init__(self, member_id, name, email):
+        self.id = member_id
+        self.name = name
+        self.email = email
+
+
+class DictLoan:
+    def __init__(self, loan_id, member_id, book_id, borrow_date):
+        self.id = loan_id
+        self.member_id = member_id
+        self.book_id = book_id
+        self.borrow_date = borrow_date
+
+
+def measure(build: Callable[[], object]) -> int:
+    """Bytes still allocated by build()'s result once it returns"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=200_000)
+    args = parser.parse_args(argv)
+    n = args.count
+    members = max(1, n // 5)
+    start = datetime(2024, 1, 1)
+
+    # Each builder creates its own field values, so strings are counted for every layout
+    def book_fields(i):
+        return f"book{i}", f"Title of book number {i}", f"Author {i % 5000}"
+
+    def member_fields(i):
+        return f"member{i}", f"Member {i}", f"member{i}@example.com"
+
+    def loan_fields(i):
+        return (str(uuid.UUID(int=i)), f"member{i % members}", f"book{i}",
+                start + timedelta(seconds=i))
+
+    def columnar(store_type, entity_type, fields):
+        def build():
+            store = store_type()
+            for i in range(n):
+                store.add(entity_type(*fields(i)))
+            return store
+        return build
+
+    def objects(entity_type, fields):
+        def build():
+            # Keyed by id, as the services hold them
+            return {entity[0]: entity_type(*entity) for entity in map(fields, range(n))}
+        return build
+
+    rows = []
+    for name, fields, dict_type, slot_type, store_type in (
+            ('Book', book_fields, DictBook, Book, ColumnarBookStore),
+            ('Member', member_fields, DictMember, Member, ColumnarMemberStore),
+            ('Loan', loan_fields, DictLoan, Loan, ColumnarLoanStore)):
+        rows.append((name, 'objects with __dict__', measure(objects(dict_type, fields)) / n))
+        rows.append((name, 'objects with __slots__', measure(objects(slot_type, fields)) / n))
+        rows.append((name, 'columnar store', measure(columnar(store_type, slot_type, fields)) / n))
+    print(f"{n:,} entities per layout (members and authors repeat across entities)")
+    print_table(['entity', 'layout', 'bytes/entity'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Per-operation latency of LibraryService as the catalog grows.
+
+With id-keyed indexes the borrow, return and fine lookups, and the due-date
+queries, should stay flat regardless of how many books, members and open
+loans the service holds.
+
+    python -m python_library.benchmarks.bench_library_service --sizes 10000 100000 1000000
+"""
+import argparse
+from typing import Optional
+
+from .common import print_table, summarize, time_calls
+from ..book import Book
+from ..library_service import LibraryService
+from ..member import Member
+
+
+def build_service(book_count: int, open_loan_ratio: float = 0.2, service: Optional[LibraryService] = None):
+    """Fill service (a new LibraryService by default) with book_count books, book_count / 5 members and some open loans"""
+    service = service if service is not None else LibraryService()
+    member_count = max(1, book_count // 5)
+    for i in range(member_count):
+        service.add_member(Member(f"member{i}", f"Member {i}", f"member{i}@example.com"))
+    for i in range(book_count):
+        service.add_book(Book(f"book{i}", f"Title {i}", f"Author {i % 1000}"))
+
+    seeded_loan_ids = []
+    for i in range(int(book_count * open_loan_ratio)):
+        result = service.borrow_book(f"member{i % member_count}", f"book{i}")
+        seeded_loan_ids.append(result.rsplit(' ', 1)[-1])
+    return service, seeded_loan_ids
+
+
+def run(book_count: int, operations: int):
+    service, seeded_loan_ids = build_service(book_count)
+    member_count = len(service.members)
+    free_start = len(seeded_loan_ids)
+    operations = min(operations, book_count - free_start, len(seeded_loan_ids))
+
+    loan_ids = []
+
+    def borrow(i):
+        result = service.borrow_book(f"member{i % member_count}", f"book{free_start + i}")
+        loan_ids.append(result.rsplit(' ', 1)[-1])
+
+    def fine(i):
+        service.calculate_fine(seeded_loan_ids[i])
+
+    def give_back(i):
+        service.return_book(loan_ids[i])
+
+    def next_due(i):
+        service.next_due(10)
+
+    def available_page(i):
+        list(service.iter_available_books(0, 20))
+
+    results = []
+    for name, func in (('borrow_book', borrow), ('calculate_fine', fine), ('return_book', give_back),
+                       ('next_due(10)', next_due), ('available page(20)', available_page)):
+        stats = summarize(time_calls(func, operations))
+        results.append((book_count, name, stats['ops_per_sec'], stats['p50_us'], stats['p99_us']))
+    return results
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument('--operations', type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    rows = []
+    for size in args.sizes:
+        rows.extend(run(size, args.operations))
+    print_table(['books', 'operation', 'ops/sec', 'p50 us', 'p99 us'], rows)
+
+
+if __name__ == '__main__':
+    main()
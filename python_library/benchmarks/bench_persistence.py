@@ -0,0 +1,114 @@
+"""
+Cost of durability in PersistentLibraryService: ops/sec with logging on, and startup time.
+
+The throughput phase runs borrow+return pairs against an in-memory
+LibraryService and against PersistentLibraryService with several group
+commit settings, including an fsync per operation. The startup phase saves
+a catalog and runs churn borrow+return pairs on it, then times reopening it
+from the operation log alone and from a snapshot, next to rebuilding it with
+add_book/borrow_book calls in memory. That rebuild reads nothing, so it is
+the floor a load from disk approaches, not an alternative to one.
+
+    python -m python_library.benchmarks.bench_persistence --books 100000 --operations 20000 --churn 200000
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from .bench_library_service import build_service
+from .common import print_table, summarize, time_calls
+from ..library_service import LibraryService
+from ..persistent_library_service import PersistentLibraryService
+
+# (label, PersistentLibraryService options); None is the plain in-memory service
+CONFIGURATIONS = [
+    ('in-memory only', None),
+    ('log, no fsync', dict(fsync=False)),
+    ('group 1024 / 5 ms', dict(group_size=1024, max_delay=0.005)),
+    ('group 64 / 5 ms', dict(group_size=64, max_delay=0.005)),
+    ('fsync every op', dict(group_size=1, max_delay=None, synchronous_commit=True)),
+]
+
+
+def directory_size(directory: str) -> int:
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+
+def throughput(label: str, options, book_count: int, operations: int):
+    directory = tempfile.mkdtemp(prefix='library-persistence-')
+    try:
+        if options is None:
+            service = LibraryService()
+        else:
+            service = PersistentLibraryService(directory, snapshot_every=None, **options)
+        service, _ = build_service(book_count, service=service)
+        member_count = len(service.members)
+        free_start = len(service.loans)
+        operations = min(operations, book_count - free_start)
+
+        def borrow_and_return(i):
+            result = service.borrow_book(f"member{i % member_count}", f"book{free_start + i}")
+            service.return_book(result.rsplit(' ', 1)[-1])
+
+        start = time.perf_counter()
+        stats = summarize(time_calls(borrow_and_return, operations))
+        if options is not None:
+            service.close()
+        seconds = time.perf_counter() - start
+        return (label, operations / seconds if seconds > 0 else 0.0, stats['p50_us'], stats['p99_us'])
+    finally:
+        shutil.rmtree(directory)
+
+
+def startup(book_count: int, churn: int):
+    directory = tempfile.mkdtemp(prefix='library-persistence-')
+    try:
+        rows = []
+
+        start = time.perf_counter()
+        build_service(book_count)
+        rows.append(('rebuild in memory (no I/O)', time.perf_counter() - start, 0))
+
+        service, seeded_loan_ids = build_service(book_count,
+                                                 service=PersistentLibraryService(directory, snapshot_every=None))
+        member_count = len(service.members)
+        free_start = len(seeded_loan_ids)
+        free_count = book_count - free_start
+        for i in range(churn):
+            result = service.borrow_book(f"member{i % member_count}", f"book{free_start + i % free_count}")
+            service.return_book(result.rsplit(' ', 1)[-1])
+        service.close()
+        log_bytes = directory_size(directory)
+        start = time.perf_counter()
+        PersistentLibraryService(directory, snapshot_every=None).close()
+        rows.append(('replay operation log', time.perf_counter() - start, log_bytes))
+
+        service = PersistentLibraryService(directory, snapshot_every=None)
+        service.snapshot()
+        service.close()
+        snapshot_bytes = directory_size(directory)
+        start = time.perf_counter()
+        PersistentLibraryService(directory, snapshot_every=None).close()
+        rows.append(('load snapshot (mmap)', time.perf_counter() - start, snapshot_bytes))
+        return rows
+    finally:
+        shutil.rmtree(directory)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--books', type=int, default=100_000)
+    parser.add_argument('--operations', type=int, default=20_000, help="borrow+return pairs per configuration")
+    parser.add_argument('--churn', type=int, default=200_000, help="borrow+return pairs logged before the startup phase")
+    args = parser.parse_args(argv)
+
+    rows = [throughput(label, options, args.books, args.operations) for label, options in CONFIGURATIONS]
+    print_table(['durability', 'borrow+return/sec', 'p50 us', 'p99 us'], rows)
+    print()
+    print_table(['startup', 'seconds', 'bytes on disk'], startup(args.books, args.churn))
+
+
+if __name__ == '__main__':
+    main()
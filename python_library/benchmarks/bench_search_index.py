@@ -0,0 +1,96 @@
+"""
+Autocomplete and search latency of BookSearchIndex as the catalog grows.
+
+Titles and authors are drawn from a synthetic vocabulary with Zipf-like word
+frequencies. Queries are typed-ahead versions of real titles: whole words
+followed by the first few letters of the next one.
+
+    python -m python_library.benchmarks.bench_search_index --sizes 100000 2000000
+"""
+import argparse
+import random
+import time
+from itertools import accumulate
+
+from .common import print_table, summarize, time_calls
+from ..book import Book
+from ..search_index import BookSearchIndex
+
+_SYLLABLES = ['ka', 'lo', 'mi', 'ren', 'tos', 'va', 'bel', 'dor', 'an', 'ith', 'qu', 'sel',
+              'mar', 'ny', 'or', 'pe', 'stra', 'gu', 'hel', 'wyn', 'ze', 'cor', 'fa', 'ul']
+
+
+def make_vocabulary(size: int, rng: random.Random):
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def make_books(count: int, seed: int = 1):
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(50_000, rng)
+    rng.shuffle(vocabulary)
+    cum_weights = list(accumulate(1.0 / (rank + 1) for rank in range(len(vocabulary))))
+    names = make_vocabulary(5_000, rng)
+    for i in range(count):
+        title = ' '.join(w.capitalize() for w in rng.choices(vocabulary, cum_weights=cum_weights, k=rng.randint(1, 5)))
+        author = f"{rng.choice(names).capitalize()} {rng.choice(names).capitalize()}"
+        yield Book(f"book{i}", title, author)
+
+
+def make_queries(books, count: int, rng: random.Random):
+    queries = []
+    for book in rng.sample(books, min(count, len(books))):
+        words = book.get_title().lower().split()
+        whole = rng.randint(0, len(words) - 1)
+        typed = words[whole][:rng.randint(3, 5)]
+        queries.append(' '.join(words[:whole] + [typed]))
+    return queries
+
+
+def run(book_count: int, operations: int):
+    books = list(make_books(book_count))
+    start = time.perf_counter()
+    index = BookSearchIndex(books)
+    build_seconds = time.perf_counter() - start
+
+    rng = random.Random(2)
+    queries = make_queries(books, operations, rng)
+    operations = len(queries)
+    unavailable = {book.get_id() for book in rng.sample(books, book_count // 5)}
+
+    def suggest(i):
+        index.suggest(queries[i].rsplit(' ', 1)[-1])
+
+    def search(i):
+        index.search(queries[i])
+
+    def search_exact(i):
+        index.search(queries[i], prefix=False)
+
+    def search_available(i):
+        index.search(queries[i], predicate=lambda book_id: book_id not in unavailable)
+
+    results = []
+    for name, func in (('suggest', suggest), ('search (prefix)', search),
+                       ('search (exact words)', search_exact), ('search (available only)', search_available)):
+        stats = summarize(time_calls(func, operations))
+        results.append((book_count, build_seconds, name, stats['ops_per_sec'], stats['p50_us'], stats['p99_us']))
+    return results
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--operations', type=int, default=2_000)
+    args = parser.parse_args(argv)
+
+    rows = []
+    for size in args.sizes:
+        rows.extend(run(size, args.operations))
+    print_table(['books', 'build s', 'operation', 'ops/sec', 'p50 us', 'p99 us'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+import statistics
+import time
+from typing import Callable, Dict, Iterable, List, Sequence
+
+
+def time_calls(func: Callable[[int], object], count: int) -> List[float]:
+    """Call func(i) for i in range(count) and return per-call latencies in seconds"""
+    timer = time.perf_counter
+    latencies = []
+    for i in range(count):
+        start = timer()
+        func(i)
+        latencies.append(timer() - start)
+    return latencies
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: Iterable[float]) -> Dict[str, float]:
+    """Summarize latencies (seconds) as ops/sec and mean/p50/p99 in microseconds"""
+    values = sorted(latencies)
+    total = sum(values)
+    return {
+        'ops_per_sec': len(values) / total if total > 0 else 0.0,
+        'mean_us': statistics.fmean(values) * 1e6 if values else 0.0,
+        'p50_us': percentile(values, 0.50) * 1e6,
+        'p99_us': percentile(values, 0.99) * 1e6,
+    }
+
+
+def print_table(headers: Sequence[str], rows: Iterable[Sequence[object]]) -> None:
+    """Print rows as a fixed-width text table"""
+    rows = [[_format_cell(cell) for cell in row] for row in rows]
+    widths = [len(header) for header in headers]
+    for row in rows:
+        widths = [max(width, len(cell)) for width, cell in zip(widths, row)]
+    print('  '.join(header.rjust(width) for header, width in zip(headers, widths)))
+    for row in rows:
+        print('  '.join(cell.rjust(width) for cell, width in zip(row, widths)))
+
+
+def _format_cell(cell: object) -> str:
+    if isinstance(cell, float):
+        return f"{cell:,.2f}"
+    if isinstance(cell, int):
+        return f"{cell:,}"
+    return str(cell)
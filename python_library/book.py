@@ -3,11 +3,15 @@ from typing import Optional
 
 
 class Book:
-    def __init__(self, book_id: str, title: str, author: str):
+    __slots__ = ('id', 'title', 'author', 'available', 'title_id')
+    
+    def __init__(self, book_id: str, title: str, author: str, title_id: Optional[str] = None):
         self.id = book_id
         self.title = title
         self.author = author
         self.available = True
+        # Copies of one title share its title id; a book without one is a single-copy title
+        self.title_id = title_id or book_id
     
     def get_id(self) -> str:
         return self.id
@@ -18,6 +22,9 @@ class Book:
     def get_author(self) -> str:
         return self.author
     
+    def get_title_id(self) -> str:
+        return self.title_id
+    
     def is_available(self) -> bool:
         return self.available
     
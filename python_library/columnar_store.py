@@ -0,0 +1,307 @@
+import sys
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+
+from .book import Book
+from .loan import Loan
+from .member import Member
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+NO_DATE = -2 ** 63  # same bit pattern as numpy's NaT
+
+
+def to_micros(date: Optional[datetime]) -> int:
+    """A naive datetime as microseconds since 1970-01-01, or NO_DATE for None"""
+    return (date - _EPOCH) // _MICROSECOND if date is not None else NO_DATE
+
+
+def from_micros(micros: int) -> Optional[datetime]:
+    """The inverse of to_micros"""
+    return _EPOCH + timedelta(microseconds=micros) if micros != NO_DATE else None
+
+
+class _StringColumn:
+    """Append-only column of strings packed as UTF-8 into one buffer"""
+
+    __slots__ = ('_data', '_offsets')
+
+    def __init__(self):
+        self._data = bytearray()
+        self._offsets = array('Q', [0])
+
+    def append(self, value: str) -> None:
+        self._data += value.encode('utf-8')
+        self._offsets.append(len(self._data))
+
+    def __getitem__(self, row: int) -> str:
+        return self._data[self._offsets[row]:self._offsets[row + 1]].decode('utf-8')
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+
+class _Bitset:
+    """Growable bitset backed by a bytearray"""
+
+    __slots__ = ('_bits', '_count')
+
+    def __init__(self):
+        self._bits = bytearray()
+        self._count = 0
+
+    def append(self, value: bool) -> None:
+        row = self._count
+        if row >> 3 >= len(self._bits):
+            self._bits.append(0)
+        self._count += 1
+        self[row] = value
+
+    def __getitem__(self, row: int) -> bool:
+        return bool(self._bits[row >> 3] >> (row & 7) & 1)
+
+    def __setitem__(self, row: int, value: bool) -> None:
+        if value:
+            self._bits[row >> 3] |= 1 << (row & 7)
+        else:
+            self._bits[row >> 3] &= ~(1 << (row & 7)) & 0xFF
+
+
+class BookView:
+    """Book-compatible view of one row of a ColumnarBookStore"""
+
+    __slots__ = ('_store', '_row')
+
+    def __init__(self, store: 'ColumnarBookStore', row: int):
+        self._store = store
+        self._row = row
+
+    id = property(lambda self: self.get_id())
+    title = property(lambda self: self.get_title())
+    author = property(lambda self: self.get_author())
+    available = property(lambda self: self.is_available())
+    title_id = property(lambda self: self.get_title_id())
+
+    def get_id(self) -> str:
+        return self._store._ids[self._row]
+
+    def get_title(self) -> str:
+        return self._store._titles[self._row]
+
+    def get_author(self) -> str:
+        return self._store._authors[self._row]
+
+    def get_title_id(self) -> str:
+        return self._store._title_ids.get(self._row) or self.get_id()
+
+    def is_available(self) -> bool:
+        return self._store._available[self._row]
+
+    def set_available(self, available: bool) -> None:
+        self._store._available[self._row] = available
+
+
+class ColumnarBookStore:
+    """
+    Compact, append-only book storage.
+
+    Ids and authors are interned strings (repeated authors share one object),
+    titles are packed UTF-8 and availability is one bit per book. Books are
+    read back as BookView objects, which expose the same getters as Book.
+    """
+
+    def __init__(self):
+        self._ids: List[str] = []
+        self._titles = _StringColumn()
+        self._authors: List[str] = []
+        self._available = _Bitset()
+        self._title_ids: Dict[int, str] = {}   # only for copies of multi-copy titles
+        self._rows: Dict[str, int] = {}
+
+    def add(self, book: Book) -> BookView:
+        book_id = sys.intern(book.get_id())
+        if book_id in self._rows:
+            raise ValueError(f"Duplicate book id: {book_id}")
+        row = len(self._ids)
+        self._ids.append(book_id)
+        self._titles.append(book.get_title())
+        self._authors.append(sys.intern(book.get_author()))
+        self._available.append(book.is_available())
+        if book.get_title_id() != book_id:
+            self._title_ids[row] = sys.intern(book.get_title_id())
+        self._rows[book_id] = row
+        return BookView(self, row)
+
+    def get(self, book_id: str) -> Optional[BookView]:
+        row = self._rows.get(book_id)
+        return BookView(self, row) if row is not None else None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, book_id: str) -> bool:
+        return book_id in self._rows
+
+    def __iter__(self) -> Iterator[BookView]:
+        return (BookView(self, row) for row in range(len(self._ids)))
+
+
+class MemberView:
+    """Member-compatible view of one row of a ColumnarMemberStore"""
+
+    __slots__ = ('_store', '_row')
+
+    def __init__(self, store: 'ColumnarMemberStore', row: int):
+        self._store = store
+        self._row = row
+
+    id = property(lambda self: self.get_id())
+    name = property(lambda self: self.get_name())
+    email = property(lambda self: self.get_email())
+    category = property(lambda self: self.get_category())
+
+    def get_id(self) -> str:
+        return self._store._ids[self._row]
+
+    def get_name(self) -> str:
+        return self._store._names[self._row]
+
+    def get_email(self) -> str:
+        return self._store._emails[self._row]
+
+    def get_category(self) -> str:
+        return self._store._categories[self._row]
+
+
+class ColumnarMemberStore:
+    """Compact, append-only member storage read back as MemberView objects"""
+
+    def __init__(self):
+        self._ids: List[str] = []
+        self._names = _StringColumn()
+        self._emails = _StringColumn()
+        self._categories: List[str] = []   # a handful of distinct values, interned
+        self._rows: Dict[str, int] = {}
+
+    def add(self, member: Member) -> MemberView:
+        member_id = sys.intern(member.get_id())
+        if member_id in self._rows:
+            raise ValueError(f"Duplicate member id: {member_id}")
+        row = len(self._ids)
+        self._ids.append(member_id)
+        self._names.append(member.get_name())
+        self._emails.append(member.get_email())
+        self._categories.append(sys.intern(member.get_category()))
+        self._rows[member_id] = row
+        return MemberView(self, row)
+
+    def get(self, member_id: str) -> Optional[MemberView]:
+        row = self._rows.get(member_id)
+        return MemberView(self, row) if row is not None else None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, member_id: str) -> bool:
+        return member_id in self._rows
+
+    def __iter__(self) -> Iterator[MemberView]:
+        return (MemberView(self, row) for row in range(len(self._ids)))
+
+
+class LoanView:
+    """
+    Loan-compatible view of one loan in a ColumnarLoanStore.
+
+    Loans can be removed (which moves another loan into the freed row), so a
+    view remembers its loan id and looks its row up on every access.
+    """
+
+    __slots__ = ('_store', '_id')
+
+    def __init__(self, store: 'ColumnarLoanStore', loan_id: str):
+        self._store = store
+        self._id = loan_id
+
+    id = property(lambda self: self.get_id())
+    member_id = property(lambda self: self.get_member_id())
+    book_id = property(lambda self: self.get_book_id())
+    borrow_date = property(lambda self: self.get_borrow_date())
+
+    def get_id(self) -> str:
+        return self._id
+
+    def get_member_id(self) -> str:
+        return self._store._member_ids[self._store._rows[self._id]]
+
+    def get_book_id(self) -> str:
+        return self._store._book_ids[self._store._rows[self._id]]
+
+    def get_borrow_date(self) -> Optional[datetime]:
+        return from_micros(self._store._borrow_micros[self._store._rows[self._id]])
+
+
+class ColumnarLoanStore:
+    """
+    Compact loan storage.
+
+    Member and book ids are interned, so a member's id is stored once however
+    many loans reference it, and borrow dates are int64 microseconds since the
+    epoch (day granularity would change fine results). Removal moves the last
+    loan into the freed row, keeping the columns dense.
+    """
+
+    def __init__(self):
+        self._ids: List[str] = []
+        self._member_ids: List[str] = []
+        self._book_ids: List[str] = []
+        self._borrow_micros = array('q')
+        self._rows: Dict[str, int] = {}
+
+    def add(self, loan: Loan) -> LoanView:
+        loan_id = sys.intern(loan.get_id())
+        if loan_id in self._rows:
+            raise ValueError(f"Duplicate loan id: {loan_id}")
+        self._rows[loan_id] = len(self._ids)
+        self._ids.append(loan_id)
+        self._member_ids.append(sys.intern(loan.get_member_id()))
+        self._book_ids.append(sys.intern(loan.get_book_id()))
+        self._borrow_micros.append(to_micros(loan.get_borrow_date()))
+        return LoanView(self, loan_id)
+
+    def remove(self, loan_id: str) -> bool:
+        row = self._rows.pop(loan_id, None)
+        if row is None:
+            return False
+        last = len(self._ids) - 1
+        if row != last:
+            moved_id = self._ids[last]
+            self._ids[row] = moved_id
+            self._member_ids[row] = self._member_ids[last]
+            self._book_ids[row] = self._book_ids[last]
+            self._borrow_micros[row] = self._borrow_micros[last]
+            self._rows[moved_id] = row
+        self._ids.pop()
+        self._member_ids.pop()
+        self._book_ids.pop()
+        self._borrow_micros.pop()
+        return True
+
+    def get(self, loan_id: str) -> Optional[LoanView]:
+        return LoanView(self, loan_id) if loan_id in self._rows else None
+
+    def borrow_dates_array(self):
+        """Borrow dates as a numpy datetime64[us] array aligned with iteration order (needs numpy)"""
+        import numpy as np
+        # Copy, so the array('q') is not locked against resizing by the exported buffer
+        return np.frombuffer(self._borrow_micros, dtype='datetime64[us]').copy()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, loan_id: str) -> bool:
+        return loan_id in self._rows
+
+    def __iter__(self) -> Iterator[LoanView]:
+        return (LoanView(self, loan_id) for loan_id in list(self._ids))
@@ -0,0 +1,102 @@
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from .availability_index import AvailabilityIndex
+from .book import Book
+
+
+class TitleAvailability(NamedTuple):
+    """One title with at least one free copy"""
+    title_id: str
+    title: str
+    author: str
+    available_copies: int
+    total_copies: int
+
+
+class HoldingsIndex:
+    """
+    Copies grouped by title, with each title's free copies ready to lend.
+
+    Only titles with several copies are tracked: a book that is its own title
+    (title id == book id, the default) needs no entry, so a catalog of single
+    copies costs nothing extra. A title is tracked from the first copy whose
+    id differs from the title id; a copy that carries the title id itself
+    joins it like any other copy. Each tracked title keeps its free copy ids
+    in an AvailabilityIndex, so handing out a free copy, lending a specific
+    one and taking one back are all O(1) however many copies the title has.
+    """
+
+    __slots__ = ('_copies', '_free')
+
+    def __init__(self):
+        self._copies: Dict[str, Set[str]] = {}           # title id -> every copy id
+        self._free: Dict[str, AvailabilityIndex] = {}    # title id -> free copy ids
+
+    def add(self, book: Book, find_book: Optional[Callable[[str], Optional[Book]]] = None) -> None:
+        """
+        Track a copy. When this starts tracking its title, find_book(title_id)
+        looks up a copy added earlier under the title id, so it joins too.
+        """
+        title_id, copy_id = book.get_title_id(), book.get_id()
+        copies = self._copies.get(title_id)
+        if copies is None:
+            if title_id == copy_id:
+                return
+            copies = self._copies[title_id] = set()
+            self._free[title_id] = AvailabilityIndex()
+            first_copy = find_book(title_id) if find_book is not None else None
+            if first_copy is not None and first_copy.get_title_id() == title_id:
+                copies.add(title_id)
+                self.set_available(first_copy)
+        copies.add(copy_id)
+        self.set_available(book)
+
+    def remove(self, book: Book) -> None:
+        """Stop tracking a copy, and its title once it has no copies left"""
+        title_id = book.get_title_id()
+        copies = self._copies.get(title_id)
+        if copies is None:
+            return
+        copies.discard(book.get_id())
+        self._free[title_id].discard(book.get_id())
+        if not copies:
+            del self._copies[title_id]
+            del self._free[title_id]
+
+    def set_available(self, book: Book) -> None:
+        """Record a copy's availability after it was lent or returned"""
+        free = self._free.get(book.get_title_id())
+        if free is None:
+            return
+        if book.is_available():
+            free.add(book.get_id())
+        else:
+            free.discard(book.get_id())
+
+    def free_copies(self, title_id: str, limit: int = 1) -> List[str]:
+        """Up to limit free copy ids of a tracked title, without lending them"""
+        free = self._free.get(title_id)
+        return free.page(0, limit) if free is not None else []
+
+    def counts(self, title_id: str) -> Optional[Tuple[int, int]]:
+        """(free, total) copies of a tracked title, None for single-copy titles"""
+        copies = self._copies.get(title_id)
+        return (len(self._free[title_id]), len(copies)) if copies is not None else None
+
+    def available_titles(self, available_books: Iterable[Book]) -> Iterator[TitleAvailability]:
+        """One TitleAvailability per title among available_books, in their order"""
+        seen: Set[str] = set()
+        for book in available_books:
+            title_id = book.get_title_id()
+            counts = self.counts(title_id)
+            if counts is None:
+                yield TitleAvailability(title_id, book.get_title(), book.get_author(), 1, 1)
+            elif title_id not in seen:
+                seen.add(title_id)
+                yield TitleAvailability(title_id, book.get_title(), book.get_author(), *counts)
+
+    def __len__(self) -> int:
+        return len(self._copies)
+
+    def __contains__(self, title_id: str) -> bool:
+        return title_id in self._copies
@@ -1,51 +1,92 @@
-import uuid
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, ValuesView
 
 from .book import Book
 from .member import Member
 from .loan import Loan
+from .loan_date_index import LoanDateIndex
+from .availability_index import AvailabilityIndex
+from .holdings_index import HoldingsIndex, TitleAvailability
+from .loan_id_generator import LoanIdGenerator
+from .search_index import BookSearchIndex
 
 
 class LibraryService:
-    def __init__(self):
-        self.books: List[Book] = []
-        self.members: List[Member] = []
-        self.loans: List[Loan] = []
+    LOAN_DURATION_DAYS = 14
+    
+    def __init__(self, loan_id_generator: Optional[LoanIdGenerator] = None):
+        # Time-ordered loan ids; the process-wide generator unless one is given
+        self.loan_id_generator = loan_id_generator or LoanIdGenerator.default()
+        
+        # Primary indexes keyed by id (dicts keep insertion order)
+        self._books_by_id: Dict[str, Book] = {}
+        self._members_by_id: Dict[str, Member] = {}
+        self._loans_by_id: Dict[str, Loan] = {}
+        
+        # Secondary index: member id -> {loan id -> loan}
+        self.member_loans: Dict[str, Dict[str, Loan]] = {}
+        
+        # Secondary index: loan ids ordered by due date
+        self.due_dates = LoanDateIndex()
+        
+        # Secondary index: ids of available books
+        self.available_books = AvailabilityIndex()
+        
+        # Secondary index: free copies of titles with several copies
+        self.holdings = HoldingsIndex()
+        
+        # Full-text index over titles and authors
+        self.search_index = BookSearchIndex()
+    
+    @property
+    def books(self) -> ValuesView[Book]:
+        # Every book, in the order added; a live, read-only view like the list it replaced
+        return self._books_by_id.values()
+    
+    @property
+    def members(self) -> ValuesView[Member]:
+        return self._members_by_id.values()
+    
+    @property
+    def loans(self) -> ValuesView[Loan]:
+        # Open loans, in the order borrowed
+        return self._loans_by_id.values()
+    
+    def get_book(self, book_id: str) -> Optional[Book]:
+        return self._books_by_id.get(book_id)
+    
+    def get_member(self, member_id: str) -> Optional[Member]:
+        return self._members_by_id.get(member_id)
+    
+    def get_loan(self, loan_id: str) -> Optional[Loan]:
+        return self._loans_by_id.get(loan_id)
     
     def borrow_book(self, member_id: str, book_id: str) -> str:
         try:
             # Find member
-            member = None
-            for m in self.members:
-                if m.get_id() == member_id:
-                    member = m
-                    break
+            member = self._members_by_id.get(member_id)
             
             if member is None:
                 return "Member not found"
             
-            # Find book
-            book = None
-            for b in self.books:
-                if b.get_id() == book_id:
-                    book = b
-                    break
+            # Find book; a title id lends any free copy of the title
+            book = self._books_by_id.get(book_id)
+            if book is None or not book.is_available():
+                copy_ids = self.holdings.free_copies(book_id)
+                if copy_ids:
+                    book = self._books_by_id[copy_ids[0]]
             
             if book is None:
-                return "Book not found"
+                # A title whose copies are all lent is known, just not available
+                return "Book is not available" if book_id in self.holdings else "Book not found"
             
             # Check if book is available
             if not book.is_available():
                 return "Book is not available"
             
             # Create loan
-            loan_id = str(uuid.uuid4())
-            loan = Loan(loan_id, member_id, book_id, datetime.now())
-            self.loans.append(loan)
-            
-            # Update book status
-            book.set_available(False)
+            loan_id = self.loan_id_generator.next_id()
+            self._apply_borrow(Loan(loan_id, member_id, book.get_id(), datetime.now()))
             
             return f"Book borrowed successfully. Loan ID: {loan_id}"
             
@@ -55,27 +96,12 @@ class LibraryService:
     def return_book(self, loan_id: str) -> str:
         try:
             # Find loan
-            loan = None
-            for l in self.loans:
-                if l.get_id() == loan_id:
-                    loan = l
-                    break
+            loan = self._loans_by_id.get(loan_id)
             
             if loan is None:
                 return "Loan not found"
             
-            # Find book
-            book = None
-            for b in self.books:
-                if b.get_id() == loan.get_book_id():
-                    book = b
-                    break
-            
-            if book is not None:
-                book.set_available(True)
-            
-            # Remove loan
-            self.loans.remove(loan)
+            self._apply_return(loan)
             
             return "Book returned successfully"
             
@@ -83,31 +109,63 @@ class LibraryService:
             return f"Error: {str(e)}"
     
     def get_available_books(self) -> List[Book]:
-        available_books = []
-        for book in self.books:
-            if book.is_available():
-                available_books.append(book)
-        return available_books
+        return list(self.iter_available_books())
+    
+    def get_available_titles(self) -> List[TitleAvailability]:
+        # One entry per title with a free copy, with its free and total copy counts
+        return list(self.holdings.available_titles(self.iter_available_books()))
+    
+    def iter_available_books(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[Book]:
+        # Stream available books from the availability index, skipping offset of them
+        books = self._books_by_id
+        for book_id in self.available_books.iter_pages(offset, limit):
+            yield books[book_id]
+    
+    def search_books(self, query: str, limit: int = 10, available_only: bool = False) -> List[Book]:
+        # Ranked title/author search; the last word of query also matches as a prefix
+        predicate = self.available_books.__contains__ if available_only else None
+        return [self._books_by_id[book_id] for book_id in self.search_index.search(query, limit, predicate=predicate)]
+    
+    def suggest(self, prefix: str, limit: int = 10) -> List[str]:
+        # Autocomplete a title or author word
+        return self.search_index.suggest(prefix, limit)
     
     def get_member_loans(self, member_id: str) -> List[Loan]:
-        member_loans = []
-        for loan in self.loans:
-            if loan.get_member_id() == member_id:
-                member_loans.append(loan)
-        return member_loans
+        return list(self.member_loans.get(member_id, {}).values())
+    
+    def get_overdue_loans(self, as_of: Optional[datetime] = None) -> List[Loan]:
+        # Loans whose due date has passed, most overdue first
+        as_of = as_of or datetime.now()
+        return [self._loans_by_id[loan_id] for loan_id in self.due_dates.range(end=as_of)]
+    
+    def next_due(self, count: int) -> List[Loan]:
+        # The count loans with the earliest due dates
+        return [self._loans_by_id[loan_id] for loan_id in self.due_dates.first(count)]
+    
+    def get_loans_due_within(self, window: timedelta = timedelta(hours=24),
+                             as_of: Optional[datetime] = None) -> List[Loan]:
+        # Loans that are not overdue yet but will be within the window
+        as_of = as_of or datetime.now()
+        loan_ids = self.due_dates.range(start=as_of, end=as_of + window)
+        return [self._loans_by_id[loan_id] for loan_id in loan_ids]
     
     def add_book(self, book: Book) -> None:
-        self.books.append(book)
+        previous = self._books_by_id.get(book.get_id())
+        if previous is not None:
+            self.holdings.remove(previous)
+        self._books_by_id[book.get_id()] = book
+        if book.is_available():
+            self.available_books.add(book.get_id())
+        else:
+            self.available_books.discard(book.get_id())
+        self.holdings.add(book, self._books_by_id.get)
+        self.search_index.add(book)
     
     def add_member(self, member: Member) -> None:
-        self.members.append(member)
+        self._members_by_id[member.get_id()] = member
     
     def calculate_fine(self, loan_id: str) -> float:
-        loan = None
-        for l in self.loans:
-            if l.get_id() == loan_id:
-                loan = l
-                break
+        loan = self._loans_by_id.get(loan_id)
         
         if loan is None:
             return 0.0
@@ -115,7 +173,38 @@ class LibraryService:
         # Calculate days overdue
         days_overdue = (datetime.now() - loan.get_borrow_date()).days
         
-        if days_overdue > 14:
-            return (days_overdue - 14) * 0.50  # $0.50 per day after 14 days
+        if days_overdue > self.LOAN_DURATION_DAYS:
+            return (days_overdue - self.LOAN_DURATION_DAYS) * 0.50  # $0.50 per day after 14 days
         
         return 0.0
+    
+    def _apply_borrow(self, loan: Loan) -> None:
+        # Record a validated loan and mark its book as lent
+        self._loans_by_id[loan.get_id()] = loan
+        self.member_loans.setdefault(loan.get_member_id(), {})[loan.get_id()] = loan
+        self.due_dates.add(loan.get_id(), self._due_date(loan))
+        
+        book = self._books_by_id.get(loan.get_book_id())
+        if book is not None:
+            book.set_available(False)
+            self.available_books.discard(book.get_id())
+            self.holdings.set_available(book)
+    
+    def _apply_return(self, loan: Loan) -> None:
+        # Close an open loan and make its book available again
+        book = self._books_by_id.get(loan.get_book_id())
+        if book is not None:
+            book.set_available(True)
+            self.available_books.add(book.get_id())
+            self.holdings.set_available(book)
+        
+        del self._loans_by_id[loan.get_id()]
+        member_loans = self.member_loans.get(loan.get_member_id())
+        if member_loans is not None:
+            member_loans.pop(loan.get_id(), None)
+            if not member_loans:
+                del self.member_loans[loan.get_member_id()]
+        self.due_dates.remove(loan.get_id())
+    
+    def _due_date(self, loan: Loan) -> datetime:
+        return loan.get_borrow_date() + timedelta(days=self.LOAN_DURATION_DAYS)
@@ -3,6 +3,8 @@ from typing import Optional
 
 
 class Loan:
+    __slots__ = ('id', 'member_id', 'book_id', 'borrow_date')
+    
     def __init__(self, loan_id: str, member_id: str, book_id: str, borrow_date: datetime):
         self.id = loan_id
         self.member_id = member_id
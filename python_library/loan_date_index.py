@@ -0,0 +1,106 @@
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class LoanDateIndex:
+    """
+    Loan ids ordered by a date (due date or borrow date).
+
+    Entries are kept in a list of small sorted blocks, so adding or removing a
+    loan costs O(log n) plus a memmove inside one block, and range scans cost
+    O(log n + k) for k results. Ties are broken by loan id.
+    """
+
+    BLOCK_SIZE = 512
+
+    def __init__(self):
+        self._blocks: List[List[Tuple[datetime, str]]] = []
+        self._maxes: List[Tuple[datetime, str]] = []
+        self._keys: Dict[str, Tuple[datetime, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, loan_id: str) -> bool:
+        return loan_id in self._keys
+
+    def add(self, loan_id: str, date: datetime) -> None:
+        if loan_id in self._keys:
+            self.remove(loan_id)
+        key = (date, loan_id)
+        self._keys[loan_id] = key
+
+        if not self._blocks:
+            self._blocks.append([key])
+            self._maxes.append(key)
+            return
+
+        position = bisect_left(self._maxes, key)
+        if position == len(self._maxes):
+            position -= 1
+        block = self._blocks[position]
+        insort(block, key)
+        self._maxes[position] = block[-1]
+
+        if len(block) > 2 * self.BLOCK_SIZE:
+            half = block[self.BLOCK_SIZE:]
+            del block[self.BLOCK_SIZE:]
+            self._blocks.insert(position + 1, half)
+            self._maxes[position] = block[-1]
+            self._maxes.insert(position + 1, half[-1])
+
+    def remove(self, loan_id: str) -> bool:
+        key = self._keys.pop(loan_id, None)
+        if key is None:
+            return False
+
+        position = bisect_left(self._maxes, key)
+        block = self._blocks[position]
+        del block[bisect_left(block, key)]
+        if block:
+            self._maxes[position] = block[-1]
+        else:
+            del self._blocks[position]
+            del self._maxes[position]
+        return True
+
+    def date_of(self, loan_id: str) -> Optional[datetime]:
+        key = self._keys.get(loan_id)
+        return key[0] if key is not None else None
+
+    def iter_range(self, start: Optional[datetime] = None,
+                   end: Optional[datetime] = None) -> Iterator[Tuple[datetime, str]]:
+        """Yield (date, loan_id) pairs with start <= date < end in date order"""
+        if start is None:
+            position, offset = 0, 0
+        else:
+            probe = (start,)  # sorts before every (start, loan_id) key
+            position = bisect_left(self._maxes, probe)
+            offset = bisect_left(self._blocks[position], probe) if position < len(self._blocks) else 0
+
+        while position < len(self._blocks):
+            block = self._blocks[position]
+            for index in range(offset, len(block)):
+                key = block[index]
+                if end is not None and key[0] >= end:
+                    return
+                yield key
+            position += 1
+            offset = 0
+
+    def range(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+              limit: Optional[int] = None) -> List[str]:
+        """Loan ids with start <= date < end in date order, at most limit of them"""
+        loan_ids = []
+        if limit is not None and limit <= 0:
+            return loan_ids
+        for _, loan_id in self.iter_range(start, end):
+            loan_ids.append(loan_id)
+            if limit is not None and len(loan_ids) >= limit:
+                break
+        return loan_ids
+
+    def first(self, count: int) -> List[str]:
+        """The count loan ids with the earliest dates"""
+        return self.range(limit=count)
@@ -0,0 +1,110 @@
+import os
+import re
+import threading
+import time
+from typing import Callable, Optional
+
+_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"    # Crockford base32: no I, L, O or U
+
+
+class LoanIdGenerator:
+    """
+    Time-ordered 63-bit loan ids, written as 13 Crockford base32 characters.
+
+    An id packs, from the top: 41 bits of milliseconds since EPOCH_MS
+    (about 69 years), a 10-bit node id and a 12-bit sequence within the
+    millisecond. The text form is fixed-width, so ids sort as text in the
+    order they were made, and decode() turns it back into the integer a
+    store can key on. Ids from one generator strictly increase: if the clock
+    stands still or goes back, the sequence keeps counting, and after 4096
+    ids in one millisecond the next millisecond is borrowed.
+
+    Generators only avoid each other through their node ids: give every
+    process or shard that writes to the same store its own. The shared
+    default() generator takes its node id from the process id, and a new
+    one in a child after fork; two processes whose ids are equal modulo 1024
+    could still collide, so processes sharing a store should pass their own.
+    """
+
+    EPOCH_MS = 1_704_067_200_000    # 2024-01-01T00:00:00Z
+    NODE_BITS = 10
+    SEQUENCE_BITS = 12
+    MAX_NODE_ID = (1 << NODE_BITS) - 1
+    MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+    ID_BITS = 63                    # fits a signed 64-bit column
+    LENGTH = 13
+
+    ALPHABET = _ALPHABET
+    _PAIRS = [a + b for a in _ALPHABET for b in _ALPHABET]    # every 10-bit value as two characters
+    _TO_BASE32 = str.maketrans(_ALPHABET, "0123456789abcdefghijklmnopqrstuv")
+    _CANONICAL = re.compile(f"[{_ALPHABET}]{{{LENGTH}}}")
+
+    _default: Optional['LoanIdGenerator'] = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, node_id: int = 0, clock: Callable[[], int] = time.time_ns):
+        if not 0 <= node_id <= self.MAX_NODE_ID:
+            raise ValueError(f"node_id must be between 0 and {self.MAX_NODE_ID}")
+        self.node_id = node_id
+        self._clock = clock
+        self._last_ms = 0
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def default(cls) -> 'LoanIdGenerator':
+        """The generator shared by every service of this process that is not given one"""
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls(os.getpid() & cls.MAX_NODE_ID)
+            return cls._default
+
+    def next_int(self) -> int:
+        with self._lock:
+            now_ms = self._clock() // 1_000_000
+            if now_ms > self._last_ms:
+                self._last_ms, self._sequence = now_ms, 0
+            elif self._sequence < self.MAX_SEQUENCE:
+                self._sequence += 1
+            else:
+                self._last_ms, self._sequence = self._last_ms + 1, 0
+            return ((self._last_ms - self.EPOCH_MS) << (self.NODE_BITS + self.SEQUENCE_BITS)
+                    | self.node_id << self.SEQUENCE_BITS | self._sequence)
+
+    def next_id(self) -> str:
+        return self.encode(self.next_int())
+
+    @classmethod
+    def encode(cls, value: int) -> str:
+        # One character for the top 3 bits, then two per 10 bits
+        pairs = cls._PAIRS
+        return (cls.ALPHABET[value >> 60] + pairs[value >> 50 & 1023] + pairs[value >> 40 & 1023]
+                + pairs[value >> 30 & 1023] + pairs[value >> 20 & 1023] + pairs[value >> 10 & 1023]
+                + pairs[value & 1023])
+
+    @classmethod
+    def decode(cls, loan_id: str) -> Optional[int]:
+        """The integer of an id in this format, or None for any other string (e.g. a uuid)"""
+        if not isinstance(loan_id, str) or not cls._CANONICAL.fullmatch(loan_id):
+            return None
+        value = int(loan_id.translate(cls._TO_BASE32), 32)
+        return value if value >> cls.ID_BITS == 0 else None
+
+    @classmethod
+    def timestamp_ms(cls, value: int) -> int:
+        """When an id was made, in milliseconds since the Unix epoch"""
+        return (value >> (cls.NODE_BITS + cls.SEQUENCE_BITS)) + cls.EPOCH_MS
+
+
+def _reset_default_after_fork() -> None:
+    # Services hold on to the default generator, so the child changes its node id in place
+    # rather than continuing the parent's sequence under the parent's
+    LoanIdGenerator._default_lock = threading.Lock()
+    generator = LoanIdGenerator._default
+    if generator is not None:
+        generator._lock = threading.Lock()
+        generator.node_id = os.getpid() & LoanIdGenerator.MAX_NODE_ID
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_default_after_fork)
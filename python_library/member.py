@@ -2,10 +2,16 @@ from typing import Optional
 
 
 class Member:
-    def __init__(self, member_id: str, name: str, email: str):
+    __slots__ = ('id', 'name', 'email', 'category')
+    
+    # Category of members created without one; fine strategies can be chosen per category
+    DEFAULT_CATEGORY = "public"
+    
+    def __init__(self, member_id: str, name: str, email: str, category: str = DEFAULT_CATEGORY):
         self.id = member_id
         self.name = name
         self.email = email
+        self.category = category
     
     def get_id(self) -> str:
         return self.id
@@ -15,3 +21,6 @@ class Member:
     
     def get_email(self) -> str:
         return self.email
+    
+    def get_category(self) -> str:
+        return self.category
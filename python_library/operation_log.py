@@ -0,0 +1,243 @@
+import os
+import struct
+import threading
+import zlib
+from typing import Iterator, NamedTuple, Optional, Tuple
+
+# Operation codes
+ADD_BOOK = 1
+ADD_MEMBER = 2
+BORROW = 3
+RETURN = 4
+
+# Frame: payload length, CRC-32 of the payload
+_FRAME = struct.Struct('<II')
+# Payload header: sequence number, operation, string count, integer argument
+_HEADER = struct.Struct('<QBBq')
+_LENGTH = struct.Struct('<I')
+
+LOG_MAGIC = b'LIBOPLOG1\n'
+# Read buffer for scanning the log; frames are read one at a time through it
+_READ_BUFFER = 1 << 20
+
+
+class LogRecord(NamedTuple):
+    """One logged operation: an integer argument plus a few strings"""
+    seq: int
+    op: int
+    number: int
+    strings: Tuple[str, ...]
+
+
+def encode_record(seq: int, op: int, number: int, strings: Tuple[str, ...]) -> bytes:
+    """Serialize a record as a length- and CRC-prefixed frame"""
+    parts = [_HEADER.pack(seq, op, len(strings), number)]
+    for value in strings:
+        data = value.encode('utf-8')
+        parts.append(_LENGTH.pack(len(data)))
+        parts.append(data)
+    payload = b''.join(parts)
+    return _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def iter_frames(buffer, offset: int = 0) -> Iterator[Tuple[int, int]]:
+    """
+    Yield (start, end) of each intact payload in buffer from offset on.
+
+    Stops at the first frame that runs past the end of the buffer or whose
+    checksum does not match, i.e. at a write torn by a crash.
+    """
+    size = len(buffer)
+    frame_size = _FRAME.size
+    with memoryview(buffer) as view:
+        while offset + frame_size <= size:
+            length, checksum = _FRAME.unpack_from(view, offset)
+            start = offset + frame_size
+            end = start + length
+            if length < _HEADER.size or end > size or zlib.crc32(view[start:end]) != checksum:
+                return
+            yield start, end
+            offset = end
+
+
+def read_frames(file) -> Iterator[Tuple[bytes, int]]:
+    """
+    Yield (payload, end offset) of each intact frame read from file's position on.
+
+    Only one frame is held at a time, so the file is never read into memory
+    whole. Stops where iter_frames would: at a frame that runs past the end
+    of the file or whose checksum does not match.
+    """
+    size = os.fstat(file.fileno()).st_size
+    position = file.tell()
+    frame_size = _FRAME.size
+    while position + frame_size <= size:
+        length, checksum = _FRAME.unpack(file.read(frame_size))
+        end = position + frame_size + length
+        if length < _HEADER.size or end > size:
+            return
+        payload = file.read(length)
+        if zlib.crc32(payload) != checksum:
+            return
+        yield payload, end
+        position = end
+
+
+def decode_record(buffer, start: int, _unpack_header=_HEADER.unpack_from,
+                  _unpack_length=_LENGTH.unpack_from) -> LogRecord:
+    """Decode the payload beginning at start"""
+    seq, op, count, number = _unpack_header(buffer, start)
+    position = start + _HEADER.size
+    strings = []
+    for _ in range(count):
+        (length,) = _unpack_length(buffer, position)
+        position += _LENGTH.size
+        strings.append(str(buffer[position:position + length], 'utf-8'))
+        position += length
+    return LogRecord(seq, op, number, tuple(strings))
+
+
+class OperationLog:
+    """
+    Append-only, checksummed log of service operations.
+
+    Records are buffered in memory and written with a single write + fsync
+    per group (group commit): a group is flushed when group_size records are
+    pending, when a background flusher finds records older than max_delay
+    seconds, or on sync(). Appending never waits for the disk; callers that
+    need a record to be durable call wait_durable(seq). Records appended by
+    other threads while an fsync is in progress go into the next group.
+
+    On open, a torn or corrupt tail left by a crash is truncated away, so
+    every record in the file is intact. Numbering continues after the last
+    record, or after start_seq if that is higher (e.g. the sequence number a
+    snapshot covers, once reset() has emptied the log).
+    """
+
+    DEFAULT_GROUP_SIZE = 256
+    DEFAULT_MAX_DELAY = 0.005
+
+    def __init__(self, path: str, group_size: int = DEFAULT_GROUP_SIZE,
+                 max_delay: Optional[float] = DEFAULT_MAX_DELAY, fsync: bool = True, start_seq: int = 0):
+        if group_size < 1:
+            raise ValueError("group_size must be at least 1")
+        self.path = path
+        self.group_size = group_size
+        self.max_delay = max_delay
+        self._fsync = fsync
+
+        self._file = open(path, 'a+b')
+        self._last_seq = max(self._recover(), start_seq)
+        self._synced_seq = self._last_seq
+
+        self._lock = threading.Lock()      # guards the buffer and sequence numbers
+        self._io_lock = threading.Lock()   # serializes writes to the file
+        self._buffer = bytearray()
+        self._buffered = 0
+
+        self._closed = threading.Event()
+        self._flusher = None
+        if max_delay is not None:
+            self._flusher = threading.Thread(target=self._flush_periodically, name='operation-log-flusher',
+                                             daemon=True)
+            self._flusher.start()
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the last appended record"""
+        return self._last_seq
+
+    @property
+    def synced_seq(self) -> int:
+        """Sequence number of the last record known to be on disk"""
+        return self._synced_seq
+
+    def append(self, op: int, number: int = 0, strings: Tuple[str, ...] = ()) -> int:
+        """Buffer one record and return its sequence number"""
+        with self._lock:
+            seq = self._last_seq + 1
+            self._buffer += encode_record(seq, op, number, strings)
+            self._last_seq = seq
+            self._buffered += 1
+            full = self._buffered >= self.group_size
+        if full:
+            self.sync()
+        return seq
+
+    def sync(self) -> None:
+        """Write and fsync every buffered record as one group"""
+        with self._io_lock:
+            with self._lock:
+                if not self._buffer:
+                    return
+                data, seq = self._buffer, self._last_seq
+                self._buffer = bytearray()
+                self._buffered = 0
+            self._file.write(data)
+            self._file.flush()
+            if self._fsync:
+                os.fsync(self._file.fileno())
+            self._synced_seq = seq
+
+    def wait_durable(self, seq: int) -> None:
+        """Block until the record with sequence number seq is on disk"""
+        while self._synced_seq < seq:
+            self.sync()
+
+    def records(self, after_seq: int = 0) -> Iterator[LogRecord]:
+        """Yield the records on disk with a sequence number above after_seq"""
+        self.sync()
+        with open(self.path, 'rb', buffering=_READ_BUFFER) as file:
+            file.seek(len(LOG_MAGIC))
+            for payload, _ in read_frames(file):
+                record = decode_record(payload, 0)
+                if record.seq > after_seq:
+                    yield record
+
+    def reset(self) -> None:
+        """Discard the records on disk, e.g. once a snapshot covers them; buffered records and numbering are kept"""
+        with self._io_lock:
+            self._file.truncate(len(LOG_MAGIC))
+            self._file.flush()
+            if self._fsync:
+                os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.sync()
+        self._file.close()
+
+    def __enter__(self) -> 'OperationLog':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _recover(self) -> int:
+        # Find the last intact record, cut off anything after it and return its sequence number
+        self._file.seek(0)
+        magic = self._file.read(len(LOG_MAGIC))
+        if magic != LOG_MAGIC and LOG_MAGIC.startswith(magic):
+            # New file, or a crash while creating it
+            self._file.truncate(0)
+            self._file.write(LOG_MAGIC)
+            self._file.flush()
+            return 0
+        if magic != LOG_MAGIC:
+            raise ValueError(f"Not an operation log: {self.path}")
+
+        end, last_seq = len(LOG_MAGIC), 0
+        for payload, end in read_frames(self._file):
+            last_seq = _HEADER.unpack_from(payload)[0]
+        if end < os.fstat(self._file.fileno()).st_size:
+            self._file.truncate(end)
+            self._file.flush()
+        return last_seq
+
+    def _flush_periodically(self) -> None:
+        while not self._closed.wait(self.max_delay):
+            self.sync()
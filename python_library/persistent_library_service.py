@@ -0,0 +1,156 @@
+import os
+from typing import Iterable, Iterator, Optional, Tuple
+
+from .book import Book
+from .columnar_store import from_micros, to_micros
+from .library_service import LibraryService
+from .loan_id_generator import LoanIdGenerator
+from .loan import Loan
+from .member import Member
+from .operation_log import ADD_BOOK, ADD_MEMBER, BORROW, RETURN, LogRecord, OperationLog
+from .snapshot import SnapshotReader, write_snapshot
+
+
+class PersistentLibraryService(LibraryService):
+    """
+    LibraryService whose state survives restarts.
+
+    Every add_book, add_member, borrow and return is appended to a
+    write-ahead OperationLog before it is applied. Every snapshot_every
+    operations (and on snapshot()) the whole state is written to a compact
+    snapshot file and the log is emptied. On startup the snapshot is loaded
+    through a memory map and the log tail is replayed on top of it.
+
+    By default an operation returns once it is buffered, and the log makes
+    it durable within max_delay seconds or group_size operations; with
+    synchronous_commit=True every operation waits for its group's fsync.
+    Only changes made through the service are logged; mutating a Book
+    directly (e.g. set_available) is not.
+    """
+
+    LOG_FILE = 'operations.log'
+    SNAPSHOT_FILE = 'snapshot.bin'
+    DEFAULT_SNAPSHOT_EVERY = 100_000
+
+    def __init__(self, directory: str, group_size: int = OperationLog.DEFAULT_GROUP_SIZE,
+                 max_delay: Optional[float] = OperationLog.DEFAULT_MAX_DELAY, fsync: bool = True,
+                 synchronous_commit: bool = False, snapshot_every: Optional[int] = DEFAULT_SNAPSHOT_EVERY,
+                 loan_id_generator: Optional[LoanIdGenerator] = None):
+        super().__init__(loan_id_generator)
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.synchronous_commit = synchronous_commit
+        self.snapshot_every = snapshot_every
+        self._fsync = fsync
+
+        # Rebuild the state: snapshot first, then the operations logged after it
+        snapshot_seq = 0
+        if os.path.exists(self._snapshot_path):
+            with SnapshotReader(self._snapshot_path) as snapshot:
+                snapshot_seq = snapshot.seq
+                self._replay(snapshot)
+        self._log = OperationLog(os.path.join(directory, self.LOG_FILE), group_size, max_delay, fsync,
+                                 start_seq=snapshot_seq)
+        self._since_snapshot = self._replay(self._log.records(snapshot_seq))
+
+    def add_book(self, book: Book) -> None:
+        self._write(ADD_BOOK, int(book.is_available()), (book.get_id(), book.get_title(), book.get_author(),
+                                                        book.get_title_id()))
+        super().add_book(book)
+        self._maybe_snapshot()
+
+    def add_member(self, member: Member) -> None:
+        self._write(ADD_MEMBER, 0, (member.get_id(), member.get_name(), member.get_email(), member.get_category()))
+        super().add_member(member)
+        self._maybe_snapshot()
+
+    def borrow_book(self, member_id: str, book_id: str) -> str:
+        result = super().borrow_book(member_id, book_id)
+        self._maybe_snapshot()
+        return result
+
+    def return_book(self, loan_id: str) -> str:
+        result = super().return_book(loan_id)
+        self._maybe_snapshot()
+        return result
+
+    def snapshot(self) -> int:
+        # Write the current state to the snapshot file, empty the log and return the snapshot size
+        self._log.sync()
+        size = write_snapshot(self._snapshot_path, self._log.last_seq, self._state_records(), self._fsync)
+        self._log.reset()
+        self._since_snapshot = 0
+        return size
+
+    def sync(self) -> None:
+        # Make every operation so far durable
+        self._log.sync()
+
+    def close(self) -> None:
+        self._log.close()
+
+    def __enter__(self) -> 'PersistentLibraryService':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _apply_borrow(self, loan: Loan) -> None:
+        self._write(BORROW, to_micros(loan.get_borrow_date()),
+                    (loan.get_id(), loan.get_member_id(), loan.get_book_id()))
+        super()._apply_borrow(loan)
+
+    def _apply_return(self, loan: Loan) -> None:
+        self._write(RETURN, 0, (loan.get_id(),))
+        super()._apply_return(loan)
+
+    @property
+    def _snapshot_path(self) -> str:
+        return os.path.join(self.directory, self.SNAPSHOT_FILE)
+
+    def _write(self, op: int, number: int, strings: Tuple[str, ...]) -> None:
+        # Log an operation ahead of applying it
+        seq = self._log.append(op, number, strings)
+        if self.synchronous_commit:
+            self._log.wait_durable(seq)
+        self._since_snapshot += 1
+
+    def _maybe_snapshot(self) -> None:
+        if self.snapshot_every is not None and self._since_snapshot >= self.snapshot_every:
+            self.snapshot()
+
+    def _replay(self, records: Iterable[LogRecord]) -> int:
+        # Apply logged operations without logging them again; return how many were applied
+        count = 0
+        for record in records:
+            strings = record.strings
+            if record.op == ADD_BOOK:
+                book_id, title, author, title_id = strings
+                book = Book(book_id, title, author, title_id)
+                book.set_available(bool(record.number))
+                super().add_book(book)
+            elif record.op == ADD_MEMBER:
+                member_id, name, email, category = strings
+                super().add_member(Member(member_id, name, email, category))
+            elif record.op == BORROW:
+                super()._apply_borrow(Loan(strings[0], strings[1], strings[2], from_micros(record.number)))
+            elif record.op == RETURN:
+                loan = self.get_loan(strings[0])
+                if loan is not None:
+                    super()._apply_return(loan)
+            else:
+                raise ValueError(f"Unknown operation {record.op} in record {record.seq}")
+            count += 1
+        return count
+
+    def _state_records(self) -> Iterator[LogRecord]:
+        # The current state as the operations that rebuild it
+        for book in self.books:
+            yield LogRecord(0, ADD_BOOK, int(book.is_available()), (book.get_id(), book.get_title(), book.get_author(),
+                                                                    book.get_title_id()))
+        for member in self.members:
+            yield LogRecord(0, ADD_MEMBER, 0, (member.get_id(), member.get_name(), member.get_email(),
+                                                member.get_category()))
+        for loan in self.loans:
+            yield LogRecord(0, BORROW, to_micros(loan.get_borrow_date()),
+                            (loan.get_id(), loan.get_member_id(), loan.get_book_id()))
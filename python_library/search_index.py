@@ -0,0 +1,244 @@
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .book import Book
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lower-case, accent-folded word tokens of text"""
+    if not text:
+        return []
+    if text.isascii():
+        # Nothing to fold: NFKD leaves ASCII unchanged and it has no combining marks
+        return _TOKEN.findall(text.lower())
+    folded = unicodedata.normalize('NFKD', text.casefold())
+    folded = ''.join(ch for ch in folded if not unicodedata.combining(ch))
+    return _TOKEN.findall(folded)
+
+
+class BookSearchIndex:
+    """
+    Incremental inverted index over book titles and authors.
+
+    Each token maps to the ids of the books containing it, grouped by field
+    weight (a title match counts more than an author match). A sorted
+    vocabulary supports prefix expansion of the last query word for
+    autocomplete. Queries match books containing every query word; results
+    are ranked by summed weights, with exact matches of the last word ranked
+    above prefix matches. Ties go to the more common completion of the last
+    word, then to the earlier indexed book.
+
+    Within a weight group ids are kept in indexing order, so single-word
+    queries walk the groups best first and stop after limit results however
+    common the word is. Multi-word queries intersect the postings with set
+    operations, rarest word first, and only score books matching every word.
+    """
+
+    TITLE_WEIGHT = 2.0
+    AUTHOR_WEIGHT = 1.0
+    EXACT_MATCH_BONUS = 0.5
+
+    # Prefix expansion keeps the MAX_EXPANSIONS most frequent terms starting
+    # with the prefix. Prefixes of at most MAX_PREFIX_SCAN terms are scanned;
+    # wider ones keep their top terms cached and updated as books change
+    MAX_PREFIX_SCAN = 256
+    MAX_EXPANSIONS = 50
+
+    def __init__(self, books: Iterable[Book] = ()):
+        # token -> weight -> {book_id: None} in indexing order
+        self._postings: Dict[str, Dict[float, Dict[str, None]]] = {}
+        self._frequencies: Dict[str, int] = {}
+        # book_id -> (title, author, token weights, indexing sequence number)
+        self._documents: Dict[str, Tuple[str, str, Dict[str, float], int]] = {}
+        self._vocabulary: List[str] = []
+        # Terms added since the vocabulary was last sorted; merged in on the next lookup,
+        # so bulk loads do not pay for an insort per new term
+        self._new_terms: List[str] = []
+        # prefix -> its MAX_EXPANSIONS most frequent terms, for prefixes too wide to scan
+        self._top_terms: Dict[str, List[str]] = {}
+        self._sequence = 0
+        for book in books:
+            self.add(book)
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __contains__(self, book_id: str) -> bool:
+        return book_id in self._documents
+
+    def add(self, book: Book) -> None:
+        """Index a book, replacing any earlier entry with the same id"""
+        book_id = book.get_id()
+        title, author = book.get_title() or '', book.get_author() or ''
+        document = self._documents.get(book_id)
+        if document is not None:
+            if document[0] == title and document[1] == author:
+                return
+            self.remove(book_id)
+
+        weights: Dict[str, float] = {}
+        for token in tokenize(title):
+            weights[token] = weights.get(token, 0.0) + self.TITLE_WEIGHT
+        for token in tokenize(author):
+            weights[token] = weights.get(token, 0.0) + self.AUTHOR_WEIGHT
+
+        for token, weight in weights.items():
+            groups = self._postings.get(token)
+            if groups is None:
+                groups = self._postings[token] = {}
+                self._frequencies[token] = 0
+                self._new_terms.append(token)
+            groups.setdefault(weight, {})[book_id] = None
+            self._frequencies[token] += 1
+            if self._top_terms:
+                self._promote(token)
+        self._documents[book_id] = (title, author, weights, self._sequence)
+        self._sequence += 1
+
+    def remove(self, book_id: str) -> None:
+        document = self._documents.pop(book_id, None)
+        if document is None:
+            return
+        for token, weight in document[2].items():
+            groups = self._postings[token]
+            group = groups[weight]
+            del group[book_id]
+            if not group:
+                del groups[weight]
+            self._frequencies[token] -= 1
+            if self._top_terms:
+                self._demote(token)
+            if not groups:
+                del self._postings[token]
+                del self._frequencies[token]
+                vocabulary = self._sorted_vocabulary()
+                del vocabulary[bisect_left(vocabulary, token)]
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[str]:
+        """Autocomplete: the most common indexed words starting with prefix"""
+        tokens = tokenize(prefix)
+        if not tokens or limit <= 0:
+            return []
+        return self._expand(tokens[-1], limit)
+
+    def search(self, query: str, limit: int = 10, prefix: bool = True,
+               predicate: Optional[Callable[[str], bool]] = None) -> List[str]:
+        """
+        Ids of the best matching books, best first.
+
+        With prefix=True the last query word also matches longer words
+        (autocomplete). predicate, if given, filters book ids before ranking.
+        """
+        tokens = tokenize(query)
+        if not tokens or limit <= 0:
+            return []
+        *words, last = tokens
+        bonus = self.EXACT_MATCH_BONUS
+        # Terms the last word may match, most common first, with their score boost
+        last_terms = {term: bonus if term == last else 0.0 for term in self._expand(last, self.MAX_EXPANSIONS)} \
+            if prefix else ({last: 0.0} if last in self._postings else {})
+        if not last_terms:
+            return []
+
+        if not words:
+            matches = self._iter_ranked(last_terms)
+            if predicate is not None:
+                matches = (book_id for book_id in matches if predicate(book_id))
+            return list(islice(matches, limit))
+
+        postings = self._postings
+        if any(word not in postings for word in words):
+            return []
+        # Intersect with C-level set operations, smallest term first, so only
+        # books matching every word are scored
+        term_groups = [list(postings[word].values()) for word in set(words)]
+        term_groups.append([group for term in last_terms for group in postings[term].values()])
+        term_groups.sort(key=lambda groups: sum(map(len, groups)))
+        candidates = set().union(*term_groups[0])
+        for groups in term_groups[1:]:
+            candidates = set().union(*(group.keys() & candidates for group in groups))
+            if not candidates:
+                return []
+
+        documents = self._documents
+        ranks = {term: rank for rank, term in enumerate(last_terms)}
+        scored = []
+        for book_id in candidates:
+            if predicate is not None and not predicate(book_id):
+                continue
+            _, _, terms, sequence = documents[book_id]
+            score = sum(terms[word] for word in words)
+            best, rank = max((weight + last_terms[term], -ranks[term])
+                             for term, weight in terms.items() if term in last_terms)
+            scored.append((-(score + best), -rank, sequence, book_id))
+        return [entry[-1] for entry in heapq.nsmallest(limit, scored)]
+
+    def _iter_ranked(self, terms: Dict[str, float]) -> Iterator[str]:
+        """Ids of books containing any of terms (most common first), best weight + boost first, each once"""
+        levels: Dict[float, List[Dict[str, None]]] = {}
+        for term, boost in terms.items():
+            for weight, group in self._postings[term].items():
+                levels.setdefault(weight + boost, []).append(group)
+
+        seen = set()
+        for score in sorted(levels, reverse=True):
+            for group in levels[score]:
+                # A book seen earlier already came out with its best score
+                for book_id in group:
+                    if book_id not in seen:
+                        seen.add(book_id)
+                        yield book_id
+
+    def _expand(self, prefix: str, limit: int) -> List[str]:
+        """Vocabulary terms starting with prefix, most frequent first, then alphabetically"""
+        vocabulary = self._sorted_vocabulary()
+        start = bisect_left(vocabulary, prefix)
+        end = bisect_left(vocabulary, prefix + '\U0010ffff', start)
+        if end - start <= self.MAX_PREFIX_SCAN or limit > self.MAX_EXPANSIONS:
+            return self._most_frequent(vocabulary[start:end], limit)
+        top = self._top_terms.get(prefix)
+        if top is None:
+            top = self._top_terms[prefix] = self._most_frequent(vocabulary[start:end], self.MAX_EXPANSIONS)
+        return top[:limit]
+
+    def _most_frequent(self, terms: List[str], limit: int) -> List[str]:
+        return heapq.nsmallest(limit, terms, key=self._rank_key)
+
+    def _rank_key(self, term: str) -> Tuple[int, str]:
+        return -self._frequencies[term], term
+
+    def _promote(self, term: str) -> None:
+        """term became more frequent: it may enter or move up the cached lists of its prefixes"""
+        for length in range(1, len(term) + 1):
+            top = self._top_terms.get(term[:length])
+            if top is None:
+                continue
+            if term not in top:
+                if self._rank_key(term) > self._rank_key(top[-1]):
+                    continue
+                top.append(term)
+            # Nearly sorted, so this is about one pass over the list
+            top.sort(key=self._rank_key)
+            del top[self.MAX_EXPANSIONS:]
+
+    def _demote(self, term: str) -> None:
+        """term became less frequent: a cached list holding it may now miss a better term, so drop it"""
+        for length in range(1, len(term) + 1):
+            prefix = term[:length]
+            top = self._top_terms.get(prefix)
+            if top is not None and term in top:
+                del self._top_terms[prefix]
+
+    def _sorted_vocabulary(self) -> List[str]:
+        if self._new_terms:
+            # Timsort keeps the already sorted run, so this costs O(n + k log k) for k new terms
+            self._vocabulary += self._new_terms
+            self._vocabulary.sort()
+            self._new_terms = []
+        return self._vocabulary
@@ -0,0 +1,105 @@
+import mmap
+import os
+import struct
+from typing import Iterable, Iterator, Optional
+
+from .operation_log import LogRecord, decode_record, encode_record, iter_frames
+
+SNAPSHOT_MAGIC = b'LIBSNAP1\n'
+# Last record of every complete snapshot; its integer argument is the record count
+END = 0
+
+_SEQ = struct.Struct('<Q')
+_WRITE_CHUNK = 1 << 20
+
+
+def write_snapshot(path: str, seq: int, records: Iterable[LogRecord], fsync: bool = True) -> int:
+    """
+    Atomically replace the snapshot at path and return its size in bytes.
+
+    The records are written to a temporary file in the same framing as the
+    operation log, followed by an END record, then renamed over path, so a
+    crash leaves either the old or the new snapshot, never a mix. seq is the
+    sequence number of the last logged operation the snapshot reflects.
+    """
+    temporary = path + '.tmp'
+    count = 0
+    with open(temporary, 'wb') as file:
+        chunk = bytearray(SNAPSHOT_MAGIC)
+        chunk += _SEQ.pack(seq)
+        for record in records:
+            chunk += encode_record(seq, record.op, record.number, record.strings)
+            count += 1
+            if len(chunk) >= _WRITE_CHUNK:
+                file.write(chunk)
+                chunk = bytearray()
+        chunk += encode_record(seq, END, count, ())
+        file.write(chunk)
+        file.flush()
+        if fsync:
+            os.fsync(file.fileno())
+        size = file.tell()
+    os.replace(temporary, path)
+    if fsync and hasattr(os, 'O_DIRECTORY'):
+        # Make the rename itself durable
+        directory = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+    return size
+
+
+class SnapshotReader:
+    """
+    Memory-mapped snapshot file.
+
+    Records are decoded straight from the mapping, so loading never copies
+    the whole file into memory first. Iteration raises ValueError if the
+    snapshot is damaged or has no END record.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map: Optional[mmap.mmap] = None
+        try:
+            header_size = len(SNAPSHOT_MAGIC) + _SEQ.size
+            if os.fstat(self._file.fileno()).st_size < header_size:
+                raise ValueError(f"Not a snapshot: {path}")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self._map[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+                raise ValueError(f"Not a snapshot: {path}")
+            (self.seq,) = _SEQ.unpack_from(self._map, len(SNAPSHOT_MAGIC))
+        except BaseException:
+            self.close()
+            raise
+
+    def __iter__(self) -> Iterator[LogRecord]:
+        data = self._map
+        count = 0
+        for start, _ in iter_frames(data, len(SNAPSHOT_MAGIC) + _SEQ.size):
+            record = decode_record(data, start)
+            if record.op == END:
+                if record.number != count:
+                    break
+                return
+            count += 1
+            yield record
+        raise ValueError(f"Incomplete snapshot: {self.path}")
+
+    def close(self) -> None:
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # A partially consumed iterator still holds a view; the mapping is freed with it
+                pass
+            self._map = None
+        self._file.close()
+
+    def __enter__(self) -> 'SnapshotReader':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -1,9 +1,21 @@
+import os
+import random
+import shutil
+import tempfile
 import unittest
+from datetime import datetime, timedelta
 from unittest import TestCase
 
 from .library_service import LibraryService
 from .book import Book
 from .member import Member
+from .loan import Loan
+from .loan_date_index import LoanDateIndex
+from .loan_id_generator import LoanIdGenerator
+from .columnar_store import ColumnarBookStore, ColumnarLoanStore
+from .search_index import BookSearchIndex
+from .operation_log import OperationLog
+from .persistent_library_service import PersistentLibraryService
 
 
 class LibraryServiceTest(TestCase):
@@ -19,9 +31,345 @@ class LibraryServiceTest(TestCase):
         result = self.service.borrow_book("member1", "book1")
         self.assertIn("Book borrowed successfully", result)
     
+    def test_collections_yield_entities(self):
+        self.service.borrow_book("member1", "book1")
+        self.assertEqual([], [b for b in self.service.books if b.is_available()])
+        self.assertEqual(["John Doe"], [m.get_name() for m in self.service.members])
+        loan = next(iter(self.service.loans))
+        self.assertIs(loan, self.service.get_loan(loan.get_id()))
+        self.assertIsNone(self.service.get_book("missing"))
+    
     def test_borrow_book_member_not_found(self):
         result = self.service.borrow_book("invalid", "book1")
         self.assertEqual("Member not found", result)
+    
+    def test_borrow_book_not_available(self):
+        self.service.borrow_book("member1", "book1")
+        result = self.service.borrow_book("member1", "book1")
+        self.assertEqual("Book is not available", result)
+    
+    def test_return_book_updates_indexes(self):
+        result = self.service.borrow_book("member1", "book1")
+        loan_id = result.split("Loan ID: ")[1]
+        self.assertEqual(1, len(self.service.get_member_loans("member1")))
+        
+        self.assertEqual("Book returned successfully", self.service.return_book(loan_id))
+        self.assertEqual([], self.service.get_member_loans("member1"))
+        self.assertEqual("Loan not found", self.service.return_book(loan_id))
+        self.assertEqual(1, len(self.service.get_available_books()))
+    
+    def test_calculate_fine_overdue_loan(self):
+        self.service.borrow_book("member1", "book1")
+        loan = self.service.get_member_loans("member1")[0]
+        loan.borrow_date = datetime.now() - timedelta(days=20, hours=1)
+        self.assertEqual(3.0, self.service.calculate_fine(loan.get_id()))
+        self.assertEqual(0.0, self.service.calculate_fine("invalid"))
+    
+    def test_iter_available_books(self):
+        for i in range(2, 6):
+            self.service.add_book(Book(f"book{i}", f"Title {i}", "Author Name"))
+        self.service.borrow_book("member1", "book2")
+        
+        available = [b.get_id() for b in self.service.get_available_books()]
+        self.assertEqual(["book1", "book3", "book4", "book5"], sorted(available))
+        self.assertEqual(available[1:3], [b.get_id() for b in self.service.iter_available_books(1, 2)])
+    
+    def test_due_date_queries(self):
+        for i in range(2, 5):
+            self.service.add_book(Book(f"book{i}", f"Title {i}", "Author Name"))
+        for i in range(1, 5):
+            self.service.borrow_book("member1", f"book{i}")
+        loans = self.service.get_member_loans("member1")
+        now = datetime.now()
+        
+        self.assertEqual([], self.service.get_overdue_loans())
+        earliest = sorted(loans, key=lambda l: (l.get_borrow_date(), l.get_id()))[:2]
+        self.assertEqual(earliest, self.service.next_due(2))
+        self.assertEqual(4, len(self.service.get_overdue_loans(now + timedelta(days=15))))
+        self.assertEqual(4, len(self.service.get_loans_due_within(timedelta(days=1), now + timedelta(days=13, hours=12))))
+        
+        self.service.return_book(loans[0].get_id())
+        self.assertEqual(3, len(self.service.get_overdue_loans(now + timedelta(days=15))))
+    
+    def test_search_books(self):
+        self.service.add_book(Book("book2", "Learning Python", "Mark Lutz"))
+        self.service.add_book(Book("book3", "Python Tricks", "Dan Bader"))
+        self.service.add_book(Book("book4", "The Pythonic Way", "Someone Else"))
+        self.service.borrow_book("member1", "book3")
+        
+        self.assertEqual(["book2", "book3", "book4"], [b.get_id() for b in self.service.search_books("pyth")])
+        self.assertEqual(["book2", "book4"], [b.get_id() for b in self.service.search_books("pyth", available_only=True)])
+        self.assertEqual(["book3"], [b.get_id() for b in self.service.search_books("python bad")])
+        self.assertEqual([], self.service.search_books("python cooking"))
+        self.assertEqual(["python", "pythonic"], self.service.suggest("PYT"))
+    
+    def test_borrow_by_title_allocates_free_copies(self):
+        # book1 is the first copy of its title; two more copies join it
+        self.service.add_book(Book("book1-2", "Java Programming", "Author Name", "book1"))
+        self.service.add_book(Book("book1-3", "Java Programming", "Author Name", "book1"))
+        self.service.add_book(Book("book2", "Learning Python", "Mark Lutz"))
+        self.assertEqual((3, 3), self.service.holdings.counts("book1"))
+        
+        lent = set()
+        for _ in range(3):
+            loan_id = self.service.borrow_book("member1", "book1").split(": ")[1]
+            lent.add(self.service.get_loan(loan_id).get_book_id())
+        self.assertEqual({"book1", "book1-2", "book1-3"}, lent)
+        self.assertEqual("Book is not available", self.service.borrow_book("member1", "book1"))
+        self.assertEqual([("book2", "Learning Python", "Mark Lutz", 1, 1)], self.service.get_available_titles())
+        
+        loan = next(l for l in self.service.get_member_loans("member1") if l.get_book_id() == "book1-2")
+        self.service.return_book(loan.get_id())
+        self.assertEqual((1, 3), self.service.holdings.counts("book1"))
+        self.assertEqual([("book1", "Java Programming", "Author Name", 1, 3)],
+                         [t for t in self.service.get_available_titles() if t.title_id == "book1"])
+        self.assertIn("Book borrowed successfully", self.service.borrow_book("member1", "book1"))
+        self.assertEqual((0, 3), self.service.holdings.counts("book1"))
+    
+    def test_fully_lent_title_is_not_available(self):
+        # No book has the title's own id, only its copies do
+        self.service.add_book(Book("dune-1", "Dune", "Frank Herbert", "dune"))
+        self.service.add_book(Book("dune-2", "Dune", "Frank Herbert", "dune"))
+        for _ in range(2):
+            self.assertIn("Book borrowed successfully", self.service.borrow_book("member1", "dune"))
+        self.assertEqual("Book is not available", self.service.borrow_book("member1", "dune"))
+        self.assertEqual("Book not found", self.service.borrow_book("member1", "missing"))
+
+
+class LoanDateIndexTest(TestCase):
+    
+    def test_matches_sorted_reference(self):
+        rng = random.Random(7)
+        index = LoanDateIndex()
+        reference = {}
+        start = datetime(2024, 1, 1)
+        for i in range(5000):
+            loan_id = f"loan{rng.randrange(3000)}"
+            if loan_id in reference and rng.random() < 0.4:
+                self.assertTrue(index.remove(loan_id))
+                del reference[loan_id]
+            else:
+                date = start + timedelta(minutes=rng.randrange(100000))
+                index.add(loan_id, date)
+                reference[loan_id] = date
+        
+        expected = sorted((date, loan_id) for loan_id, date in reference.items())
+        self.assertEqual(len(expected), len(index))
+        self.assertEqual([loan_id for _, loan_id in expected[:10]], index.first(10))
+        low, high = start + timedelta(minutes=20000), start + timedelta(minutes=30000)
+        self.assertEqual([loan_id for date, loan_id in expected if low <= date < high], index.range(low, high))
+        self.assertFalse(index.remove("missing"))
+
+
+class ColumnarStoreTest(TestCase):
+    
+    def test_book_views_share_getters(self):
+        store = ColumnarBookStore()
+        for i in range(20):
+            store.add(Book(f"book{i}", f"Title {i} \u00e9", "Author Name"))
+        view = store.get("book13")
+        self.assertEqual(("book13", "Title 13 \u00e9", "Author Name"), (view.get_id(), view.get_title(), view.get_author()))
+        
+        view.set_available(False)
+        self.assertFalse(store.get("book13").is_available())
+        self.assertEqual(19, sum(book.is_available() for book in store))
+        self.assertIsNone(store.get("missing"))
+        with self.assertRaises(ValueError):
+            store.add(Book("book1", "Duplicate", "Author Name"))
+    
+    def test_loan_removal_keeps_views_valid(self):
+        store = ColumnarLoanStore()
+        borrow_date = datetime(2024, 5, 6, 7, 8, 9, 123456)
+        for i in range(5):
+            store.add(Loan(f"loan{i}", "member1", f"book{i}", borrow_date + timedelta(days=i)))
+        last = store.get("loan4")
+        
+        self.assertTrue(store.remove("loan1"))
+        self.assertFalse(store.remove("loan1"))
+        self.assertEqual(4, len(store))
+        self.assertEqual("book4", last.get_book_id())
+        self.assertEqual(borrow_date + timedelta(days=4), last.get_borrow_date())
+        self.assertEqual(["loan0", "loan4", "loan2", "loan3"], [loan.get_id() for loan in store])
+
+
+class BookSearchIndexTest(TestCase):
+    
+    def test_ranking_and_updates(self):
+        index = BookSearchIndex([
+            Book("b1", "Caf\u00e9 Society", "Anne Brown"),
+            Book("b2", "Brownies", "Cafe Baker"),
+            Book("b3", "Brown Study", "Brown"),
+        ])
+        # Title matches outrank author matches, exact words outrank prefixes
+        self.assertEqual(["b3", "b2", "b1"], index.search("brown"))
+        self.assertEqual(["b1", "b2"], index.search("cafe"))
+        self.assertEqual(["b3"], index.search("brown", prefix=False, predicate=lambda book_id: book_id != "b1"))
+        
+        index.add(Book("b3", "Study in Scarlet", "Doyle"))
+        self.assertEqual(["b2", "b1"], index.search("brown"))
+        index.remove("b2")
+        index.remove("b2")
+        self.assertEqual(["b1"], index.search("brown"))
+        self.assertEqual([], index.suggest("brownie"))
+        self.assertEqual(2, len(index))
+
+    def test_suggestions_rank_every_completion(self):
+        # Far more completions of "s" than one scan covers; the common ones sort last
+        rng = random.Random(3)
+        words = [f"s{i:04}" for i in range(2000)] + ["szechuan", "sweet", "salt"]
+        index = BookSearchIndex()
+        books = {}
+        for i in range(6000):
+            book_id = f"b{rng.randrange(3000)}"
+            if book_id in books and rng.random() < 0.3:
+                index.remove(book_id)
+                del books[book_id]
+                continue
+            title = " ".join(rng.choice(words[-3:]) if rng.random() < 0.3 else rng.choice(words) for _ in range(2))
+            books[book_id] = title
+            index.add(Book(book_id, title, "Anon"))
+            if i % 500 == 0:
+                counts = {}
+                for text in books.values():
+                    for word in set(text.split()):
+                        counts[word] = counts.get(word, 0) + 1
+                for prefix in ("s", "sw", "s00"):
+                    expected = sorted((word for word in counts if word.startswith(prefix)),
+                                      key=lambda word: (-counts[word], word))[:5]
+                    self.assertEqual(expected, index.suggest(prefix, 5))
+        self.assertEqual(["salt", "sweet", "szechuan"], sorted(index.suggest("s", 3)))
+
+
+class LoanIdGeneratorTest(TestCase):
+    
+    def test_ids_sort_in_creation_order(self):
+        now_ns = [1_717_200_000_000 * 1_000_000]
+        generator = LoanIdGenerator(node_id=5, clock=lambda: now_ns[0])
+        ids = []
+        for step in [0] * 5000 + [-10_000_000] * 3 + [2_000_000] * 3:
+            now_ns[0] += step          # thousands in one millisecond, then the clock goes back
+            ids.append(generator.next_id())
+        self.assertEqual(sorted(set(ids)), ids)
+        self.assertTrue(all(len(loan_id) == LoanIdGenerator.LENGTH for loan_id in ids))
+        
+        value = LoanIdGenerator.decode(ids[0])
+        self.assertEqual(ids[0], LoanIdGenerator.encode(value))
+        self.assertEqual(1_717_200_000_000, LoanIdGenerator.timestamp_ms(value))
+        self.assertEqual(5, value >> LoanIdGenerator.SEQUENCE_BITS & LoanIdGenerator.MAX_NODE_ID)
+        for other in ["loan1", ids[0].lower(), "Z" * 13, "0" * 12, "550e8400-e29b-41d4-a716-446655440000", None]:
+            self.assertIsNone(LoanIdGenerator.decode(other))
+        with self.assertRaises(ValueError):
+            LoanIdGenerator(node_id=1024)
+    
+    def test_service_uses_its_generator(self):
+        service = LibraryService(LoanIdGenerator(node_id=7))
+        service.add_member(Member("member1", "John Doe", "john@example.com"))
+        for i in range(3):
+            service.add_book(Book(f"book{i}", "Title", "Author"))
+            self.assertIn("Book borrowed successfully", service.borrow_book("member1", f"book{i}"))
+        loan_ids = [loan.get_id() for loan in service.loans]
+        self.assertEqual(sorted(loan_ids), loan_ids)
+        self.assertEqual([7] * 3, [LoanIdGenerator.decode(loan_id) >> LoanIdGenerator.SEQUENCE_BITS & 1023
+                                   for loan_id in loan_ids])
+        self.assertIs(LoanIdGenerator.default(), LibraryService().loan_id_generator)
+
+
+class PersistentLibraryServiceTest(TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+    
+    def open_service(self, **options):
+        options.setdefault('fsync', False)
+        options.setdefault('max_delay', None)
+        return PersistentLibraryService(self.directory, **options)
+    
+    def populate(self, service):
+        for i in range(6):
+            service.add_book(Book(f"book{i}", f"Title {i}", "Author"))
+        service.add_member(Member("member1", "John Doe", "john@example.com"))
+        loan_ids = [service.borrow_book("member1", f"book{i}").split(": ")[1] for i in range(3)]
+        service.return_book(loan_ids[1])
+        return [loan_ids[0], loan_ids[2]]
+    
+    def assert_restored(self, service, loan_ids):
+        self.assertEqual(6, len(service.books))
+        self.assertEqual(["member1"], [member.get_id() for member in service.members])
+        self.assertEqual(sorted(loan_ids), sorted(loan.get_id() for loan in service.get_member_loans("member1")))
+        self.assertEqual(["book1", "book3", "book4", "book5"],
+                         sorted(book.get_id() for book in service.get_available_books()))
+        overdue = service.get_overdue_loans(datetime.now() + timedelta(days=15))
+        self.assertEqual(sorted(loan_ids), sorted(loan.get_id() for loan in overdue))
+        self.assertEqual("book1", service.search_books("title 1")[0].get_id())
+    
+    def test_log_replay_restores_state(self):
+        with self.open_service(snapshot_every=None) as service:
+            loan_ids = self.populate(service)
+            borrow_date = service.get_loan(loan_ids[0]).get_borrow_date()
+        
+        with self.open_service(snapshot_every=None) as service:
+            self.assert_restored(service, loan_ids)
+            self.assertEqual(borrow_date, service.get_loan(loan_ids[0]).get_borrow_date())
+            self.assertEqual("Book is not available", service.borrow_book("member1", "book0"))
+    
+    def test_snapshot_plus_log_tail(self):
+        with self.open_service(snapshot_every=4) as service:
+            loan_ids = self.populate(service)
+        self.assertTrue(os.path.exists(os.path.join(self.directory, PersistentLibraryService.SNAPSHOT_FILE)))
+        
+        with self.open_service(snapshot_every=4) as service:
+            self.assert_restored(service, loan_ids)
+            service.return_book(loan_ids[0])
+        
+        with self.open_service() as service:
+            self.assertEqual([loan_ids[1]], [loan.get_id() for loan in service.get_member_loans("member1")])
+    
+    def test_torn_tail_is_discarded(self):
+        with self.open_service(snapshot_every=None) as service:
+            loan_ids = self.populate(service)
+        log_path = os.path.join(self.directory, PersistentLibraryService.LOG_FILE)
+        with open(log_path, 'ab') as file:
+            file.write(b"\x40\x00\x00\x00partial record")
+        
+        with self.open_service(snapshot_every=None) as service:
+            self.assert_restored(service, loan_ids)
+            service.add_member(Member("member2", "Jane Doe", "jane@example.com"))
+        
+        with self.open_service(snapshot_every=None) as service:
+            self.assertIsNotNone(service.get_member("member2"))
+        with OperationLog(log_path, max_delay=None, fsync=False) as log:
+            sequence = [record.seq for record in log.records()]
+        self.assertEqual(list(range(1, len(sequence) + 1)), sequence)
+    
+    def test_corrupt_record_ends_the_log(self):
+        log_path = os.path.join(self.directory, PersistentLibraryService.LOG_FILE)
+        with OperationLog(log_path, max_delay=None, fsync=False) as log:
+            for i in range(5):
+                log.append(1, i, (f"book{i}",))
+        with open(log_path, 'r+b') as file:
+            data = file.read()
+            # Flip a byte inside the third record's string
+            file.seek(data.index(b"book2") + 4)
+            file.write(b"X")
+        
+        with OperationLog(log_path, max_delay=None, fsync=False) as log:
+            self.assertEqual([("book0",), ("book1",)], [record.strings for record in log.records()])
+            self.assertEqual(2, log.last_seq)
+            self.assertEqual([("book1",)], [record.strings for record in log.records(after_seq=1)])
+    
+    def test_title_copies_survive_restart(self):
+        with self.open_service(snapshot_every=3) as service:
+            service.add_member(Member("member1", "John Doe", "john@example.com"))
+            for i in range(4):
+                service.add_book(Book(f"copy{i}", "Dune", "Frank Herbert", "dune"))
+            service.borrow_book("member1", "dune")
+        
+        with self.open_service(snapshot_every=None) as service:
+            self.assertEqual((3, 4), service.holdings.counts("dune"))
+            self.assertEqual([("dune", "Dune", "Frank Herbert", 3, 4)], service.get_available_titles())
 
 
 if __name__ == '__main__':
@@ -1,24 +1,106 @@
 # Library Management System - Solutions Package
 # This package contains improved implementations with design patterns and best practices
 
+from .async_book_repository import AsyncBookRepository
+from .async_library_service import AsyncLibraryService
+from .async_loan_repository import AsyncLoanRepository
+from .async_member_repository import AsyncMemberRepository
+from .async_repository_adapters import ExecutorBookRepository, ExecutorLoanRepository, ExecutorMemberRepository
+from .async_striped_lock import AsyncStripedLock
 from .book_repository import BookRepository
 from .borrow_result import BorrowResult
+from .bulk_exporter import BulkExporter
+from .bulk_importer import BulkImporter
+from .caching_repositories import CachingBookRepository, CachingLoanRepository, CachingMemberRepository
+from .catalog_file import CatalogFile
+from .concurrent_library_service import ConcurrentLibraryService
+from .daily_rate_fine_strategy import DailyRateFineStrategy
 from .fine_calculation_strategy import FineCalculationStrategy
+from .fine_ledger import FineLedger
+from .hold import Hold
+from .hold_queue import HoldQueue
+from .hold_result import HoldResult
+from .import_result import ImportResult, RowError
 from .improved_library_service import ImprovedLibraryService
+from .in_memory_book_repository import InMemoryBookRepository
+from .in_memory_loan_repository import InMemoryLoanRepository
+from .in_memory_member_repository import InMemoryMemberRepository
+from .loan_aggregations import LoanAggregation, LoanFines, MemberLoanCounts, OverdueLoans
+from .loan_chunk import LoanChunk
 from .loan_repository import LoanRepository
+from .lru_cache import CacheStats, LRUCache
+from .member_category_fine_strategy import MemberCategoryFineStrategy
 from .member_repository import MemberRepository
+from .mmap_book_repository import MmapBookRepository
+from .mmap_member_repository import MmapMemberRepository
+from .nightly_job_runner import NightlyJobRunner
 from .return_result import ReturnResult
+from .searchable_book_repository import SearchableBookRepository
+from .service_instrumentation import ServiceInstrumentation
+from .service_metrics import ServiceMetrics, SlowOperation
+from .sharded_library_service import ShardedLibraryService
+from .sqlite_book_repository import SQLiteBookRepository
+from .sqlite_connection_pool import SQLiteConnectionPool
+from .sqlite_loan_repository import SQLiteLoanRepository
+from .sqlite_member_repository import SQLiteMemberRepository
 from .standard_fine_strategy import StandardFineStrategy
+from .striped_lock import StripedLock
 from .student_fine_strategy import StudentFineStrategy
 
 __all__ = [
+    'AsyncBookRepository',
+    'AsyncLibraryService',
+    'AsyncLoanRepository',
+    'AsyncMemberRepository',
+    'AsyncStripedLock',
     'BookRepository',
     'BorrowResult', 
+    'BulkExporter',
+    'BulkImporter',
+    'CacheStats',
+    'CachingBookRepository',
+    'CachingLoanRepository',
+    'CachingMemberRepository',
+    'CatalogFile',
+    'ConcurrentLibraryService',
+    'DailyRateFineStrategy',
+    'ExecutorBookRepository',
+    'ExecutorLoanRepository',
+    'ExecutorMemberRepository',
     'FineCalculationStrategy',
+    'FineLedger',
+    'Hold',
+    'HoldQueue',
+    'HoldResult',
+    'ImportResult',
     'ImprovedLibraryService',
+    'InMemoryBookRepository',
+    'InMemoryLoanRepository',
+    'InMemoryMemberRepository',
+    'LoanAggregation',
+    'LoanChunk',
+    'LoanFines',
     'LoanRepository',
+    'LRUCache',
+    'MemberCategoryFineStrategy',
+    'MemberLoanCounts',
     'MemberRepository',
+    'MmapBookRepository',
+    'MmapMemberRepository',
+    'NightlyJobRunner',
+    'OverdueLoans',
     'ReturnResult',
+    'RowError',
+    'SearchableBookRepository',
+    'ServiceInstrumentation',
+    'ServiceMetrics',
+    'ShardedLibraryService',
+    'SlowOperation',
+    'SQLiteBookRepository',
+    'SQLiteConnectionPool',
+    'SQLiteLoanRepository',
+    'SQLiteMemberRepository',
     'StandardFineStrategy',
+    'StripedLock',
     'StudentFineStrategy'
 ]
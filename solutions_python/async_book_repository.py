@@ -0,0 +1,88 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional
+
+from ..python_library.book import Book
+
+
+class AsyncBookRepository(ABC):
+    """
+    SOLUTION: asyncio counterpart of BookRepository
+    
+    Same operations and semantics as BookRepository, as coroutines, so an
+    event-loop server can await data access instead of blocking on it.
+    """
+    
+    @abstractmethod
+    async def save(self, book: Book) -> None:
+        """Save a book to the repository"""
+        pass
+    
+    @abstractmethod
+    async def find_by_id(self, book_id: str) -> Optional[Book]:
+        """Find a book by its ID"""
+        pass
+    
+    @abstractmethod
+    async def update(self, book: Book) -> None:
+        """Update an existing book in the repository"""
+        pass
+    
+    @abstractmethod
+    async def delete(self, book_id: str) -> None:
+        """Delete a book from the repository"""
+        pass
+    
+    @abstractmethod
+    async def find_all(self) -> List[Book]:
+        """Get all books from the repository"""
+        pass
+    
+    # SOLUTION: Bulk operations. The defaults issue one call per book
+    # concurrently; backends with real round trips should override them.
+    
+    async def find_by_ids(self, book_ids: Iterable[str]) -> Dict[str, Book]:
+        """Find several books by ID, returning only the ones that exist"""
+        book_ids = list(dict.fromkeys(book_ids))
+        books = await asyncio.gather(*(self.find_by_id(book_id) for book_id in book_ids))
+        return {book_id: book for book_id, book in zip(book_ids, books) if book is not None}
+    
+    async def save_many(self, books: Iterable[Book]) -> None:
+        """Save several books to the repository"""
+        await asyncio.gather(*(self.save(book) for book in books))
+    
+    async def update_many(self, books: Iterable[Book]) -> None:
+        """Update several existing books in the repository"""
+        await asyncio.gather(*(self.update(book) for book in books))
+    
+    async def delete_many(self, book_ids: Iterable[str]) -> None:
+        """Delete several books from the repository"""
+        await asyncio.gather(*(self.delete(book_id) for book_id in book_ids))
+    
+    async def find_available(self, offset: int = 0, limit: Optional[int] = None) -> List[Book]:
+        """
+        Get available books, skipping the first offset of them
+        
+        The default filters find_all(); backends should serve it from an
+        availability index.
+        """
+        available = [book for book in await self.find_all() if book.is_available()]
+        return available[offset:offset + limit] if limit is not None else available[offset:]
+    
+    async def find_free_copies(self, title_id: str, limit: int = 1) -> List[Book]:
+        """
+        Up to limit available copies of a title
+        
+        A single-copy title is the book with the title's id. The default
+        filters find_available(); backends should keep free copies per title.
+        """
+        copies = [book for book in await self.find_available() if book.get_title_id() == title_id]
+        return copies[:max(limit, 0)]
+    
+    async def count_copies(self, title_id: str) -> int:
+        """
+        Number of copies of a title, lent or not; 0 if there is no such title
+        
+        The default scans find_all(); backends should count from their title index.
+        """
+        return sum(1 for book in await self.find_all() if book.get_title_id() == title_id)
@@ -0,0 +1,243 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Awaitable, Hashable, List, Optional
+
+from .async_book_repository import AsyncBookRepository
+from .async_loan_repository import AsyncLoanRepository
+from .async_member_repository import AsyncMemberRepository
+from .async_striped_lock import AsyncStripedLock
+from .borrow_result import BorrowResult
+from .fine_calculation_strategy import FineCalculationStrategy
+from .improved_library_service import ImprovedLibraryService
+from .return_result import ReturnResult
+from .striped_lock import StripedLock
+from ..python_library.book import Book
+from ..python_library.loan import Loan
+from ..python_library.loan_id_generator import LoanIdGenerator
+from ..python_library.member import Member
+
+
+class AsyncLibraryService:
+    """
+    SOLUTION: asyncio Library Service
+    
+    Same rules, messages and results as ImprovedLibraryService, for
+    event-loop servers:
+    1. Repositories are awaited (AsyncBookRepository and friends); wrap
+       synchronous ones with the Executor*Repository adapters
+    2. borrow_book looks up the member, the book and the member's loans
+       concurrently with asyncio.gather, so a borrow costs one round trip of
+       latency instead of three. When every repository is an inline adapter
+       the lookups never suspend, so they are awaited one after another
+       instead of paying for three tasks per borrow
+    3. Coroutines interleave at every await, so borrows and returns hold the
+       AsyncStripedLock stripes of their member and title, keeping the
+       availability flip and the borrowing limit check atomic
+    4. A title ID lends any free copy of the title: the copy is picked with
+       find_free_copies under the title's stripe, so two borrows of the
+       same title never pick the same copy
+    """
+    
+    # SOLUTION: Business rules shared with the synchronous service
+    MAX_BOOKS_PER_MEMBER = ImprovedLibraryService.MAX_BOOKS_PER_MEMBER
+    LOAN_DURATION_DAYS = ImprovedLibraryService.LOAN_DURATION_DAYS
+    
+    def __init__(self, book_repository: AsyncBookRepository,
+                 member_repository: AsyncMemberRepository,
+                 loan_repository: AsyncLoanRepository,
+                 fine_strategy: FineCalculationStrategy,
+                 stripes: int = StripedLock.DEFAULT_STRIPES,
+                 loan_id_generator: Optional[LoanIdGenerator] = None):
+        self.book_repository = book_repository
+        self.member_repository = member_repository
+        self.loan_repository = loan_repository
+        self.fine_strategy = fine_strategy
+        self.loan_id_generator = loan_id_generator or LoanIdGenerator.default()
+        self._locks = AsyncStripedLock(stripes)
+        self._inline = all(getattr(repository, 'inline', False)
+                           for repository in (book_repository, member_repository, loan_repository))
+    
+    async def borrow_book(self, member_id: str, book_id: str) -> BorrowResult:
+        """
+        SOLUTION: Borrow with concurrent lookups under the member and title stripes
+        """
+        validation_error = self._validate_borrow_request(member_id, book_id)
+        if validation_error is not None:
+            return BorrowResult.failure(validation_error)
+        
+        title_id = await self._title_of(book_id)
+        async with self._locks.locked(self._member_key(member_id), self._book_key(title_id)):
+            try:
+                member, book, member_loans = await self._gather(
+                    self.member_repository.find_by_id(member_id),
+                    self.book_repository.find_by_id(book_id),
+                    self.loan_repository.find_by_member_id(member_id))
+                
+                # SOLUTION: Same checks, in the same order, as the synchronous service
+                if member is None:
+                    return BorrowResult.failure("Member not found")
+                if book is None or not book.is_available():
+                    # SOLUTION: A title ID lends any free copy of the title
+                    copies = await self.book_repository.find_free_copies(book_id)
+                    if copies:
+                        book = copies[0]
+                if book is None:
+                    # SOLUTION: A title whose copies are all lent is not available rather than unknown
+                    if await self.book_repository.count_copies(book_id) > 0:
+                        return BorrowResult.failure("Book is not available")
+                    return BorrowResult.failure("Book not found")
+                if not book.is_available():
+                    return BorrowResult.failure("Book is not available")
+                if len(member_loans) >= self.MAX_BOOKS_PER_MEMBER:
+                    return BorrowResult.failure(f"Member has reached maximum borrowing limit of {self.MAX_BOOKS_PER_MEMBER} books")
+                
+                loan = Loan(self.loan_id_generator.next_id(), member_id, book.get_id(), datetime.now())
+                await self.loan_repository.save(loan)
+                
+                book.set_available(False)
+                await self.book_repository.update(book)
+                
+                return BorrowResult.success(loan)
+            
+            except Exception as e:
+                return BorrowResult.failure(f"Failed to borrow book: {str(e)}")
+    
+    async def return_book(self, loan_id: str) -> ReturnResult:
+        """
+        SOLUTION: Return under the stripes of the loan's member and title
+        """
+        if not loan_id or not loan_id.strip():
+            return ReturnResult.failure("Loan ID cannot be null or empty")
+        
+        try:
+            loan = await self.loan_repository.find_by_id(loan_id)
+            if loan is None:
+                return ReturnResult.failure("Loan not found")
+            
+            title_id = await self._title_of(loan.get_book_id())
+            async with self._locks.locked(self._member_key(loan.get_member_id()), self._book_key(title_id)):
+                # SOLUTION: Another coroutine may have returned the loan while we waited
+                loan, book = await self._gather(
+                    self.loan_repository.find_by_id(loan_id),
+                    self.book_repository.find_by_id(loan.get_book_id()))
+                if loan is None:
+                    return ReturnResult.failure("Loan not found")
+                
+                if book is not None:
+                    book.set_available(True)
+                    await self.book_repository.update(book)
+                
+                await self.loan_repository.delete(loan_id)
+                
+                return ReturnResult.success("Book returned successfully")
+        
+        except Exception as e:
+            return ReturnResult.failure(f"Failed to return book: {str(e)}")
+    
+    async def get_available_books(self, offset: int = 0, limit: Optional[int] = None) -> List[Book]:
+        """
+        SOLUTION: Available books, optionally one page of them
+        """
+        if offset < 0 or (limit is not None and limit < 0):
+            return []
+        try:
+            books = await self.book_repository.find_available(offset, limit)
+            return [book for book in books if book.is_available()]
+        except Exception as e:
+            return []
+    
+    async def get_member_loans(self, member_id: str) -> List[Loan]:
+        """
+        SOLUTION: Loans of one member
+        """
+        if not member_id or not member_id.strip():
+            return []
+        
+        try:
+            return await self.loan_repository.find_by_member_id(member_id)
+        except Exception as e:
+            return []
+    
+    async def get_overdue_loans(self, as_of: Optional[datetime] = None) -> List[Loan]:
+        """
+        SOLUTION: Loans past their due date, most overdue first
+        """
+        as_of = as_of or datetime.now()
+        try:
+            return await self.loan_repository.find_by_borrow_date_range(end=as_of - self._loan_duration())
+        except Exception as e:
+            return []
+    
+    async def calculate_fine(self, loan_id: str) -> float:
+        """
+        SOLUTION: Fine calculation with the strategy pattern
+        """
+        if not loan_id or not loan_id.strip():
+            return 0.0
+        
+        try:
+            loan = await self.loan_repository.find_by_id(loan_id)
+            if loan is None:
+                return 0.0
+            return self.fine_strategy.calculate_fine(loan, self.LOAN_DURATION_DAYS)
+        except Exception as e:
+            return 0.0
+    
+    async def add_book(self, book: Book) -> bool:
+        """
+        SOLUTION: Add book with validation
+        """
+        if book is None or not book.get_id() or not book.get_id().strip():
+            return False
+        
+        try:
+            await self.book_repository.save(book)
+            return True
+        except Exception as e:
+            return False
+    
+    async def add_member(self, member: Member) -> bool:
+        """
+        SOLUTION: Add member with validation
+        """
+        if member is None or not member.get_id() or not member.get_id().strip():
+            return False
+        
+        try:
+            await self.member_repository.save(member)
+            return True
+        except Exception as e:
+            return False
+    
+    async def _gather(self, *calls: Awaitable) -> List:
+        """Await calls concurrently, or in order when the repositories run inline"""
+        if self._inline:
+            return [await call for call in calls]
+        return await asyncio.gather(*calls)
+    
+    async def _title_of(self, book_id: str) -> str:
+        # A copy's title ID, or book_id itself for titles and unknown IDs; borrow_book reports the errors
+        try:
+            book = await self.book_repository.find_by_id(book_id) if book_id else None
+        except Exception:
+            book = None
+        return book.get_title_id() if book is not None else book_id
+    
+    def _validate_borrow_request(self, member_id: str, book_id: str) -> Optional[str]:
+        """Return the validation error for a borrow request, or None if it is valid"""
+        if not member_id or not member_id.strip():
+            return "Member ID cannot be null or empty"
+        if not book_id or not book_id.strip():
+            return "Book ID cannot be null or empty"
+        return None
+    
+    def _loan_duration(self) -> timedelta:
+        return timedelta(days=self.LOAN_DURATION_DAYS)
+    
+    @staticmethod
+    def _member_key(member_id: str) -> Hashable:
+        return ('member', member_id)
+    
+    @staticmethod
+    def _book_key(book_id: str) -> Hashable:
+        return ('book', book_id)
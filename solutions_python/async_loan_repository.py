@@ -0,0 +1,83 @@
+import asyncio
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from ..python_library.loan import Loan
+
+
+class AsyncLoanRepository(ABC):
+    """
+    SOLUTION: asyncio counterpart of LoanRepository
+    """
+    
+    @abstractmethod
+    async def save(self, loan: Loan) -> None:
+        """Save a loan to the repository"""
+        pass
+    
+    @abstractmethod
+    async def find_by_id(self, loan_id: str) -> Optional[Loan]:
+        """Find a loan by its ID"""
+        pass
+    
+    @abstractmethod
+    async def update(self, loan: Loan) -> None:
+        """Update an existing loan in the repository"""
+        pass
+    
+    @abstractmethod
+    async def delete(self, loan_id: str) -> None:
+        """Delete a loan from the repository"""
+        pass
+    
+    @abstractmethod
+    async def find_all(self) -> List[Loan]:
+        """Get all loans from the repository"""
+        pass
+    
+    @abstractmethod
+    async def find_by_member_id(self, member_id: str) -> List[Loan]:
+        """Find all loans for a specific member"""
+        pass
+    
+    # SOLUTION: Bulk operations. The defaults issue one call per loan
+    # concurrently; backends with real round trips should override them.
+    
+    async def find_by_ids(self, loan_ids: Iterable[str]) -> Dict[str, Loan]:
+        """Find several loans by ID, returning only the ones that exist"""
+        loan_ids = list(dict.fromkeys(loan_ids))
+        loans = await asyncio.gather(*(self.find_by_id(loan_id) for loan_id in loan_ids))
+        return {loan_id: loan for loan_id, loan in zip(loan_ids, loans) if loan is not None}
+    
+    async def save_many(self, loans: Iterable[Loan]) -> None:
+        """Save several loans to the repository"""
+        await asyncio.gather(*(self.save(loan) for loan in loans))
+    
+    async def update_many(self, loans: Iterable[Loan]) -> None:
+        """Update several existing loans in the repository"""
+        await asyncio.gather(*(self.update(loan) for loan in loans))
+    
+    async def delete_many(self, loan_ids: Iterable[str]) -> None:
+        """Delete several loans from the repository"""
+        await asyncio.gather(*(self.delete(loan_id) for loan_id in loan_ids))
+    
+    async def find_by_member_ids(self, member_ids: Iterable[str]) -> Dict[str, List[Loan]]:
+        """Find the loans of several members, keyed by member ID"""
+        member_ids = list(dict.fromkeys(member_ids))
+        loans = await asyncio.gather(*(self.find_by_member_id(member_id) for member_id in member_ids))
+        return dict(zip(member_ids, loans))
+    
+    async def find_by_borrow_date_range(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                                        limit: Optional[int] = None) -> List[Loan]:
+        """
+        Find loans with start <= borrow date < end, earliest first, at most limit of them
+        
+        The default scans and sorts every loan; backends should serve it from an
+        index ordered by borrow date.
+        """
+        loans = [loan for loan in await self.find_all()
+                 if (start is None or loan.get_borrow_date() >= start)
+                 and (end is None or loan.get_borrow_date() < end)]
+        loans.sort(key=lambda loan: (loan.get_borrow_date(), loan.get_id()))
+        return loans[:limit] if limit is not None else loans
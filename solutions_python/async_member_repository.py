@@ -0,0 +1,57 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional
+
+from ..python_library.member import Member
+
+
+class AsyncMemberRepository(ABC):
+    """
+    SOLUTION: asyncio counterpart of MemberRepository
+    """
+    
+    @abstractmethod
+    async def save(self, member: Member) -> None:
+        """Save a member to the repository"""
+        pass
+    
+    @abstractmethod
+    async def find_by_id(self, member_id: str) -> Optional[Member]:
+        """Find a member by their ID"""
+        pass
+    
+    @abstractmethod
+    async def update(self, member: Member) -> None:
+        """Update an existing member in the repository"""
+        pass
+    
+    @abstractmethod
+    async def delete(self, member_id: str) -> None:
+        """Delete a member from the repository"""
+        pass
+    
+    @abstractmethod
+    async def find_all(self) -> List[Member]:
+        """Get all members from the repository"""
+        pass
+    
+    # SOLUTION: Bulk operations. The defaults issue one call per member
+    # concurrently; backends with real round trips should override them.
+    
+    async def find_by_ids(self, member_ids: Iterable[str]) -> Dict[str, Member]:
+        """Find several members by ID, returning only the ones that exist"""
+        member_ids = list(dict.fromkeys(member_ids))
+        members = await asyncio.gather(*(self.find_by_id(member_id) for member_id in member_ids))
+        return {member_id: member for member_id, member in zip(member_ids, members) if member is not None}
+    
+    async def save_many(self, members: Iterable[Member]) -> None:
+        """Save several members to the repository"""
+        await asyncio.gather(*(self.save(member) for member in members))
+    
+    async def update_many(self, members: Iterable[Member]) -> None:
+        """Update several existing members in the repository"""
+        await asyncio.gather(*(self.update(member) for member in members))
+    
+    async def delete_many(self, member_ids: Iterable[str]) -> None:
+        """Delete several members from the repository"""
+        await asyncio.gather(*(self.delete(member_id) for member_id in member_ids))
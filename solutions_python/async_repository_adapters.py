@@ -0,0 +1,176 @@
+import asyncio
+from concurrent.futures import Executor
+from datetime import datetime
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional, TypeVar
+
+from .async_book_repository import AsyncBookRepository
+from .async_loan_repository import AsyncLoanRepository
+from .async_member_repository import AsyncMemberRepository
+from .book_repository import BookRepository
+from .loan_repository import LoanRepository
+from .member_repository import MemberRepository
+from ..python_library.book import Book
+from ..python_library.loan import Loan
+from ..python_library.member import Member
+
+T = TypeVar('T')
+
+
+class _ExecutorAdapter:
+    """
+    SOLUTION: Runs the calls of a synchronous repository off the event loop
+    
+    Every call is submitted to executor (the loop's default thread pool when
+    None), so blocking I/O such as SQLite queries never stalls other
+    coroutines. The wrapped repository must be thread-safe. With inline=True
+    calls run directly on the loop instead, which is cheaper for in-memory
+    repositories whose operations never block.
+    """
+    
+    def __init__(self, repository, executor: Optional[Executor] = None, inline: bool = False):
+        self._repository = repository
+        self._executor = executor
+        self._inline = inline
+    
+    @property
+    def repository(self):
+        """The wrapped synchronous repository"""
+        return self._repository
+    
+    @property
+    def inline(self) -> bool:
+        """True if calls run directly on the event loop and never suspend"""
+        return self._inline
+    
+    async def _call(self, func: Callable[..., T], *args) -> T:
+        if self._inline:
+            return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, partial(func, *args))
+
+
+class ExecutorBookRepository(_ExecutorAdapter, AsyncBookRepository):
+    """
+    SOLUTION: AsyncBookRepository backed by a synchronous BookRepository
+    """
+    
+    def __init__(self, repository: BookRepository, executor: Optional[Executor] = None, inline: bool = False):
+        super().__init__(repository, executor, inline)
+    
+    async def save(self, book: Book) -> None:
+        await self._call(self._repository.save, book)
+    
+    async def find_by_id(self, book_id: str) -> Optional[Book]:
+        return await self._call(self._repository.find_by_id, book_id)
+    
+    async def update(self, book: Book) -> None:
+        await self._call(self._repository.update, book)
+    
+    async def delete(self, book_id: str) -> None:
+        await self._call(self._repository.delete, book_id)
+    
+    async def find_all(self) -> List[Book]:
+        return await self._call(self._repository.find_all)
+    
+    async def find_by_ids(self, book_ids: Iterable[str]) -> Dict[str, Book]:
+        return await self._call(self._repository.find_by_ids, list(book_ids))
+    
+    async def save_many(self, books: Iterable[Book]) -> None:
+        await self._call(self._repository.save_many, list(books))
+    
+    async def update_many(self, books: Iterable[Book]) -> None:
+        await self._call(self._repository.update_many, list(books))
+    
+    async def delete_many(self, book_ids: Iterable[str]) -> None:
+        await self._call(self._repository.delete_many, list(book_ids))
+    
+    async def find_available(self, offset: int = 0, limit: Optional[int] = None) -> List[Book]:
+        return await self._call(lambda: list(self._repository.iter_available(offset, limit)))
+    
+    async def find_free_copies(self, title_id: str, limit: int = 1) -> List[Book]:
+        return await self._call(self._repository.find_free_copies, title_id, limit)
+    
+    async def count_copies(self, title_id: str) -> int:
+        return await self._call(self._repository.count_copies, title_id)
+
+
+class ExecutorMemberRepository(_ExecutorAdapter, AsyncMemberRepository):
+    """
+    SOLUTION: AsyncMemberRepository backed by a synchronous MemberRepository
+    """
+    
+    def __init__(self, repository: MemberRepository, executor: Optional[Executor] = None, inline: bool = False):
+        super().__init__(repository, executor, inline)
+    
+    async def save(self, member: Member) -> None:
+        await self._call(self._repository.save, member)
+    
+    async def find_by_id(self, member_id: str) -> Optional[Member]:
+        return await self._call(self._repository.find_by_id, member_id)
+    
+    async def update(self, member: Member) -> None:
+        await self._call(self._repository.update, member)
+    
+    async def delete(self, member_id: str) -> None:
+        await self._call(self._repository.delete, member_id)
+    
+    async def find_all(self) -> List[Member]:
+        return await self._call(self._repository.find_all)
+    
+    async def find_by_ids(self, member_ids: Iterable[str]) -> Dict[str, Member]:
+        return await self._call(self._repository.find_by_ids, list(member_ids))
+    
+    async def save_many(self, members: Iterable[Member]) -> None:
+        await self._call(self._repository.save_many, list(members))
+    
+    async def update_many(self, members: Iterable[Member]) -> None:
+        await self._call(self._repository.update_many, list(members))
+    
+    async def delete_many(self, member_ids: Iterable[str]) -> None:
+        await self._call(self._repository.delete_many, list(member_ids))
+
+
+class ExecutorLoanRepository(_ExecutorAdapter, AsyncLoanRepository):
+    """
+    SOLUTION: AsyncLoanRepository backed by a synchronous LoanRepository
+    """
+    
+    def __init__(self, repository: LoanRepository, executor: Optional[Executor] = None, inline: bool = False):
+        super().__init__(repository, executor, inline)
+    
+    async def save(self, loan: Loan) -> None:
+        await self._call(self._repository.save, loan)
+    
+    async def find_by_id(self, loan_id: str) -> Optional[Loan]:
+        return await self._call(self._repository.find_by_id, loan_id)
+    
+    async def update(self, loan: Loan) -> None:
+        await self._call(self._repository.update, loan)
+    
+    async def delete(self, loan_id: str) -> None:
+        await self._call(self._repository.delete, loan_id)
+    
+    async def find_all(self) -> List[Loan]:
+        return await self._call(self._repository.find_all)
+    
+    async def find_by_member_id(self, member_id: str) -> List[Loan]:
+        return await self._call(self._repository.find_by_member_id, member_id)
+    
+    async def find_by_ids(self, loan_ids: Iterable[str]) -> Dict[str, Loan]:
+        return await self._call(self._repository.find_by_ids, list(loan_ids))
+    
+    async def save_many(self, loans: Iterable[Loan]) -> None:
+        await self._call(self._repository.save_many, list(loans))
+    
+    async def update_many(self, loans: Iterable[Loan]) -> None:
+        await self._call(self._repository.update_many, list(loans))
+    
+    async def delete_many(self, loan_ids: Iterable[str]) -> None:
+        await self._call(self._repository.delete_many, list(loan_ids))
+    
+    async def find_by_member_ids(self, member_ids: Iterable[str]) -> Dict[str, List[Loan]]:
+        return await self._call(self._repository.find_by_member_ids, list(member_ids))
+    
+    async def find_by_borrow_date_range(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                                        limit: Optional[int] = None) -> List[Loan]:
+        return await self._call(self._repository.find_by_borrow_date_range, start, end, limit)
@@ -0,0 +1,43 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Hashable, List
+
+from .striped_lock import StripedLock
+
+
+class AsyncStripedLock:
+    """
+    SOLUTION: asyncio counterpart of StripedLock
+    
+    Coroutines on one event loop interleave at every await, so a
+    check-then-act sequence spanning awaits needs a lock just like threads
+    do. Stripes are asyncio.Lock objects and are taken in ascending index
+    order, so coroutines locking several keys cannot deadlock.
+    """
+    
+    def __init__(self, stripes: int = StripedLock.DEFAULT_STRIPES):
+        if stripes < 1:
+            raise ValueError("stripes must be at least 1")
+        self._locks = [asyncio.Lock() for _ in range(stripes)]
+    
+    @property
+    def stripes(self) -> int:
+        return len(self._locks)
+    
+    def stripe_for(self, key: Hashable) -> int:
+        """Index of the lock guarding key"""
+        return hash(key) % len(self._locks)
+    
+    @asynccontextmanager
+    async def locked(self, *keys: Hashable) -> AsyncIterator[None]:
+        """Hold the locks for all keys for the duration of the async with-block"""
+        acquired: List[asyncio.Lock] = []
+        try:
+            for stripe in sorted({self.stripe_for(key) for key in keys}):
+                lock = self._locks[stripe]
+                await lock.acquire()
+                acquired.append(lock)
+            yield
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
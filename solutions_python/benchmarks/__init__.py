@@ -0,0 +1,3 @@
+# Library Management System - Solutions Benchmarks
+# Each module can be run directly, e.g.:
+#   python -m solutions_python.benchmarks.bench_repository_backends
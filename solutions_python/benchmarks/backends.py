@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+from typing import Callable, Dict, Iterator, NamedTuple, Optional, Tuple
+
+from ..book_repository import BookRepository
+from ..in_memory_book_repository import InMemoryBookRepository
+from ..in_memory_loan_repository import InMemoryLoanRepository
+from ..in_memory_member_repository import InMemoryMemberRepository
+from ..loan_repository import LoanRepository
+from ..member_repository import MemberRepository
+from ..sqlite_book_repository import SQLiteBookRepository
+from ..sqlite_connection_pool import SQLiteConnectionPool
+from ..sqlite_loan_repository import SQLiteLoanRepository
+from ..sqlite_member_repository import SQLiteMemberRepository
+from ...python_library.book import Book
+from ...python_library.member import Member
+
+
+class Backend(NamedTuple):
+    """A seeded set of repositories plus a callback releasing their resources"""
+    name: str
+    book_repository: BookRepository
+    member_repository: MemberRepository
+    loan_repository: LoanRepository
+    close: Callable[[], None]
+
+
+def member_count_for(book_count: int) -> int:
+    """Synthetic catalogs have one member per five books"""
+    return max(1, book_count // 5)
+
+
+def book_rows(book_count: int) -> Iterator[Tuple[str, str, str]]:
+    for i in range(book_count):
+        yield f"book{i}", f"Title {i}", f"Author {i % 5000}"
+
+
+def member_rows(book_count: int) -> Iterator[Tuple[str, str, str]]:
+    for i in range(member_count_for(book_count)):
+        yield f"member{i}", f"Member {i}", f"member{i}@example.com"
+
+
+def in_memory_backend(book_count: int) -> Backend:
+    books = InMemoryBookRepository()
+    members = InMemoryMemberRepository()
+    for row in book_rows(book_count):
+        books.save(Book(*row))
+    for row in member_rows(book_count):
+        members.save(Member(*row))
+    return Backend('in-memory', books, members, InMemoryLoanRepository(), lambda: None)
+
+
+def sqlite_backend(book_count: int, directory: Optional[str] = None) -> Backend:
+    owned_directory = directory is None
+    directory = directory or tempfile.mkdtemp(prefix='library-bench-')
+    pool = SQLiteConnectionPool(os.path.join(directory, 'library.db'))
+
+    # Seed with one bulk transaction instead of going through save()
+    with pool.transaction() as connection:
+        connection.executemany("INSERT INTO books (id, title, author, available) VALUES (?, ?, ?, 1)",
+                               book_rows(book_count))
+        connection.executemany("INSERT INTO members (id, name, email) VALUES (?, ?, ?)",
+                               member_rows(book_count))
+
+    def close() -> None:
+        pool.close()
+        if owned_directory:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    return Backend('sqlite', SQLiteBookRepository(pool), SQLiteMemberRepository(pool),
+                   SQLiteLoanRepository(pool), close)
+
+
+BACKENDS: Dict[str, Callable[[int], Backend]] = {
+    'in-memory': in_memory_backend,
+    'sqlite': sqlite_backend,
+}
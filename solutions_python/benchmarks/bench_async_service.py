@@ -0,0 +1,111 @@
+"""
+Latency of AsyncLibraryService under many concurrent simulated clients.
+
+Every client is a coroutine that borrows a random book for a random member
+and returns it straight away, timing each borrow+return. All clients share
+one event loop and one service. Repositories are the seeded in-memory and
+SQLite backends wrapped in the Executor*Repository adapters: the in-memory
+ones both inline and through the thread pool, the SQLite ones through the
+thread pool. The synchronous ImprovedLibraryService, called from a single
+client, is listed as a baseline.
+
+    python -m solutions_python.benchmarks.bench_async_service --clients 1000 --operations 20
+"""
+import argparse
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from .backends import BACKENDS, member_count_for
+from ..async_library_service import AsyncLibraryService
+from ..async_repository_adapters import ExecutorBookRepository, ExecutorLoanRepository, ExecutorMemberRepository
+from ..improved_library_service import ImprovedLibraryService
+from ..standard_fine_strategy import StandardFineStrategy
+from ...python_library.benchmarks.common import print_table, summarize, time_calls
+
+
+async def run_clients(service: AsyncLibraryService, book_count: int, clients: int,
+                      operations: int) -> Tuple[List[float], float]:
+    """Run clients coroutines of operations borrow+return each; return (latencies, seconds)"""
+    member_count = member_count_for(book_count)
+    latencies: List[float] = []
+    timer = time.perf_counter
+
+    async def client(index: int) -> None:
+        rng = random.Random(index)
+        for _ in range(operations):
+            start = timer()
+            result = await service.borrow_book(f"member{rng.randrange(member_count)}",
+                                               f"book{rng.randrange(book_count)}")
+            if result.is_success():
+                await service.return_book(result.get_loan().get_id())
+            latencies.append(timer() - start)
+
+    start = timer()
+    await asyncio.gather(*(client(index) for index in range(clients)))
+    return latencies, timer() - start
+
+
+def async_row(backend_name: str, mode: str, book_count: int, clients: int, operations: int,
+              workers: Optional[int]) -> tuple:
+    backend = BACKENDS[backend_name](book_count)
+    executor = None if mode == 'inline' else ThreadPoolExecutor(max_workers=workers)
+    try:
+        inline = executor is None
+        service = AsyncLibraryService(ExecutorBookRepository(backend.book_repository, executor, inline),
+                                      ExecutorMemberRepository(backend.member_repository, executor, inline),
+                                      ExecutorLoanRepository(backend.loan_repository, executor, inline),
+                                      StandardFineStrategy())
+        latencies, seconds = asyncio.run(run_clients(service, book_count, clients, operations))
+        stats = summarize(latencies)
+        return (backend_name, mode, clients, len(latencies) / seconds if seconds > 0 else 0.0,
+                stats['p50_us'], stats['p99_us'])
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        backend.close()
+
+
+def sync_row(backend_name: str, book_count: int, operations: int) -> tuple:
+    backend = BACKENDS[backend_name](book_count)
+    try:
+        service = ImprovedLibraryService(backend.book_repository, backend.member_repository,
+                                         backend.loan_repository, StandardFineStrategy())
+        member_count = member_count_for(book_count)
+        rng = random.Random(0)
+
+        def borrow_and_return(_: int) -> None:
+            result = service.borrow_book(f"member{rng.randrange(member_count)}", f"book{rng.randrange(book_count)}")
+            if result.is_success():
+                service.return_book(result.get_loan().get_id())
+
+        stats = summarize(time_calls(borrow_and_return, operations))
+        return (backend_name, 'sync baseline', 1, stats['ops_per_sec'], stats['p50_us'], stats['p99_us'])
+    finally:
+        backend.close()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, nargs='+', default=[1000])
+    parser.add_argument('--operations', type=int, default=20, help="borrow+return operations per client")
+    parser.add_argument('--backends', nargs='+', choices=sorted(BACKENDS), default=sorted(BACKENDS))
+    parser.add_argument('--books', type=int, default=100_000)
+    parser.add_argument('--workers', type=int, default=None, help="thread pool size (default: executor's own)")
+    args = parser.parse_args(argv)
+
+    rows = []
+    for backend_name in args.backends:
+        rows.append(sync_row(backend_name, args.books, max(args.clients) * args.operations))
+        # Inline calls block the loop, so they only make sense for in-memory repositories
+        modes = ['inline', 'executor'] if backend_name == 'in-memory' else ['executor']
+        for mode in modes:
+            for clients in args.clients:
+                rows.append(async_row(backend_name, mode, args.books, clients, args.operations, args.workers))
+    print_table(['backend', 'mode', 'clients', 'borrow+return/sec', 'p50 us', 'p99 us'], rows)
+
+
+if __name__ == '__main__':
+    main()
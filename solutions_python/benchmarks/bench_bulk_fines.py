@@ -0,0 +1,67 @@
+"""
+Nightly overdue run: per-loan calculate_fine vs one bulk calculate_fines call.
+
+    python -m solutions_python.benchmarks.bench_bulk_fines --loans 500000
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from .. import fine_calculation_strategy
+from ..improved_library_service import ImprovedLibraryService
+from ..in_memory_book_repository import InMemoryBookRepository
+from ..in_memory_loan_repository import InMemoryLoanRepository
+from ..in_memory_member_repository import InMemoryMemberRepository
+from ..standard_fine_strategy import StandardFineStrategy
+from ...python_library.benchmarks.common import print_table
+from ...python_library.loan import Loan
+
+
+def build_service(loan_count: int, seed: int = 42) -> ImprovedLibraryService:
+    rng = random.Random(seed)
+    now = datetime.now()
+    loan_repository = InMemoryLoanRepository()
+    loan_repository.save_many(
+        Loan(f"loan{i}", f"member{i // 5}", f"book{i}", now - timedelta(seconds=rng.randrange(40 * 86400)))
+        for i in range(loan_count)
+    )
+    return ImprovedLibraryService(InMemoryBookRepository(), InMemoryMemberRepository(),
+                                  loan_repository, StandardFineStrategy())
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--loans', type=int, default=500_000)
+    args = parser.parse_args(argv)
+
+    service = build_service(args.loans)
+    loan_ids = [loan.get_id() for loan in service.loan_repository.find_all()]
+    rows = []
+
+    start = time.perf_counter()
+    per_loan = {loan_id: service.calculate_fine(loan_id) for loan_id in loan_ids}
+    rows.append(('calculate_fine per loan', time.perf_counter() - start))
+
+    as_of = datetime.now()
+    start = time.perf_counter()
+    bulk = service.calculate_fines(as_of=as_of)
+    rows.append(('calculate_fines', time.perf_counter() - start))
+
+    np = fine_calculation_strategy.np
+    if np is not None:
+        # Columnar callers already hold the borrow dates as datetime64
+        dates = np.array([loan.get_borrow_date() for loan in service.loan_repository.find_all()],
+                         dtype='datetime64[us]')
+        start = time.perf_counter()
+        service.fine_strategy.calculate_fines_array(dates, service.LOAN_DURATION_DAYS, as_of)
+        rows.append(('calculate_fines_array (datetime64)', time.perf_counter() - start))
+
+    mismatches = sum(1 for loan_id, fine in per_loan.items() if bulk[loan_id] != fine)
+    print_table(['method', 'seconds'], rows)
+    print(f"{args.loans:,} loans, total fines ${sum(bulk.values()):,.2f}, "
+          f"{mismatches} fines differ from the per-loan run (loans crossing a day boundary mid-run)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""
+Streaming bulk import of a MARC-derived book CSV into SQLite.
+
+Writes a CSV shaped like a MARC extract (001 control number, 245$a title,
+100$a author, 260$c date, 650$a subject) and starts a fresh interpreter per
+mode, so peak resident memory belongs to that mode alone:
+
+  bulk     BulkImporter with a column mapping, batches handed to save_many
+  per-row  csv.DictReader plus ImprovedLibraryService.add_book for every row
+           (only the first --per-row-limit rows; it commits once per row)
+
+The bulk run also streams the books back out with BulkExporter.export_books.
+Peak RSS should stay flat as --rows grows; the catalog itself lives on disk.
+
+    python -m solutions_python.benchmarks.bench_bulk_import --rows 5000000
+"""
+import argparse
+import csv
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from ..bulk_exporter import BulkExporter
+from ..bulk_importer import BulkImporter
+from ..improved_library_service import ImprovedLibraryService
+from ..in_memory_loan_repository import InMemoryLoanRepository
+from ..sqlite_book_repository import SQLiteBookRepository
+from ..sqlite_connection_pool import SQLiteConnectionPool
+from ..sqlite_member_repository import SQLiteMemberRepository
+from ..standard_fine_strategy import StandardFineStrategy
+from ...python_library.benchmarks.common import print_table
+from ...python_library.book import Book
+
+MARC_COLUMNS = {'id': '001', 'title': '245$a', 'author': '100$a'}
+
+
+def write_marc_csv(path: str, row_count: int) -> None:
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['001', '245$a', '100$a', '260$c', '650$a'])
+        for i in range(row_count):
+            writer.writerow([f"ocm{i:09d}", f"Title {i}, a novel", f"Author {i % 5000}, 1900-1980",
+                             str(1900 + i % 120), f"Subject {i % 300}"])
+
+
+def import_bulk(csv_path: str, database: str, batch_size: int) -> dict:
+    pool = SQLiteConnectionPool(database)
+    try:
+        books = SQLiteBookRepository(pool)
+        start = time.perf_counter()
+        result = BulkImporter(books, batch_size=batch_size).import_books(csv_path, columns=MARC_COLUMNS)
+        elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        exported = BulkExporter(books).export_books(os.devnull, format='csv')
+        export_elapsed = time.perf_counter() - start
+    finally:
+        pool.close()
+    return {'rows': result.get_imported_count(), 'seconds': elapsed,
+            'export_rows_per_sec': exported / export_elapsed if export_elapsed else 0.0}
+
+
+def import_per_row(csv_path: str, database: str, limit: int) -> dict:
+    pool = SQLiteConnectionPool(database)
+    try:
+        service = ImprovedLibraryService(SQLiteBookRepository(pool), SQLiteMemberRepository(pool),
+                                         InMemoryLoanRepository(), StandardFineStrategy())
+        rows = 0
+        start = time.perf_counter()
+        with open(csv_path, encoding='utf-8', newline='') as file:
+            for record in csv.DictReader(file):
+                if rows >= limit:
+                    break
+                service.add_book(Book(record['001'], record['245$a'], record['100$a']))
+                rows += 1
+        elapsed = time.perf_counter() - start
+    finally:
+        pool.close()
+    return {'rows': rows, 'seconds': elapsed, 'export_rows_per_sec': 0.0}
+
+
+def child(mode: str, csv_path: str, database: str, args) -> None:
+    """Run one import in this (fresh) process and print the results as JSON"""
+    if mode == 'bulk':
+        result = import_bulk(csv_path, database, args.batch_size)
+    else:
+        result = import_per_row(csv_path, database, args.per_row_limit)
+    result['peak_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps(result))
+
+
+def run(mode: str, csv_path: str, database: str, args) -> dict:
+    command = [sys.executable, '-m', __spec__.name, '--child', mode, csv_path, database,
+               '--batch-size', str(args.batch_size), '--per-row-limit', str(args.per_row_limit)]
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[5_000_000])
+    parser.add_argument('--batch-size', type=int, default=BulkImporter.DEFAULT_BATCH_SIZE)
+    parser.add_argument('--per-row-limit', type=int, default=50_000, help="rows imported by the per-row mode")
+    parser.add_argument('--modes', nargs='+', choices=['bulk', 'per-row'], default=['bulk', 'per-row'])
+    parser.add_argument('--child', nargs=3, metavar=('MODE', 'CSV', 'DATABASE'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        child(*args.child, args)
+        return
+
+    rows = []
+    for row_count in args.rows:
+        directory = tempfile.mkdtemp(prefix='library-import-')
+        try:
+            csv_path = os.path.join(directory, 'marc.csv')
+            start = time.perf_counter()
+            write_marc_csv(csv_path, row_count)
+            print(f"{row_count:,} rows: CSV written in {time.perf_counter() - start:.1f}s, "
+                  f"{os.path.getsize(csv_path) / 2 ** 20:,.0f} MiB", file=sys.stderr)
+            for mode in args.modes:
+                result = run(mode, csv_path, os.path.join(directory, f'{mode}.db'), args)
+                rows.append((row_count, mode, result['rows'], result['seconds'],
+                             result['rows'] / result['seconds'], result['export_rows_per_sec'],
+                             result['peak_mb']))
+        finally:
+            shutil.rmtree(directory)
+    print_table(['file rows', 'import', 'imported', 'seconds', 'rows/s', 'export rows/s', 'peak RSS MiB'], rows)
+
+
+if __name__ == '__main__':
+    main()
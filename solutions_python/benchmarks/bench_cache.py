@@ -0,0 +1,99 @@
+"""
+Hit rate and latency of the caching repository decorators under a Zipfian workload.
+
+Seeds SQLite repositories, then replays the same Zipf-distributed sequence of
+(member, book) pairs against the plain repositories and against
+CachingBookRepository/CachingMemberRepository/CachingLoanRepository at each
+capacity. Each run first replays an untimed warm-up sequence drawn from the
+same distribution, so hit rates and latencies are those of a service that
+has been up for a while. Two workloads are measured:
+
+  lookup   member_repository.find_by_id + book_repository.find_by_id, the
+           reads borrow_book repeats for hot members and bestsellers
+  borrow   ImprovedLibraryService.borrow_book followed by return_book
+
+    python -m solutions_python.benchmarks.bench_cache --books 1000000 --capacities 1000 10000 100000
+"""
+import argparse
+import random
+from itertools import accumulate
+
+from .backends import member_count_for, sqlite_backend
+from ..caching_repositories import CachingBookRepository, CachingLoanRepository, CachingMemberRepository
+from ..improved_library_service import ImprovedLibraryService
+from ..standard_fine_strategy import StandardFineStrategy
+from ...python_library.benchmarks.common import print_table, summarize, time_calls
+
+
+def zipf_indexes(count: int, population: int, skew: float, seed: int):
+    """count indexes in [0, population), index k drawn with weight 1 / (k + 1) ** skew"""
+    rng = random.Random(seed)
+    cum_weights = list(accumulate(1.0 / (k + 1) ** skew for k in range(population)))
+    indexes = rng.choices(range(population), cum_weights=cum_weights, k=count)
+    # Spread the hot ids over the key space instead of book0, book1, ...
+    permutation = list(range(population))
+    rng.shuffle(permutation)
+    return [permutation[index] for index in indexes]
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--books', type=int, default=1_000_000)
+    parser.add_argument('--operations', type=int, default=50_000)
+    parser.add_argument('--warmup', type=int, default=100_000, help="untimed operations before measuring")
+    parser.add_argument('--skew', type=float, default=1.0, help="Zipf exponent; higher is more skewed")
+    parser.add_argument('--capacities', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--ttl', type=float, default=None, help="cache time to live in seconds")
+    args = parser.parse_args(argv)
+
+    member_count = member_count_for(args.books)
+    total = args.warmup + args.operations
+    books = [f"book{i}" for i in zipf_indexes(total, args.books, args.skew, seed=1)]
+    members = [f"member{i}" for i in zipf_indexes(total, member_count, args.skew, seed=2)]
+
+    backend = sqlite_backend(args.books)
+    try:
+        rows = []
+        for capacity in [None] + args.capacities:
+            if capacity is None:
+                book_repository, member_repository = backend.book_repository, backend.member_repository
+                loan_repository = backend.loan_repository
+            else:
+                book_repository = CachingBookRepository(backend.book_repository, capacity, args.ttl)
+                member_repository = CachingMemberRepository(backend.member_repository, capacity, args.ttl)
+                loan_repository = CachingLoanRepository(backend.loan_repository, capacity, args.ttl)
+            service = ImprovedLibraryService(book_repository, member_repository, loan_repository,
+                                             StandardFineStrategy())
+
+            def lookup(i):
+                member_repository.find_by_id(members[i])
+                book_repository.find_by_id(books[i])
+
+            def borrow(i):
+                result = service.borrow_book(members[i], books[i])
+                service.return_book(result.get_loan().get_id())
+
+            for name, func in (('lookup', lookup), ('borrow', borrow)):
+                if capacity is not None:
+                    book_repository.clear_cache()
+                    member_repository.clear_cache()
+                for i in range(args.warmup):
+                    func(i)
+                if capacity is not None:
+                    before = (book_repository.cache_stats(), member_repository.cache_stats())
+                stats = summarize(time_calls(lambda i: func(args.warmup + i), args.operations))
+                hit_rate = '-'
+                if capacity is not None:
+                    after = (book_repository.cache_stats(), member_repository.cache_stats())
+                    hits = sum(a.hits - b.hits for a, b in zip(after, before))
+                    misses = sum(a.misses - b.misses for a, b in zip(after, before))
+                    hit_rate = f"{hits / (hits + misses):.1%}"
+                rows.append((capacity or 'uncached', name, hit_rate, stats['ops_per_sec'],
+                             stats['p50_us'], stats['p99_us']))
+    finally:
+        backend.close()
+    print_table(['capacity', 'workload', 'hit rate', 'ops/s', 'p50 us', 'p99 us'], rows)
+
+
+if __name__ == '__main__':
+    main()
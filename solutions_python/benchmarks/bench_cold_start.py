@@ -0,0 +1,142 @@
+"""
+Startup time of eager vs lazy (memory-mapped) catalog loading.
+
+Writes a book catalog and a member catalog (one member per five books) with
+the CatalogFile format, then starts a fresh interpreter per mode and times
+how long it takes until the repositories can answer find_by_id:
+
+  eager  reads every record into InMemoryBookRepository/InMemoryMemberRepository
+  lazy   opens MmapBookRepository/MmapMemberRepository, which only map the files
+
+Each run also reports the first lookup, random lookups afterwards, the peak
+resident memory of the process and, on Linux, its anonymous (heap) memory.
+Resident memory includes the page cache pages of the mapped catalog that the
+lookups touched; those are shared and reclaimable, the heap is not.
+
+    python -m solutions_python.benchmarks.bench_cold_start --sizes 1000000 10000000
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from .backends import book_rows, member_count_for, member_rows
+from ..in_memory_book_repository import InMemoryBookRepository
+from ..in_memory_member_repository import InMemoryMemberRepository
+from ..mmap_book_repository import MmapBookRepository
+from ..mmap_member_repository import MmapMemberRepository
+from ...python_library.benchmarks.common import print_table, summarize, time_calls
+from ...python_library.book import Book
+from ...python_library.member import Member
+
+
+def write_catalogs(directory: str, book_count: int):
+    books_path = os.path.join(directory, 'books.bin')
+    members_path = os.path.join(directory, 'members.bin')
+    MmapBookRepository.write_catalog(books_path, (Book(*row) for row in book_rows(book_count)))
+    MmapMemberRepository.write_catalog(members_path, (Member(*row) for row in member_rows(book_count)))
+    return books_path, members_path
+
+
+def open_eager(books_path: str, members_path: str):
+    books = InMemoryBookRepository()
+    members = InMemoryMemberRepository()
+    book_catalog, member_catalog = open_lazy(books_path, members_path)
+    try:
+        for book in book_catalog.iter_all():
+            books.save(book)
+        for member in member_catalog.iter_all():
+            members.save(member)
+    finally:
+        book_catalog.close()
+        member_catalog.close()
+    return books, members
+
+
+def open_lazy(books_path: str, members_path: str):
+    return MmapBookRepository(books_path), MmapMemberRepository(members_path)
+
+
+def anonymous_memory_mb() -> float:
+    """Current anonymous resident memory in MiB (Linux only, 0.0 elsewhere)"""
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('RssAnon:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def child(mode: str, books_path: str, members_path: str, book_count: int, lookups: int) -> None:
+    """Measure one cold start in this (fresh) process and print the results as JSON"""
+    start = time.perf_counter()
+    books, members = (open_eager if mode == 'eager' else open_lazy)(books_path, members_path)
+    startup = time.perf_counter() - start
+
+    start = time.perf_counter()
+    books.find_by_id(f"book{book_count // 2}")
+    first = time.perf_counter() - start
+
+    rng = random.Random(0)
+    member_count = member_count_for(book_count)
+    ids = [(f"book{rng.randrange(book_count)}", f"member{rng.randrange(member_count)}") for _ in range(lookups)]
+
+    def lookup(i):
+        book_id, member_id = ids[i]
+        books.find_by_id(book_id)
+        members.find_by_id(member_id)
+
+    stats = summarize(time_calls(lookup, lookups))
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({'startup_ms': startup * 1e3, 'first_us': first * 1e6, 'p50_us': stats['p50_us'],
+                      'p99_us': stats['p99_us'], 'peak_mb': peak_kb / 1024, 'anon_mb': anonymous_memory_mb()}))
+
+
+def run(mode: str, books_path: str, members_path: str, book_count: int, lookups: int) -> dict:
+    command = [sys.executable, '-m', __spec__.name, '--child', mode, books_path, members_path,
+               '--sizes', str(book_count), '--lookups', str(lookups)]
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000_000, 10_000_000])
+    parser.add_argument('--lookups', type=int, default=10_000, help="random book+member lookups after startup")
+    parser.add_argument('--modes', nargs='+', choices=['eager', 'lazy'], default=['eager', 'lazy'])
+    parser.add_argument('--child', nargs=3, metavar=('MODE', 'BOOKS', 'MEMBERS'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        mode, books_path, members_path = args.child
+        child(mode, books_path, members_path, args.sizes[0], args.lookups)
+        return
+
+    rows = []
+    for book_count in args.sizes:
+        directory = tempfile.mkdtemp(prefix='library-catalog-')
+        try:
+            start = time.perf_counter()
+            books_path, members_path = write_catalogs(directory, book_count)
+            written = time.perf_counter() - start
+            size = os.path.getsize(books_path) + os.path.getsize(members_path)
+            print(f"{book_count:,} books: catalogs written in {written:.1f}s, {size / 2 ** 20:,.0f} MiB", file=sys.stderr)
+            for mode in args.modes:
+                result = run(mode, books_path, members_path, book_count, args.lookups)
+                rows.append((book_count, mode, result['startup_ms'], result['first_us'], result['p50_us'],
+                             result['p99_us'], result['peak_mb'], result['anon_mb']))
+        finally:
+            shutil.rmtree(directory)
+    print_table(['books', 'load', 'startup ms', 'first lookup us', 'p50 us', 'p99 us', 'peak RSS MiB', 'heap MiB'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""
+Multithreaded stress test of ConcurrentLibraryService on each repository backend.
+
+The contention phase has every thread borrow from the same few books for the
+same few members, then checks that no book has two open loans and no member
+is over MAX_BOOKS_PER_MEMBER. The unsynchronized ImprovedLibraryService runs
+the same phase for comparison. The throughput phase has threads borrow and
+immediately return random books, and reports operations per second for each
+thread count, with the default stripes and with a single stripe (one global
+lock) for comparison.
+
+    python -m solutions_python.benchmarks.bench_concurrency --threads 1 2 4 8 16
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Callable, List, Tuple
+
+from .backends import BACKENDS, member_count_for
+from ..concurrent_library_service import ConcurrentLibraryService
+from ..improved_library_service import ImprovedLibraryService
+from ..standard_fine_strategy import StandardFineStrategy
+from ..striped_lock import StripedLock
+from ...python_library.benchmarks.common import print_table
+
+HOT_BOOKS = 32
+HOT_MEMBERS = 4
+
+
+def run_threads(thread_count: int, work: Callable[[int], int]) -> Tuple[int, float]:
+    """Run work(thread_index) on thread_count threads released together; return (total ops, seconds)"""
+    barrier = threading.Barrier(thread_count + 1)
+    counts = [0] * thread_count
+
+    def target(index: int) -> None:
+        barrier.wait()
+        counts[index] = work(index)
+
+    threads = [threading.Thread(target=target, args=(index,)) for index in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return sum(counts), time.perf_counter() - start
+
+
+def count_violations(service: ImprovedLibraryService) -> Tuple[int, int]:
+    """(extra loans on already-lent books, members over the borrowing limit)"""
+    loans = service.loan_repository.find_all()
+    per_book = Counter(loan.get_book_id() for loan in loans)
+    per_member = Counter(loan.get_member_id() for loan in loans)
+    double_loans = sum(count - 1 for count in per_book.values() if count > 1)
+    over_limit = sum(1 for count in per_member.values() if count > service.MAX_BOOKS_PER_MEMBER)
+    return double_loans, over_limit
+
+
+def contention(service_class, backend_name: str, thread_count: int, attempts: int):
+    backend = BACKENDS[backend_name](max(HOT_BOOKS, HOT_MEMBERS * 5))
+    try:
+        service = service_class(backend.book_repository, backend.member_repository,
+                                backend.loan_repository, StandardFineStrategy())
+
+        def work(index: int) -> int:
+            rng = random.Random(index)
+            for _ in range(attempts):
+                service.borrow_book(f"member{rng.randrange(HOT_MEMBERS)}", f"book{rng.randrange(HOT_BOOKS)}")
+            return attempts
+
+        run_threads(thread_count, work)
+        double_loans, over_limit = count_violations(service)
+        return (service_class.__name__, backend_name, thread_count, len(service.loan_repository.find_all()),
+                double_loans, over_limit)
+    finally:
+        backend.close()
+
+
+def throughput(backend_name: str, book_count: int, thread_count: int, operations: int, stripes: int):
+    backend = BACKENDS[backend_name](book_count)
+    try:
+        service = ConcurrentLibraryService(backend.book_repository, backend.member_repository,
+                                           backend.loan_repository, StandardFineStrategy(), stripes)
+        member_count = member_count_for(book_count)
+        per_thread = max(1, operations // thread_count)
+
+        def work(index: int) -> int:
+            rng = random.Random(index)
+            for _ in range(per_thread):
+                result = service.borrow_book(f"member{rng.randrange(member_count)}", f"book{rng.randrange(book_count)}")
+                if result.is_success():
+                    service.return_book(result.get_loan().get_id())
+            return per_thread
+
+        total, seconds = run_threads(thread_count, work)
+        return total / seconds if seconds > 0 else 0.0
+    finally:
+        backend.close()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    parser.add_argument('--backends', nargs='+', choices=sorted(BACKENDS), default=sorted(BACKENDS))
+    parser.add_argument('--books', type=int, default=100_000)
+    parser.add_argument('--operations', type=int, default=20_000)
+    parser.add_argument('--attempts', type=int, default=200, help="borrow attempts per thread in the contention phase")
+    args = parser.parse_args(argv)
+
+    # Switch threads as often as possible so unsynchronized check-then-act races show up
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        rows: List[tuple] = []
+        for backend_name in args.backends:
+            for thread_count in args.threads:
+                for service_class in (ImprovedLibraryService, ConcurrentLibraryService):
+                    rows.append(contention(service_class, backend_name, thread_count, args.attempts))
+    finally:
+        sys.setswitchinterval(switch_interval)
+    print_table(['service', 'backend', 'threads', 'open loans', 'double loans', 'members over limit'], rows)
+    print()
+
+    rows = []
+    for backend_name in args.backends:
+        for stripes in (StripedLock.DEFAULT_STRIPES, 1):
+            baseline = None
+            for thread_count in args.threads:
+                ops_per_sec = throughput(backend_name, args.books, thread_count, args.operations, stripes)
+                baseline = baseline or ops_per_sec
+                rows.append((backend_name, stripes, thread_count, ops_per_sec,
+                             ops_per_sec / baseline if baseline else 0.0))
+    print_table(['backend', 'stripes', 'threads', 'borrow+return/sec', 'speedup'], rows)
+
+
+if __name__ == '__main__':
+    main()
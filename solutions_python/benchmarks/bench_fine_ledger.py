@@ -0,0 +1,92 @@
+"""
+Member fine totals from the materialized FineLedger vs recomputing them per read.
+
+Seeds every member with loans borrowed over the last --days days (so some
+are overdue), then times three ways of answering "what does this member
+owe", for random members:
+
+  per-loan   get_member_loans + calculate_fine for each loan (an account page today)
+  batch      get_member_open_fine without a ledger: one strategy batch per read
+  ledger     get_member_open_fine with a FineLedger: a dict lookup
+
+It also times building the ledger and one daily accrual pass over all loans.
+
+    python -m solutions_python.benchmarks.bench_fine_ledger --books 1000000 --backend sqlite
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from .backends import BACKENDS, member_count_for
+from ..fine_ledger import FineLedger
+from ..improved_library_service import ImprovedLibraryService
+from ..standard_fine_strategy import StandardFineStrategy
+from ...python_library.benchmarks.common import print_table, summarize, time_calls
+from ...python_library.loan import Loan
+
+
+def seed_loans(loan_repository, book_count: int, loans_per_member: int, days: int, now: datetime) -> int:
+    rng = random.Random(0)
+    member_count = member_count_for(book_count)
+    loans = [Loan(f"loan{m}-{k}", f"member{m}", f"book{(m * loans_per_member + k) % book_count}",
+                  now - timedelta(seconds=rng.randrange(days * 86400)))
+             for m in range(member_count) for k in range(loans_per_member)]
+    for start in range(0, len(loans), 10_000):
+        loan_repository.save_many(loans[start:start + 10_000])
+    return len(loans)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--books', type=int, default=100_000)
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='sqlite')
+    parser.add_argument('--loans-per-member', type=int, default=ImprovedLibraryService.MAX_BOOKS_PER_MEMBER)
+    parser.add_argument('--days', type=int, default=30, help="loans were borrowed up to this many days ago")
+    parser.add_argument('--reads', type=int, default=20_000)
+    args = parser.parse_args(argv)
+
+    now = datetime.now()
+    backend = BACKENDS[args.backend](args.books)
+    try:
+        loan_count = seed_loans(backend.loan_repository, args.books, args.loans_per_member, args.days, now)
+        strategy = StandardFineStrategy()
+        plain = ImprovedLibraryService(backend.book_repository, backend.member_repository,
+                                       backend.loan_repository, strategy)
+
+        start = time.perf_counter()
+        ledger = FineLedger(strategy, ImprovedLibraryService.LOAN_DURATION_DAYS,
+                            backend.loan_repository.iter_all(), as_of=now)
+        build_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        repriced = ledger.accrue(now + timedelta(days=1))
+        accrue_seconds = time.perf_counter() - start
+        with_ledger = ImprovedLibraryService(backend.book_repository, backend.member_repository,
+                                             backend.loan_repository, strategy, ledger)
+
+        rng = random.Random(1)
+        member_count = member_count_for(args.books)
+        members = [f"member{rng.randrange(member_count)}" for _ in range(args.reads)]
+
+        def per_loan(i):
+            sum(plain.calculate_fine(loan.get_id()) for loan in plain.get_member_loans(members[i]))
+
+        def batch(i):
+            plain.get_member_open_fine(members[i])
+
+        def lookup(i):
+            with_ledger.get_member_open_fine(members[i])
+
+        rows = []
+        for name, func in (('per-loan', per_loan), ('batch', batch), ('ledger', lookup)):
+            stats = summarize(time_calls(func, args.reads))
+            rows.append((args.backend, loan_count, name, stats['ops_per_sec'], stats['p50_us'], stats['p99_us']))
+    finally:
+        backend.close()
+    print_table(['backend', 'loans', 'member total', 'reads/s', 'p50 us', 'p99 us'], rows)
+    print(f"ledger built from {loan_count:,} loans in {build_seconds:.2f}s; "
+          f"daily accrual re-priced {repriced:,} overdue loans in {accrue_seconds * 1e3:.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Borrowing from titles with many copies: probing copies for a free one vs holdings allocation.
+
+Builds a catalog of --titles titles with --copies copies each and lends the
+first --lent fraction of every title's copies, then times borrows of random
+titles two ways on each service:
+
+  probe copies   look copies of the title up one by one until a free one turns up, then borrow it
+                 (what a caller has to do when the service only lends book IDs)
+  by title       borrow_book(member, title_id), which takes a free copy from the holdings
+
+Each loan is returned, untimed, before the next borrow, so the fraction lent
+stays the same throughout.
+
+    python -m solutions_python.benchmarks.bench_holdings --titles 100 --copies 1000 --lent 0.9
+"""
+import argparse
+import random
+import time
+
+from .backends import BACKENDS
+from ..improved_library_service import ImprovedLibraryService
+from ..standard_fine_strategy import StandardFineStrategy
+from ...python_library.benchmarks.common import print_table, summarize
+from ...python_library.book import Book
+from ...python_library.library_service import LibraryService
+from ...python_library.member import Member
+
+MEMBERS = 1000
+
+
+def catalog(titles: int, copies: int, lent: float):
+    lent_copies = int(copies * lent)
+    for t in range(titles):
+        for c in range(copies):
+            book = Book(f"title{t}-{c}", f"Title {t}", f"Author {t}", f"title{t}")
+            book.set_available(c >= lent_copies)
+            yield book
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--titles', type=int, default=100)
+    parser.add_argument('--copies', type=int, default=1000)
+    parser.add_argument('--lent', type=float, default=0.9, help="fraction of each title's copies already lent")
+    parser.add_argument('--borrows', type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    picks = [(f"member{rng.randrange(MEMBERS)}", rng.randrange(args.titles)) for _ in range(args.borrows)]
+    rows = []
+
+    service = LibraryService()
+    for book in catalog(args.titles, args.copies, args.lent):
+        service.add_book(book)
+    for i in range(MEMBERS):
+        service.add_member(Member(f"member{i}", f"Member {i}", f"member{i}@example.com"))
+
+    def probe_library_service(member_id: str, t: int) -> str:
+        for c in range(args.copies):
+            book = service.get_book(f"title{t}-{c}")
+            if book is not None and book.is_available():
+                return service.borrow_book(member_id, book.get_id())
+        return service.borrow_book(member_id, f"title{t}")
+
+    for name, borrow in (('probe copies', probe_library_service),
+                         ('by title', lambda member_id, t: service.borrow_book(member_id, f"title{t}"))):
+        latencies = []
+        for member_id, t in picks:
+            start = time.perf_counter()
+            result = borrow(member_id, t)
+            latencies.append(time.perf_counter() - start)
+            service.return_book(result.split(": ")[1])
+        rows.append(('LibraryService', name, *summarize(latencies).values()))
+
+    for backend_name in sorted(BACKENDS):
+        backend = BACKENDS[backend_name](0)
+        try:
+            books = backend.book_repository
+            books.save_many(catalog(args.titles, args.copies, args.lent))
+            backend.member_repository.save_many(Member(f"member{i}", f"Member {i}", f"member{i}@example.com")
+                                                for i in range(1, MEMBERS))
+            improved = ImprovedLibraryService(books, backend.member_repository, backend.loan_repository,
+                                              StandardFineStrategy())
+
+            def probe_improved(member_id: str, t: int):
+                for c in range(args.copies):
+                    book = books.find_by_id(f"title{t}-{c}")
+                    if book is not None and book.is_available():
+                        return improved.borrow_book(member_id, book.get_id())
+                return improved.borrow_book(member_id, f"title{t}")
+
+            for name, borrow in (('probe copies', probe_improved),
+                                 ('by title', lambda member_id, t: improved.borrow_book(member_id, f"title{t}"))):
+                latencies = []
+                for member_id, t in picks:
+                    start = time.perf_counter()
+                    result = borrow(member_id, t)
+                    latencies.append(time.perf_counter() - start)
+                    if not result.is_success():
+                        raise RuntimeError(result.get_message())
+                    improved.return_book(result.get_loan().get_id())
+                rows.append((f"ImprovedLibraryService/{backend_name}", name, *summarize(latencies).values()))
+        finally:
+            backend.close()
+
+    print_table(['service', 'borrow', 'ops/sec', 'mean us', 'p50 us', 'p99 us'], rows)
+    print(f"{args.titles:,} titles x {args.copies:,} copies, {args.lent:.0%} of each title lent")
+
+
+if __name__ == '__main__':
+    main()
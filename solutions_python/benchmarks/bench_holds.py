@@ -0,0 +1,94 @@
+"""
+Hold queue costs on one bestseller as its queue grows: place, cancel, return with handoff, pickup.
+
+For each queue length, lends every copy of one title, queues that many holds
+on it, then times:
+
+  place hold       place_hold for each member in the queue
+  cancel hold      cancel_hold for every tenth hold
+  return+handoff   return_book of a lent copy, which sets it aside for the next hold
+  pickup borrow    the next holder's borrow_book of the copy set aside for them
+
+Each handoff round returns one copy and has its holder pick it up, so the
+queue shortens by one per round. With a heap per title, the times should not
+grow with the queue.
+
+    python -m solutions_python.benchmarks.bench_holds --holds 100 10000 100000 --backend sqlite
+"""
+import argparse
+import time
+
+from .backends import BACKENDS
+from ..hold_queue import HoldQueue
+from ..improved_library_service import ImprovedLibraryService
+from ..standard_fine_strategy import StandardFineStrategy
+from ...python_library.benchmarks.common import print_table, summarize
+from ...python_library.book import Book
+from ...python_library.member import Member
+
+
+def timed(func, arguments):
+    latencies, results = [], []
+    for argument in arguments:
+        start = time.perf_counter()
+        results.append(func(argument))
+        latencies.append(time.perf_counter() - start)
+    return latencies, results
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--holds', type=int, nargs='+', default=[100, 10_000, 100_000])
+    parser.add_argument('--copies', type=int, default=10)
+    parser.add_argument('--rounds', type=int, default=1000, help="return+pickup rounds per queue length")
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='in-memory')
+    args = parser.parse_args(argv)
+
+    rows = []
+    for hold_count in args.holds:
+        backend = BACKENDS[args.backend](0)
+        try:
+            backend.book_repository.save_many(Book(f"bestseller-{i}", "Bestseller", "Author", "bestseller")
+                                              for i in range(args.copies))
+            backend.member_repository.save_many(Member(f"member{i}", f"Member {i}", f"member{i}@example.com")
+                                                for i in range(1, args.copies + hold_count + 1))
+            service = ImprovedLibraryService(backend.book_repository, backend.member_repository,
+                                             backend.loan_repository, StandardFineStrategy(), holds=HoldQueue())
+            loans = [service.borrow_book(f"member{i}", "bestseller").get_loan().get_id()
+                     for i in range(1, args.copies + 1)]
+            holders = [f"member{args.copies + i}" for i in range(1, hold_count + 1)]
+
+            latencies, results = timed(lambda member_id: service.place_hold(member_id, "bestseller"), holders)
+            rows.append((hold_count, 'place hold', *summarize(latencies).values()))
+            holds = [result.get_hold() for result in results]
+            cancelled = holds[::10]
+            latencies, _ = timed(lambda hold: service.cancel_hold(hold.get_id()), cancelled)
+            rows.append((hold_count, 'cancel hold', *summarize(latencies).values()))
+
+            rounds = min(args.rounds, hold_count - len(cancelled))
+            cancelled_ids = {hold.get_id() for hold in cancelled}
+            queue = iter(hold for hold in holds if hold.get_id() not in cancelled_ids)
+            return_latencies, pickup_latencies = [], []
+            for round_number in range(rounds):
+                loan_id = loans[round_number % len(loans)]
+                start = time.perf_counter()
+                service.return_book(loan_id)
+                return_latencies.append(time.perf_counter() - start)
+                hold = next(queue)
+                start = time.perf_counter()
+                result = service.borrow_book(hold.get_member_id(), "bestseller")
+                pickup_latencies.append(time.perf_counter() - start)
+                if not result.is_success():
+                    raise RuntimeError(result.get_message())
+                loans[round_number % len(loans)] = result.get_loan().get_id()
+            rows.append((hold_count, 'return+handoff', *summarize(return_latencies).values()))
+            rows.append((hold_count, 'pickup borrow', *summarize(pickup_latencies).values()))
+        finally:
+            backend.close()
+
+    print_table(['holds', 'operation', 'ops/sec', 'mean us', 'p50 us', 'p99 us'], rows)
+    print(f"{args.backend}, one title with {args.copies} copies, all lent")
+
+
+if __name__ == '__main__':
+    main()
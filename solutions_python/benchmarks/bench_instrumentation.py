@@ -0,0 +1,91 @@
+"""
+Overhead of ServiceInstrumentation on borrow_book + return_book.
+
+Three services share the same seeded repositories:
+
+  baseline   never instrumented
+  disabled   instrumented, then disabled again (must stay within --budget of baseline)
+  enabled    instrumented: every service method and repository call timed
+
+Rounds of each are interleaved, in rotating order, so drift on the machine
+hits all three alike, and the median round is reported. Exits with status 1
+if the disabled overhead is over budget.
+
+    python -m solutions_python.benchmarks.bench_instrumentation --backend in-memory --rounds 15
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+
+from .backends import BACKENDS, member_count_for
+from ..improved_library_service import ImprovedLibraryService
+from ..service_instrumentation import ServiceInstrumentation
+from ..standard_fine_strategy import StandardFineStrategy
+from ...python_library.benchmarks.common import print_table
+
+
+def run_round(service: ImprovedLibraryService, pairs) -> float:
+    """Seconds for one borrow + return per pair"""
+    start = time.perf_counter()
+    for member_id, book_id in pairs:
+        result = service.borrow_book(member_id, book_id)
+        service.return_book(result.get_loan().get_id())
+    return time.perf_counter() - start
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--books', type=int, default=100_000)
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='in-memory')
+    parser.add_argument('--operations', type=int, default=20_000, help="borrow + return pairs per round")
+    parser.add_argument('--rounds', type=int, default=15)
+    parser.add_argument('--budget', type=float, default=0.01, help="allowed disabled overhead, as a fraction")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    member_count = member_count_for(args.books)
+    pairs = [(f"member{rng.randrange(member_count)}", f"book{rng.randrange(args.books)}")
+             for _ in range(args.operations)]
+
+    backend = BACKENDS[args.backend](args.books)
+    try:
+        def new_service() -> ImprovedLibraryService:
+            return ImprovedLibraryService(backend.book_repository, backend.member_repository,
+                                          backend.loan_repository, StandardFineStrategy())
+
+        baseline, disabled, enabled = new_service(), new_service(), new_service()
+        instrumentation = ServiceInstrumentation(disabled)
+        instrumentation.enable()
+        run_round(disabled, pairs[:100])
+        instrumentation.disable()
+        ServiceInstrumentation(enabled).enable()
+
+        services = (('baseline', baseline), ('disabled', disabled), ('enabled', enabled))
+        timings = {name: [] for name, _ in services}
+        for name, service in services:
+            run_round(service, pairs[:1000])   # warm-up
+        for round_number in range(args.rounds):
+            # Rotate the order so no service always runs right after another
+            shift = round_number % len(services)
+            for name, service in services[shift:] + services[:shift]:
+                timings[name].append(run_round(service, pairs))
+    finally:
+        backend.close()
+
+    base = statistics.median(timings['baseline'])
+    rows = []
+    for name, _ in services:
+        seconds = statistics.median(timings[name])
+        rows.append((args.backend, name, args.operations / seconds, seconds / args.operations * 1e6,
+                     f"{seconds / base - 1:+.2%}"))
+    print_table(['backend', 'instrumentation', 'borrow+return/s', 'mean us', 'vs baseline'], rows)
+    overhead = statistics.median(timings['disabled']) / base - 1
+    within = overhead <= args.budget
+    print(f"disabled overhead {overhead:+.2%} ({'within' if within else 'OVER'} the {args.budget:.0%} budget)")
+    return 0 if within else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
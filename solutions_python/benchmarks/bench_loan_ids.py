@@ -0,0 +1,103 @@
+"""
+Loan IDs: uuid4 strings vs LoanIdGenerator, from minting to a disk-backed SQLite repository.
+
+Times how fast each scheme mints IDs, then saves --loans loans under each
+into a fresh SQLite database (save_many in batches of --batch, then
+--single more through save(), one transaction each) and reports:
+
+  ids/s              IDs minted per second
+  batch loans/s      save_many throughput
+  save() p50/p99 us  latency of one committed insert
+  lookup p50 us      find_by_id of a random saved loan
+  table/index MB     pages of the loans table and of idx_loans_id (from dbstat)
+  file MB            the database file after a checkpoint
+
+uuid4 IDs are kept as text under the partial unique index, as any ID
+that is not a generated one is; generated IDs are stored as the integer
+key alone and append at the end of the table.
+
+    python -m solutions_python.benchmarks.bench_loan_ids --loans 500000
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from ..sqlite_connection_pool import SQLiteConnectionPool
+from ..sqlite_loan_repository import SQLiteLoanRepository
+from ...python_library.benchmarks.common import print_table, summarize, time_calls
+from ...python_library.loan import Loan
+from ...python_library.loan_id_generator import LoanIdGenerator
+
+SCHEMES = {
+    'uuid4': lambda: str(uuid.uuid4()),
+    'LoanIdGenerator': LoanIdGenerator(node_id=1).next_id,
+}
+
+
+def mint_rate(new_id, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        new_id()
+    return count / (time.perf_counter() - start)
+
+
+def sizes_mb(pool) -> tuple:
+    with pool.connection() as connection:
+        connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        sizes = dict(connection.execute("SELECT name, sum(pgsize) FROM dbstat "
+                                        "WHERE name IN ('loans', 'idx_loans_id') GROUP BY name"))
+    return (sizes.get('loans', 0) / 2 ** 20, sizes.get('idx_loans_id', 0) / 2 ** 20,
+            os.path.getsize(pool.database) / 2 ** 20)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--loans', type=int, default=500_000)
+    parser.add_argument('--batch', type=int, default=10_000)
+    parser.add_argument('--single', type=int, default=2_000)
+    parser.add_argument('--lookups', type=int, default=20_000)
+    args = parser.parse_args(argv)
+
+    as_of = datetime.now()
+    rows = []
+    for name, new_id in SCHEMES.items():
+        rng = random.Random(0)
+
+        def new_loan():
+            return Loan(new_id(), f"member{rng.randrange(args.loans // 5 + 1)}", f"book{rng.randrange(args.loans)}",
+                        as_of - timedelta(seconds=rng.randrange(40 * 86400)))
+
+        directory = tempfile.mkdtemp(prefix='library-loan-ids-')
+        pool = SQLiteConnectionPool(os.path.join(directory, 'library.db'))
+        try:
+            loans = SQLiteLoanRepository(pool)
+            saved = 0
+            start = time.perf_counter()
+            while saved < args.loans:
+                batch = [new_loan() for _ in range(min(args.batch, args.loans - saved))]
+                loans.save_many(batch)
+                saved += len(batch)
+            batch_rate = saved / (time.perf_counter() - start)
+            single = summarize(time_calls(lambda i: loans.save(new_loan()), args.single))
+
+            loan_ids = [loan.get_id() for loan in loans.iter_all()]
+            sample = [rng.choice(loan_ids) for _ in range(args.lookups)]
+            lookup = summarize(time_calls(lambda i: loans.find_by_id(sample[i]), args.lookups))
+
+            rows.append((name, mint_rate(new_id, 200_000), batch_rate, single['p50_us'], single['p99_us'],
+                         lookup['p50_us']) + sizes_mb(pool))
+        finally:
+            pool.close()
+            shutil.rmtree(directory)
+    print_table(['ids', 'ids/s', 'batch loans/s', 'save() p50 us', 'save() p99 us', 'lookup p50 us',
+                 'table MB', 'index MB', 'file MB'], rows)
+    print(f"{args.loans + args.single:,} loans on disk, batches of {args.batch:,}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Fines for a mix of public, student and staff members: per-loan dispatch vs MemberCategoryFineStrategy.
+
+Seeds members with a category each and one open loan per book, then prices
+every loan as of one instant four ways:
+
+  lookup per loan     find_by_id + pick a strategy + price the loan (the branching callers do today)
+  registry per loan   MemberCategoryFineStrategy, one calculate_fines_batch([loan]) per loan
+  registry batch      MemberCategoryFineStrategy.calculate_fines_batch over all loans, cold and warm cache
+  single strategy     StandardFineStrategy over all loans, the floor without any dispatch
+
+    python -m solutions_python.benchmarks.bench_member_fines --books 500000 --backend sqlite
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from .backends import BACKENDS, member_count_for, member_rows
+from ..daily_rate_fine_strategy import DailyRateFineStrategy
+from ..improved_library_service import ImprovedLibraryService
+from ..member_category_fine_strategy import MemberCategoryFineStrategy
+from ..standard_fine_strategy import StandardFineStrategy
+from ..student_fine_strategy import StudentFineStrategy
+from ...python_library.benchmarks.common import print_table
+from ...python_library.loan import Loan
+from ...python_library.member import Member
+
+CATEGORIES = ('public', 'public', 'student', 'staff')
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--books', type=int, default=500_000)
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='sqlite')
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    as_of = datetime.now()
+    member_count = member_count_for(args.books)
+    loans = [Loan(f"loan{i}", f"member{rng.randrange(member_count)}", f"book{i}",
+                  as_of - timedelta(seconds=rng.randrange(40 * 86400)))
+             for i in range(args.books)]
+    duration = ImprovedLibraryService.LOAN_DURATION_DAYS
+    strategies = {'student': StudentFineStrategy(), 'staff': DailyRateFineStrategy(0.10)}
+    default = StandardFineStrategy()
+
+    backend = BACKENDS[args.backend](args.books)
+    try:
+        members = backend.member_repository
+        members.save_many(Member(*row, CATEGORIES[i % len(CATEGORIES)])
+                          for i, row in enumerate(member_rows(args.books)))
+
+        def lookup_per_loan():
+            fines = []
+            for loan in loans:
+                member = members.find_by_id(loan.get_member_id())
+                strategy = strategies.get(member.get_category(), default) if member is not None else default
+                fines.extend(strategy.calculate_fines_batch([loan], duration, as_of))
+            return fines
+
+        registry = MemberCategoryFineStrategy(members, strategies, default)
+
+        def registry_per_loan():
+            fines = []
+            for loan in loans:
+                fines.extend(registry.calculate_fines_batch([loan], duration, as_of))
+            return fines
+
+        def registry_batch():
+            return registry.calculate_fines_batch(loans, duration, as_of)
+
+        cases = [('lookup per loan', lookup_per_loan, False),
+                 ('registry per loan (cold cache)', registry_per_loan, True),
+                 ('registry per loan (warm cache)', registry_per_loan, False),
+                 ('registry batch (cold cache)', registry_batch, True),
+                 ('registry batch (warm cache)', registry_batch, False),
+                 ('single strategy batch', lambda: default.calculate_fines_batch(loans, duration, as_of), False)]
+        rows, results = [], []
+        for name, func, cold in cases:
+            if cold:
+                registry.invalidate()
+            start = time.perf_counter()
+            results.append(func())
+            rows.append((args.backend, len(loans), name, time.perf_counter() - start))
+    finally:
+        backend.close()
+    print_table(['backend', 'loans', 'method', 'seconds'], rows)
+    mismatches = sum(1 for a, b in zip(results[0], results[3]) if a != b)
+    print(f"total fines ${sum(results[3]):,.2f} with categories vs ${sum(results[-1]):,.2f} at the standard rate; "
+          f"{mismatches} fines differ between per-loan lookup and the registry batch")
+
+
+if __name__ == '__main__':
+    main()
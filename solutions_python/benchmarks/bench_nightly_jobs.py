@@ -0,0 +1,108 @@
+"""
+Nightly batch (fines, overdue list, loans per member): one process over find_all() vs NightlyJobRunner on a process pool.
+
+Saves --loans loans with uuid4 IDs and borrow dates spread over 40 days,
+then times the whole batch as of one instant:
+
+  find_all            find_all(), one calculate_fines_batch, an overdue filter and sort, a Counter of members
+  runner, 0 workers   NightlyJobRunner(workers=0): the same jobs on the same chunks, in this process
+  runner, N workers   NightlyJobRunner on a warmed-up ProcessPoolExecutor of N processes
+
+and prints how large one chunk is pickled as a LoanChunk and as a list of
+Loan objects, with the time to pickle it and rebuild the loans on the other
+side. The calling process still reads and encodes every loan, so the
+runner cannot finish faster than one pass of iter_all() plus the encoding,
+whatever the worker count.
+
+    python -m solutions_python.benchmarks.bench_nightly_jobs --loans 1000000 --workers 1 2 4 8 16
+"""
+import argparse
+import os
+import pickle
+import random
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+from .backends import BACKENDS
+from ..loan_chunk import LoanChunk
+from ..nightly_job_runner import NightlyJobRunner
+from ..standard_fine_strategy import StandardFineStrategy
+from ...python_library.benchmarks.common import print_table
+from ...python_library.loan import Loan
+
+LOAN_DURATION_DAYS = 14
+
+
+def single_process(loan_repository, strategy, as_of: datetime) -> dict:
+    loans = loan_repository.find_all()
+    fines = dict(zip([loan.get_id() for loan in loans],
+                     strategy.calculate_fines_batch(loans, LOAN_DURATION_DAYS, as_of)))
+    cutoff = as_of - timedelta(days=LOAN_DURATION_DAYS)
+    overdue = [loan.get_id() for loan in sorted((loan for loan in loans if loan.get_borrow_date() < cutoff),
+                                                key=lambda loan: (loan.get_borrow_date(), loan.get_id()))]
+    return {'fines': fines, 'overdue': overdue,
+            'member_loan_counts': Counter(loan.get_member_id() for loan in loans)}
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--loans', type=int, default=1_000_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    parser.add_argument('--chunk-size', type=int, default=NightlyJobRunner.DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='in-memory')
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    as_of = datetime.now()
+    strategy = StandardFineStrategy()
+    backend = BACKENDS[args.backend](0)
+    try:
+        loans = backend.loan_repository
+        loans.save_many(Loan(str(uuid.uuid4()), f"member{rng.randrange(args.loans // 5 + 1)}", str(uuid.uuid4()),
+                             as_of - timedelta(seconds=rng.randrange(40 * 86400)))
+                        for _ in range(args.loans))
+
+        rows = []
+        start = time.perf_counter()
+        expected = single_process(loans, strategy, as_of)
+        baseline = time.perf_counter() - start
+        rows.append(('find_all', baseline, 1.0))
+
+        def timed_run(runner, executor=None):
+            start = time.perf_counter()
+            report = runner.run_nightly(strategy, LOAN_DURATION_DAYS, as_of, executor)
+            seconds = time.perf_counter() - start
+            if report['fines'] != expected['fines'] or report['overdue'] != expected['overdue']:
+                raise RuntimeError("runner disagrees with the single-process batch")
+            return seconds
+
+        seconds = timed_run(NightlyJobRunner(loans, workers=0, chunk_size=args.chunk_size))
+        rows.append(('runner, 0 workers', seconds, baseline / seconds))
+        for workers in args.workers:
+            with ProcessPoolExecutor(workers) as executor:
+                list(executor.map(abs, range(workers)))   # start the processes before timing
+                seconds = timed_run(NightlyJobRunner(loans, workers, args.chunk_size), executor)
+            rows.append((f"runner, {workers} workers", seconds, baseline / seconds))
+        print_table(['batch', 'seconds', 'speedup'], rows)
+
+        sample = loans.find_all()[:args.chunk_size]
+        encodings = []
+        for name, encode, decode in (('LoanChunk', LoanChunk.encode, lambda chunk: chunk.loans()),
+                                     ('list of Loan', list, lambda loans: loans)):
+            payload = encode(sample)
+            start = time.perf_counter()
+            data = pickle.dumps(payload)
+            decode(pickle.loads(data))
+            encodings.append((name, len(data) / len(sample), 1e3 * (time.perf_counter() - start)))
+        print()
+        print_table(['chunk pickled as', 'bytes/loan', 'pickle+rebuild ms'], encodings)
+        print(f"{args.backend}, {args.loans:,} loans, chunks of {len(sample):,}, {os.cpu_count()} CPUs")
+    finally:
+        backend.close()
+
+
+if __name__ == '__main__':
+    main()
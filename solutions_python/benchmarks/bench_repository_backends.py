@@ -0,0 +1,78 @@
+"""
+Borrow/return throughput of ImprovedLibraryService on each repository backend,
+one call at a time and through the borrow_books/return_books batch API.
+
+    python -m solutions_python.benchmarks.bench_repository_backends --sizes 10000 1000000 10000000
+"""
+import argparse
+import time
+
+from .backends import BACKENDS, member_count_for
+from ..improved_library_service import ImprovedLibraryService
+from ..standard_fine_strategy import StandardFineStrategy
+from ...python_library.benchmarks.common import print_table, summarize, time_calls
+
+
+def run(backend_name: str, book_count: int, operations: int, batch_size: int):
+    start = time.perf_counter()
+    backend = BACKENDS[backend_name](book_count)
+    setup_seconds = time.perf_counter() - start
+    try:
+        service = ImprovedLibraryService(backend.book_repository, backend.member_repository,
+                                         backend.loan_repository, StandardFineStrategy())
+        member_count = member_count_for(book_count)
+        operations = min(operations, book_count)
+        stride = max(1, book_count // operations)
+        loan_ids = []
+
+        def borrow(i):
+            result = service.borrow_book(f"member{i % member_count}", f"book{i * stride}")
+            loan_ids.append(result.get_loan().get_id())
+
+        def give_back(i):
+            service.return_book(loan_ids[i])
+
+        rows = []
+        for name, func in (('borrow_book', borrow), ('return_book', give_back)):
+            stats = summarize(time_calls(func, operations))
+            rows.append((backend_name, book_count, setup_seconds, name,
+                         stats['ops_per_sec'], stats['p50_us'], stats['p99_us']))
+
+        # Batch API: latencies are per batch, throughput is reported per item
+        batches = max(1, operations // batch_size)
+        loan_ids.clear()
+
+        def borrow_batch(b):
+            pairs = [(f"member{i % member_count}", f"book{i * stride}")
+                     for i in range(b * batch_size, (b + 1) * batch_size)]
+            loan_ids.append([r.get_loan().get_id() for r in service.borrow_books(pairs)])
+
+        def return_batch(b):
+            service.return_books(loan_ids[b])
+
+        for name, func in (('borrow_books', borrow_batch), ('return_books', return_batch)):
+            stats = summarize(time_calls(func, batches))
+            rows.append((backend_name, book_count, setup_seconds, name,
+                         stats['ops_per_sec'] * batch_size, stats['p50_us'], stats['p99_us']))
+        return rows
+    finally:
+        backend.close()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000])
+    parser.add_argument('--backends', nargs='+', choices=sorted(BACKENDS), default=sorted(BACKENDS))
+    parser.add_argument('--operations', type=int, default=5_000)
+    parser.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args(argv)
+
+    rows = []
+    for size in args.sizes:
+        for backend_name in args.backends:
+            rows.extend(run(backend_name, size, args.operations, args.batch_size))
+    print_table(['backend', 'books', 'setup s', 'operation', 'ops/sec', 'p50 us', 'p99 us'], rows)
+
+
+if __name__ == '__main__':
+    main()
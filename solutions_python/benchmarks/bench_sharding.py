@@ -0,0 +1,94 @@
+"""
+Borrow/return throughput of ShardedLibraryService as worker processes are added, against one in-process service.
+
+Loads --books books and enough members for them into every configuration,
+then runs --operations borrows and their returns in batches of --batch,
+from --clients threads sharing the router:
+
+  in-process     ImprovedLibraryService on in-memory repositories, no processes
+  N workers      ShardedLibraryService(N), each shard on in-memory repositories
+
+Every borrow is of a distinct book by a member under the borrowing limit, so
+all of them succeed. A batch goes to its shards in one message each, and the
+shards work on their parts at the same time; how close the throughput comes
+to N times one worker depends on the free cores.
+
+    python -m solutions_python.benchmarks.bench_sharding --workers 1 2 4 8 16 --batch 256
+"""
+import argparse
+import os
+import threading
+import time
+
+from ..improved_library_service import ImprovedLibraryService
+from ..in_memory_book_repository import InMemoryBookRepository
+from ..in_memory_loan_repository import InMemoryLoanRepository
+from ..in_memory_member_repository import InMemoryMemberRepository
+from ..sharded_library_service import ShardedLibraryService
+from ..standard_fine_strategy import StandardFineStrategy
+from ...python_library.benchmarks.common import percentile, print_table
+from ...python_library.book import Book
+from ...python_library.member import Member
+
+
+def run(service, args) -> tuple:
+    """Borrow then return every book in batches from the client threads; returns (seconds, batch latencies)"""
+    batches = [[(f"member{i // 4}", f"book{i}") for i in range(start, min(start + args.batch, args.operations))]
+               for start in range(0, args.operations, args.batch)]
+    latencies = []
+
+    def client(part):
+        for batch in part:
+            start = time.perf_counter()
+            results = service.borrow_books(batch)
+            loan_ids = [result.get_loan().get_id() for result in results if result.is_success()]
+            if len(loan_ids) != len(batch):
+                raise RuntimeError(next(r.get_message() for r in results if not r.is_success()))
+            service.return_books(loan_ids)
+            latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client, args=(batches[i::args.clients],)) for i in range(args.clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, latencies
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    parser.add_argument('--books', type=int, default=100_000)
+    parser.add_argument('--operations', type=int, default=50_000, help="borrows, each followed by its return")
+    parser.add_argument('--batch', type=int, default=256)
+    parser.add_argument('--clients', type=int, default=4, help="threads submitting batches")
+    args = parser.parse_args(argv)
+    args.operations = min(args.operations, args.books)
+
+    books = [Book(f"book{i}", f"Title {i}", f"Author {i % 1000}") for i in range(args.books)]
+    members = [Member(f"member{i}", f"Member {i}", f"member{i}@example.com") for i in range(args.books // 4 + 1)]
+    rows = []
+
+    service = ImprovedLibraryService(InMemoryBookRepository(), InMemoryMemberRepository(), InMemoryLoanRepository(),
+                                     StandardFineStrategy())
+    service.book_repository.save_many(books)
+    service.member_repository.save_many(members)
+    baseline, latencies = run(service, args)
+    rows.append(('in-process', 2 * args.operations / baseline, 1.0, 1e6 * percentile(sorted(latencies), 0.5)))
+
+    for workers in args.workers:
+        with ShardedLibraryService(workers) as sharded:
+            sharded.add_books(books)
+            sharded.add_members(members)
+            seconds, latencies = run(sharded, args)
+        rows.append((f"{workers} workers", 2 * args.operations / seconds, baseline / seconds,
+                     1e6 * percentile(sorted(latencies), 0.5)))
+
+    print_table(['service', 'ops/sec', 'vs in-process', 'p50 batch us'], rows)
+    print(f"{args.operations:,} borrows + returns in batches of {args.batch} from {args.clients} threads, "
+          f"{args.books:,} books, {os.cpu_count()} CPUs")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+"""
+Replay a trace from trace.py against a service and report throughput and tail latency.
+
+The target is built with the trace's catalog (the suite's targets: the
+python_library LibraryService, or ImprovedLibraryService over a backend with
+its books wrapped in SearchableBookRepository) and the trace's open loans
+are applied before timing. Then the events run:
+
+  (default)     as fast as possible
+  --rate N      N events per second in total, ignoring the trace's timestamps
+  --speed X     the trace's own timing, X times faster (720 replays a 12 hour day in a minute)
+
+When paced, each event also gets a response time measured from when it was
+due rather than when it started, so a backlog behind slow calls shows up in
+the tail instead of being hidden by the replayer waiting for them
+(coordinated omission). "behind" is the largest such backlog.
+
+--processes P replays in P processes, each with its own copy of the target
+and the events of members with member % P equal to its number, so a
+member's loans stay in one process; catalog browsing and searches are dealt
+round-robin. With a SQLite target each process has its own database file:
+this sizes a deployment sharded by member, not contention on one database.
+
+    python -m solutions_python.benchmarks.replay day.jsonl.gz --target ImprovedLibraryService/sqlite --speed 720
+"""
+import argparse
+import gc
+import multiprocessing
+import time
+import traceback
+from queue import Empty
+from typing import Callable, Dict, List, Optional, Tuple
+
+from . import trace
+from .suite import TARGETS, build_target
+from ...python_library.benchmarks.common import percentile, print_table
+
+PAGE_SIZE = 20
+SETUP_TIMEOUT = 600.0   # seconds a partition waits at the start line for the others to finish setting up
+POLL_SECONDS = 1.0      # how often the parent checks on its children while waiting for results
+KIND_NAMES = {trace.BORROW: 'borrow', trace.RETURN: 'return', trace.FINE: 'fine', trace.BROWSE: 'browse',
+              trace.SEARCH: 'search'}
+
+
+def load_partition(path: str, partition: int, partitions: int) -> Tuple[dict, list, list]:
+    """The header, seed loans and timed events of one partition, with ids already formatted"""
+    header, lines = trace.read(path)
+    loan_members: List[int] = []   # loan number -> member, for routing returns and fine lookups
+    seeds, events, catalog_events = [], [], 0
+    for line in lines:
+        if line[0] == trace.SEED:
+            _, member, book = line
+            loan_members.append(member)
+            if member % partitions == partition:
+                seeds.append((f"member{member}", f"book{book}", len(loan_members) - 1))
+            continue
+        at, kind = line[0], line[1]
+        if kind == trace.BORROW:
+            member, book = line[2], line[3]
+            loan_members.append(member)
+            if member % partitions == partition:
+                events.append((at, kind, (f"member{member}", f"book{book}", len(loan_members) - 1)))
+        elif kind in (trace.RETURN, trace.FINE):
+            if loan_members[line[2]] % partitions == partition:
+                events.append((at, kind, line[2]))
+        else:
+            if catalog_events % partitions == partition:
+                argument = line[2] * PAGE_SIZE if kind == trace.BROWSE else f"Author {line[2]}"
+                events.append((at, kind, argument))
+            catalog_events += 1
+    return header, seeds, events
+
+
+def replay_partition(path: str, target: str, partition: int, partitions: int, rate: Optional[float],
+                     speed: Optional[float], ready: Optional[Callable[[], object]] = None) -> dict:
+    """Replay one partition of the trace; returns latencies (seconds) per event kind and counters"""
+    header, seeds, events = load_partition(path, partition, partitions)
+    setup_start = time.perf_counter()
+    operations = build_target(target, header['books'], searchable=True)
+    loan_ids: Dict[int, str] = {}
+    failed = {name: 0 for name in KIND_NAMES.values()}
+    seed_failures = 0
+    for member_id, book_id, loan in seeds:
+        loan_id = operations.borrow(member_id, book_id)
+        if loan_id is None:
+            seed_failures += 1
+        else:
+            loan_ids[loan] = loan_id
+    setup_seconds = time.perf_counter() - setup_start
+
+    if rate:
+        def due_after(index: int, at: int) -> float:
+            return index / (rate / partitions)
+    elif speed:
+        def due_after(index: int, at: int) -> float:
+            return at / 1000 / speed
+    else:
+        due_after = None
+
+    service_times = {name: [] for name in KIND_NAMES.values()}
+    response_times = {name: [] for name in KIND_NAMES.values()}
+    gc.collect()
+    if ready is not None:
+        ready()
+    timer, sleep = time.perf_counter, time.sleep
+    start = timer()
+    try:
+        for index, (at, kind, argument) in enumerate(events):
+            due = None
+            if due_after is not None:
+                due = start + due_after(index, at)
+                ahead = due - timer()
+                if ahead > 0:
+                    sleep(ahead)
+            name = KIND_NAMES[kind]
+            began = timer()
+            if kind == trace.BORROW:
+                member_id, book_id, loan = argument
+                loan_id = operations.borrow(member_id, book_id)
+                if loan_id is None:
+                    failed[name] += 1
+                else:
+                    loan_ids[loan] = loan_id
+            elif kind == trace.RETURN or kind == trace.FINE:
+                # Loans whose borrow failed, here or in the seeding, are skipped
+                loan_id = loan_ids.pop(argument, None) if kind == trace.RETURN else loan_ids.get(argument)
+                if loan_id is None:
+                    failed[name] += 1
+                    continue
+                if kind == trace.RETURN:
+                    operations.give_back(loan_id)
+                else:
+                    operations.fine(loan_id)
+            elif kind == trace.BROWSE:
+                operations.browse(argument, PAGE_SIZE)
+            else:
+                operations.search(argument)
+            ended = timer()
+            service_times[name].append(ended - began)
+            if due is not None:
+                response_times[name].append(ended - due)
+        elapsed = timer() - start
+    finally:
+        operations.close()
+    return {'partition': partition, 'events': len(events), 'elapsed': elapsed, 'setup_seconds': setup_seconds,
+            'seed_loans': len(seeds), 'seed_failures': seed_failures, 'failed': failed,
+            'service': service_times, 'response': response_times}
+
+
+def _run_child(queue, barrier, *arguments) -> None:
+    # A failure is reported too, so the parent is not left waiting for a result that never comes
+    try:
+        queue.put((True, replay_partition(*arguments, ready=barrier.wait)))
+    except BaseException:
+        queue.put((False, traceback.format_exc()))
+        raise
+
+
+def replay(path: str, target: str, processes: int = 1, rate: Optional[float] = None,
+           speed: Optional[float] = None) -> List[dict]:
+    """Replay the trace in processes processes (in this one if 1); returns each partition's results"""
+    if processes == 1:
+        return [replay_partition(path, target, 0, 1, rate, speed)]
+    queue, barrier = multiprocessing.Queue(), multiprocessing.Barrier(processes, timeout=SETUP_TIMEOUT)
+    children = [multiprocessing.Process(target=_run_child,
+                                        args=(queue, barrier, path, target, partition, processes, rate, speed))
+                for partition in range(processes)]
+    for process in children:
+        process.start()
+    # Read before joining: a child with a large result blocks until its queue is drained
+    results = []
+    try:
+        while len(results) < len(children):
+            try:
+                ok, result = queue.get(timeout=POLL_SECONDS)
+            except Empty:
+                # A child killed before it could report anything only shows in its exit code
+                dead = [process for process in children if process.exitcode]
+                if dead:
+                    raise RuntimeError(f"replay process exited with status {dead[0].exitcode}")
+                continue
+            if not ok:
+                raise RuntimeError(f"replay process failed:\n{result}")
+            results.append(result)
+    except BaseException:
+        # Siblings may be waiting at the barrier for the failed child: break it and stop them
+        barrier.abort()
+        for process in children:
+            process.terminate()
+        for process in children:
+            process.join()
+        raise
+    for process in children:
+        process.join()
+        if process.exitcode:
+            raise RuntimeError(f"replay process exited with status {process.exitcode}")
+    return sorted(results, key=lambda result: result['partition'])
+
+
+def report(results: List[dict], paced: bool) -> None:
+    # All partitions start together, so the slowest one is the wall time
+    wall = max(result['elapsed'] for result in results)
+    rows = []
+    for name in list(KIND_NAMES.values()) + ['overall']:
+        if name == 'overall':
+            service = sorted(value for result in results for values in result['service'].values()
+                             for value in values)
+            response = sorted(value for result in results for values in result['response'].values()
+                              for value in values)
+            failed = sum(sum(result['failed'].values()) for result in results)
+        else:
+            service = sorted(value for result in results for value in result['service'][name])
+            response = sorted(value for result in results for value in result['response'][name])
+            failed = sum(result['failed'][name] for result in results)
+        row = [name, len(service), failed, len(service) / wall if wall else 0.0]
+        row += [percentile(service, fraction) * 1e6 for fraction in (0.50, 0.99, 0.999)]
+        if paced:
+            row += [percentile(response, 0.99) * 1e6, percentile(response, 0.999) * 1e6,
+                    (response[-1] if response else 0.0) * 1e3]
+        rows.append(row)
+    headers = ['event', 'count', 'failed', 'per sec', 'p50 us', 'p99 us', 'p99.9 us']
+    if paced:
+        headers += ['resp p99 us', 'resp p99.9 us', 'behind ms']
+    print_table(headers, rows)
+    seeds = sum(result['seed_loans'] for result in results)
+    seed_failures = sum(result['seed_failures'] for result in results)
+    print(f"{len(results)} process(es), {wall:.2f}s, setup {max(r['setup_seconds'] for r in results):.2f}s, "
+          f"{seeds - seed_failures:,} of {seeds:,} open loans seeded")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('path', help="a trace written by trace.py")
+    parser.add_argument('--target', choices=TARGETS, default=TARGETS[0])
+    pacing = parser.add_mutually_exclusive_group()
+    pacing.add_argument('--rate', type=float, help="events per second, in total")
+    pacing.add_argument('--speed', type=float, help="replay the trace's timing this many times faster")
+    parser.add_argument('--processes', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    results = replay(args.path, args.target, args.processes, args.rate, args.speed)
+    report(results, paced=bool(args.rate or args.speed))
+
+
+if __name__ == '__main__':
+    main()
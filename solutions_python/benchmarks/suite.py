@@ -0,0 +1,274 @@
+"""
+Regression benchmark suite: one borrow/return workload against every service and backend.
+
+For each catalog size and target, a fresh interpreter builds the catalog
+(N books, N / 5 members, a share of the books already lent out) and replays
+the same seeded mix of operations --repeat times, keeping the fastest:
+
+  borrow        a random member borrows a random book (unavailable books and
+                members at their limit fail, as they would at a real desk)
+  return        a random open loan is returned
+  member loans  get_member_loans for a random member
+  fine          calculate_fine for a random open loan
+
+Targets are python_library's LibraryService and ImprovedLibraryService over
+each repository backend. The suite reports ops/sec, p50/p99 latency per
+operation and overall, setup time and peak RSS (per child process). --save
+stores the results as a JSON baseline; --compare reports the change against
+one and exits with status 1 if any throughput or peak RSS regressed by more
+than --tolerance.
+
+    python -m solutions_python.benchmarks.suite --sizes 1000 100000 10000000 --save baseline.json
+    python -m solutions_python.benchmarks.suite --sizes 1000 100000 10000000 --compare baseline.json
+"""
+import argparse
+import datetime
+import gc
+import json
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+from itertools import islice
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from .backends import BACKENDS, member_count_for
+from ..improved_library_service import ImprovedLibraryService
+from ..searchable_book_repository import SearchableBookRepository
+from ..standard_fine_strategy import StandardFineStrategy
+from ...python_library.benchmarks.bench_library_service import build_service
+from ...python_library.benchmarks.common import print_table, summarize
+
+LIBRARY_SERVICE = 'LibraryService'
+TARGETS = [LIBRARY_SERVICE] + [f"ImprovedLibraryService/{name}" for name in sorted(BACKENDS)]
+
+BORROW, RETURN, MEMBER_LOANS, FINE = 'borrow', 'return', 'member loans', 'fine'
+DEFAULT_MIX = {BORROW: 0.40, RETURN: 0.35, MEMBER_LOANS: 0.15, FINE: 0.10}
+
+
+class Operations(NamedTuple):
+    """The workload's operations on one target; borrow returns the loan id or None"""
+    borrow: Callable[[str, str], Optional[str]]
+    give_back: Callable[[str], object]
+    member_loans: Callable[[str], object]
+    fine: Callable[[str], object]
+    browse: Callable[[int, int], list]   # (offset, limit) -> a page of available books
+    search: Callable[[str], object]
+    close: Callable[[], None]
+
+
+def _browser(service) -> Callable[[int, int], list]:
+    def browse(offset: int, limit: int) -> list:
+        return list(islice(service.iter_available_books(offset, limit), limit))
+    return browse
+
+
+def library_service_operations(book_count: int) -> Operations:
+    service, _ = build_service(book_count, open_loan_ratio=0.0)
+
+    def borrow(member_id: str, book_id: str) -> Optional[str]:
+        result = service.borrow_book(member_id, book_id)
+        return result.rsplit(' ', 1)[-1] if result.startswith("Book borrowed successfully") else None
+
+    return Operations(borrow, service.return_book, service.get_member_loans, service.calculate_fine,
+                      _browser(service), service.search_books, lambda: None)
+
+
+def improved_service_operations(backend_name: str, book_count: int, searchable: bool = False) -> Operations:
+    backend = BACKENDS[backend_name](book_count)
+    # Without the index, search_books scans the catalog; the suite's workload never searches
+    book_repository = SearchableBookRepository(backend.book_repository) if searchable else backend.book_repository
+    service = ImprovedLibraryService(book_repository, backend.member_repository,
+                                     backend.loan_repository, StandardFineStrategy())
+
+    def borrow(member_id: str, book_id: str) -> Optional[str]:
+        result = service.borrow_book(member_id, book_id)
+        return result.get_loan().get_id() if result.is_success() else None
+
+    return Operations(borrow, service.return_book, service.get_member_loans, service.calculate_fine,
+                      _browser(service), service.search_books, backend.close)
+
+
+def build_target(target: str, book_count: int, searchable: bool = False) -> Operations:
+    if target == LIBRARY_SERVICE:
+        return library_service_operations(book_count)
+    return improved_service_operations(target.split('/', 1)[1], book_count, searchable)
+
+
+def seed_loans(operations: Operations, book_count: int, open_loans: int) -> List[str]:
+    """Lend out open_loans books spread over the catalog and return the loan ids"""
+    member_count = member_count_for(book_count)
+    stride = book_count // max(1, open_loans)
+    loan_ids = []
+    for i in range(open_loans):
+        loan_id = operations.borrow(f"member{i % member_count}", f"book{i * stride}")
+        if loan_id is not None:
+            loan_ids.append(loan_id)
+    return loan_ids
+
+
+def run_workload(operations: Operations, book_count: int, count: int, loan_ids: List[str],
+                 mix: Dict[str, float], seed: int) -> Dict[str, List[float]]:
+    """Replay count operations drawn from mix; returns latencies (seconds) per operation"""
+    rng = random.Random(seed)
+    member_count = member_count_for(book_count)
+    kinds = rng.choices(list(mix), weights=list(mix.values()), k=count)
+    latencies: Dict[str, List[float]] = {kind: [] for kind in mix}
+    timer = time.perf_counter
+    for kind in kinds:
+        member_id = f"member{rng.randrange(member_count)}"
+        if kind == BORROW:
+            book_id = f"book{rng.randrange(book_count)}"
+            start = timer()
+            loan_id = operations.borrow(member_id, book_id)
+            latencies[kind].append(timer() - start)
+            if loan_id is not None:
+                loan_ids.append(loan_id)
+        elif kind == MEMBER_LOANS:
+            start = timer()
+            operations.member_loans(member_id)
+            latencies[kind].append(timer() - start)
+        elif loan_ids:
+            index = rng.randrange(len(loan_ids))
+            loan_id = loan_ids[index]
+            if kind == RETURN:
+                # Swap-remove so picking a random open loan stays O(1)
+                loan_ids[index] = loan_ids[-1]
+                loan_ids.pop()
+                start = timer()
+                operations.give_back(loan_id)
+            else:
+                start = timer()
+                operations.fine(loan_id)
+            latencies[kind].append(timer() - start)
+    return latencies
+
+
+def child(target: str, book_count: int, args) -> None:
+    """Run one case in this (fresh) process and print the results as JSON"""
+    start = time.perf_counter()
+    operations = build_target(target, book_count)
+    setup_seconds = time.perf_counter() - start
+    try:
+        loan_ids = seed_loans(operations, book_count, min(int(book_count * args.open_loan_ratio),
+                                                          args.max_open_loans))
+        best = None
+        for repeat in range(args.repeat):
+            # Keep the fastest repeat: slower ones measure the machine's noise, not the code
+            gc.collect()
+            latencies = run_workload(operations, book_count, args.operations, loan_ids, DEFAULT_MIX,
+                                     args.seed + repeat)
+            total = sum(sum(values) for values in latencies.values())
+            if best is None or total < best[0]:
+                best = (total, latencies)
+        latencies = best[1]
+    finally:
+        operations.close()
+    result = {
+        'target': target,
+        'books': book_count,
+        'setup_seconds': setup_seconds,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'operations': {kind: summarize(values) for kind, values in latencies.items() if values},
+        'overall': summarize(value for values in latencies.values() for value in values),
+    }
+    print(json.dumps(result))
+
+
+def run_case(target: str, book_count: int, args) -> dict:
+    command = [sys.executable, '-m', __spec__.name, '--child', target, str(book_count),
+               '--operations', str(args.operations), '--open-loan-ratio', str(args.open_loan_ratio),
+               '--max-open-loans', str(args.max_open_loans), '--seed', str(args.seed),
+               '--repeat', str(args.repeat)]
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def metadata(args) -> dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'operations': args.operations,
+        'seed': args.seed,
+        'repeat': args.repeat,
+    }
+
+
+def compare(results: List[dict], baseline: dict, tolerance: float) -> bool:
+    """Print the change against baseline and return True if nothing regressed beyond tolerance"""
+    previous = {(case['target'], case['books']): case for case in baseline['results']}
+    rows, regressed = [], False
+    for case in results:
+        old = previous.get((case['target'], case['books']))
+        if old is None:
+            continue
+        measures = [('peak RSS MiB', old['peak_rss_mb'], case['peak_rss_mb'], False)]
+        for kind, stats in [('overall', case['overall'])] + sorted(case['operations'].items()):
+            old_stats = old['overall'] if kind == 'overall' else old['operations'].get(kind)
+            if old_stats is not None:
+                measures.append((f"{kind} ops/s", old_stats['ops_per_sec'], stats['ops_per_sec'], True))
+                measures.append((f"{kind} p99 us", old_stats['p99_us'], stats['p99_us'], None))
+        for name, before, after, higher_is_better in measures:
+            change = after / before - 1 if before else 0.0
+            # p99 is reported but too noisy to gate on
+            worse = higher_is_better is not None and (-change if higher_is_better else change) > tolerance
+            regressed = regressed or worse
+            rows.append((case['target'], case['books'], name, before, after, f"{change:+.1%}",
+                         'REGRESSION' if worse else ''))
+    print_table(['target', 'books', 'measure', 'baseline', 'current', 'change', ''], rows)
+    return not regressed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 100_000])
+    parser.add_argument('--targets', nargs='+', choices=TARGETS, default=TARGETS)
+    parser.add_argument('--operations', type=int, default=20_000)
+    parser.add_argument('--open-loan-ratio', type=float, default=0.1, help="share of books lent out before timing")
+    parser.add_argument('--max-open-loans', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=3, help="workload repeats per case; the fastest is kept")
+    parser.add_argument('--save', metavar='FILE', help="write the results to FILE as a baseline")
+    parser.add_argument('--compare', metavar='FILE', help="compare the results with the baseline in FILE")
+    parser.add_argument('--tolerance', type=float, default=0.10, help="allowed regression, as a fraction")
+    parser.add_argument('--child', nargs=2, metavar=('TARGET', 'BOOKS'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        child(args.child[0], int(args.child[1]), args)
+        return 0
+
+    results, rows = [], []
+    for size in args.sizes:
+        for target in args.targets:
+            case = run_case(target, size, args)
+            results.append(case)
+            for kind, stats in [('overall', case['overall'])] + list(case['operations'].items()):
+                rows.append((target, size, kind, stats['ops_per_sec'], stats['p50_us'], stats['p99_us'],
+                             case['setup_seconds'], case['peak_rss_mb']))
+    print_table(['target', 'books', 'operation', 'ops/s', 'p50 us', 'p99 us', 'setup s', 'peak RSS MiB'], rows)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as file:
+            json.dump({'meta': metadata(args), 'results': results}, file, indent=2)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            baseline = json.load(file)
+        print(f"\ncompared with {args.compare} ({baseline['meta'].get('created')}, "
+              f"commit {baseline['meta'].get('commit')})")
+        if not compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""
+Seeded traces of a library's day, for replay.py.
+
+A trace is JSON Lines, gzip-compressed when the path ends in .gz. The first
+line is a header object; every other line is a compact array:
+
+  ["s", member, book]               a loan open when the day starts (applied untimed)
+  [ms, "b", member, book]           borrow
+  [ms, "r", loan]                   return; loan numbers count "s" and "b" lines in order
+  [ms, "f", loan]                   fine lookup for an open loan
+  [ms, "v", page]                   browse a page of available books
+  [ms, "q", author]                 search for an author
+
+ms is the time since opening. The day is shaped like a real one: borrows
+peak in a morning rush, book popularity is Zipfian and member activity
+skewed, browsing and searching outnumber borrows three and two to one, loans come back around their due date (so today's returns are
+mostly loans opened about two weeks ago) and the return bin is emptied in
+batches every --bin-minutes. Members and books are numbered like the
+synthetic catalogs in backends.py (member{i}, book{i}).
+
+    python -m solutions_python.benchmarks.trace day.jsonl.gz --books 1000000 --seed 7
+"""
+import argparse
+import bisect
+import gzip
+import json
+import random
+from array import array
+from itertools import accumulate
+from typing import IO, Iterator, List, Sequence, Tuple
+
+from .backends import member_count_for
+
+FORMAT = 'library-trace'
+VERSION = 1
+
+SEED, BORROW, RETURN, FINE, BROWSE, SEARCH = 's', 'b', 'r', 'f', 'v', 'q'
+AUTHORS = 5000   # backends.book_rows spreads books over this many authors
+
+# Relative activity per opening hour, from opening time on
+BORROW_PROFILE = (3.0, 4.0, 3.0, 2.0, 1.5, 1.5, 1.5, 1.5, 2.0, 2.0, 1.5, 1.0)
+BROWSE_PROFILE = (1.0, 1.5, 1.5, 1.5, 2.0, 2.0, 1.5, 1.5, 1.5, 1.5, 1.0, 0.5)
+FINE_PROFILE = (1.0,) * 12
+
+LOAN_DAYS = 14
+
+
+class ZipfSampler:
+    """Draws from range(population) with weight 1 / (rank + 1) ** skew; ranks are shuffled over the ids"""
+
+    def __init__(self, population: int, skew: float, rng: random.Random):
+        self._rng = rng
+        self._cum_weights = array('d', accumulate(1.0 / (rank + 1) ** skew for rank in range(population)))
+        self._ids = array('q', range(population))
+        rng.shuffle(self._ids)
+
+    def __call__(self) -> int:
+        total = self._cum_weights[-1]
+        return self._ids[bisect.bisect(self._cum_weights, self._rng.random() * total)]
+
+
+def generate(books: int, seed: int = 0, borrows: int = 0, hours: int = 12, book_skew: float = 0.8,
+             member_skew: float = 0.8, bin_minutes: int = 120) -> Iterator[list]:
+    """Yield the header, then the lines of one day's trace"""
+    rng = random.Random(seed)
+    members = member_count_for(books)
+    borrows = borrows or max(1, books // 100)
+    pick_book, pick_member = ZipfSampler(books, book_skew, rng), ZipfSampler(members, member_skew, rng)
+    day_ms = hours * 3_600_000
+
+    # Loans open at opening time: in steady state about LOAN_DAYS days of borrows, spread
+    # evenly over members (ImprovedLibraryService caps loans per member). Each is kept for
+    # a random time around the loan period and is somewhere into it, so the ones with
+    # less than a day left come back today.
+    seeded = min(borrows * LOAN_DAYS, books // 2)
+    lent, seed_lines, returns = set(), [], []
+    while len(seed_lines) < seeded:
+        book = rng.randrange(books)
+        if book in lent:
+            continue
+        lent.add(book)
+        kept_days = max(0.5, rng.gauss(LOAN_DAYS - 1, 4.0))
+        remaining_days = rng.uniform(0.0, kept_days)
+        if remaining_days < 1.0:
+            # Dropped in the bin at some point today, processed when the bin is next emptied
+            dropped = int(remaining_days * day_ms)
+            returns.append((min(day_ms - 1, (dropped // (bin_minutes * 60_000) + 1) * bin_minutes * 60_000),
+                            len(seed_lines)))
+        seed_lines.append([SEED, rng.randrange(members), book])
+
+    timeline: List[Tuple[int, str]] = []
+    timeline += [(at, BORROW) for at in _times(rng, borrows, BORROW_PROFILE, hours)]
+    timeline += [(at, BROWSE) for at in _times(rng, borrows * 3, BROWSE_PROFILE, hours)]
+    timeline += [(at, SEARCH) for at in _times(rng, borrows * 2, BROWSE_PROFILE, hours)]
+    timeline += [(at, FINE) for at in _times(rng, borrows // 2, FINE_PROFILE, hours)]
+    timeline += [(at, RETURN) for at, _ in returns]
+    timeline.sort(key=lambda event: event[0])
+
+    yield {'format': FORMAT, 'version': VERSION, 'seed': seed, 'books': books, 'members': members,
+           'hours': hours, 'seed_loans': len(seed_lines), 'events': len(timeline)}
+    yield from seed_lines
+
+    open_loans = list(range(len(seed_lines)))
+    position = {loan: index for index, loan in enumerate(open_loans)}
+    returning = iter(sorted(returns))
+    loan_count = len(seed_lines)
+    for at, kind in timeline:
+        if kind == BORROW:
+            yield [at, BORROW, pick_member(), pick_book()]
+            position[loan_count] = len(open_loans)
+            open_loans.append(loan_count)
+            loan_count += 1
+        elif kind == RETURN:
+            loan = next(returning)[1]
+            _remove(open_loans, position, loan)
+            yield [at, RETURN, loan]
+        elif kind == FINE and open_loans:
+            yield [at, FINE, open_loans[rng.randrange(len(open_loans))]]
+        elif kind == BROWSE:
+            # Most readers stay on the first pages
+            yield [at, BROWSE, min(int(rng.expovariate(0.5)), 50)]
+        elif kind == SEARCH:
+            yield [at, SEARCH, rng.randrange(AUTHORS)]
+
+
+def _times(rng: random.Random, count: int, profile: Sequence[float], hours: int) -> List[int]:
+    weights = [profile[hour % len(profile)] for hour in range(hours)]
+    hour_of = rng.choices(range(hours), weights=weights, k=count)
+    return [int((hour + rng.random()) * 3_600_000) for hour in hour_of]
+
+
+def _remove(open_loans: List[int], position: dict, loan: int) -> None:
+    # Swap-remove, so picking a random open loan for a fine lookup stays O(1)
+    index = position.pop(loan)
+    last = open_loans.pop()
+    if last != loan:
+        open_loans[index] = last
+        position[last] = index
+
+
+def open_trace(path: str, mode: str) -> IO[str]:
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def write(path: str, lines: Iterator[object]) -> int:
+    """Write a generated trace to path and return the number of lines"""
+    count = 0
+    with open_trace(path, 'w') as file:
+        for line in lines:
+            file.write(json.dumps(line, separators=(',', ':')))
+            file.write('\n')
+            count += 1
+    return count
+
+
+def read(path: str) -> Tuple[dict, Iterator[list]]:
+    """The header and an iterator over the lines of a trace"""
+    file = open_trace(path, 'r')
+    header = json.loads(file.readline())
+    if header.get('format') != FORMAT or header.get('version') != VERSION:
+        file.close()
+        raise ValueError(f"Not a version {VERSION} library trace: {path}")
+
+    def lines() -> Iterator[list]:
+        with file:
+            for text in file:
+                yield json.loads(text)
+
+    return header, lines()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('path', help="output file; .gz compresses it")
+    parser.add_argument('--books', type=int, default=100_000)
+    parser.add_argument('--borrows', type=int, default=0, help="borrows in the day (default books / 100)")
+    parser.add_argument('--hours', type=int, default=12, help="opening hours")
+    parser.add_argument('--book-skew', type=float, default=0.8, help="Zipf exponent of book popularity")
+    parser.add_argument('--member-skew', type=float, default=0.8, help="Zipf exponent of member activity")
+    parser.add_argument('--bin-minutes', type=int, default=120, help="how often the return bin is emptied")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    lines = generate(args.books, args.seed, args.borrows, args.hours, args.book_skew, args.member_skew,
+                     args.bin_minutes)
+    count = write(args.path, lines)
+    print(f"wrote {count:,} lines to {args.path}")
+
+
+if __name__ == '__main__':
+    main()
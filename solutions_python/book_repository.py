@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
 
 from ..python_library.book import Book
+from ..python_library.holdings_index import HoldingsIndex, TitleAvailability
+from ..python_library.search_index import BookSearchIndex
 
 
 class BookRepository(ABC):
@@ -40,3 +43,93 @@ class BookRepository(ABC):
     def find_all(self) -> List[Book]:
         """Get all books from the repository"""
         pass
+    
+    # SOLUTION: Bulk operations. The defaults fall back to one call per book;
+    # backends with real round trips should override them.
+    
+    def find_by_ids(self, book_ids: Iterable[str]) -> Dict[str, Book]:
+        """Find several books by ID, returning only the ones that exist"""
+        found = {}
+        for book_id in book_ids:
+            book = self.find_by_id(book_id)
+            if book is not None:
+                found[book_id] = book
+        return found
+    
+    def save_many(self, books: Iterable[Book]) -> None:
+        """Save several books to the repository"""
+        for book in books:
+            self.save(book)
+    
+    def update_many(self, books: Iterable[Book]) -> None:
+        """Update several existing books in the repository"""
+        for book in books:
+            self.update(book)
+    
+    def delete_many(self, book_ids: Iterable[str]) -> None:
+        """Delete several books from the repository"""
+        for book_id in book_ids:
+            self.delete(book_id)
+    
+    def iter_all(self) -> Iterator[Book]:
+        """
+        Stream every book in the repository
+        
+        The default iterates find_all(); backends that load rows on demand
+        should override it to fetch page by page.
+        """
+        return iter(self.find_all())
+    
+    def iter_available(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[Book]:
+        """
+        Stream available books, skipping the first offset of them
+        
+        The default filters find_all(); backends should serve it from an
+        availability index without materializing the whole catalog.
+        """
+        stop = offset + limit if limit is not None else None
+        return islice((book for book in self.find_all() if book.is_available()), offset, stop)
+    
+    def find_free_copies(self, title_id: str, limit: int = 1) -> List[Book]:
+        """
+        Up to limit available copies of a title
+        
+        A single-copy title is the book with the title's id. The default
+        scans iter_available(); backends should keep free copies per title.
+        """
+        copies = (book for book in self.iter_available() if book.get_title_id() == title_id)
+        return list(islice(copies, max(limit, 0)))
+    
+    def count_copies(self, title_id: str) -> int:
+        """
+        Number of copies of a title, lent or not; 0 if there is no such title
+        
+        The default scans find_all(); backends should count from their title index.
+        """
+        return sum(1 for book in self.find_all() if book.get_title_id() == title_id)
+    
+    def available_titles(self) -> List[TitleAvailability]:
+        """
+        Every title with a free copy, with its free and total copy counts
+        
+        The default groups find_all() on every call; backends should count
+        copies per title as they are written.
+        """
+        books = {book.get_id(): book for book in self.find_all()}
+        holdings = HoldingsIndex()
+        for book in books.values():
+            holdings.add(book, books.get)
+        return list(holdings.available_titles(book for book in books.values() if book.is_available()))
+    
+    def search(self, query: str, limit: int = 10, available_only: bool = False) -> List[Book]:
+        """
+        Find books whose title or author matches query, best match first
+        
+        The last query word also matches as a prefix. The default indexes
+        find_all() on every call; wrap the repository in a
+        SearchableBookRepository to keep an index in sync instead.
+        """
+        books = {book.get_id(): book for book in self.find_all()}
+        predicate = (lambda book_id: books[book_id].is_available()) if available_only else None
+        book_ids = BookSearchIndex(books.values()).search(query, limit, predicate=predicate)
+        return [books[book_id] for book_id in book_ids]
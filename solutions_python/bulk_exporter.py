@@ -0,0 +1,86 @@
+import csv
+import json
+from typing import Callable, Iterable, Mapping, Optional, Sequence
+
+from .book_repository import BookRepository
+from .bulk_formats import BOOK_FIELDS, CSV, LOAN_FIELDS, MEMBER_FIELDS, Target, open_text, resolve_format
+from .loan_repository import LoanRepository
+from .member_repository import MemberRepository
+from ..python_library.book import Book
+from ..python_library.loan import Loan
+from ..python_library.member import Member
+
+
+class BulkExporter:
+    """
+    SOLUTION: Streaming CSV / JSON-Lines export from the repositories
+    
+    Rows are read with iter_all() and written as they arrive, so exporting
+    never holds more than one repository page in memory. The files use the
+    columns BulkImporter reads by default, so an export imports back as is;
+    columns renames them the same way it does for imports.
+    """
+    
+    def __init__(self, book_repository: Optional[BookRepository] = None,
+                 member_repository: Optional[MemberRepository] = None,
+                 loan_repository: Optional[LoanRepository] = None):
+        self.book_repository = book_repository
+        self.member_repository = member_repository
+        self.loan_repository = loan_repository
+    
+    def export_books(self, destination: Target, format: Optional[str] = None,
+                     columns: Optional[Mapping[str, str]] = None) -> int:
+        """Write every book to a CSV or JSON-Lines file and return how many were written"""
+        return self._export(self._require(self.book_repository, "book").iter_all(), destination, format,
+                            columns, BOOK_FIELDS, self._book_values)
+    
+    def export_members(self, destination: Target, format: Optional[str] = None,
+                       columns: Optional[Mapping[str, str]] = None) -> int:
+        """Write every member to a CSV or JSON-Lines file and return how many were written"""
+        return self._export(self._require(self.member_repository, "member").iter_all(), destination, format,
+                            columns, MEMBER_FIELDS, self._member_values)
+    
+    def export_loans(self, destination: Target, format: Optional[str] = None,
+                     columns: Optional[Mapping[str, str]] = None) -> int:
+        """Write every loan to a CSV or JSON-Lines file and return how many were written"""
+        return self._export(self._require(self.loan_repository, "loan").iter_all(), destination, format,
+                            columns, LOAN_FIELDS, self._loan_values)
+    
+    def _export(self, entities: Iterable, destination: Target, format: Optional[str],
+                columns: Optional[Mapping[str, str]], fields: Sequence[str],
+                values: Callable[[object], tuple]) -> int:
+        format = resolve_format(destination, format)
+        names = [(columns or {}).get(field, field) for field in fields]
+        count = 0
+        with open_text(destination, 'w') as stream:
+            if format == CSV:
+                writer = csv.writer(stream)
+                writer.writerow(names)
+                for entity in entities:
+                    writer.writerow(values(entity))
+                    count += 1
+            else:
+                write = stream.write
+                for entity in entities:
+                    write(json.dumps(dict(zip(names, values(entity))), ensure_ascii=False))
+                    write('\n')
+                    count += 1
+        return count
+    
+    @staticmethod
+    def _book_values(book: Book) -> tuple:
+        return book.get_id(), book.get_title(), book.get_author(), book.is_available(), book.get_title_id()
+    
+    @staticmethod
+    def _member_values(member: Member) -> tuple:
+        return member.get_id(), member.get_name(), member.get_email(), member.get_category()
+    
+    @staticmethod
+    def _loan_values(loan: Loan) -> tuple:
+        return loan.get_id(), loan.get_member_id(), loan.get_book_id(), loan.get_borrow_date().isoformat()
+    
+    @staticmethod
+    def _require(repository, kind: str):
+        if repository is None:
+            raise ValueError(f"No {kind} repository to export from")
+        return repository
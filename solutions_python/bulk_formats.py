@@ -0,0 +1,40 @@
+import os
+from contextlib import contextmanager
+from typing import IO, Iterator, Optional, Union
+
+# Field names of each entity, in export column order
+BOOK_FIELDS = ('id', 'title', 'author', 'available', 'title_id')
+MEMBER_FIELDS = ('id', 'name', 'email', 'category')
+LOAN_FIELDS = ('id', 'member_id', 'book_id', 'borrow_date')
+
+CSV = 'csv'
+JSONL = 'jsonl'
+FORMATS = (CSV, JSONL)
+
+_EXTENSIONS = {'.csv': CSV, '.jsonl': JSONL, '.ndjson': JSONL}
+
+Target = Union[str, os.PathLike, IO[str]]
+
+
+def resolve_format(target: Target, format: Optional[str] = None) -> str:
+    """The explicit format if given, otherwise the one implied by the file extension"""
+    if format is not None:
+        if format not in FORMATS:
+            raise ValueError(f"Unknown format {format!r}, expected one of {', '.join(FORMATS)}")
+        return format
+    name = target if isinstance(target, (str, os.PathLike)) else getattr(target, 'name', '')
+    extension = os.path.splitext(name)[1].lower() if isinstance(name, (str, os.PathLike)) else ''
+    if extension not in _EXTENSIONS:
+        raise ValueError(f"Cannot tell the format of {name or target!r}; pass format='csv' or 'jsonl'")
+    return _EXTENSIONS[extension]
+
+
+@contextmanager
+def open_text(target: Target, mode: str) -> Iterator[IO[str]]:
+    """Open a path as UTF-8 text, or pass an already open file through without closing it"""
+    if hasattr(target, 'read') or hasattr(target, 'write'):
+        yield target
+        return
+    # newline='' lets the csv module handle line endings inside quoted fields
+    with open(target, mode, encoding='utf-8', newline='') as file:
+        yield file
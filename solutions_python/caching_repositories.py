@@ -0,0 +1,173 @@
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from .book_repository import BookRepository
+from .loan_repository import LoanRepository
+from .lru_cache import CacheStats, LRUCache
+from .member_repository import MemberRepository
+from ..python_library.book import Book
+from ..python_library.holdings_index import TitleAvailability
+from ..python_library.loan import Loan
+
+
+class _CachingRepository:
+    """
+    SOLUTION: Read-through, write-through cache of entities by ID
+    
+    1. find_by_id and find_by_ids answer from an LRUCache and load only the
+       misses from the wrapped repository; IDs that do not exist are cached
+       as None too
+    2. save/update (and their _many forms) write to the repository first
+       and then cache the written entity; if the write fails the entry is
+       dropped instead, since the caller may have changed the cached object
+    3. delete drops the entry whatever the outcome
+    4. With a ttl, entries expire so writes made behind the decorator's back
+       (another process, another decorator) are seen after at most ttl
+       seconds; without one they are only seen after eviction or
+       invalidate()
+    
+    Cached entities are shared between callers, exactly like the entities of
+    the in-memory repositories. Queries other than by ID go straight to the
+    wrapped repository.
+    """
+    
+    DEFAULT_CAPACITY = 10_000
+    
+    def __init__(self, repository, capacity: int = DEFAULT_CAPACITY, ttl: Optional[float] = None):
+        self._repository = repository
+        self._cache = LRUCache(capacity, ttl)
+    
+    @property
+    def repository(self):
+        """The wrapped repository"""
+        return self._repository
+    
+    def cache_stats(self) -> CacheStats:
+        """Hit, miss, eviction and expiration counts of the cache"""
+        return self._cache.stats()
+    
+    def invalidate(self, entity_id: str) -> None:
+        """Drop one cached entity, e.g. after it was changed behind the decorator"""
+        self._cache.invalidate(entity_id)
+    
+    def clear_cache(self) -> None:
+        """Drop every cached entity"""
+        self._cache.clear()
+    
+    def save(self, entity) -> None:
+        self._write([entity], lambda entities: self._repository.save(entities[0]))
+    
+    def find_by_id(self, entity_id: str):
+        return self._cache.get_or_load(entity_id, self._repository.find_by_id)
+    
+    def update(self, entity) -> None:
+        self._write([entity], lambda entities: self._repository.update(entities[0]))
+    
+    def delete(self, entity_id: str) -> None:
+        try:
+            self._repository.delete(entity_id)
+        finally:
+            self._cache.invalidate(entity_id)
+    
+    def find_all(self) -> List:
+        return self._repository.find_all()
+    
+    def iter_all(self) -> Iterator:
+        return self._repository.iter_all()
+    
+    def find_by_ids(self, entity_ids: Iterable[str]) -> Dict:
+        cached, missing = self._cache.get_many(dict.fromkeys(entity_ids))
+        found = {entity_id: entity for entity_id, entity in cached.items() if entity is not None}
+        if missing:
+            generation = self._cache.generation()
+            loaded = self._repository.find_by_ids(missing)
+            for entity_id in missing:
+                self._cache.put(entity_id, loaded.get(entity_id), generation)
+            found.update(loaded)
+        return found
+    
+    def save_many(self, entities: Iterable) -> None:
+        self._write(list(entities), self._repository.save_many)
+    
+    def update_many(self, entities: Iterable) -> None:
+        self._write(list(entities), self._repository.update_many)
+    
+    def delete_many(self, entity_ids: Iterable[str]) -> None:
+        entity_ids = list(entity_ids)
+        try:
+            self._repository.delete_many(entity_ids)
+        finally:
+            for entity_id in entity_ids:
+                self._cache.invalidate(entity_id)
+    
+    def _write(self, entities: List, write: Callable[[List], None]) -> None:
+        try:
+            write(entities)
+        except BaseException:
+            for entity in entities:
+                self._cache.invalidate(entity.get_id())
+            raise
+        for entity in entities:
+            self._cache.put(entity.get_id(), entity)
+
+
+class CachingBookRepository(_CachingRepository, BookRepository):
+    """
+    SOLUTION: BookRepository decorator with a bounded LRU/TTL cache of books by ID
+    """
+    
+    def __init__(self, repository: BookRepository, capacity: int = _CachingRepository.DEFAULT_CAPACITY,
+                 ttl: Optional[float] = None):
+        super().__init__(repository, capacity, ttl)
+    
+    def iter_available(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[Book]:
+        return self._repository.iter_available(offset, limit)
+    
+    def find_free_copies(self, title_id: str, limit: int = 1) -> List[Book]:
+        return self._repository.find_free_copies(title_id, limit)
+    
+    def count_copies(self, title_id: str) -> int:
+        return self._repository.count_copies(title_id)
+    
+    def available_titles(self) -> List[TitleAvailability]:
+        return self._repository.available_titles()
+    
+    def search(self, query: str, limit: int = 10, available_only: bool = False) -> List[Book]:
+        return self._repository.search(query, limit, available_only)
+
+
+class CachingMemberRepository(_CachingRepository, MemberRepository):
+    """
+    SOLUTION: MemberRepository decorator with a bounded LRU/TTL cache of members by ID
+    """
+    
+    def __init__(self, repository: MemberRepository, capacity: int = _CachingRepository.DEFAULT_CAPACITY,
+                 ttl: Optional[float] = None):
+        super().__init__(repository, capacity, ttl)
+
+
+class CachingLoanRepository(_CachingRepository, LoanRepository):
+    """
+    SOLUTION: LoanRepository decorator with a bounded LRU/TTL cache of loans by ID
+    
+    Loans by member are not cached: every borrow and return changes the
+    member's list, so those entries would be invalidated about as often as
+    they were read.
+    """
+    
+    def __init__(self, repository: LoanRepository, capacity: int = _CachingRepository.DEFAULT_CAPACITY,
+                 ttl: Optional[float] = None):
+        super().__init__(repository, capacity, ttl)
+    
+    def find_by_member_id(self, member_id: str) -> List[Loan]:
+        return self._repository.find_by_member_id(member_id)
+    
+    def find_by_member_ids(self, member_ids: Iterable[str]) -> Dict[str, List[Loan]]:
+        return self._repository.find_by_member_ids(member_ids)
+    
+    def find_by_book_id(self, book_id: str) -> Optional[Loan]:
+        return self._repository.find_by_book_id(book_id)
+    
+    def find_by_borrow_date_range(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                                  limit: Optional[int] = None) -> List[Loan]:
+        return self._repository.find_by_borrow_date_range(start, end, limit)
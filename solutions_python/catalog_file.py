@@ -0,0 +1,201 @@
+import mmap
+import os
+import struct
+from array import array
+from hashlib import blake2b
+from typing import Iterable, Iterator, Optional, Sequence, Tuple
+
+# Record: flags byte, then field_count length-prefixed UTF-8 strings; the first field is the id
+Row = Tuple[Tuple[str, ...], int]
+
+_MAGIC = b'LIBCAT1\n'
+# record count, fields per record, index slot count, index offset
+_HEADER = struct.Struct('<QQQQ')
+# index slot: 64-bit id hash, record offset (0 = empty slot)
+_SLOT = struct.Struct('<QQ')
+_FLAGS = struct.Struct('<B')
+_LENGTH = struct.Struct('<I')
+_RECORDS_START = len(_MAGIC) + _HEADER.size
+
+
+def _hash(key: bytes) -> int:
+    # Stable across processes, unlike hash(str)
+    return int.from_bytes(blake2b(key, digest_size=8).digest(), 'little')
+
+
+class CatalogFile:
+    """
+    SOLUTION: Read-only, memory-mapped catalog of records keyed by id
+    
+    The file holds offset-addressed records followed by an open-addressing
+    hash table of (id hash, record offset) slots:
+    1. Opening maps the file and reads a fixed-size header, so it costs the
+       same for a thousand records as for ten million
+    2. get() hashes the id with blake2b, probes the table inside the
+       mapping and decodes only the one record it lands on
+    3. Pages are loaded by the OS on first touch and shared between
+       processes opening the same catalog
+    """
+    
+    MAX_LOAD_FACTOR = 0.7
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map: Optional[mmap.mmap] = None
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            if size < _RECORDS_START:
+                raise ValueError(f"Not a catalog file: {path}")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self._map[:len(_MAGIC)] != _MAGIC:
+                raise ValueError(f"Not a catalog file: {path}")
+            self._count, self._field_count, self._slots, self._index = _HEADER.unpack_from(self._map, len(_MAGIC))
+            if self._slots & (self._slots - 1) or self._index + self._slots * _SLOT.size > size:
+                raise ValueError(f"Damaged catalog file: {path}")
+        except BaseException:
+            self.close()
+            raise
+    
+    @classmethod
+    def write(cls, path: str, rows: Iterable[Row], field_count: int) -> int:
+        """
+        Write rows of (fields, flags) to a new catalog at path and return the row count
+        
+        The file is written next to path and renamed into place, so readers
+        never see a partial catalog. Raises ValueError on a duplicate id.
+        """
+        temporary = path + '.tmp'
+        hashes = array('Q')
+        offsets = array('Q')
+        try:
+            with open(temporary, 'w+b') as file:
+                file.write(_MAGIC + _HEADER.pack(0, 0, 0, 0))
+                position = _RECORDS_START
+                chunk = bytearray()
+                for fields, flags in rows:
+                    if len(fields) != field_count:
+                        raise ValueError(f"Expected {field_count} fields, got {len(fields)}")
+                    record = bytearray(_FLAGS.pack(flags))
+                    for value in fields:
+                        data = value.encode('utf-8')
+                        record += _LENGTH.pack(len(data))
+                        record += data
+                    hashes.append(_hash(fields[0].encode('utf-8')))
+                    offsets.append(position)
+                    position += len(record)
+                    chunk += record
+                    if len(chunk) >= 1 << 20:
+                        file.write(chunk)
+                        chunk = bytearray()
+                file.write(chunk)
+                file.flush()
+                
+                slots = 8
+                while slots * cls.MAX_LOAD_FACTOR < len(hashes):
+                    slots *= 2
+                table = cls._build_index(file, hashes, offsets, slots)
+                index = (position + 7) & ~7
+                file.write(b'\0' * (index - position))
+                file.write(table)
+                file.seek(len(_MAGIC))
+                file.write(_HEADER.pack(len(hashes), field_count, slots, index))
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporary, path)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        return len(hashes)
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    @property
+    def field_count(self) -> int:
+        return self._field_count
+    
+    def get(self, key: str) -> Optional[Row]:
+        """The (fields, flags) of the record with id key, or None"""
+        data = self._map
+        encoded = key.encode('utf-8')
+        key_hash = _hash(encoded)
+        mask = self._slots - 1
+        slot = key_hash & mask
+        index = self._index
+        while True:
+            slot_hash, offset = _SLOT.unpack_from(data, index + slot * _SLOT.size)
+            if offset == 0:
+                return None
+            if slot_hash == key_hash and self._read_key(data, offset) == encoded:
+                return self._read_row(offset)
+            slot = (slot + 1) & mask
+    
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+    
+    def __iter__(self) -> Iterator[Row]:
+        """All rows in file order"""
+        offset = _RECORDS_START
+        for _ in range(self._count):
+            row, offset = self._read_row(offset, with_end=True)
+            yield row
+    
+    def close(self) -> None:
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # A suspended iterator still references the mapping; it is freed with it
+                pass
+            self._map = None
+        self._file.close()
+    
+    def __enter__(self) -> 'CatalogFile':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def _read_row(self, offset: int, with_end: bool = False):
+        data = self._map
+        flags = data[offset]
+        position = offset + _FLAGS.size
+        fields = []
+        for _ in range(self._field_count):
+            (length,) = _LENGTH.unpack_from(data, position)
+            position += _LENGTH.size
+            fields.append(str(data[position:position + length], 'utf-8'))
+            position += length
+        row = (tuple(fields), flags)
+        return (row, position) if with_end else row
+    
+    @staticmethod
+    def _read_key(data, offset: int) -> bytes:
+        position = offset + _FLAGS.size
+        (length,) = _LENGTH.unpack_from(data, position)
+        position += _LENGTH.size
+        return data[position:position + length]
+    
+    @classmethod
+    def _build_index(cls, file, hashes: Sequence[int], offsets: Sequence[int], slots: int) -> bytearray:
+        # Linear probing; ids are compared on full hash collisions to reject duplicates
+        table = bytearray(slots * _SLOT.size)
+        mask = slots - 1
+        records = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if len(hashes) else None
+        try:
+            for key_hash, offset in zip(hashes, offsets):
+                slot = key_hash & mask
+                while True:
+                    slot_hash, existing = _SLOT.unpack_from(table, slot * _SLOT.size)
+                    if existing == 0:
+                        _SLOT.pack_into(table, slot * _SLOT.size, key_hash, offset)
+                        break
+                    if slot_hash == key_hash and cls._read_key(records, existing) == cls._read_key(records, offset):
+                        raise ValueError(f"Duplicate id: {str(cls._read_key(records, offset), 'utf-8')}")
+                    slot = (slot + 1) & mask
+        finally:
+            if records is not None:
+                records.close()
+        return table
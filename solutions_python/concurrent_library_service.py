@@ -0,0 +1,169 @@
+from datetime import datetime
+from typing import Hashable, Iterable, List, Optional, Tuple
+
+from .book_repository import BookRepository
+from .borrow_result import BorrowResult
+from .fine_calculation_strategy import FineCalculationStrategy
+from .fine_ledger import FineLedger
+from .hold_queue import HoldQueue
+from .hold_result import HoldResult
+from .improved_library_service import ImprovedLibraryService
+from .loan_repository import LoanRepository
+from .member_repository import MemberRepository
+from .return_result import ReturnResult
+from .striped_lock import StripedLock
+from ..python_library.loan_id_generator import LoanIdGenerator
+
+
+class ConcurrentLibraryService(ImprovedLibraryService):
+    """
+    SOLUTION: Thread-safe library service built on lock striping
+    
+    ImprovedLibraryService.borrow_book checks availability and the borrowing
+    limit, then writes; two threads can both pass the checks. This subclass
+    runs every borrow and return while holding the stripes of the member and
+    the book involved:
+    1. The availability check and the availability flip of a book are atomic,
+       so a book can never be lent twice
+    2. The MAX_BOOKS_PER_MEMBER check and the new loan are atomic, so
+       concurrent borrows cannot push a member over the limit
+    3. Operations on unrelated books and members take different stripes and
+       run in parallel instead of behind one global lock
+    
+    Borrows, returns and holds take the stripe of the book's title, looked up
+    before locking, so borrowing a title and borrowing one of its copies by
+    ID cannot pick the same free copy, and a copy coming back cannot miss a
+    hold placed at the same time. Expired holds pass their copies on under
+    the stripe of each copy's title, before the caller's stripes are taken,
+    since those copies may belong to other titles. Locks only coordinate
+    threads of this process sharing one service; the repositories
+    themselves must be thread-safe (the in-memory and SQLite ones are).
+    """
+    
+    def __init__(self, book_repository: BookRepository,
+                 member_repository: MemberRepository,
+                 loan_repository: LoanRepository,
+                 fine_strategy: FineCalculationStrategy,
+                 stripes: int = StripedLock.DEFAULT_STRIPES,
+                 fine_ledger: Optional[FineLedger] = None,
+                 holds: Optional[HoldQueue] = None,
+                 loan_id_generator: Optional[LoanIdGenerator] = None):
+        super().__init__(book_repository, member_repository, loan_repository, fine_strategy, fine_ledger, holds,
+                         loan_id_generator)
+        self._locks = StripedLock(stripes)
+    
+    def borrow_book(self, member_id: str, book_id: str) -> BorrowResult:
+        """
+        SOLUTION: borrow_book holding the member and book stripes
+        """
+        self._expire_before_locking()
+        with self._locks.locked(self._member_key(member_id), self._book_key(self._title_of(book_id))):
+            return super().borrow_book(member_id, book_id)
+    
+    def borrow_books(self, batch: Iterable[Tuple[str, str]]) -> List[BorrowResult]:
+        """
+        SOLUTION: borrow_books holding the stripes of every member and book in the batch
+        """
+        requests = list(batch)
+        self._expire_before_locking()
+        keys = [self._member_key(member_id) for member_id, _ in requests]
+        keys += [self._book_key(self._title_of(book_id)) for _, book_id in requests]
+        with self._locks.locked(*keys):
+            return super().borrow_books(requests)
+    
+    def return_book(self, loan_id: str) -> ReturnResult:
+        """
+        SOLUTION: return_book holding the stripes of the loan's member and title
+        """
+        if not loan_id or not loan_id.strip():
+            return super().return_book(loan_id)
+        
+        try:
+            loan = self.loan_repository.find_by_id(loan_id)
+        except Exception as e:
+            return ReturnResult.failure(f"Failed to return book: {str(e)}")
+        if loan is None:
+            return ReturnResult.failure("Loan not found")
+        
+        self._expire_before_locking()
+        # SOLUTION: The loan is looked up again under the locks, in case another
+        # thread returned it in the meantime
+        with self._locks.locked(self._member_key(loan.get_member_id()),
+                                self._book_key(self._title_of(loan.get_book_id()))):
+            return super().return_book(loan_id)
+    
+    def return_books(self, loan_ids: Iterable[str]) -> List[ReturnResult]:
+        """
+        SOLUTION: return_books holding the stripes of every loan's member and title
+        """
+        loan_ids = list(loan_ids)
+        try:
+            loans = self.loan_repository.find_by_ids({loan_id for loan_id in loan_ids if loan_id})
+        except Exception as e:
+            failure = ReturnResult.failure(f"Failed to return book: {str(e)}")
+            return [failure] * len(loan_ids)
+        
+        self._expire_before_locking()
+        keys = [self._member_key(loan.get_member_id()) for loan in loans.values()]
+        keys += [self._book_key(self._title_of(loan.get_book_id())) for loan in loans.values()]
+        with self._locks.locked(*keys):
+            return super().return_books(loan_ids)
+    
+    def place_hold(self, member_id: str, book_id: str, priority: int = 0) -> HoldResult:
+        """
+        SOLUTION: place_hold holding the member and title stripes
+        """
+        self._expire_before_locking()
+        with self._locks.locked(self._member_key(member_id), self._book_key(self._title_of(book_id))):
+            return super().place_hold(member_id, book_id, priority)
+    
+    def cancel_hold(self, hold_id: str) -> HoldResult:
+        """
+        SOLUTION: cancel_hold holding the stripes of the hold's member and title
+        """
+        hold = self.holds.get(hold_id) if self.holds is not None and hold_id else None
+        if hold is None:
+            return super().cancel_hold(hold_id)
+        with self._locks.locked(self._member_key(hold.get_member_id()), self._book_key(hold.get_title_id())):
+            return super().cancel_hold(hold_id)
+    
+    def expire_holds(self, as_of: Optional[datetime] = None) -> int:
+        """
+        SOLUTION: expire_holds passing each copy on while holding its title's stripe
+        """
+        if self.holds is None:
+            return 0
+        as_of = as_of or datetime.now()
+        expired = self.holds.expire(as_of)
+        for hold in expired:
+            with self._locks.locked(self._book_key(hold.get_title_id())):
+                self._pass_on_expired_copy(hold, as_of)
+        return len(expired)
+    
+    def _expire_due_holds(self, now: Optional[datetime] = None) -> None:
+        # The base methods call this under the caller's stripes, where copies of other titles
+        # cannot be handed on safely; the public methods expire in _expire_before_locking instead
+        pass
+    
+    def _expire_before_locking(self) -> None:
+        try:
+            super()._expire_due_holds()
+        except Exception:
+            # The holds stay due and the next call retries; the operation itself reports repository errors
+            pass
+    
+    @staticmethod
+    def _member_key(member_id: str) -> Hashable:
+        return ('member', member_id)
+    
+    @staticmethod
+    def _book_key(book_id: str) -> Hashable:
+        return ('book', book_id)
+    
+    def _title_of(self, book_id: str) -> str:
+        # A copy's title ID, or book_id itself for titles and unknown IDs; borrow_book reports the errors
+        try:
+            book = self.book_repository.find_by_id(book_id) if book_id else None
+        except Exception:
+            book = None
+        return book.get_title_id() if book is not None else book_id
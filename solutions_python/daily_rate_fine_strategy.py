@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta
+from typing import List, Optional, Sequence
+
+from .fine_calculation_strategy import FineCalculationStrategy
+from ..python_library.loan import Loan
+
+
+class DailyRateFineStrategy(FineCalculationStrategy):
+    """
+    SOLUTION: Fine Calculation Strategy with a configurable daily rate
+    
+    Same rules as the standard and student strategies, with the rate given
+    at construction, so a rate table (staff, seniors, ...) needs no new class:
+    - No fine for books returned within the loan period
+    - daily_rate per whole day after the loan period
+    """
+    
+    def __init__(self, daily_rate: float):
+        if daily_rate < 0:
+            raise ValueError("daily_rate must not be negative")
+        self.daily_rate = daily_rate
+    
+    def calculate_fine(self, loan: Loan, loan_duration_days: int) -> float:
+        """Calculate fine using the configured rate"""
+        if loan is None or loan.get_borrow_date() is None:
+            return 0.0
+        
+        due_date = loan.get_borrow_date() + timedelta(days=loan_duration_days)
+        days_overdue = (datetime.now() - due_date).days
+        return days_overdue * self.daily_rate if days_overdue > 0 else 0.0
+    
+    def calculate_fines_batch(self, loans: Sequence[Loan], loan_duration_days: int,
+                              as_of: Optional[datetime] = None) -> List[float]:
+        """Calculate fines for many loans at once using the configured rate"""
+        return self._daily_rate_fines_batch(loans, loan_duration_days, as_of, self.daily_rate)
+    
+    def calculate_fines_array(self, borrow_dates, loan_duration_days: int,
+                              as_of: Optional[datetime] = None):
+        """Calculate fines for a datetime64 array of borrow dates using the configured rate"""
+        return self._daily_rate_fines_array(borrow_dates, loan_duration_days, as_of, self.daily_rate)
+    
+    def __repr__(self) -> str:
+        return f"DailyRateFineStrategy({self.daily_rate!r})"
@@ -1,7 +1,14 @@
 from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Sequence
 
 from ..python_library.loan import Loan
 
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; only calculate_fines_array needs it
+    np = None
+
 
 class FineCalculationStrategy(ABC):
     """
@@ -19,3 +26,66 @@ class FineCalculationStrategy(ABC):
     def calculate_fine(self, loan: Loan, loan_duration_days: int) -> float:
         """Calculate the fine for a loan"""
         pass
+    
+    def calculate_fines_batch(self, loans: Sequence[Loan], loan_duration_days: int,
+                              as_of: Optional[datetime] = None) -> List[float]:
+        """
+        Calculate the fines for many loans at once, aligned with loans
+        
+        The default calls calculate_fine once per loan, which evaluates each fine
+        as of "now" and ignores as_of; strategies should override it.
+        """
+        return [self.calculate_fine(loan, loan_duration_days) for loan in loans]
+    
+    def for_members(self, member_ids: Iterable[str]) -> 'FineCalculationStrategy':
+        """
+        A strategy that prices these members' loans like this one and can be pickled cheaply
+        
+        Used to ship a strategy to worker processes. The default is the strategy
+        itself; strategies that read a repository resolve what they need here.
+        """
+        return self
+    
+    def calculate_fines_array(self, borrow_dates: "np.ndarray", loan_duration_days: int,
+                              as_of: Optional[datetime] = None) -> "np.ndarray":
+        """
+        Calculate fines for a numpy datetime64 array of borrow dates (NaT owes nothing)
+        
+        The default converts the dates back to loans and calls calculate_fines_batch;
+        strategies should override it with a vectorized version.
+        """
+        loans = [Loan(None, None, None, borrow_date)
+                 for borrow_date in borrow_dates.astype('datetime64[us]').astype(object)]
+        return np.array(self.calculate_fines_batch(loans, loan_duration_days, as_of), dtype=float)
+    
+    @staticmethod
+    def _daily_rate_fines_batch(loans: Sequence[Loan], loan_duration_days: int,
+                                as_of: Optional[datetime], daily_rate: float) -> List[float]:
+        """
+        SOLUTION: "rate x whole days overdue" for a batch of loans
+        
+        Matches calculate_fine for daily-rate strategies: a loan is overdue once
+        as_of passes borrow_date + loan_duration_days, and only whole days are
+        charged. The due-date cutoff is computed once for the whole batch, so
+        each loan costs one datetime subtraction. (For Loan objects this beats
+        converting the dates to numpy first; see calculate_fines_array.)
+        """
+        cutoff = (as_of or datetime.now()) - timedelta(days=loan_duration_days)
+        fines = []
+        for loan in loans:
+            borrow_date = loan.get_borrow_date() if loan is not None else None
+            if borrow_date is not None and cutoff > borrow_date:
+                fines.append((cutoff - borrow_date).days * daily_rate)
+            else:
+                fines.append(0.0)
+        return fines
+    
+    @staticmethod
+    def _daily_rate_fines_array(borrow_dates: "np.ndarray", loan_duration_days: int,
+                                as_of: Optional[datetime], daily_rate: float) -> "np.ndarray":
+        """SOLUTION: Vectorized _daily_rate_fines_batch over a datetime64 array"""
+        cutoff = np.datetime64((as_of or datetime.now()) - timedelta(days=loan_duration_days), 'us')
+        dates = borrow_dates.astype('datetime64[us]', copy=True)
+        dates[np.isnat(dates)] = cutoff  # loans without a borrow date owe nothing
+        days = (cutoff - dates) // np.timedelta64(1, 'D')
+        return np.maximum(days, 0) * daily_rate
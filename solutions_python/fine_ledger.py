@@ -0,0 +1,173 @@
+import heapq
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .fine_calculation_strategy import FineCalculationStrategy
+from ..python_library.loan import Loan
+
+
+class FineLedger:
+    """
+    SOLUTION: Materialized per-loan and per-member fines
+    
+    Instead of recomputing every fine from the borrow date on each read, the
+    ledger keeps the accrued fine of every loan and the running total of
+    every member, both as of a watermark:
+    1. accrue(as_of) is the daily pass: loans whose due date has passed are
+       moved off a due-date heap into the overdue set, and only overdue loans
+       are re-priced with one calculate_fines_batch call; member totals are
+       adjusted by the change of each loan's fine
+    2. accrue_if_stale() runs that pass lazily, at most once per
+       accrual_interval, so readers bring the ledger up to date themselves
+    3. close_loan() prices a returned loan as of the return time and freezes
+       that fine in the member's total; the fines of the last
+       frozen_capacity returned loans are also kept per loan, older ones
+       only in the member totals
+    4. get_member_total_fine(), get_member_open_fine() and get_loan_fine()
+       are dict lookups
+    
+    Open loans are assumed to owe nothing before their due date, which holds
+    for every strategy that charges by days overdue. Reads reflect open
+    loans as of the watermark and returned loans as of their return. All
+    operations hold one lock, so a ledger can be shared between threads.
+    """
+    
+    DEFAULT_ACCRUAL_INTERVAL = timedelta(days=1)
+    DEFAULT_FROZEN_CAPACITY = 10_000
+    
+    def __init__(self, fine_strategy: FineCalculationStrategy, loan_duration_days: int,
+                 loans: Iterable[Loan] = (), as_of: Optional[datetime] = None,
+                 accrual_interval: timedelta = DEFAULT_ACCRUAL_INTERVAL,
+                 frozen_capacity: int = DEFAULT_FROZEN_CAPACITY):
+        if frozen_capacity < 0:
+            raise ValueError("frozen_capacity cannot be negative")
+        self._fine_strategy = fine_strategy
+        self._loan_duration = timedelta(days=loan_duration_days)
+        self._loan_duration_days = loan_duration_days
+        self._accrual_interval = accrual_interval
+        self._frozen_capacity = frozen_capacity
+        self._open: Dict[str, Loan] = {}
+        self._pending: List[Tuple[datetime, str]] = []   # (due date, loan id) of loans not yet overdue
+        self._overdue: Dict[str, float] = {}             # loan id -> accrued fine
+        self._frozen: Dict[str, float] = {}              # returned loan id -> final fine, oldest first
+        self._member_totals: Dict[str, float] = {}
+        self._member_open: Dict[str, float] = {}         # member id -> accrued fines of open loans
+        self._watermark: Optional[datetime] = None
+        self._lock = threading.RLock()
+        self._load(loans, as_of)
+    
+    @property
+    def watermark(self) -> Optional[datetime]:
+        """The instant open-loan fines were last brought up to date, or None before the first pass"""
+        return self._watermark
+    
+    def open_loan(self, loan: Loan) -> None:
+        """Start tracking a new loan"""
+        with self._lock:
+            if loan.get_id() in self._open:
+                return
+            self._open[loan.get_id()] = loan
+            due = loan.get_borrow_date() + self._loan_duration
+            if self._watermark is not None and due < self._watermark:
+                # Already overdue (e.g. an imported loan): price it as of the watermark right away
+                self._overdue[loan.get_id()] = 0.0
+                self._reprice([loan], self._watermark)
+            else:
+                heapq.heappush(self._pending, (due, loan.get_id()))
+    
+    def close_loan(self, loan_id: str, returned_at: Optional[datetime] = None) -> float:
+        """Stop tracking a returned loan, freeze its fine as of returned_at and return that fine"""
+        returned_at = returned_at or datetime.now()
+        with self._lock:
+            loan = self._open.pop(loan_id, None)
+            if loan is None:
+                return self._frozen.get(loan_id, 0.0)
+            accrued = self._overdue.pop(loan_id, 0.0)
+            # A loan still on the due-date heap is skipped when it comes up
+            fine = self._fine_strategy.calculate_fines_batch([loan], self._loan_duration_days, returned_at)[0]
+            self._add_to_member(self._member_totals, loan.get_member_id(), fine - accrued)
+            self._add_to_member(self._member_open, loan.get_member_id(), -accrued)
+            if fine and self._frozen_capacity:
+                self._frozen[loan_id] = fine
+                # The fine is already in the member's total: keep only the most recent ones per loan
+                if len(self._frozen) > self._frozen_capacity:
+                    del self._frozen[next(iter(self._frozen))]
+            return fine
+    
+    def accrue(self, as_of: Optional[datetime] = None) -> int:
+        """
+        Bring every open loan's fine up to as_of and return how many loans were re-priced
+        
+        Costs O(overdue loans + loans that became due) rather than O(all loans).
+        """
+        as_of = as_of or datetime.now()
+        with self._lock:
+            if self._watermark is not None and as_of < self._watermark:
+                raise ValueError(f"Cannot accrue back to {as_of}, the ledger is at {self._watermark}")
+            while self._pending and self._pending[0][0] < as_of:
+                _, loan_id = heapq.heappop(self._pending)
+                if loan_id in self._open:
+                    self._overdue[loan_id] = 0.0
+            self._reprice([self._open[loan_id] for loan_id in self._overdue], as_of)
+            self._watermark = as_of
+            return len(self._overdue)
+    
+    def accrue_if_stale(self, now: Optional[datetime] = None) -> bool:
+        """Run accrue(now) if the last pass is older than accrual_interval; True if it ran"""
+        now = now or datetime.now()
+        with self._lock:
+            if self._watermark is not None and now - self._watermark < self._accrual_interval:
+                return False
+            self.accrue(now)
+            return True
+    
+    def get_loan_fine(self, loan_id: str) -> float:
+        """The accrued fine of an open loan, or the frozen fine of a recently returned one"""
+        with self._lock:
+            return self._overdue.get(loan_id, self._frozen.get(loan_id, 0.0))
+    
+    def get_member_total_fine(self, member_id: str) -> float:
+        """Accrued fines of the member's open loans plus the frozen fines of returned ones"""
+        with self._lock:
+            return self._member_totals.get(member_id, 0.0)
+    
+    def get_member_open_fine(self, member_id: str) -> float:
+        """Accrued fines of the member's open loans only"""
+        with self._lock:
+            return self._member_open.get(member_id, 0.0)
+    
+    def _load(self, loans: Iterable[Loan], as_of: Optional[datetime]) -> None:
+        # Bulk open_loan plus the first accrual: one heapify and one pricing batch
+        watermark = as_of or datetime.now()
+        overdue = []
+        for loan in loans:
+            loan_id = loan.get_id()
+            if loan_id in self._open:
+                continue
+            self._open[loan_id] = loan
+            due = loan.get_borrow_date() + self._loan_duration
+            if due < watermark:
+                self._overdue[loan_id] = 0.0
+                overdue.append(loan)
+            else:
+                self._pending.append((due, loan_id))
+        heapq.heapify(self._pending)
+        if as_of is not None or self._open:
+            self._reprice(overdue, watermark)
+            self._watermark = watermark
+    
+    def _reprice(self, loans: List[Loan], as_of: datetime) -> None:
+        fines = self._fine_strategy.calculate_fines_batch(loans, self._loan_duration_days, as_of)
+        overdue = self._overdue
+        for loan, fine in zip(loans, fines):
+            delta = fine - overdue[loan.get_id()]
+            if delta:
+                overdue[loan.get_id()] = fine
+                self._add_to_member(self._member_totals, loan.get_member_id(), delta)
+                self._add_to_member(self._member_open, loan.get_member_id(), delta)
+    
+    @staticmethod
+    def _add_to_member(totals: Dict[str, float], member_id: str, delta: float) -> None:
+        if delta:
+            totals[member_id] = totals.get(member_id, 0.0) + delta
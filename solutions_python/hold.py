@@ -0,0 +1,59 @@
+from datetime import datetime
+from typing import Optional
+
+
+class Hold:
+    """
+    SOLUTION: A member's place in the queue for a title
+    
+    A hold is WAITING until a copy comes back, then READY with that copy set
+    aside until ready_until. It ends FULFILLED when the member borrows the
+    copy, CANCELLED, or EXPIRED when the copy is not picked up in time.
+    """
+    
+    WAITING = 'waiting'
+    READY = 'ready'
+    FULFILLED = 'fulfilled'
+    CANCELLED = 'cancelled'
+    EXPIRED = 'expired'
+    
+    __slots__ = ('id', 'member_id', 'title_id', 'placed_at', 'priority', 'status', 'copy_id', 'ready_until')
+    
+    def __init__(self, hold_id: str, member_id: str, title_id: str, placed_at: datetime, priority: int = 0):
+        self.id = hold_id
+        self.member_id = member_id
+        self.title_id = title_id
+        self.placed_at = placed_at
+        self.priority = priority
+        self.status = self.WAITING
+        self.copy_id: Optional[str] = None
+        self.ready_until: Optional[datetime] = None
+    
+    def get_id(self) -> str:
+        return self.id
+    
+    def get_member_id(self) -> str:
+        return self.member_id
+    
+    def get_title_id(self) -> str:
+        return self.title_id
+    
+    def get_placed_at(self) -> datetime:
+        return self.placed_at
+    
+    def get_priority(self) -> int:
+        return self.priority
+    
+    def get_status(self) -> str:
+        return self.status
+    
+    def get_copy_id(self) -> Optional[str]:
+        """The copy set aside for the member once the hold is ready"""
+        return self.copy_id
+    
+    def get_ready_until(self) -> Optional[datetime]:
+        """When a ready hold expires if the copy has not been borrowed"""
+        return self.ready_until
+    
+    def is_ready(self) -> bool:
+        return self.status == self.READY
@@ -0,0 +1,202 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from .hold import Hold
+
+
+class HoldQueue:
+    """
+    SOLUTION: Hold queues of every title, with constant-time bookkeeping per handoff
+    
+    1. Each title has a heap of (-priority, sequence, hold id) entries, so the
+       highest priority goes first and equal priorities are first come,
+       first served
+    2. cancel() only forgets the hold; its heap entry is skipped when it
+       reaches the top, and a heap that is mostly such entries is rebuilt
+    3. handoff() pops the title's next waiting hold and makes it READY with
+       the returned copy, set aside until a pickup deadline
+    4. Ready holds also sit on a deadline heap; expire() pops the ones past
+       their deadline so the service can pass their copies on
+    5. Listeners, callbacks or asyncio queues, hear of every hold that
+       becomes ready or expires, so members need not poll for copies
+    
+    place() and handoff() are O(log n) in the title's queue length (handoff
+    amortized over cancelled entries), cancel() and the member lookups are
+    O(1). All operations hold one lock, so a queue can be shared between
+    threads. Listeners run after the lock is released, in the thread that
+    made the change; an exception in a listener is ignored.
+    """
+    
+    DEFAULT_PICKUP_WINDOW = timedelta(days=3)
+    COMPACT_THRESHOLD = 64   # cancelled entries a heap may hold before it is rebuilt
+    
+    def __init__(self, pickup_window: timedelta = DEFAULT_PICKUP_WINDOW):
+        self._pickup_window = pickup_window
+        self._queues: Dict[str, List[Tuple[int, int, str]]] = {}   # title id -> heap of waiting hold entries
+        self._waiting: Dict[str, int] = {}                         # title id -> holds still waiting
+        self._holds: Dict[str, Hold] = {}                          # waiting and ready holds by id
+        self._by_member: Dict[str, Dict[str, str]] = {}            # member id -> title id -> hold id
+        self._deadlines: List[Tuple[datetime, str]] = []           # (ready_until, hold id) of ready holds
+        self._sequence = itertools.count()
+        self._listeners: Dict[Hashable, Callable[[Hold], None]] = {}
+        self._lock = threading.RLock()
+    
+    def place(self, member_id: str, title_id: str, priority: int = 0, now: Optional[datetime] = None) -> Hold:
+        """Queue a new hold; raises ValueError if the member already has one on the title"""
+        hold = Hold(str(uuid.uuid4()), member_id, title_id, now or datetime.now(), priority)
+        with self._lock:
+            titles = self._by_member.setdefault(member_id, {})
+            if title_id in titles:
+                raise ValueError(f"Member already has a hold on {title_id}")
+            titles[title_id] = hold.get_id()
+            self._holds[hold.get_id()] = hold
+            heapq.heappush(self._queues.setdefault(title_id, []), (-priority, next(self._sequence), hold.get_id()))
+            self._waiting[title_id] = self._waiting.get(title_id, 0) + 1
+        return hold
+    
+    def cancel(self, hold_id: str) -> Optional[Hold]:
+        """End a waiting or ready hold; a ready one returned still names the copy set aside"""
+        with self._lock:
+            hold = self._holds.get(hold_id)
+            if hold is not None:
+                self._end(hold, Hold.CANCELLED)
+        return hold
+    
+    def handoff(self, title_id: str, copy_id: str, now: Optional[datetime] = None) -> Optional[Hold]:
+        """Set copy_id aside for the title's next waiting hold and return it, or None if nobody waits"""
+        with self._lock:
+            heap = self._queues.get(title_id)
+            hold = None
+            while heap and hold is None:
+                hold = self._holds.get(heapq.heappop(heap)[2])
+            if hold is None:
+                return None
+            self._count_waiting(title_id, -1)
+            hold.status = Hold.READY
+            hold.copy_id = copy_id
+            hold.ready_until = (now or datetime.now()) + self._pickup_window
+            heapq.heappush(self._deadlines, (hold.ready_until, hold.get_id()))
+        self._notify(hold)
+        return hold
+    
+    def fulfil(self, hold_id: str) -> Optional[Hold]:
+        """End a ready hold whose copy the member has borrowed"""
+        with self._lock:
+            hold = self._holds.get(hold_id)
+            if hold is None or not hold.is_ready():
+                return None
+            self._end(hold, Hold.FULFILLED)
+        return hold
+    
+    def expire(self, now: Optional[datetime] = None) -> List[Hold]:
+        """End the ready holds past their pickup deadline and return them, so their copies can go on"""
+        now = now or datetime.now()
+        expired = []
+        with self._lock:
+            deadlines = self._deadlines
+            while deadlines and deadlines[0][0] <= now:
+                deadline, hold_id = heapq.heappop(deadlines)
+                # Entries of holds fulfilled or cancelled since are skipped
+                hold = self._holds.get(hold_id)
+                if hold is not None and hold.is_ready() and hold.ready_until == deadline:
+                    self._end(hold, Hold.EXPIRED)
+                    expired.append(hold)
+        for hold in expired:
+            self._notify(hold)
+        return expired
+    
+    def next_deadline(self) -> Optional[datetime]:
+        """The earliest pickup deadline that may still be pending, for scheduling expire()"""
+        with self._lock:
+            return self._deadlines[0][0] if self._deadlines else None
+    
+    def get(self, hold_id: str) -> Optional[Hold]:
+        """A waiting or ready hold by ID"""
+        with self._lock:
+            return self._holds.get(hold_id)
+    
+    def find(self, member_id: str, title_id: str) -> Optional[Hold]:
+        """The member's waiting or ready hold on a title"""
+        with self._lock:
+            hold_id = self._by_member.get(member_id, {}).get(title_id)
+            return self._holds[hold_id] if hold_id is not None else None
+    
+    def member_holds(self, member_id: str) -> List[Hold]:
+        """The member's waiting and ready holds"""
+        with self._lock:
+            return [self._holds[hold_id] for hold_id in self._by_member.get(member_id, {}).values()]
+    
+    def waiting_count(self, title_id: str) -> int:
+        """Holds on a title still waiting for a copy"""
+        with self._lock:
+            return self._waiting.get(title_id, 0)
+    
+    def subscribe(self, callback: Callable[[Hold], None]) -> None:
+        """Call callback(hold) whenever a hold becomes ready or expires"""
+        with self._lock:
+            self._listeners[callback] = callback
+    
+    def unsubscribe(self, listener: Hashable) -> None:
+        """Stop notifying a callback or an asyncio queue from async_queue()"""
+        with self._lock:
+            self._listeners.pop(listener, None)
+    
+    def async_queue(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> 'asyncio.Queue[Hold]':
+        """
+        An asyncio queue receiving every hold that becomes ready or expires
+        
+        Holds are put on the queue through loop (by default the running one),
+        whichever thread changes them. unsubscribe(queue) stops the feed.
+        """
+        loop = loop or asyncio.get_running_loop()
+        queue: 'asyncio.Queue[Hold]' = asyncio.Queue()
+        
+        def put(hold: Hold) -> None:
+            loop.call_soon_threadsafe(queue.put_nowait, hold)
+        
+        with self._lock:
+            self._listeners[queue] = put
+        return queue
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._holds)
+    
+    def _end(self, hold: Hold, status: str) -> None:
+        hold_id, title_id = hold.get_id(), hold.get_title_id()
+        del self._holds[hold_id]
+        titles = self._by_member[hold.get_member_id()]
+        del titles[title_id]
+        if not titles:
+            del self._by_member[hold.get_member_id()]
+        if hold.status == Hold.WAITING:
+            self._count_waiting(title_id, -1)
+            heap = self._queues.get(title_id)
+            if heap is not None and len(heap) - self._waiting[title_id] > max(self.COMPACT_THRESHOLD, len(heap) // 2):
+                # Mostly cancelled entries: rebuild from the live ones
+                heap[:] = [entry for entry in heap if entry[2] in self._holds]
+                heapq.heapify(heap)
+        hold.status = status
+    
+    def _count_waiting(self, title_id: str, delta: int) -> None:
+        waiting = self._waiting.get(title_id, 0) + delta
+        if waiting > 0:
+            self._waiting[title_id] = waiting
+        else:
+            # Nobody waits: drop the heap with whatever cancelled entries it still holds
+            self._waiting.pop(title_id, None)
+            self._queues.pop(title_id, None)
+    
+    def _notify(self, hold: Hold) -> None:
+        with self._lock:
+            listeners = list(self._listeners.values())
+        for listener in listeners:
+            try:
+                listener(hold)
+            except Exception:
+                pass
@@ -0,0 +1,38 @@
+from typing import Optional
+
+from .hold import Hold
+
+
+class HoldResult:
+    """
+    SOLUTION: Result class for hold operations
+    
+    This class provides better error handling and result communication
+    """
+    
+    def __init__(self, success: bool, message: str, hold: Optional[Hold] = None):
+        self._success = success
+        self._message = message
+        self._hold = hold
+    
+    @classmethod
+    def success(cls, message: str, hold: Hold) -> 'HoldResult':
+        """Create a successful hold result"""
+        return cls(True, message, hold)
+    
+    @classmethod
+    def failure(cls, message: str) -> 'HoldResult':
+        """Create a failed hold result"""
+        return cls(False, message, None)
+    
+    def is_success(self) -> bool:
+        """Check if the operation was successful"""
+        return self._success
+    
+    def get_message(self) -> str:
+        """Get the result message"""
+        return self._message
+    
+    def get_hold(self) -> Optional[Hold]:
+        """Get the hold object if successful"""
+        return self._hold
@@ -0,0 +1,51 @@
+from typing import List, NamedTuple
+
+
+class RowError(NamedTuple):
+    line: int
+    message: str
+
+
+class ImportResult:
+    """
+    SOLUTION: Result class for bulk imports
+    
+    Counts imported and rejected rows. Only the first max_errors row errors
+    are kept, so importing a badly broken file still runs in bounded memory.
+    """
+    
+    def __init__(self, max_errors: int = 1000):
+        self._imported = 0
+        self._failed = 0
+        self._errors: List[RowError] = []
+        self._max_errors = max_errors
+    
+    def record_imported(self, count: int) -> None:
+        """Count rows that were written to the repository"""
+        self._imported += count
+    
+    def record_error(self, line: int, message: str) -> None:
+        """Count a rejected row and keep its error if there is room"""
+        self._failed += 1
+        if len(self._errors) < self._max_errors:
+            self._errors.append(RowError(line, message))
+    
+    def is_success(self) -> bool:
+        """Check if every row was imported"""
+        return self._failed == 0
+    
+    def get_imported_count(self) -> int:
+        """Get the number of rows written to the repository"""
+        return self._imported
+    
+    def get_failed_count(self) -> int:
+        """Get the number of rejected rows"""
+        return self._failed
+    
+    def get_errors(self) -> List[RowError]:
+        """Get the first rejected rows as (line, message), in the order they were found"""
+        return list(self._errors)
+    
+    def get_message(self) -> str:
+        """Get a one-line summary of the import"""
+        return f"Imported {self._imported} rows, {self._failed} failed"
@@ -0,0 +1,117 @@
+import threading
+from typing import Dict, Iterator, List, Optional
+
+from .book_repository import BookRepository
+from ..python_library.availability_index import AvailabilityIndex
+from ..python_library.book import Book
+from ..python_library.holdings_index import HoldingsIndex, TitleAvailability
+
+
+class InMemoryBookRepository(BookRepository):
+    """
+    SOLUTION: In-memory Book Repository
+    
+    Books are kept in a dict keyed by id, and the ids of available books are
+    kept in an AvailabilityIndex so availability queries never scan the
+    whole catalog. Copies of multi-copy titles are also kept in a
+    HoldingsIndex, so a free copy of a title is found in O(1). Both are
+    refreshed by save/update/delete, so callers must call update() after
+    changing a book's availability. Writes hold a lock, so the repository
+    can be shared between threads.
+    """
+    
+    def __init__(self):
+        self._books: Dict[str, Book] = {}
+        self._available = AvailabilityIndex()
+        self._holdings = HoldingsIndex()
+        self._lock = threading.RLock()
+    
+    def save(self, book: Book) -> None:
+        """Save a book to the repository"""
+        with self._lock:
+            previous = self._books.get(book.get_id())
+            self._books[book.get_id()] = book
+            self._index_holdings(previous, book)
+            self._index_availability(book)
+    
+    def find_by_id(self, book_id: str) -> Optional[Book]:
+        """Find a book by its ID"""
+        return self._books.get(book_id)
+    
+    def update(self, book: Book) -> None:
+        """Update an existing book in the repository"""
+        with self._lock:
+            previous = self._books.get(book.get_id())
+            if previous is None:
+                raise KeyError(f"Book not found: {book.get_id()}")
+            self._books[book.get_id()] = book
+            self._index_holdings(previous, book)
+            self._index_availability(book)
+    
+    def delete(self, book_id: str) -> None:
+        """Delete a book from the repository"""
+        with self._lock:
+            book = self._books.pop(book_id, None)
+            if book is not None:
+                self._holdings.remove(book)
+            self._available.discard(book_id)
+    
+    def find_all(self) -> List[Book]:
+        """Get all books from the repository"""
+        return list(self._books.values())
+    
+    def find_available(self) -> List[Book]:
+        """Get all available books without scanning unavailable ones"""
+        return list(self.iter_available())
+    
+    def iter_available(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[Book]:
+        """Stream available books from the availability set"""
+        books = self._books
+        for book_id in self._available.iter_pages(offset, limit):
+            # Skip books deleted by another thread while streaming
+            book = books.get(book_id)
+            if book is not None:
+                yield book
+    
+    def find_free_copies(self, title_id: str, limit: int = 1) -> List[Book]:
+        """Up to limit available copies of a title, from the holdings index"""
+        if title_id not in self._holdings:
+            book = self._books.get(title_id)
+            if book is None or book.get_title_id() != title_id or not book.is_available() or limit <= 0:
+                return []
+            return [book]
+        books = self._books
+        return [books[copy_id] for copy_id in self._holdings.free_copies(title_id, limit)]
+    
+    def count_copies(self, title_id: str) -> int:
+        """Number of copies of a title, from the holdings index"""
+        counts = self._holdings.counts(title_id)
+        if counts is not None:
+            return counts[1]
+        book = self._books.get(title_id)
+        return 1 if book is not None and book.get_title_id() == title_id else 0
+    
+    def available_titles(self) -> List[TitleAvailability]:
+        """Every title with a free copy, with its free and total copy counts"""
+        return list(self._holdings.available_titles(self.iter_available()))
+    
+    def count_available(self) -> int:
+        """Get the number of available books"""
+        return len(self._available)
+    
+    def __len__(self) -> int:
+        return len(self._books)
+    
+    def _index_holdings(self, previous: Optional[Book], book: Book) -> None:
+        # The same object saved again only needs its availability refreshed
+        if previous is not book:
+            if previous is not None:
+                self._holdings.remove(previous)
+            self._holdings.add(book, self._books.get)
+    
+    def _index_availability(self, book: Book) -> None:
+        if book.is_available():
+            self._available.add(book.get_id())
+        else:
+            self._available.discard(book.get_id())
+        self._holdings.set_available(book)
@@ -0,0 +1,114 @@
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from .loan_repository import LoanRepository
+from ..python_library.loan import Loan
+from ..python_library.loan_date_index import LoanDateIndex
+
+
+class InMemoryLoanRepository(LoanRepository):
+    """
+    SOLUTION: In-memory Loan Repository with secondary indexes
+    
+    Besides the primary loan id -> loan dict this repository maintains:
+    1. member id -> loan ids, so find_by_member_id (run on every borrow to
+       enforce the borrowing limit) costs O(member's loans), not O(all loans)
+    2. book id -> open loan id, so the loan holding a book is an O(1) lookup
+    3. loan ids ordered by borrow date, so due-date queries cost O(log n + k)
+    
+    save/update/delete keep both indexes consistent. The member and book ids a
+    loan was indexed under are remembered, so update() re-indexes correctly even
+    if the Loan object was mutated in place. A lock makes every call atomic, so
+    the repository can be shared between threads.
+    """
+    
+    def __init__(self):
+        self._loans: Dict[str, Loan] = {}
+        self._loan_ids_by_member: Dict[str, Dict[str, None]] = {}
+        self._loan_id_by_book: Dict[str, str] = {}
+        self._indexed_keys: Dict[str, Tuple[str, str]] = {}
+        self._borrow_dates = LoanDateIndex()
+        self._lock = threading.RLock()
+    
+    def save(self, loan: Loan) -> None:
+        """Save a loan to the repository"""
+        with self._lock:
+            loan_id = loan.get_id()
+            if loan_id in self._loans:
+                self._unindex(loan_id)
+            self._loans[loan_id] = loan
+            self._index(loan)
+    
+    def find_by_id(self, loan_id: str) -> Optional[Loan]:
+        """Find a loan by its ID"""
+        return self._loans.get(loan_id)
+    
+    def update(self, loan: Loan) -> None:
+        """Update an existing loan in the repository"""
+        with self._lock:
+            loan_id = loan.get_id()
+            if loan_id not in self._loans:
+                raise KeyError(f"Loan not found: {loan_id}")
+            self._unindex(loan_id)
+            self._loans[loan_id] = loan
+            self._index(loan)
+    
+    def delete(self, loan_id: str) -> None:
+        """Delete a loan from the repository"""
+        with self._lock:
+            if self._loans.pop(loan_id, None) is not None:
+                self._unindex(loan_id)
+    
+    def find_all(self) -> List[Loan]:
+        """Get all loans from the repository"""
+        return list(self._loans.values())
+    
+    def find_by_member_id(self, member_id: str) -> List[Loan]:
+        """Find all loans for a specific member"""
+        with self._lock:
+            loan_ids = self._loan_ids_by_member.get(member_id)
+            if not loan_ids:
+                return []
+            loans = self._loans
+            return [loans[loan_id] for loan_id in loan_ids]
+    
+    def count_by_member_id(self, member_id: str) -> int:
+        """Count the loans for a specific member in O(1)"""
+        return len(self._loan_ids_by_member.get(member_id, ()))
+    
+    def find_by_book_id(self, book_id: str) -> Optional[Loan]:
+        """Find the open loan for a specific book"""
+        loan_id = self._loan_id_by_book.get(book_id)
+        return self._loans.get(loan_id) if loan_id is not None else None
+    
+    def find_by_borrow_date_range(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                                  limit: Optional[int] = None) -> List[Loan]:
+        """Find loans with start <= borrow date < end, earliest first, from the date index"""
+        with self._lock:
+            loans = self._loans
+            return [loans[loan_id] for loan_id in self._borrow_dates.range(start, end, limit)]
+    
+    def __len__(self) -> int:
+        return len(self._loans)
+    
+    def _index(self, loan: Loan) -> None:
+        loan_id = loan.get_id()
+        member_id = loan.get_member_id()
+        book_id = loan.get_book_id()
+        self._loan_ids_by_member.setdefault(member_id, {})[loan_id] = None
+        self._loan_id_by_book[book_id] = loan_id
+        self._indexed_keys[loan_id] = (member_id, book_id)
+        if loan.get_borrow_date() is not None:
+            self._borrow_dates.add(loan_id, loan.get_borrow_date())
+    
+    def _unindex(self, loan_id: str) -> None:
+        member_id, book_id = self._indexed_keys.pop(loan_id)
+        member_loans = self._loan_ids_by_member.get(member_id)
+        if member_loans is not None:
+            member_loans.pop(loan_id, None)
+            if not member_loans:
+                del self._loan_ids_by_member[member_id]
+        if self._loan_id_by_book.get(book_id) == loan_id:
+            del self._loan_id_by_book[book_id]
+        self._borrow_dates.remove(loan_id)
@@ -0,0 +1,40 @@
+from typing import Dict, List, Optional
+
+from .member_repository import MemberRepository
+from ..python_library.member import Member
+
+
+class InMemoryMemberRepository(MemberRepository):
+    """
+    SOLUTION: In-memory Member Repository
+    
+    Members are kept in a dict keyed by id for O(1) lookups.
+    """
+    
+    def __init__(self):
+        self._members: Dict[str, Member] = {}
+    
+    def save(self, member: Member) -> None:
+        """Save a member to the repository"""
+        self._members[member.get_id()] = member
+    
+    def find_by_id(self, member_id: str) -> Optional[Member]:
+        """Find a member by their ID"""
+        return self._members.get(member_id)
+    
+    def update(self, member: Member) -> None:
+        """Update an existing member in the repository"""
+        if member.get_id() not in self._members:
+            raise KeyError(f"Member not found: {member.get_id()}")
+        self._members[member.get_id()] = member
+    
+    def delete(self, member_id: str) -> None:
+        """Delete a member from the repository"""
+        self._members.pop(member_id, None)
+    
+    def find_all(self) -> List[Member]:
+        """Get all members from the repository"""
+        return list(self._members.values())
+    
+    def __len__(self) -> int:
+        return len(self._members)
@@ -0,0 +1,146 @@
+from abc import ABC, abstractmethod
+from array import array
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from .fine_calculation_strategy import FineCalculationStrategy
+from .loan_chunk import LoanChunk
+from ..python_library.columnar_store import NO_DATE, to_micros
+
+
+class LoanAggregation(ABC):
+    """
+    SOLUTION: A per-loan job that NightlyJobRunner splits over processes
+    
+    A job is a fold in two halves:
+    1. map_chunk runs in a worker process on one LoanChunk and returns a
+       partial result; the job returned by for_chunk is pickled along with
+       the chunk, so it must be picklable and small, and should keep its
+       partials compact (arrays over lists of objects, positions in the
+       chunk over IDs)
+    2. merge runs in the calling process, in chunk order, and folds each
+       partial into the result started by empty(); it is passed the chunk
+       too, so a partial can refer to loans by position
+    3. finish turns the folded result into what the runner returns
+    
+    Anything the job depends on, like "now", must be fixed when the job is
+    built, not read in map_chunk, so every worker sees the same value.
+    """
+    
+    def empty(self) -> Any:
+        """The result before any chunk is merged"""
+        return None
+    
+    def for_chunk(self, chunk: LoanChunk) -> 'LoanAggregation':
+        """
+        The job to send with chunk; runs in the calling process
+        
+        Override it to resolve here what map_chunk needs but should not be
+        pickled, like a repository or a connection. The default is the job itself.
+        """
+        return self
+    
+    @abstractmethod
+    def map_chunk(self, chunk: LoanChunk) -> Any:
+        """Partial result of one chunk; runs in a worker process"""
+        pass
+    
+    @abstractmethod
+    def merge(self, result: Any, chunk: LoanChunk, partial: Any) -> Any:
+        """Fold a chunk's partial result into result and return it"""
+        pass
+    
+    def finish(self, result: Any) -> Any:
+        """The job's final result"""
+        return result
+
+
+class LoanFines(LoanAggregation):
+    """
+    SOLUTION: Fines of every loan as of one instant, like ImprovedLibraryService.calculate_fines
+    
+    Each worker rebuilds its chunk's loans and prices them with one
+    calculate_fines_batch call, so the strategy sees the member IDs it may
+    need; the fines come back as a float array aligned with the chunk.
+    Workers get the strategy's for_members() copy for the chunk's members,
+    so a strategy backed by a member repository is resolved in the calling
+    process and the repository is never pickled.
+    """
+    
+    def __init__(self, fine_strategy: FineCalculationStrategy, loan_duration_days: int,
+                 as_of: Optional[datetime] = None):
+        self.fine_strategy = fine_strategy
+        self.loan_duration_days = loan_duration_days
+        self.as_of = as_of or datetime.now()
+    
+    def empty(self) -> Dict[str, float]:
+        return {}
+    
+    def for_chunk(self, chunk: LoanChunk) -> 'LoanFines':
+        strategy = self.fine_strategy.for_members(chunk.members)
+        if strategy is self.fine_strategy:
+            return self
+        return LoanFines(strategy, self.loan_duration_days, self.as_of)
+    
+    def map_chunk(self, chunk: LoanChunk) -> array:
+        return array('d', self.fine_strategy.calculate_fines_batch(chunk.loans(), self.loan_duration_days,
+                                                                   self.as_of))
+    
+    def merge(self, result: Dict[str, float], chunk: LoanChunk, partial: array) -> Dict[str, float]:
+        result.update(zip(chunk.loan_ids, partial))
+        return result
+
+
+class OverdueLoans(LoanAggregation):
+    """
+    SOLUTION: IDs of the loans past their due date, most overdue first
+    
+    The order of ImprovedLibraryService.get_overdue_loans. Workers compare
+    the encoded borrow dates with the cutoff and return the positions of
+    the overdue loans, which are sorted by (borrow date, ID) at the end.
+    No Loan objects are built: a nightly run may find most loans overdue.
+    """
+    
+    def __init__(self, loan_duration_days: int, as_of: Optional[datetime] = None):
+        cutoff = (as_of or datetime.now()) - timedelta(days=loan_duration_days)
+        self.cutoff_micros = to_micros(cutoff)
+    
+    def empty(self) -> List[Tuple[int, str]]:
+        return []
+    
+    def map_chunk(self, chunk: LoanChunk) -> array:
+        cutoff = self.cutoff_micros
+        return array('I', (index for index, micros in enumerate(chunk.borrow_micros)
+                           if micros < cutoff and micros != NO_DATE))
+    
+    def merge(self, result: List[Tuple[int, str]], chunk: LoanChunk, partial: array) -> List[Tuple[int, str]]:
+        loan_ids, borrow_micros = chunk.loan_ids, chunk.borrow_micros
+        result.extend([(borrow_micros[index], loan_ids[index]) for index in partial])
+        return result
+    
+    def finish(self, result: List[Tuple[int, str]]) -> List[str]:
+        result.sort()
+        return [loan_id for _, loan_id in result]
+
+
+class MemberLoanCounts(LoanAggregation):
+    """
+    SOLUTION: Number of open loans of each member
+    
+    Workers count the chunk's dictionary-encoded member indexes, so the
+    partial is one count per distinct member of the chunk.
+    """
+    
+    def empty(self) -> Dict[str, int]:
+        return {}
+    
+    def map_chunk(self, chunk: LoanChunk) -> array:
+        counts = array('I', bytes(4 * len(chunk.members)))
+        for index in chunk.member_index:
+            counts[index] += 1
+        return counts
+    
+    def merge(self, result: Dict[str, int], chunk: LoanChunk, partial: array) -> Dict[str, int]:
+        for member_id, count in zip(chunk.members, partial):
+            result[member_id] = result.get(member_id, 0) + count
+        return result
@@ -0,0 +1,115 @@
+from array import array
+from datetime import datetime
+from itertools import accumulate
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..python_library.columnar_store import NO_DATE, from_micros, to_micros
+from ..python_library.loan import Loan
+
+
+class LoanChunk:
+    """
+    SOLUTION: A run of loans in a columnar encoding that is cheap to pickle
+    
+    Shipping Loan objects to another process pickles every object and its
+    four attributes one by one. A chunk instead holds a handful of flat
+    columns, so it pickles as a few strings and byte buffers:
+    1. Loan and book IDs are each concatenated into one string, with an
+       array of their lengths
+    2. Member IDs are dictionary-encoded: the distinct IDs once, plus an
+       index into them per loan
+    3. Borrow dates are microseconds since 1970-01-01 in an int64 array,
+       with NO_DATE for loans without one (the encoding of the columnar
+       store, which numpy reads as NaT)
+    
+    The columns are decoded lazily and the decoded lists are not pickled.
+    Borrow dates are naive, like the rest of the service; a missing
+    member or book ID comes back as an empty string.
+    """
+    
+    __slots__ = ('_loan_ids', '_loan_id_lengths', '_book_ids', '_book_id_lengths',
+                 '_members', '_member_lengths', '_member_index', '_borrow_micros', '_decoded')
+    
+    def __init__(self, loan_ids: Tuple[str, array], book_ids: Tuple[str, array], members: Tuple[str, array],
+                 member_index: array, borrow_micros: array):
+        self._loan_ids, self._loan_id_lengths = loan_ids
+        self._book_ids, self._book_id_lengths = book_ids
+        self._members, self._member_lengths = members
+        self._member_index = member_index
+        self._borrow_micros = borrow_micros
+        self._decoded: Dict[str, List[str]] = {}
+    
+    @classmethod
+    def encode(cls, loans: Iterable[Loan]) -> 'LoanChunk':
+        """Encode loans into a chunk, keeping their order"""
+        loans = list(loans)
+        # Column by column: this runs in the calling process for every loan of a run
+        members: Dict[str, int] = {}
+        member_index = array('I', [members.setdefault(loan.get_member_id() or '', len(members)) for loan in loans])
+        borrow_micros = array('q', [to_micros(loan.get_borrow_date()) for loan in loans])
+        return cls(_join([loan.get_id() for loan in loans]), _join([loan.get_book_id() or '' for loan in loans]),
+                   _join(list(members)), member_index, borrow_micros)
+    
+    def __len__(self) -> int:
+        return len(self._member_index)
+    
+    @property
+    def loan_ids(self) -> List[str]:
+        return self._decode('loan_ids', self._loan_ids, self._loan_id_lengths)
+    
+    @property
+    def book_ids(self) -> List[str]:
+        return self._decode('book_ids', self._book_ids, self._book_id_lengths)
+    
+    @property
+    def members(self) -> List[str]:
+        """The distinct member IDs of the chunk, in the order member_index refers to them"""
+        return self._decode('members', self._members, self._member_lengths)
+    
+    @property
+    def member_index(self) -> array:
+        """Per loan, the position of its member in members"""
+        return self._member_index
+    
+    @property
+    def borrow_micros(self) -> array:
+        """Per loan, the borrow date in microseconds since 1970-01-01, or NO_DATE"""
+        return self._borrow_micros
+    
+    def member_ids(self) -> List[str]:
+        """The member ID of each loan"""
+        members = self.members
+        return [members[index] for index in self._member_index]
+    
+    def borrow_date(self, index: int) -> Optional[datetime]:
+        return from_micros(self._borrow_micros[index])
+    
+    def loan(self, index: int) -> Loan:
+        """Rebuild the loan at index"""
+        return Loan(self.loan_ids[index], self.members[self._member_index[index]], self.book_ids[index],
+                    self.borrow_date(index))
+    
+    def loans(self) -> List[Loan]:
+        """Rebuild every loan of the chunk"""
+        members = self.members
+        return [Loan(loan_id, members[member], book_id, from_micros(micros))
+                for loan_id, member, book_id, micros
+                in zip(self.loan_ids, self._member_index, self.book_ids, self._borrow_micros)]
+    
+    def __getstate__(self):
+        return ((self._loan_ids, self._loan_id_lengths), (self._book_ids, self._book_id_lengths),
+                (self._members, self._member_lengths), self._member_index, self._borrow_micros)
+    
+    def __setstate__(self, state) -> None:
+        self.__init__(*state)
+    
+    def _decode(self, column: str, text: str, lengths: array) -> List[str]:
+        values = self._decoded.get(column)
+        if values is None:
+            ends = list(accumulate(lengths))
+            values = self._decoded[column] = [text[end - length:end] for end, length in zip(ends, lengths)]
+        return values
+
+
+def _join(values: List[str]) -> Tuple[str, array]:
+    return ''.join(values), array('I', map(len, values))
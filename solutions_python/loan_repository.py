@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
 
 from ..python_library.loan import Loan
 
@@ -38,3 +39,66 @@ class LoanRepository(ABC):
     def find_by_member_id(self, member_id: str) -> List[Loan]:
         """Find all loans for a specific member"""
         pass
+    
+    # SOLUTION: Bulk operations. The defaults fall back to one call per loan;
+    # backends with real round trips should override them.
+    
+    def find_by_ids(self, loan_ids: Iterable[str]) -> Dict[str, Loan]:
+        """Find several loans by ID, returning only the ones that exist"""
+        found = {}
+        for loan_id in loan_ids:
+            loan = self.find_by_id(loan_id)
+            if loan is not None:
+                found[loan_id] = loan
+        return found
+    
+    def save_many(self, loans: Iterable[Loan]) -> None:
+        """Save several loans to the repository"""
+        for loan in loans:
+            self.save(loan)
+    
+    def update_many(self, loans: Iterable[Loan]) -> None:
+        """Update several existing loans in the repository"""
+        for loan in loans:
+            self.update(loan)
+    
+    def delete_many(self, loan_ids: Iterable[str]) -> None:
+        """Delete several loans from the repository"""
+        for loan_id in loan_ids:
+            self.delete(loan_id)
+    
+    def iter_all(self) -> Iterator[Loan]:
+        """
+        Stream every loan in the repository
+        
+        The default iterates find_all(); backends that load rows on demand
+        should override it to fetch page by page.
+        """
+        return iter(self.find_all())
+    
+    def find_by_member_ids(self, member_ids: Iterable[str]) -> Dict[str, List[Loan]]:
+        """Find the loans of several members, keyed by member ID"""
+        return {member_id: self.find_by_member_id(member_id) for member_id in member_ids}
+    
+    def find_by_book_id(self, book_id: str) -> Optional[Loan]:
+        """
+        Find the open loan for a specific book
+        
+        The default scans every loan; backends should serve it from an index
+        on book ID.
+        """
+        return next((loan for loan in self.iter_all() if loan.get_book_id() == book_id), None)
+    
+    def find_by_borrow_date_range(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                                  limit: Optional[int] = None) -> List[Loan]:
+        """
+        Find loans with start <= borrow date < end, earliest first, at most limit of them
+        
+        The default scans and sorts every loan; backends should serve it from an
+        index ordered by borrow date.
+        """
+        loans = [loan for loan in self.find_all()
+                 if (start is None or loan.get_borrow_date() >= start)
+                 and (end is None or loan.get_borrow_date() < end)]
+        loans.sort(key=lambda loan: (loan.get_borrow_date(), loan.get_id()))
+        return loans[:limit] if limit is not None else loans
@@ -0,0 +1,146 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Hashable, Iterable, List, NamedTuple, Optional, Tuple, TypeVar
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+_MISSING = object()
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    size: int
+    
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LRUCache(Generic[K, V]):
+    """
+    SOLUTION: Bounded least-recently-used cache with an optional time to live
+    
+    1. An OrderedDict keeps entries in recency order, so a hit moves the
+       entry to the end and an insert past capacity evicts the first one,
+       both in O(1)
+    2. With a ttl, each entry carries an expiry time on the monotonic clock
+       and is dropped when it is found expired
+    3. Every write bumps a generation counter. A loader reads generation()
+       before going to the backend and passes it back to put(), which drops
+       the value if a write happened meanwhile, so a slow read can never
+       overwrite a newer write with the data it fetched before it
+    
+    None is a valid cached value (a known-missing key). All operations hold
+    one lock, so the cache can be shared between threads.
+    """
+    
+    def __init__(self, capacity: int, ttl: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self._capacity = capacity
+        self._ttl = ttl
+        self._clock = clock
+        self._entries: 'OrderedDict[K, Tuple[V, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+    
+    def get(self, key: K, default=None):
+        """The cached value for key, or default if it is missing or expired"""
+        with self._lock:
+            return self._lookup(key, default)
+    
+    def get_many(self, keys: Iterable[K]) -> Tuple[Dict[K, V], List[K]]:
+        """The cached values for keys plus the keys that were missing or expired"""
+        found, missing = {}, []
+        with self._lock:
+            for key in keys:
+                value = self._lookup(key, _MISSING)
+                if value is _MISSING:
+                    missing.append(key)
+                else:
+                    found[key] = value
+        return found, missing
+    
+    def get_or_load(self, key: K, loader: Callable[[K], V]) -> V:
+        """The cached value for key, loading and caching it on a miss"""
+        with self._lock:
+            value = self._lookup(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            generation = self._generation
+        # The loader runs without the lock, so a slow backend does not block other keys
+        value = loader(key)
+        self.put(key, value, generation)
+        return value
+    
+    def generation(self) -> int:
+        """The write counter to pass to put() for a value about to be loaded"""
+        with self._lock:
+            return self._generation
+    
+    def put(self, key: K, value: V, generation: Optional[int] = None) -> None:
+        """
+        Cache value under key
+        
+        Writes leave generation out. A value loaded from the backend passes
+        the generation() read before loading it, and is dropped if any
+        write happened since.
+        """
+        with self._lock:
+            if generation is None:
+                self._generation += 1
+            elif generation != self._generation:
+                return
+            expires = self._clock() + self._ttl if self._ttl is not None else 0.0
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._capacity:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+    
+    def invalidate(self, key: K) -> None:
+        """Drop key from the cache"""
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        """Drop every entry, keeping the counters"""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+    
+    def stats(self) -> CacheStats:
+        """Hit, miss, eviction and expiration counts since the cache was created"""
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, self._expirations, len(self._entries))
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def _lookup(self, key: K, default):
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return default
+        value, expires = entry
+        if self._ttl is not None and expires <= self._clock():
+            del self._entries[key]
+            self._expirations += 1
+            self._misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return value
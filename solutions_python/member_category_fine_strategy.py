@@ -0,0 +1,138 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+from .daily_rate_fine_strategy import DailyRateFineStrategy
+from .fine_calculation_strategy import FineCalculationStrategy, np
+from .member_repository import MemberRepository
+from ..python_library.loan import Loan
+
+
+class MemberCategoryFineStrategy(FineCalculationStrategy):
+    """
+    SOLUTION: Fine strategy registry keyed by member category
+    
+    Lets one service charge students, staff and the public differently:
+    1. Each category maps to its own strategy; unknown categories and
+       unknown members fall back to the default strategy
+    2. A member's strategy is resolved from their category once and kept
+       in a member id -> strategy dict, so later fines cost one dict lookup
+    3. calculate_fines_batch looks up the uncached members with a single
+       find_by_ids, groups the loans by strategy and makes one
+       calculate_fines_batch call per strategy rather than one per loan
+    
+    Call invalidate(member_id) after changing a member's category.
+    for_members(member_ids) returns a copy without the member repository,
+    holding only those members' strategies, to send to worker processes.
+    """
+    
+    def __init__(self, member_repository: MemberRepository,
+                 strategies: Mapping[str, FineCalculationStrategy],
+                 default: FineCalculationStrategy):
+        self._member_repository = member_repository
+        self._strategies = dict(strategies)
+        self._default = default
+        self._by_member: Dict[str, FineCalculationStrategy] = {}
+    
+    @classmethod
+    def from_rates(cls, member_repository: MemberRepository, rates: Mapping[str, float],
+                   default: FineCalculationStrategy) -> 'MemberCategoryFineStrategy':
+        """Build the registry from a category -> daily rate table"""
+        strategies = {category: DailyRateFineStrategy(rate) for category, rate in rates.items()}
+        return cls(member_repository, strategies, default)
+    
+    def strategy_for_category(self, category: str) -> FineCalculationStrategy:
+        """The strategy registered for category, or the default"""
+        return self._strategies.get(category, self._default)
+    
+    def strategy_for_member(self, member_id: str) -> FineCalculationStrategy:
+        """The strategy for the member's category, resolved once per member"""
+        strategy = self._by_member.get(member_id)
+        if strategy is None:
+            member = self._member_repository.find_by_id(member_id)
+            if member is None:
+                # Not cached: the member may be added later
+                return self._default
+            strategy = self._by_member[member_id] = self.strategy_for_category(member.get_category())
+        return strategy
+    
+    def invalidate(self, member_id: Optional[str] = None) -> None:
+        """Forget the cached strategy of one member, or of every member"""
+        if member_id is None:
+            self._by_member.clear()
+        else:
+            self._by_member.pop(member_id, None)
+    
+    def for_members(self, member_ids: Iterable[str]) -> 'MemberCategoryFineStrategy':
+        """A copy that prices these members without a repository: their strategies are resolved here"""
+        member_ids = set(member_ids)
+        self._resolve_members(member_ids)
+        detached = MemberCategoryFineStrategy(None, self._strategies, self._default)
+        get, default = self._by_member.get, self._default
+        detached._by_member = {member_id: get(member_id, default) for member_id in member_ids}
+        return detached
+    
+    def calculate_fine(self, loan: Loan, loan_duration_days: int) -> float:
+        """Calculate fine with the strategy of the loan's member"""
+        if loan is None:
+            return 0.0
+        return self.strategy_for_member(loan.get_member_id()).calculate_fine(loan, loan_duration_days)
+    
+    def calculate_fines_batch(self, loans: Sequence[Loan], loan_duration_days: int,
+                              as_of: Optional[datetime] = None) -> List[float]:
+        """Calculate fines for many loans with one batch call per strategy"""
+        if len(loans) == 1 and loans[0] is not None:
+            return self.strategy_for_member(loans[0].get_member_id()).calculate_fines_batch(
+                loans, loan_duration_days, as_of)
+        member_ids = [loan.get_member_id() if loan is not None else None for loan in loans]
+        get = self._by_member.get
+        strategies = [get(member_id) for member_id in member_ids]
+        if None in strategies:
+            self._resolve_members({member_id for member_id, strategy in zip(member_ids, strategies)
+                                   if strategy is None and member_id is not None})
+            default = self._default
+            strategies = [get(member_id, default) for member_id in member_ids]
+        
+        distinct = set(strategies)
+        if len(distinct) == 1:
+            # Every loan has the same strategy: its batch is already aligned with loans
+            return distinct.pop().calculate_fines_batch(loans, loan_duration_days, as_of)
+        group_fines = {}
+        for strategy in distinct:
+            group = [loan for loan, loan_strategy in zip(loans, strategies) if loan_strategy is strategy]
+            group_fines[strategy] = iter(strategy.calculate_fines_batch(group, loan_duration_days, as_of))
+        # Each group's fines come back in loan order, so they are dealt out in the same order
+        return [next(group_fines[strategy]) for strategy in strategies]
+    
+    def calculate_fines_array(self, borrow_dates, loan_duration_days: int,
+                              as_of: Optional[datetime] = None, member_ids: Optional[Sequence[str]] = None):
+        """
+        Calculate fines for a datetime64 array of borrow dates, one array call per strategy
+        
+        member_ids is required and parallel to borrow_dates: the dates alone do
+        not say whose rate applies.
+        """
+        if member_ids is None:
+            raise TypeError("MemberCategoryFineStrategy.calculate_fines_array needs the loans' member_ids")
+        if len(member_ids) != len(borrow_dates):
+            raise ValueError("member_ids and borrow_dates must have the same length")
+        self._resolve_members(set(member_ids))
+        get, default = self._by_member.get, self._default
+        strategies = [get(member_id, default) for member_id in member_ids]
+        distinct = set(strategies)
+        if len(distinct) <= 1:
+            strategy = distinct.pop() if distinct else default
+            return strategy.calculate_fines_array(borrow_dates, loan_duration_days, as_of)
+        fines = np.zeros(len(borrow_dates), dtype=float)
+        for strategy in distinct:
+            group = np.fromiter((loan_strategy is strategy for loan_strategy in strategies),
+                                dtype=bool, count=len(strategies))
+            fines[group] = strategy.calculate_fines_array(borrow_dates[group], loan_duration_days, as_of)
+        return fines
+    
+    def _resolve_members(self, member_ids: Iterable[str]) -> None:
+        missing = [member_id for member_id in member_ids if member_id not in self._by_member]
+        if not missing:
+            return
+        members = self._member_repository.find_by_ids(missing)
+        for member_id, member in members.items():
+            self._by_member[member_id] = self.strategy_for_category(member.get_category())
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 
 from ..python_library.member import Member
 
@@ -33,3 +33,39 @@ class MemberRepository(ABC):
     def find_all(self) -> List[Member]:
         """Get all members from the repository"""
         pass
+    
+    # SOLUTION: Bulk operations. The defaults fall back to one call per member;
+    # backends with real round trips should override them.
+    
+    def find_by_ids(self, member_ids: Iterable[str]) -> Dict[str, Member]:
+        """Find several members by ID, returning only the ones that exist"""
+        found = {}
+        for member_id in member_ids:
+            member = self.find_by_id(member_id)
+            if member is not None:
+                found[member_id] = member
+        return found
+    
+    def save_many(self, members: Iterable[Member]) -> None:
+        """Save several members to the repository"""
+        for member in members:
+            self.save(member)
+    
+    def update_many(self, members: Iterable[Member]) -> None:
+        """Update several existing members in the repository"""
+        for member in members:
+            self.update(member)
+    
+    def delete_many(self, member_ids: Iterable[str]) -> None:
+        """Delete several members from the repository"""
+        for member_id in member_ids:
+            self.delete(member_id)
+    
+    def iter_all(self) -> Iterator[Member]:
+        """
+        Stream every member in the repository
+        
+        The default iterates find_all(); backends that load rows on demand
+        should override it to fetch page by page.
+        """
+        return iter(self.find_all())
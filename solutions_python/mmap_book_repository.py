@@ -0,0 +1,161 @@
+import threading
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from .book_repository import BookRepository
+from .catalog_file import CatalogFile, Row
+from ..python_library.book import Book
+
+
+class MmapBookRepository(BookRepository):
+    """
+    SOLUTION: Book repository served lazily from a memory-mapped catalog file
+    
+    1. Opening maps a CatalogFile written by write_catalog(), so startup
+       costs O(1) however many books the catalog holds
+    2. find_by_id materializes a Book only when its id is first requested
+       and keeps it, so the service can update it like an in-memory book
+    3. Writes go to an in-memory overlay (saved books and deleted ids) on
+       top of the read-only file; write_catalog(path, repository.iter_all())
+       folds them into a new catalog
+    
+    find_all() and iter_available() scan the file and build Book objects as
+    they go, so they cost O(catalog) like any full scan. The first
+    find_free_copies() call also scans it once, to index the copies of
+    multi-copy titles. Writes hold a lock, so the repository can be shared
+    between threads.
+    """
+    
+    FIELDS = 4  # id, title, author, title id ('' for a single-copy title); the flags byte holds availability
+    
+    def __init__(self, path: str):
+        self._catalog = CatalogFile(path)
+        if self._catalog.field_count != self.FIELDS:
+            self._catalog.close()
+            raise ValueError(f"Not a book catalog: {path}")
+        self._books: Dict[str, Book] = {}   # materialized and written books
+        self._added: Set[str] = set()       # ids written that the file does not hold
+        self._deleted: Set[str] = set()     # file ids deleted since opening
+        self._title_copies: Optional[Dict[str, Set[str]]] = None   # built on first use
+        self._lock = threading.RLock()
+    
+    @classmethod
+    def write_catalog(cls, path: str, books: Iterable[Book]) -> int:
+        """Write books to a new catalog file at path and return how many were written"""
+        rows = (((book.get_id(), book.get_title(), book.get_author(),
+                  book.get_title_id() if book.get_title_id() != book.get_id() else ''), int(book.is_available()))
+                for book in books)
+        return CatalogFile.write(path, rows, cls.FIELDS)
+    
+    def save(self, book: Book) -> None:
+        """Save a book to the overlay"""
+        with self._lock:
+            book_id = book.get_id()
+            if book_id not in self._books and book_id not in self._catalog:
+                self._added.add(book_id)
+            self._books[book_id] = book
+            self._deleted.discard(book_id)
+            self._index_title(book)
+    
+    def find_by_id(self, book_id: str) -> Optional[Book]:
+        """Find a book by its ID, materializing it from the catalog on first access"""
+        book = self._books.get(book_id)
+        if book is not None or book_id in self._deleted:
+            return book
+        row = self._catalog.get(book_id)
+        if row is None:
+            return None
+        with self._lock:
+            # Another thread may have materialized, written or deleted it meanwhile
+            book = self._books.get(book_id)
+            if book is None and book_id not in self._deleted:
+                book = self._books[book_id] = self._materialize(row)
+            return book
+    
+    def update(self, book: Book) -> None:
+        """Update an existing book in the overlay"""
+        with self._lock:
+            if self.find_by_id(book.get_id()) is None:
+                raise KeyError(f"Book not found: {book.get_id()}")
+            self._books[book.get_id()] = book
+            self._index_title(book)
+    
+    def delete(self, book_id: str) -> None:
+        """Delete a book from the repository"""
+        with self._lock:
+            self._books.pop(book_id, None)
+            self._added.discard(book_id)
+            if book_id in self._catalog:
+                self._deleted.add(book_id)
+    
+    def find_all(self) -> List[Book]:
+        """Get all books from the repository"""
+        return list(self.iter_all())
+    
+    def iter_all(self) -> Iterator[Book]:
+        """Stream every book, catalog order first, then books added since opening"""
+        books, deleted = self._books, self._deleted
+        for row in self._catalog:
+            book_id = row[0][0]
+            book = books.get(book_id)
+            if book is not None:
+                yield book
+            elif book_id not in deleted:
+                yield self._materialize(row)
+        for book_id in list(self._added):
+            book = books.get(book_id)
+            if book is not None:
+                yield book
+    
+    def iter_available(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[Book]:
+        """Stream available books by scanning the catalog, skipping the first offset of them"""
+        stop = offset + limit if limit is not None else None
+        return islice((book for book in self.iter_all() if book.is_available()), offset, stop)
+    
+    def find_free_copies(self, title_id: str, limit: int = 1) -> List[Book]:
+        """Up to limit available copies of a title, checking each of its copies"""
+        copies = []
+        for book in self._copies(title_id):
+            if len(copies) >= limit:
+                break
+            if book.is_available():
+                copies.append(book)
+        return copies
+    
+    def count_copies(self, title_id: str) -> int:
+        """Number of copies of a title, checking each of its copies"""
+        return sum(1 for _ in self._copies(title_id))
+    
+    def close(self) -> None:
+        """Release the memory mapping"""
+        self._catalog.close()
+    
+    def __len__(self) -> int:
+        return len(self._catalog) - len(self._deleted) + len(self._added)
+    
+    def _copies(self, title_id: str) -> Iterator[Book]:
+        with self._lock:
+            if self._title_copies is None:
+                self._title_copies = {}
+                for fields, _ in self._catalog:
+                    if fields[3]:
+                        self._title_copies.setdefault(fields[3], set()).add(fields[0])
+                for book in self._books.values():
+                    self._index_title(book)
+            copy_ids = [title_id] + list(self._title_copies.get(title_id, ()))
+        # The index may list copies deleted or moved to another title since; find_by_id has the truth
+        for copy_id in copy_ids:
+            book = self.find_by_id(copy_id)
+            if book is not None and book.get_title_id() == title_id:
+                yield book
+    
+    def _index_title(self, book: Book) -> None:
+        if self._title_copies is not None and book.get_title_id() != book.get_id():
+            self._title_copies.setdefault(book.get_title_id(), set()).add(book.get_id())
+    
+    @staticmethod
+    def _materialize(row: Row) -> Book:
+        fields, flags = row
+        book = Book(*fields)
+        book.set_available(bool(flags & 1))
+        return book
@@ -0,0 +1,102 @@
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from .catalog_file import CatalogFile, Row
+from .member_repository import MemberRepository
+from ..python_library.member import Member
+
+
+class MmapMemberRepository(MemberRepository):
+    """
+    SOLUTION: Member repository served lazily from a memory-mapped catalog file
+    
+    Same design as MmapBookRepository: O(1) open, members materialized on
+    first find_by_id, and writes kept in an in-memory overlay.
+    """
+    
+    FIELDS = 4  # id, name, email, category
+    
+    def __init__(self, path: str):
+        self._catalog = CatalogFile(path)
+        if self._catalog.field_count != self.FIELDS:
+            self._catalog.close()
+            raise ValueError(f"Not a member catalog: {path}")
+        self._members: Dict[str, Member] = {}
+        self._added: Set[str] = set()
+        self._deleted: Set[str] = set()
+        self._lock = threading.RLock()
+    
+    @classmethod
+    def write_catalog(cls, path: str, members: Iterable[Member]) -> int:
+        """Write members to a new catalog file at path and return how many were written"""
+        rows = (((member.get_id(), member.get_name(), member.get_email(), member.get_category()), 0)
+                for member in members)
+        return CatalogFile.write(path, rows, cls.FIELDS)
+    
+    def save(self, member: Member) -> None:
+        """Save a member to the overlay"""
+        with self._lock:
+            member_id = member.get_id()
+            if member_id not in self._members and member_id not in self._catalog:
+                self._added.add(member_id)
+            self._members[member_id] = member
+            self._deleted.discard(member_id)
+    
+    def find_by_id(self, member_id: str) -> Optional[Member]:
+        """Find a member by their ID, materializing them from the catalog on first access"""
+        member = self._members.get(member_id)
+        if member is not None or member_id in self._deleted:
+            return member
+        row = self._catalog.get(member_id)
+        if row is None:
+            return None
+        with self._lock:
+            member = self._members.get(member_id)
+            if member is None and member_id not in self._deleted:
+                member = self._members[member_id] = self._materialize(row)
+            return member
+    
+    def update(self, member: Member) -> None:
+        """Update an existing member in the overlay"""
+        with self._lock:
+            if self.find_by_id(member.get_id()) is None:
+                raise KeyError(f"Member not found: {member.get_id()}")
+            self._members[member.get_id()] = member
+    
+    def delete(self, member_id: str) -> None:
+        """Delete a member from the repository"""
+        with self._lock:
+            self._members.pop(member_id, None)
+            self._added.discard(member_id)
+            if member_id in self._catalog:
+                self._deleted.add(member_id)
+    
+    def find_all(self) -> List[Member]:
+        """Get all members from the repository"""
+        return list(self.iter_all())
+    
+    def iter_all(self) -> Iterator[Member]:
+        """Stream every member, catalog order first, then members added since opening"""
+        members, deleted = self._members, self._deleted
+        for row in self._catalog:
+            member_id = row[0][0]
+            member = members.get(member_id)
+            if member is not None:
+                yield member
+            elif member_id not in deleted:
+                yield self._materialize(row)
+        for member_id in list(self._added):
+            member = members.get(member_id)
+            if member is not None:
+                yield member
+    
+    def close(self) -> None:
+        """Release the memory mapping"""
+        self._catalog.close()
+    
+    def __len__(self) -> int:
+        return len(self._catalog) - len(self._deleted) + len(self._added)
+    
+    @staticmethod
+    def _materialize(row: Row) -> Member:
+        return Member(*row[0])
@@ -0,0 +1,115 @@
+import itertools
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence
+
+from .fine_calculation_strategy import FineCalculationStrategy
+from .improved_library_service import ImprovedLibraryService
+from .loan_aggregations import LoanAggregation, LoanFines, MemberLoanCounts, OverdueLoans
+from .loan_chunk import LoanChunk
+from .loan_repository import LoanRepository
+
+
+class NightlyJobRunner:
+    """
+    SOLUTION: Runs per-loan batch jobs over every open loan on a process pool
+    
+    1. The loans are streamed from the repository with iter_all() and cut
+       into chunks of chunk_size, each encoded as a LoanChunk, so workers
+       receive a few flat buffers rather than pickled Loan objects
+    2. Each chunk goes to a ProcessPoolExecutor with every job of the run,
+       so the loans are read and shipped once however many jobs there are;
+       each job is shipped as its for_chunk() copy, which leaves behind
+       what workers must not receive (e.g. a member repository)
+    3. Partial results are merged in chunk order as they arrive; at most
+       a few chunks per worker are in flight, so memory stays bounded
+       while the repository is still being read
+    
+    The calling process reads and encodes the loans while the workers
+    price them, so the run takes at least as long as one pass of iter_all().
+    With workers=0 the jobs run in the calling process, on the same chunks.
+    """
+    
+    DEFAULT_CHUNK_SIZE = 20_000
+    CHUNKS_IN_FLIGHT_PER_WORKER = 2
+    
+    def __init__(self, loan_repository: LoanRepository, workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, mp_context=None):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.loan_repository = loan_repository
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.chunk_size = chunk_size
+        self._mp_context = mp_context
+    
+    def run(self, jobs: Mapping[str, LoanAggregation], executor: Optional[Executor] = None) -> Dict[str, Any]:
+        """
+        SOLUTION: Run every job over every loan in one pass; returns each job's result by name
+        
+        Pass an executor to reuse a pool across runs; by default one is
+        started for the run and shut down after it.
+        """
+        names = list(jobs)
+        aggregations = [jobs[name] for name in names]
+        results = [aggregation.empty() for aggregation in aggregations]
+        
+        def merge(chunk: LoanChunk, partials: List[Any]) -> None:
+            for i, (aggregation, partial) in enumerate(zip(aggregations, partials)):
+                results[i] = aggregation.merge(results[i], chunk, partial)
+        
+        if executor is None and self.workers == 0:
+            for chunk in self._chunks():
+                merge(chunk, _map_chunk(_for_chunk(aggregations, chunk), chunk))
+        else:
+            pool = executor or ProcessPoolExecutor(self.workers, mp_context=self._mp_context)
+            try:
+                in_flight = self.CHUNKS_IN_FLIGHT_PER_WORKER * max(1, self.workers)
+                pending = deque()
+                for chunk in self._chunks():
+                    pending.append((chunk, pool.submit(_map_chunk, _for_chunk(aggregations, chunk), chunk)))
+                    if len(pending) >= in_flight:
+                        chunk, future = pending.popleft()
+                        merge(chunk, future.result())
+                while pending:
+                    chunk, future = pending.popleft()
+                    merge(chunk, future.result())
+            finally:
+                if executor is None:
+                    pool.shutdown(cancel_futures=True)
+        
+        return {name: aggregation.finish(result) for name, aggregation, result in zip(names, aggregations, results)}
+    
+    def run_nightly(self, fine_strategy: FineCalculationStrategy,
+                    loan_duration_days: int = ImprovedLibraryService.LOAN_DURATION_DAYS,
+                    as_of: Optional[datetime] = None, executor: Optional[Executor] = None) -> Dict[str, Any]:
+        """
+        SOLUTION: The nightly batch in one pass
+        
+        Returns 'fines' (loan ID -> fine), 'overdue' (IDs of the overdue
+        loans, most overdue first) and 'member_loan_counts' (member ID ->
+        open loans), all as of one instant.
+        """
+        as_of = as_of or datetime.now()
+        return self.run({
+            'fines': LoanFines(fine_strategy, loan_duration_days, as_of),
+            'overdue': OverdueLoans(loan_duration_days, as_of),
+            'member_loan_counts': MemberLoanCounts(),
+        }, executor)
+    
+    def _chunks(self) -> Iterator[LoanChunk]:
+        loans = self.loan_repository.iter_all()
+        while True:
+            chunk = LoanChunk.encode(itertools.islice(loans, self.chunk_size))
+            if not len(chunk):
+                return
+            yield chunk
+
+
+def _for_chunk(aggregations: Sequence[LoanAggregation], chunk: LoanChunk) -> List[LoanAggregation]:
+    return [aggregation.for_chunk(chunk) for aggregation in aggregations]
+
+
+def _map_chunk(aggregations: Sequence[LoanAggregation], chunk: LoanChunk) -> List[Any]:
+    return [aggregation.map_chunk(chunk) for aggregation in aggregations]
@@ -0,0 +1,129 @@
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from .book_repository import BookRepository
+from ..python_library.book import Book
+from ..python_library.holdings_index import TitleAvailability
+from ..python_library.search_index import BookSearchIndex
+
+
+class SearchableBookRepository(BookRepository):
+    """
+    SOLUTION: Decorator that adds an in-memory search index to any BookRepository
+    
+    1. Writes go to the wrapped repository first, then to the index, so the
+       index never lists a book the repository rejected
+    2. search() ranks ids in the index and loads the hits with one
+       find_by_ids() call
+    3. Availability is tracked alongside the index, so available-only
+       searches filter without loading books
+    
+    The index is built from find_all() when the decorator is created, and is
+    only kept in sync for writes made through the decorator. Index reads and
+    writes hold a lock, so the decorator can be shared between threads.
+    """
+    
+    def __init__(self, repository: BookRepository):
+        self._repository = repository
+        self._index = BookSearchIndex()
+        self._unavailable: Set[str] = set()
+        self._lock = threading.RLock()
+        for book in repository.find_all():
+            self._index_book(book)
+    
+    def save(self, book: Book) -> None:
+        """Save a book and index it"""
+        self._repository.save(book)
+        self._index_book(book)
+    
+    def find_by_id(self, book_id: str) -> Optional[Book]:
+        """Find a book by its ID"""
+        return self._repository.find_by_id(book_id)
+    
+    def update(self, book: Book) -> None:
+        """Update a book and reindex it"""
+        self._repository.update(book)
+        self._index_book(book)
+    
+    def delete(self, book_id: str) -> None:
+        """Delete a book and drop it from the index"""
+        self._repository.delete(book_id)
+        self._unindex_book(book_id)
+    
+    def find_all(self) -> List[Book]:
+        """Get all books from the repository"""
+        return self._repository.find_all()
+    
+    def iter_all(self) -> Iterator[Book]:
+        """Stream every book from the wrapped repository"""
+        return self._repository.iter_all()
+    
+    def find_by_ids(self, book_ids: Iterable[str]) -> Dict[str, Book]:
+        """Find several books by ID, returning only the ones that exist"""
+        return self._repository.find_by_ids(book_ids)
+    
+    def save_many(self, books: Iterable[Book]) -> None:
+        """Save several books and index them"""
+        books = list(books)
+        self._repository.save_many(books)
+        for book in books:
+            self._index_book(book)
+    
+    def update_many(self, books: Iterable[Book]) -> None:
+        """Update several books and reindex them"""
+        books = list(books)
+        self._repository.update_many(books)
+        for book in books:
+            self._index_book(book)
+    
+    def delete_many(self, book_ids: Iterable[str]) -> None:
+        """Delete several books and drop them from the index"""
+        book_ids = list(book_ids)
+        self._repository.delete_many(book_ids)
+        for book_id in book_ids:
+            self._unindex_book(book_id)
+    
+    def iter_available(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[Book]:
+        """Stream available books from the wrapped repository"""
+        return self._repository.iter_available(offset, limit)
+    
+    def find_free_copies(self, title_id: str, limit: int = 1) -> List[Book]:
+        """Free copies of a title from the wrapped repository"""
+        return self._repository.find_free_copies(title_id, limit)
+    
+    def count_copies(self, title_id: str) -> int:
+        """Copy count of a title from the wrapped repository"""
+        return self._repository.count_copies(title_id)
+    
+    def available_titles(self) -> List[TitleAvailability]:
+        """Titles with free copies from the wrapped repository"""
+        return self._repository.available_titles()
+    
+    def search(self, query: str, limit: int = 10, available_only: bool = False) -> List[Book]:
+        """Find books whose title or author matches query, best match first"""
+        unavailable = self._unavailable
+        predicate = (lambda book_id: book_id not in unavailable) if available_only else None
+        with self._lock:
+            book_ids = self._index.search(query, limit, predicate=predicate)
+        if not book_ids:
+            return []
+        found = self._repository.find_by_ids(book_ids)
+        return [found[book_id] for book_id in book_ids if book_id in found]
+    
+    def suggest(self, prefix: str, limit: int = 10) -> List[str]:
+        """Autocomplete a title or author word"""
+        with self._lock:
+            return self._index.suggest(prefix, limit)
+    
+    def _index_book(self, book: Book) -> None:
+        with self._lock:
+            self._index.add(book)
+            if book.is_available():
+                self._unavailable.discard(book.get_id())
+            else:
+                self._unavailable.add(book.get_id())
+    
+    def _unindex_book(self, book_id: str) -> None:
+        with self._lock:
+            self._index.remove(book_id)
+            self._unavailable.discard(book_id)
@@ -0,0 +1,129 @@
+import functools
+import inspect
+import time
+from typing import Callable, Dict, List, Optional
+
+from .borrow_result import BorrowResult
+from .return_result import ReturnResult
+from .service_metrics import ServiceMetrics
+
+
+class _TimedComponent:
+    """Times every method call on a wrapped repository, strategy or ledger"""
+    
+    def __init__(self, target: object, name: str, metrics: ServiceMetrics):
+        self._target = target
+        self._name = name
+        self._metrics = metrics
+    
+    def __getattr__(self, attribute: str):
+        value = getattr(self._target, attribute)
+        if attribute.startswith('__') or not callable(value):
+            return value
+        timed = _timed(value, f"{self._name}.{attribute}", self._metrics, count_results=False)
+        # Cache the wrapper so later calls skip __getattr__
+        setattr(self, attribute, timed)
+        return timed
+    
+    def __len__(self) -> int:
+        return len(self._target)
+
+
+def _timed(method: Callable, operation: str, metrics: ServiceMetrics, count_results: bool) -> Callable:
+    perf_counter, record = time.perf_counter, metrics.recorder(operation)
+    
+    @functools.wraps(method)
+    def timed(*args, **kwargs):
+        start = perf_counter()
+        try:
+            result = method(*args, **kwargs)
+        except Exception as error:
+            record(perf_counter() - start, args)
+            metrics.count_error(operation, error)
+            raise
+        record(perf_counter() - start, args)
+        if count_results:
+            _count_results(metrics, operation, result)
+        return result
+    
+    return timed
+
+
+def _count_results(metrics: ServiceMetrics, operation: str, result: object) -> None:
+    # BorrowResult/ReturnResult, or a list of them from the batch methods
+    for item in (result if isinstance(result, list) else (result,)):
+        if isinstance(item, (BorrowResult, ReturnResult)):
+            metrics.count_result(operation, item.is_success(), item.get_message())
+
+
+class ServiceInstrumentation:
+    """
+    SOLUTION: Opt-in timing of a service and of the calls it makes
+    
+    enable() swaps instrumented wrappers into one ImprovedLibraryService (or
+    ConcurrentLibraryService) instance; disable() puts the originals back:
+    1. Every public service method, plus borrow request validation, is
+       timed under its own name, and BorrowResult/ReturnResult outcomes are
+       counted by message
+    2. The repositories, the fine strategy and the fine ledger are wrapped
+       in proxies that time each call as "<attribute>.<method>" and count
+       the exceptions the service would otherwise swallow
+    3. Calls at or above the metrics' slow threshold are sampled with their
+       arguments
+    
+    Nothing is patched while disabled, so a service that never enables
+    instrumentation, or has disabled it, runs its original code. The
+    wrappers live on the instance, not the class; other services are
+    unaffected. Only synchronous services are supported.
+    """
+    
+    COMPONENTS = ('book_repository', 'member_repository', 'loan_repository', 'fine_strategy', 'fine_ledger')
+    PRIVATE_METHODS = {'_validate_borrow_request': 'validate_borrow_request'}
+    
+    def __init__(self, service, metrics: Optional[ServiceMetrics] = None):
+        self.service = service
+        self.metrics = metrics or ServiceMetrics()
+        self._originals: Dict[str, object] = {}
+        self._patched_methods: List[str] = []
+    
+    @property
+    def enabled(self) -> bool:
+        return bool(self._originals or self._patched_methods)
+    
+    def enable(self) -> None:
+        """Swap the instrumented wrappers into the service; does nothing if already enabled"""
+        if self.enabled:
+            return
+        service, metrics = self.service, self.metrics
+        for attribute in self.COMPONENTS:
+            component = getattr(service, attribute, None)
+            if component is not None:
+                self._originals[attribute] = component
+                setattr(service, attribute, _TimedComponent(component, attribute, metrics))
+        for name in self._service_methods():
+            operation = self.PRIVATE_METHODS.get(name, name)
+            setattr(service, name, _timed(getattr(service, name), operation, metrics, count_results=True))
+            self._patched_methods.append(name)
+    
+    def disable(self) -> None:
+        """Put the original repositories and methods back"""
+        for attribute, component in self._originals.items():
+            setattr(self.service, attribute, component)
+        for name in self._patched_methods:
+            # The wrapper is an instance attribute shadowing the class method
+            delattr(self.service, name)
+        self._originals.clear()
+        self._patched_methods.clear()
+    
+    def __enter__(self) -> 'ServiceInstrumentation':
+        self.enable()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.disable()
+    
+    def _service_methods(self) -> List[str]:
+        service_class = type(self.service)
+        return [name for name in dir(service_class)
+                if (not name.startswith('_') or name in self.PRIVATE_METHODS)
+                and inspect.isfunction(inspect.getattr_static(service_class, name))]
@@ -0,0 +1,265 @@
+import json
+import reprlib
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+
+class SlowOperation(NamedTuple):
+    """One call that took at least the slow threshold"""
+    operation: str
+    seconds: float
+    started_at: float   # time.time() when the call started
+    detail: str         # the call's arguments, shortened
+
+
+class _Shard:
+    """The histograms and counters one thread records into"""
+    
+    def __init__(self, owner: Optional[threading.Thread] = None):
+        self.owner = owner   # the recording thread; None for the shard of retired threads
+        # operation -> [count per bucket..., count above the last bucket, sum of seconds]
+        self.histograms: Dict[str, List[float]] = {}
+        self.results: Dict[Tuple[str, str, str], int] = {}
+        self.errors: Dict[Tuple[str, str], int] = {}
+    
+    def histogram(self, operation: str, bucket_count: int) -> List[float]:
+        histogram = self.histograms.get(operation)
+        if histogram is None:
+            histogram = self.histograms[operation] = [0] * (bucket_count + 1) + [0.0]
+        return histogram
+    
+    def add(self, other: '_Shard') -> None:
+        """Fold another shard's counts into this one"""
+        for operation, histogram in other.histograms.items():
+            total = self.histogram(operation, len(histogram) - 2)
+            for index, value in enumerate(histogram):
+                total[index] += value
+        for key, count in other.results.items():
+            self.results[key] = self.results.get(key, 0) + count
+        for key, count in other.errors.items():
+            self.errors[key] = self.errors.get(key, 0) + count
+    
+    def reset(self) -> None:
+        # Zeroed in place, the owning thread may be holding a histogram
+        for histogram in self.histograms.values():
+            histogram[:] = [0] * (len(histogram) - 1) + [0.0]
+        self.results.clear()
+        self.errors.clear()
+
+
+class ServiceMetrics:
+    """
+    SOLUTION: In-process metrics registry for the service layer
+    
+    Collected by ServiceInstrumentation, read by whoever exports them:
+    1. A latency histogram per operation ("borrow_book",
+       "book_repository.find_by_id", ...) with fixed cumulative buckets, so
+       recording is a bisect and two increments
+    2. Result counters per operation, outcome and message, so failures that
+       the service turns into BorrowResult/ReturnResult messages are counted
+    3. Error counters per operation and exception type for repository calls
+       that raised
+    4. The most recent slow operations (at least slow_threshold seconds),
+       with their arguments
+    
+    snapshot() returns plain dicts, to_json() and to_prometheus() the two
+    export formats. Each thread records into its own shard without taking a
+    lock; snapshots add the shards up. The shards of threads that have
+    exited are folded into one retired shard whenever a new thread starts
+    recording or a snapshot is taken, so a pool that replaces its threads
+    does not grow the list.
+    """
+    
+    # Upper bounds in seconds, from 5us to 1s
+    DEFAULT_BUCKETS = (0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+                       0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+    DEFAULT_SLOW_THRESHOLD = 0.01
+    DEFAULT_SLOW_SAMPLES = 100
+    
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS,
+                 slow_threshold: float = DEFAULT_SLOW_THRESHOLD, slow_samples: int = DEFAULT_SLOW_SAMPLES):
+        if list(buckets) != sorted(set(buckets)) or not buckets:
+            raise ValueError("buckets must be a non-empty, strictly increasing sequence")
+        self.buckets: Tuple[float, ...] = tuple(buckets)
+        self.slow_threshold = slow_threshold
+        # Each thread records into its own shard, so recording takes no lock; snapshot() adds them up
+        self._local = threading.local()
+        self._retired = _Shard()
+        self._shards: List[_Shard] = [self._retired]
+        self._slow: Deque[SlowOperation] = deque(maxlen=slow_samples)
+        self._lock = threading.Lock()
+    
+    def observe(self, operation: str, seconds: float, detail: object = None) -> None:
+        """Record one call of operation that took seconds"""
+        self.recorder(operation)(seconds, detail)
+    
+    def recorder(self, operation: str) -> Callable[[float, object], None]:
+        """A function recording calls of operation, for hot paths"""
+        local, buckets = self._local, self.buckets
+        
+        def record(seconds: float, detail: object = None) -> None:
+            try:
+                histogram = local.shard.histograms[operation]
+            except (AttributeError, KeyError):
+                histogram = self._shard().histogram(operation, len(buckets))
+            histogram[bisect_left(buckets, seconds)] += 1
+            histogram[-1] += seconds
+            if seconds >= self.slow_threshold:
+                sample = SlowOperation(operation, seconds, time.time() - seconds, self._shorten(detail))
+                with self._lock:
+                    self._slow.append(sample)
+        
+        return record
+    
+    def count_result(self, operation: str, success: bool, message: str) -> None:
+        """Count one BorrowResult/ReturnResult-style outcome of operation"""
+        results = self._shard().results
+        key = (operation, 'success' if success else 'failure', self._message_label(message))
+        results[key] = results.get(key, 0) + 1
+    
+    def count_error(self, operation: str, error: BaseException) -> None:
+        """Count one exception raised by operation"""
+        errors = self._shard().errors
+        key = (operation, type(error).__name__)
+        errors[key] = errors.get(key, 0) + 1
+    
+    def slow_operations(self) -> List[SlowOperation]:
+        """The most recent slow operations, oldest first"""
+        with self._lock:
+            return list(self._slow)
+    
+    def reset(self) -> None:
+        """
+        Forget everything recorded so far
+        
+        Approximate while other threads record: they write to their shards
+        without the lock, so an increment racing the reset may survive it or
+        be lost.
+        """
+        with self._lock:
+            for shard in self._shards:
+                shard.reset()
+            self._slow.clear()
+    
+    def snapshot(self) -> dict:
+        """Everything recorded so far as plain dicts and lists (bucket counts are cumulative)"""
+        histograms: Dict[str, List[float]] = {}
+        results: Dict[Tuple[str, str, str], int] = {}
+        errors: Dict[Tuple[str, str], int] = {}
+        with self._lock:
+            self._retire_dead_shards()
+            for shard in self._shards:
+                # list() copies each dict in one step, even while its thread keeps recording
+                for operation, histogram in list(shard.histograms.items()):
+                    total = histograms.setdefault(operation, [0] * len(histogram))
+                    for index, value in enumerate(list(histogram)):
+                        total[index] += value
+                for key, count in list(shard.results.items()):
+                    results[key] = results.get(key, 0) + count
+                for key, count in list(shard.errors.items()):
+                    errors[key] = errors.get(key, 0) + count
+            slow = list(self._slow)
+        latency = {}
+        for operation, histogram in sorted(histograms.items()):
+            counts, total = histogram[:-1], histogram[-1]
+            count = sum(counts)
+            if not count:
+                continue
+            latency[operation] = {
+                'count': count,
+                'sum_seconds': total,
+                'mean_seconds': total / count if count else 0.0,
+                'p50_seconds': self._quantile(counts, count, 0.50),
+                'p99_seconds': self._quantile(counts, count, 0.99),
+                'buckets': self._cumulative(counts),
+            }
+        return {
+            'latency': latency,
+            'results': [{'operation': operation, 'outcome': outcome, 'message': message, 'count': count}
+                        for (operation, outcome, message), count in sorted(results.items())],
+            'errors': [{'operation': operation, 'exception': exception, 'count': count}
+                       for (operation, exception), count in sorted(errors.items())],
+            'slow_operations': [operation._asdict() for operation in slow],
+        }
+    
+    def to_json(self, indent: Optional[int] = None) -> str:
+        """The snapshot as JSON"""
+        return json.dumps(self.snapshot(), indent=indent)
+    
+    def to_prometheus(self, prefix: str = 'library') -> str:
+        """The counters and histograms in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = [f"# HELP {prefix}_operation_seconds Latency of service methods and repository calls",
+                 f"# TYPE {prefix}_operation_seconds histogram"]
+        for operation, histogram in snapshot['latency'].items():
+            labels = f'operation="{self._escape(operation)}"'
+            for bound, count in histogram['buckets']:
+                lines.append(f'{prefix}_operation_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f"{prefix}_operation_seconds_sum{{{labels}}} {histogram['sum_seconds']!r}")
+            lines.append(f"{prefix}_operation_seconds_count{{{labels}}} {histogram['count']}")
+        lines += [f"# HELP {prefix}_results_total Service results by outcome and message",
+                  f"# TYPE {prefix}_results_total counter"]
+        for result in snapshot['results']:
+            lines.append(f'{prefix}_results_total{{operation="{self._escape(result["operation"])}",'
+                         f'outcome="{result["outcome"]}",message="{self._escape(result["message"])}"}} '
+                         f'{result["count"]}')
+        lines += [f"# HELP {prefix}_errors_total Exceptions raised by instrumented calls",
+                  f"# TYPE {prefix}_errors_total counter"]
+        for error in snapshot['errors']:
+            lines.append(f'{prefix}_errors_total{{operation="{self._escape(error["operation"])}",'
+                         f'exception="{self._escape(error["exception"])}"}} {error["count"]}')
+        return "\n".join(lines) + "\n"
+    
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = _Shard(threading.current_thread())
+            with self._lock:
+                self._retire_dead_shards()
+                self._shards.append(shard)
+        return shard
+    
+    def _retire_dead_shards(self) -> None:
+        # Called with the lock held; a thread that has exited can no longer write to its shard
+        live = [self._retired]
+        for shard in self._shards[1:]:
+            if shard.owner.is_alive():
+                live.append(shard)
+            else:
+                self._retired.add(shard)
+        self._shards = live
+    
+    def _cumulative(self, counts: List[int]) -> List[Tuple[str, int]]:
+        running, buckets = 0, []
+        for bound, count in zip(self.buckets + (None,), counts):
+            running += count
+            buckets.append((repr(bound) if bound is not None else '+Inf', running))
+        return buckets
+    
+    def _quantile(self, counts: List[int], count: int, quantile: float) -> Optional[float]:
+        # The upper bound of the bucket holding the quantile; None if it is above the last bucket
+        if not count:
+            return None
+        rank, running = quantile * count, 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            running += bucket_count
+            if running >= rank:
+                return bound
+        return None
+    
+    @staticmethod
+    def _message_label(message: str) -> str:
+        # "Failed to borrow book: <exception text>" -> "Failed to borrow book", keeping label values few
+        return (message or '').split(':', 1)[0]
+    
+    @staticmethod
+    def _shorten(detail: object) -> str:
+        # reprlib caps the elements and characters shown, so a huge batch argument stays cheap
+        return '' if detail is None else reprlib.repr(detail)
+    
+    @staticmethod
+    def _escape(value: str) -> str:
+        return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
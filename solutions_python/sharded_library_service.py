@@ -0,0 +1,404 @@
+import multiprocessing
+import os
+import threading
+import zlib
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .borrow_result import BorrowResult
+from .improved_library_service import ImprovedLibraryService
+from .in_memory_book_repository import InMemoryBookRepository
+from .in_memory_loan_repository import InMemoryLoanRepository
+from .in_memory_member_repository import InMemoryMemberRepository
+from .return_result import ReturnResult
+from .sqlite_book_repository import SQLiteBookRepository
+from .sqlite_connection_pool import SQLiteConnectionPool
+from .sqlite_loan_repository import SQLiteLoanRepository
+from .sqlite_member_repository import SQLiteMemberRepository
+from .standard_fine_strategy import StandardFineStrategy
+from ..python_library.book import Book
+from ..python_library.loan import Loan
+from ..python_library.loan_id_generator import LoanIdGenerator
+from ..python_library.member import Member
+
+
+class ShardedLibraryService:
+    """
+    SOLUTION: Library service partitioned across worker processes
+    
+    One interpreter runs on one core however many threads serve it. This
+    router starts one process per shard, each with its own
+    ImprovedLibraryService, and talks to them over pipes:
+    1. Books, and the loans of those books, live on the shard picked by a
+       stable hash of the book's title ID, so every copy of a title is on
+       one shard; members are replicated to every shard
+    2. Loan IDs carry their shard ("3:<id>"), so returns and fine lookups
+       go straight to it
+    3. MAX_BOOKS_PER_MEMBER is checked here, against a count of each
+       member's open loans over all shards, since a shard only sees its
+       own; a borrow reserves a loan before it is sent and gives it back
+       if its shard refuses or fails, whatever the other shards answered
+    4. borrow_books/return_books send each shard its part of the batch
+       before waiting for any, so the shards work in parallel
+    
+    Shards are built in the worker by service_factory(shard), which must be
+    picklable: in_memory_shard, or functools.partial(sqlite_shard, directory)
+    for one database file per shard that survives restarts. Copies and loans
+    already in the shards are read back at startup. Calls from several threads
+    are safe; each shard serves one call at a time. Holds and catalog
+    queries are not routed: use one ImprovedLibraryService per shard for those.
+    """
+    
+    MAX_BOOKS_PER_MEMBER = ImprovedLibraryService.MAX_BOOKS_PER_MEMBER
+    LOAN_ID_SEPARATOR = ':'
+    
+    def __init__(self, workers: int,
+                 service_factory: Optional[Callable[[int], ImprovedLibraryService]] = None,
+                 start_method: Optional[str] = None):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        context = multiprocessing.get_context(start_method)
+        self._connections = []
+        self._processes = []
+        for shard in range(workers):
+            parent, child = context.Pipe()
+            process = context.Process(target=_serve_shard, args=(child, service_factory or in_memory_shard, shard),
+                                      name=f"library-shard-{shard}", daemon=True)
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+        self._shard_locks = [threading.Lock() for _ in range(workers)]
+        self._titles: Dict[str, str] = {}        # copy ID -> title ID, for copies whose ID is not their title's
+        self._loan_counts: Dict[str, int] = {}   # member ID -> open loans over all shards
+        self._counts_lock = threading.Lock()
+        for titles in self._call_all('copy_titles').values():
+            self._titles.update(titles)
+        for counts in self._call_all('loan_counts').values():
+            for member_id, count in counts.items():
+                self._loan_counts[member_id] = self._loan_counts.get(member_id, 0) + count
+    
+    @property
+    def workers(self) -> int:
+        return len(self._connections)
+    
+    def add_book(self, book: Book) -> bool:
+        """Add a book to its title's shard"""
+        return self.add_books([book]) == 1
+    
+    def add_books(self, books: Iterable[Book]) -> int:
+        """Add books with one bulk save per shard; returns how many were added, on the shards that saved them"""
+        by_shard: Dict[int, List[Book]] = {}
+        for book in books:
+            if book is None or not book.get_id() or not book.get_id().strip():
+                continue
+            if book.get_title_id() != book.get_id():
+                self._titles[book.get_id()] = book.get_title_id()
+            by_shard.setdefault(self._shard_of(book.get_id()), []).append(book)
+        # Each shard's save stands on its own: a failing shard does not undo the books the others saved
+        replies = self._call_each({shard: ('save_books', (part,)) for shard, part in by_shard.items()})
+        return sum(len(part) for shard, part in by_shard.items() if replies[shard][0])
+    
+    def add_member(self, member: Member) -> bool:
+        """Add a member to every shard"""
+        return self.add_members([member]) == 1
+    
+    def add_members(self, members: Iterable[Member]) -> int:
+        """
+        SOLUTION: Add members to every shard with one bulk save each; returns how many were added
+        
+        Returns 0 if no shard saved them. If only some shards did, the members
+        are on those shards alone, so this raises a RuntimeError naming the
+        shards that failed; saving is an upsert, so calling again is safe.
+        """
+        members = [member for member in members if member is not None and member.get_id() and member.get_id().strip()]
+        replies = self._call_each({shard: ('save_members', (members,)) for shard in range(len(self._connections))})
+        failed = sorted(shard for shard, (ok, _) in replies.items() if not ok)
+        if not failed:
+            return len(members)
+        if len(failed) == len(replies):
+            return 0
+        error = replies[failed[0]][1]
+        raise RuntimeError(f"Members were saved on some shards but not on shards {failed}: {error}") from error
+    
+    def borrow_book(self, member_id: str, book_id: str) -> BorrowResult:
+        """
+        SOLUTION: borrow_book on the book's shard, with the borrowing limit checked over all shards
+        """
+        return self.borrow_books([(member_id, book_id)])[0]
+    
+    def borrow_books(self, batch: Iterable[Tuple[str, str]]) -> List[BorrowResult]:
+        """
+        SOLUTION: Batch borrow, one borrow_books call per shard involved
+        
+        Pairs are checked against the borrowing limit in order, as if borrowed
+        one at a time; each shard then applies the other rules to its pairs.
+        """
+        requests = list(batch)
+        results: List[Optional[BorrowResult]] = [None] * len(requests)
+        by_shard: Dict[int, List[int]] = {}
+        with self._counts_lock:
+            for index, (member_id, book_id) in enumerate(requests):
+                if not member_id or not member_id.strip():
+                    results[index] = BorrowResult.failure("Member ID cannot be null or empty")
+                    continue
+                if not book_id or not book_id.strip():
+                    results[index] = BorrowResult.failure("Book ID cannot be null or empty")
+                    continue
+                if self._loan_counts.get(member_id, 0) >= self.MAX_BOOKS_PER_MEMBER:
+                    results[index] = BorrowResult.failure(
+                        f"Member has reached maximum borrowing limit of {self.MAX_BOOKS_PER_MEMBER} books")
+                    continue
+                self._loan_counts[member_id] = self._loan_counts.get(member_id, 0) + 1
+                by_shard.setdefault(self._shard_of(book_id), []).append(index)
+        
+        # Each shard's reply stands on its own: a failing shard must not hide loans another one saved
+        replies = self._call_each({shard: ('borrow_books', ([requests[index] for index in indexes],))
+                                   for shard, indexes in by_shard.items()})
+        
+        released = []
+        for shard, indexes in by_shard.items():
+            ok, shard_results = replies[shard]
+            if not ok:
+                shard_results = [BorrowResult.failure(f"Failed to borrow book: {str(shard_results)}")] * len(indexes)
+            for index, result in zip(indexes, shard_results):
+                if result.is_success():
+                    loan = result.get_loan()
+                    result = BorrowResult(True, result.get_message(), self._global_loan(shard, loan))
+                else:
+                    released.append(requests[index][0])
+                results[index] = result
+        self._release(released)
+        return results
+    
+    def return_book(self, loan_id: str) -> ReturnResult:
+        """
+        SOLUTION: return_book on the loan's shard
+        """
+        return self.return_books([loan_id])[0]
+    
+    def return_books(self, loan_ids: Iterable[str]) -> List[ReturnResult]:
+        """
+        SOLUTION: Batch return, one return_books call per shard involved
+        """
+        loan_ids = list(loan_ids)
+        results: List[Optional[ReturnResult]] = [None] * len(loan_ids)
+        by_shard: Dict[int, List[int]] = {}
+        for index, loan_id in enumerate(loan_ids):
+            if not loan_id or not loan_id.strip():
+                results[index] = ReturnResult.failure("Loan ID cannot be null or empty")
+                continue
+            shard = self._split_loan_id(loan_id)[0]
+            if shard is None:
+                results[index] = ReturnResult.failure("Loan not found")
+            else:
+                by_shard.setdefault(shard, []).append(index)
+        
+        replies = self._call_each({shard: ('return_loans', ([self._split_loan_id(loan_ids[index])[1]
+                                                              for index in indexes],))
+                                   for shard, indexes in by_shard.items()})
+        
+        returned = []
+        for shard, indexes in by_shard.items():
+            ok, shard_results = replies[shard]
+            if not ok:
+                shard_results = [(ReturnResult.failure(f"Failed to return book: {str(shard_results)}"), None)
+                                 ] * len(indexes)
+            for index, (result, member_id) in zip(indexes, shard_results):
+                results[index] = result
+                if member_id is not None:
+                    returned.append(member_id)
+        self._release(returned)
+        return results
+    
+    def calculate_fine(self, loan_id: str) -> float:
+        """
+        SOLUTION: calculate_fine on the loan's shard
+        """
+        shard, local_id = self._split_loan_id(loan_id)
+        if shard is None:
+            return 0.0
+        try:
+            return self._call({shard: ('calculate_fine', (local_id,))})[shard]
+        except Exception as e:
+            return 0.0
+    
+    def get_member_loans(self, member_id: str) -> List[Loan]:
+        """
+        SOLUTION: The member's loans from every shard
+        """
+        if not member_id or not member_id.strip():
+            return []
+        try:
+            replies = self._call_all('get_member_loans', member_id)
+        except Exception as e:
+            return []
+        return [self._global_loan(shard, loan) for shard, loans in sorted(replies.items()) for loan in loans]
+    
+    def get_member_loan_count(self, member_id: str) -> int:
+        """Open loans of a member over all shards, as the borrowing limit sees them"""
+        with self._counts_lock:
+            return self._loan_counts.get(member_id, 0)
+    
+    def close(self) -> None:
+        """Stop the worker processes"""
+        for connection, lock in zip(self._connections, self._shard_locks):
+            with lock:
+                try:
+                    connection.send(None)
+                except (OSError, ValueError):
+                    pass
+                connection.close()
+        for process in self._processes:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+    
+    def __enter__(self) -> 'ShardedLibraryService':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def _shard_of(self, book_id: str) -> int:
+        # crc32 rather than hash(), which differs between processes
+        title_id = self._titles.get(book_id, book_id)
+        return zlib.crc32(title_id.encode('utf-8')) % len(self._connections)
+    
+    def _global_loan(self, shard: int, loan: Loan) -> Loan:
+        return Loan(f"{shard}{self.LOAN_ID_SEPARATOR}{loan.get_id()}", loan.get_member_id(), loan.get_book_id(),
+                    loan.get_borrow_date())
+    
+    def _split_loan_id(self, loan_id: str) -> Tuple[Optional[int], str]:
+        shard, separator, local_id = (loan_id or '').partition(self.LOAN_ID_SEPARATOR)
+        if not separator or not shard.isdigit() or int(shard) >= len(self._connections) or not local_id:
+            return None, ''
+        return int(shard), local_id
+    
+    def _release(self, member_ids: List[str]) -> None:
+        if not member_ids:
+            return
+        with self._counts_lock:
+            for member_id in member_ids:
+                count = self._loan_counts.get(member_id, 0) - 1
+                if count > 0:
+                    self._loan_counts[member_id] = count
+                else:
+                    self._loan_counts.pop(member_id, None)
+    
+    def _call_all(self, method: str, *args) -> Dict[int, object]:
+        return self._call({shard: (method, args) for shard in range(len(self._connections))})
+    
+    def _call(self, calls: Dict[int, Tuple[str, tuple]]) -> Dict[int, object]:
+        """Send every shard its call, then collect the replies; raises the first error a shard reported"""
+        replies = self._call_each(calls)
+        for shard in sorted(replies):
+            ok, value = replies[shard]
+            if not ok:
+                raise value
+        return {shard: value for shard, (ok, value) in replies.items()}
+    
+    def _call_each(self, calls: Dict[int, Tuple[str, tuple]]) -> Dict[int, Tuple[bool, object]]:
+        """Send every shard its call, then collect each shard's (ok, result or error) reply; never raises"""
+        shards = sorted(calls)
+        replies: Dict[int, Tuple[bool, object]] = {}
+        # Locks are taken in shard order, so concurrent multi-shard calls cannot deadlock
+        for shard in shards:
+            self._shard_locks[shard].acquire()
+        try:
+            sent = []
+            for shard in shards:
+                try:
+                    self._connections[shard].send(calls[shard])
+                    sent.append(shard)
+                except Exception as e:
+                    replies[shard] = (False, e)
+            # Every shard that was sent a call is read, so no reply is left in a pipe
+            for shard in sent:
+                try:
+                    replies[shard] = self._connections[shard].recv()
+                except Exception as e:
+                    replies[shard] = (False, e)
+        finally:
+            for shard in shards:
+                self._shard_locks[shard].release()
+        return replies
+
+
+def in_memory_shard(shard: int) -> ImprovedLibraryService:
+    """A shard on the in-memory repositories"""
+    return ImprovedLibraryService(InMemoryBookRepository(), InMemoryMemberRepository(), InMemoryLoanRepository(),
+                                  StandardFineStrategy(), loan_id_generator=_shard_loan_ids(shard))
+
+
+def sqlite_shard(directory: str, shard: int) -> ImprovedLibraryService:
+    """A shard on its own SQLite file in directory; bind directory with functools.partial"""
+    pool = SQLiteConnectionPool(os.path.join(directory, f"shard-{shard}.db"))
+    return ImprovedLibraryService(SQLiteBookRepository(pool), SQLiteMemberRepository(pool),
+                                  SQLiteLoanRepository(pool), StandardFineStrategy(),
+                                  loan_id_generator=_shard_loan_ids(shard))
+
+
+def _shard_loan_ids(shard: int) -> LoanIdGenerator:
+    # Loan IDs carry their shard anyway; a node per shard also keeps the local IDs apart
+    return LoanIdGenerator(shard & LoanIdGenerator.MAX_NODE_ID)
+
+
+def _copy_titles(service: ImprovedLibraryService) -> Dict[str, str]:
+    return {book.get_id(): book.get_title_id() for book in service.book_repository.iter_all()
+            if book.get_title_id() != book.get_id()}
+
+
+def _loan_counts(service: ImprovedLibraryService) -> Dict[str, int]:
+    return Counter(loan.get_member_id() for loan in service.loan_repository.iter_all())
+
+
+def _save_books(service: ImprovedLibraryService, books: List[Book]) -> None:
+    service.book_repository.save_many(books)
+
+
+def _save_members(service: ImprovedLibraryService, members: List[Member]) -> None:
+    service.member_repository.save_many(members)
+
+
+def _return_loans(service: ImprovedLibraryService, loan_ids: List[str]) -> List[Tuple[ReturnResult, Optional[str]]]:
+    # The member of each returned loan, so the router can lower its count
+    loans = service.loan_repository.find_by_ids({loan_id for loan_id in loan_ids if loan_id})
+    results = service.return_books(loan_ids)
+    return [(result, loans[loan_id].get_member_id() if result.is_success() else None)
+            for result, loan_id in zip(results, loan_ids)]
+
+
+_SHARD_COMMANDS = {
+    'borrow_books': lambda service, batch: service.borrow_books(batch),
+    'calculate_fine': lambda service, loan_id: service.calculate_fine(loan_id),
+    'copy_titles': _copy_titles,
+    'get_member_loans': lambda service, member_id: service.get_member_loans(member_id),
+    'loan_counts': _loan_counts,
+    'return_loans': _return_loans,
+    'save_books': _save_books,
+    'save_members': _save_members,
+}
+
+
+def _serve_shard(connection, service_factory: Callable[[int], ImprovedLibraryService], shard: int) -> None:
+    """Worker process loop: run each (command, args) message against the shard's service until None"""
+    try:
+        service = service_factory(shard)
+    except Exception as e:
+        service, error = None, e
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+        command, args = message
+        try:
+            if service is None:
+                raise error
+            connection.send((True, _SHARD_COMMANDS[command](service, *args)))
+        except Exception as e:
+            connection.send((False, e))
+    connection.close()
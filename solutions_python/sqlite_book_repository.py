@@ -0,0 +1,172 @@
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .book_repository import BookRepository
+from .sqlite_connection_pool import SQLiteConnectionPool
+from ..python_library.book import Book
+from ..python_library.holdings_index import TitleAvailability
+
+
+class SQLiteBookRepository(BookRepository):
+    """
+    SOLUTION: SQLite-backed Book Repository
+    
+    Books are read on demand, so nothing is loaded into memory at startup.
+    Each find/update returns or writes a single row by primary key, and
+    available books are streamed from the books(available) index in pages.
+    Free copies of a title come from the partial books(title_id, available)
+    index, which only holds copies of multi-copy titles.
+    """
+    
+    _INSERT = ("INSERT INTO books (id, title, author, available, title_id) VALUES (?, ?, ?, ?, ?) "
+               "ON CONFLICT(id) DO UPDATE SET title = excluded.title, "
+               "author = excluded.author, available = excluded.available, title_id = excluded.title_id")
+    _SELECT_BY_ID = "SELECT id, title, author, available, title_id FROM books WHERE id = ?"
+    _UPDATE = "UPDATE books SET title = ?, author = ?, available = ?, title_id = ? WHERE id = ?"
+    _DELETE = "DELETE FROM books WHERE id = ?"
+    _SELECT_BY_IDS = "SELECT id, title, author, available, title_id FROM books WHERE id IN ({})"
+    _SELECT_AVAILABLE_PAGE = ("SELECT rowid, id, title, author, available, title_id FROM books "
+                              "WHERE available = 1 AND rowid > ? ORDER BY rowid LIMIT ? OFFSET ?")
+    _SELECT_ALL = "SELECT id, title, author, available, title_id FROM books ORDER BY rowid"
+    _SELECT_PAGE = ("SELECT rowid, id, title, author, available, title_id FROM books "
+                    "WHERE rowid > ? ORDER BY rowid LIMIT ?")
+    # A title's copies carry its id in title_id, except a copy whose own id is the title id
+    _SELECT_FREE_COPIES = ("SELECT id, title, author, available, title_id FROM books "
+                           "WHERE title_id = ?1 AND available = 1 "
+                           "UNION ALL SELECT id, title, author, available, title_id FROM books "
+                           "WHERE id = ?1 AND title_id IS NULL AND available = 1 LIMIT ?2")
+    _COUNT_COPIES = ("SELECT (SELECT COUNT(*) FROM books WHERE title_id = ?1) "
+                     "+ (SELECT COUNT(*) FROM books WHERE id = ?1 AND title_id IS NULL)")
+    _SELECT_AVAILABLE_TITLES = ("SELECT COALESCE(title_id, id), MIN(title), MIN(author), SUM(available), COUNT(*) "
+                                "FROM books GROUP BY COALESCE(title_id, id) HAVING SUM(available) > 0 "
+                                "ORDER BY MIN(rowid)")
+    
+    STREAM_PAGE_SIZE = 1000
+    
+    def __init__(self, pool: SQLiteConnectionPool):
+        self._pool = pool
+    
+    def save(self, book: Book) -> None:
+        """Save a book to the repository"""
+        with self._pool.connection() as connection:
+            connection.execute(self._INSERT, self._to_row(book))
+    
+    def find_by_id(self, book_id: str) -> Optional[Book]:
+        """Find a book by its ID"""
+        with self._pool.connection() as connection:
+            row = connection.execute(self._SELECT_BY_ID, (book_id,)).fetchone()
+        return self._from_row(row) if row is not None else None
+    
+    def update(self, book: Book) -> None:
+        """Update an existing book in the repository"""
+        with self._pool.connection() as connection:
+            cursor = connection.execute(self._UPDATE, self._to_update_row(book))
+        if cursor.rowcount == 0:
+            raise KeyError(f"Book not found: {book.get_id()}")
+    
+    def delete(self, book_id: str) -> None:
+        """Delete a book from the repository"""
+        with self._pool.connection() as connection:
+            connection.execute(self._DELETE, (book_id,))
+    
+    def find_all(self) -> List[Book]:
+        """Get all books from the repository"""
+        with self._pool.connection() as connection:
+            rows = connection.execute(self._SELECT_ALL).fetchall()
+        return [self._from_row(row) for row in rows]
+    
+    def iter_all(self) -> Iterator[Book]:
+        """Stream every book page by page (keyset pagination on rowid)"""
+        last_rowid = 0
+        while True:
+            # The connection is only held while a page is fetched, never across yields
+            with self._pool.connection() as connection:
+                rows = connection.execute(self._SELECT_PAGE, (last_rowid, self.STREAM_PAGE_SIZE)).fetchall()
+            for row in rows:
+                yield self._from_row(row[1:])
+            if len(rows) < self.STREAM_PAGE_SIZE:
+                return
+            last_rowid = rows[-1][0]
+    
+    def iter_available(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[Book]:
+        """Stream available books page by page (keyset pagination on rowid)"""
+        last_rowid, skip, remaining = 0, offset, limit
+        while remaining is None or remaining > 0:
+            page_size = self.STREAM_PAGE_SIZE if remaining is None else min(self.STREAM_PAGE_SIZE, remaining)
+            # The connection is only held while a page is fetched, never across yields
+            with self._pool.connection() as connection:
+                rows = connection.execute(self._SELECT_AVAILABLE_PAGE, (last_rowid, page_size, skip)).fetchall()
+            for row in rows:
+                yield self._from_row(row[1:])
+            if len(rows) < page_size:
+                return
+            last_rowid, skip = rows[-1][0], 0
+            if remaining is not None:
+                remaining -= len(rows)
+    
+    def find_free_copies(self, title_id: str, limit: int = 1) -> List[Book]:
+        """Up to limit available copies of a title, from the title index"""
+        if limit <= 0:
+            return []
+        with self._pool.connection() as connection:
+            rows = connection.execute(self._SELECT_FREE_COPIES, (title_id, limit)).fetchall()
+        return [self._from_row(row) for row in rows]
+    
+    def count_copies(self, title_id: str) -> int:
+        """Number of copies of a title, counted from the title index"""
+        with self._pool.connection() as connection:
+            return connection.execute(self._COUNT_COPIES, (title_id,)).fetchone()[0]
+    
+    def available_titles(self) -> List[TitleAvailability]:
+        """Every title with a free copy, with its free and total copy counts, grouped in one query"""
+        with self._pool.connection() as connection:
+            rows = connection.execute(self._SELECT_AVAILABLE_TITLES).fetchall()
+        return [TitleAvailability(*row) for row in rows]
+    
+    def find_by_ids(self, book_ids: Iterable[str]) -> Dict[str, Book]:
+        """Find several books by ID with one query per chunk of IDs"""
+        found = {}
+        with self._pool.connection() as connection:
+            for chunk in self._pool.chunks(set(book_ids)):
+                sql = self._SELECT_BY_IDS.format(self._pool.placeholders(len(chunk)))
+                for row in connection.execute(sql, chunk):
+                    found[row[0]] = self._from_row(row)
+        return found
+    
+    def save_many(self, books: Iterable[Book]) -> None:
+        """Save several books in a single transaction"""
+        with self._pool.transaction() as connection:
+            connection.executemany(self._INSERT, (self._to_row(book) for book in books))
+    
+    def update_many(self, books: Iterable[Book]) -> None:
+        """Update several existing books in a single transaction"""
+        rows = [self._to_update_row(book) for book in books]
+        with self._pool.transaction() as connection:
+            cursor = connection.executemany(self._UPDATE, rows)
+            if cursor.rowcount != len(rows):
+                raise KeyError("Book not found in update_many")
+    
+    def delete_many(self, book_ids: Iterable[str]) -> None:
+        """Delete several books in a single transaction"""
+        with self._pool.transaction() as connection:
+            connection.executemany(self._DELETE, ((book_id,) for book_id in book_ids))
+    
+    @staticmethod
+    def _to_row(book: Book) -> tuple:
+        return (book.get_id(), book.get_title(), book.get_author(), int(book.is_available()),
+                SQLiteBookRepository._title_column(book))
+    
+    @staticmethod
+    def _to_update_row(book: Book) -> tuple:
+        return (book.get_title(), book.get_author(), int(book.is_available()),
+                SQLiteBookRepository._title_column(book), book.get_id())
+    
+    @staticmethod
+    def _title_column(book: Book) -> Optional[str]:
+        # NULL keeps single-copy titles out of the title index
+        return book.get_title_id() if book.get_title_id() != book.get_id() else None
+    
+    @staticmethod
+    def _from_row(row: tuple) -> Book:
+        book = Book(row[0], row[1], row[2], row[4])
+        book.set_available(bool(row[3]))
+        return book
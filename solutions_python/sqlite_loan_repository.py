@@ -0,0 +1,197 @@
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .loan_repository import LoanRepository
+from .sqlite_connection_pool import SQLiteConnectionPool
+from ..python_library.loan import Loan
+from ..python_library.loan_id_generator import LoanIdGenerator
+
+
+class SQLiteLoanRepository(LoanRepository):
+    """
+    SOLUTION: SQLite-backed Loan Repository
+    
+    find_by_member_id is served by the loans(member_id) index, so the
+    borrowing-limit check does not scan the loans table. Borrow dates are
+    stored as fixed-width ISO-8601 text, which sorts chronologically, and
+    indexed so due-date queries read only the matching rows.
+    
+    Loans are stored under integer keys (see SQLiteConnectionPool): an ID
+    from a LoanIdGenerator is looked up by key, any other by its text.
+    """
+    
+    _COLUMNS = "key, id, member_id, book_id, borrow_date"
+    _UPSERT = ("DO UPDATE SET member_id = excluded.member_id, "
+               "book_id = excluded.book_id, borrow_date = excluded.borrow_date")
+    _INSERT_KEYED = ("INSERT INTO loans (key, member_id, book_id, borrow_date) VALUES (?, ?, ?, ?) "
+                     "ON CONFLICT(key) " + _UPSERT)
+    # Text IDs take the key after the highest one below TEXT_ID_KEYS, found by one B-tree seek
+    _INSERT_TEXT_ID = ("INSERT INTO loans (key, id, member_id, book_id, borrow_date) VALUES "
+                       f"(coalesce((SELECT key FROM loans WHERE key < {SQLiteConnectionPool.TEXT_ID_KEYS} "
+                       "ORDER BY key DESC LIMIT 1), 0) + 1, ?, ?, ?, ?) "
+                       "ON CONFLICT(id) WHERE id IS NOT NULL " + _UPSERT)
+    _SELECT_BY_ID = f"SELECT {_COLUMNS} FROM loans WHERE {{}} = ?"
+    _UPDATE = "UPDATE loans SET member_id = ?, book_id = ?, borrow_date = ? WHERE {} = ?"
+    _DELETE = "DELETE FROM loans WHERE {} = ?"
+    _SELECT_BY_IDS = f"SELECT {_COLUMNS} FROM loans WHERE {{}} IN ({{}})"
+    _SELECT_ALL = f"SELECT {_COLUMNS} FROM loans ORDER BY key"
+    _SELECT_PAGE = f"SELECT {_COLUMNS} FROM loans WHERE key > ? ORDER BY key LIMIT ?"
+    _SELECT_BY_MEMBER = f"SELECT {_COLUMNS} FROM loans WHERE member_id = ? ORDER BY key"
+    _SELECT_BY_MEMBERS = f"SELECT {_COLUMNS} FROM loans WHERE member_id IN ({{}}) ORDER BY key"
+    _SELECT_BY_BORROW_DATE = (f"SELECT {_COLUMNS} FROM loans "
+                              "WHERE borrow_date >= ? AND borrow_date < ? ORDER BY borrow_date, key LIMIT ?")
+    _SELECT_BY_BOOK = f"SELECT {_COLUMNS} FROM loans WHERE book_id = ?"
+    
+    STREAM_PAGE_SIZE = 1000
+    
+    def __init__(self, pool: SQLiteConnectionPool):
+        self._pool = pool
+    
+    def save(self, loan: Loan) -> None:
+        """Save a loan to the repository"""
+        key, row = self._to_row(loan)
+        with self._pool.connection() as connection:
+            if key is None:
+                connection.execute(self._INSERT_TEXT_ID, row)
+            else:
+                connection.execute(self._INSERT_KEYED, (key,) + row[1:])
+    
+    def find_by_id(self, loan_id: str) -> Optional[Loan]:
+        """Find a loan by its ID"""
+        column, value = self._locate(loan_id)
+        with self._pool.connection() as connection:
+            row = connection.execute(self._SELECT_BY_ID.format(column), (value,)).fetchone()
+        return self._from_row(row) if row is not None else None
+    
+    def update(self, loan: Loan) -> None:
+        """Update an existing loan in the repository"""
+        column, value = self._locate(loan.get_id())
+        with self._pool.connection() as connection:
+            cursor = connection.execute(self._UPDATE.format(column), self._to_row(loan)[1][1:] + (value,))
+        if cursor.rowcount == 0:
+            raise KeyError(f"Loan not found: {loan.get_id()}")
+    
+    def delete(self, loan_id: str) -> None:
+        """Delete a loan from the repository"""
+        column, value = self._locate(loan_id)
+        with self._pool.connection() as connection:
+            connection.execute(self._DELETE.format(column), (value,))
+    
+    def find_all(self) -> List[Loan]:
+        """Get all loans from the repository"""
+        with self._pool.connection() as connection:
+            rows = connection.execute(self._SELECT_ALL).fetchall()
+        return [self._from_row(row) for row in rows]
+    
+    def iter_all(self) -> Iterator[Loan]:
+        """Stream every loan page by page (keyset pagination on the integer key)"""
+        last_key = 0
+        while True:
+            # The connection is only held while a page is fetched, never across yields
+            with self._pool.connection() as connection:
+                rows = connection.execute(self._SELECT_PAGE, (last_key, self.STREAM_PAGE_SIZE)).fetchall()
+            for row in rows:
+                yield self._from_row(row)
+            if len(rows) < self.STREAM_PAGE_SIZE:
+                return
+            last_key = rows[-1][0]
+    
+    def find_by_member_id(self, member_id: str) -> List[Loan]:
+        """Find all loans for a specific member"""
+        with self._pool.connection() as connection:
+            rows = connection.execute(self._SELECT_BY_MEMBER, (member_id,)).fetchall()
+        return [self._from_row(row) for row in rows]
+    
+    def find_by_member_ids(self, member_ids: Iterable[str]) -> Dict[str, List[Loan]]:
+        """Find the loans of several members with one query per chunk of IDs"""
+        member_ids = set(member_ids)
+        found: Dict[str, List[Loan]] = {member_id: [] for member_id in member_ids}
+        with self._pool.connection() as connection:
+            for chunk in self._pool.chunks(member_ids):
+                sql = self._SELECT_BY_MEMBERS.format(self._pool.placeholders(len(chunk)))
+                for row in connection.execute(sql, chunk):
+                    found[row[2]].append(self._from_row(row))
+        return found
+    
+    def find_by_book_id(self, book_id: str) -> Optional[Loan]:
+        """Find the open loan for a specific book"""
+        with self._pool.connection() as connection:
+            row = connection.execute(self._SELECT_BY_BOOK, (book_id,)).fetchone()
+        return self._from_row(row) if row is not None else None
+    
+    def find_by_ids(self, loan_ids: Iterable[str]) -> Dict[str, Loan]:
+        """Find several loans by ID with one query per chunk of IDs"""
+        found = {}
+        with self._pool.connection() as connection:
+            for column, values in self._group(set(loan_ids)).items():
+                for chunk in self._pool.chunks(values):
+                    sql = self._SELECT_BY_IDS.format(column, self._pool.placeholders(len(chunk)))
+                    for row in connection.execute(sql, chunk):
+                        loan = self._from_row(row)
+                        found[loan.get_id()] = loan
+        return found
+    
+    def save_many(self, loans: Iterable[Loan]) -> None:
+        """Save several loans in a single transaction"""
+        keyed, text_ids = [], []
+        for loan in loans:
+            key, row = self._to_row(loan)
+            if key is None:
+                text_ids.append(row)
+            else:
+                keyed.append((key,) + row[1:])
+        with self._pool.transaction() as connection:
+            connection.executemany(self._INSERT_KEYED, keyed)
+            connection.executemany(self._INSERT_TEXT_ID, text_ids)
+    
+    def update_many(self, loans: Iterable[Loan]) -> None:
+        """Update several existing loans in a single transaction"""
+        rows: Dict[str, List[tuple]] = {'key': [], 'id': []}
+        for loan in loans:
+            column, value = self._locate(loan.get_id())
+            rows[column].append(self._to_row(loan)[1][1:] + (value,))
+        with self._pool.transaction() as connection:
+            for column, column_rows in rows.items():
+                cursor = connection.executemany(self._UPDATE.format(column), column_rows)
+                if cursor.rowcount != len(column_rows):
+                    raise KeyError("Loan not found in update_many")
+    
+    def delete_many(self, loan_ids: Iterable[str]) -> None:
+        """Delete several loans in a single transaction"""
+        with self._pool.transaction() as connection:
+            for column, values in self._group(loan_ids).items():
+                connection.executemany(self._DELETE.format(column), ((value,) for value in values))
+    
+    def find_by_borrow_date_range(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                                  limit: Optional[int] = None) -> List[Loan]:
+        """Find loans with start <= borrow date < end, earliest first, using the borrow date index"""
+        # Fixed-width ISO text sorts chronologically; '' and '~' bound every stored date
+        lower = start.isoformat(timespec='microseconds') if start is not None else ''
+        upper = end.isoformat(timespec='microseconds') if end is not None else '~'
+        with self._pool.connection() as connection:
+            rows = connection.execute(self._SELECT_BY_BORROW_DATE,
+                                      (lower, upper, limit if limit is not None else -1)).fetchall()
+        return [self._from_row(row) for row in rows]
+    
+    def _locate(self, loan_id: str) -> Tuple[str, object]:
+        """The column a loan ID is looked up in, and the value to look for"""
+        key = self._pool.loan_key(loan_id)
+        return ('key', key) if key is not None else ('id', loan_id)
+    
+    def _group(self, loan_ids: Iterable[str]) -> Dict[str, list]:
+        grouped: Dict[str, list] = {'key': [], 'id': []}
+        for loan_id in loan_ids:
+            column, value = self._locate(loan_id)
+            grouped[column].append(value)
+        return grouped
+    
+    def _to_row(self, loan: Loan) -> Tuple[Optional[int], tuple]:
+        """The loan's key (None for an ID kept as text) and its (id, member_id, book_id, borrow_date) row"""
+        return self._pool.loan_key(loan.get_id()), (
+            loan.get_id(), loan.get_member_id(), loan.get_book_id(),
+            loan.get_borrow_date().isoformat(timespec='microseconds'))
+    
+    @staticmethod
+    def _from_row(row: tuple) -> Loan:
+        loan_id = row[1] if row[1] is not None else LoanIdGenerator.encode(row[0])
+        return Loan(loan_id, row[2], row[3], datetime.fromisoformat(row[4]))
@@ -0,0 +1,108 @@
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .member_repository import MemberRepository
+from .sqlite_connection_pool import SQLiteConnectionPool
+from ..python_library.member import Member
+
+
+class SQLiteMemberRepository(MemberRepository):
+    """
+    SOLUTION: SQLite-backed Member Repository
+    """
+    
+    _INSERT = ("INSERT INTO members (id, name, email, category) VALUES (?, ?, ?, ?) "
+               "ON CONFLICT(id) DO UPDATE SET name = excluded.name, email = excluded.email, "
+               "category = excluded.category")
+    _SELECT_BY_ID = "SELECT id, name, email, category FROM members WHERE id = ?"
+    _UPDATE = "UPDATE members SET name = ?, email = ?, category = ? WHERE id = ?"
+    _DELETE = "DELETE FROM members WHERE id = ?"
+    _SELECT_BY_IDS = "SELECT id, name, email, category FROM members WHERE id IN ({})"
+    _SELECT_ALL = "SELECT id, name, email, category FROM members ORDER BY rowid"
+    _SELECT_PAGE = "SELECT rowid, id, name, email, category FROM members WHERE rowid > ? ORDER BY rowid LIMIT ?"
+    
+    STREAM_PAGE_SIZE = 1000
+    
+    def __init__(self, pool: SQLiteConnectionPool):
+        self._pool = pool
+    
+    def save(self, member: Member) -> None:
+        """Save a member to the repository"""
+        with self._pool.connection() as connection:
+            connection.execute(self._INSERT, self._to_row(member))
+    
+    def find_by_id(self, member_id: str) -> Optional[Member]:
+        """Find a member by their ID"""
+        with self._pool.connection() as connection:
+            row = connection.execute(self._SELECT_BY_ID, (member_id,)).fetchone()
+        return self._from_row(row) if row is not None else None
+    
+    def update(self, member: Member) -> None:
+        """Update an existing member in the repository"""
+        with self._pool.connection() as connection:
+            cursor = connection.execute(self._UPDATE, self._to_update_row(member))
+        if cursor.rowcount == 0:
+            raise KeyError(f"Member not found: {member.get_id()}")
+    
+    def delete(self, member_id: str) -> None:
+        """Delete a member from the repository"""
+        with self._pool.connection() as connection:
+            connection.execute(self._DELETE, (member_id,))
+    
+    def find_all(self) -> List[Member]:
+        """Get all members from the repository"""
+        with self._pool.connection() as connection:
+            rows = connection.execute(self._SELECT_ALL).fetchall()
+        return [self._from_row(row) for row in rows]
+    
+    def iter_all(self) -> Iterator[Member]:
+        """Stream every member page by page (keyset pagination on rowid)"""
+        last_rowid = 0
+        while True:
+            # The connection is only held while a page is fetched, never across yields
+            with self._pool.connection() as connection:
+                rows = connection.execute(self._SELECT_PAGE, (last_rowid, self.STREAM_PAGE_SIZE)).fetchall()
+            for row in rows:
+                yield self._from_row(row[1:])
+            if len(rows) < self.STREAM_PAGE_SIZE:
+                return
+            last_rowid = rows[-1][0]
+    
+    def find_by_ids(self, member_ids: Iterable[str]) -> Dict[str, Member]:
+        """Find several members by ID with one query per chunk of IDs"""
+        found = {}
+        with self._pool.connection() as connection:
+            for chunk in self._pool.chunks(set(member_ids)):
+                sql = self._SELECT_BY_IDS.format(self._pool.placeholders(len(chunk)))
+                for row in connection.execute(sql, chunk):
+                    found[row[0]] = self._from_row(row)
+        return found
+    
+    def save_many(self, members: Iterable[Member]) -> None:
+        """Save several members in a single transaction"""
+        with self._pool.transaction() as connection:
+            connection.executemany(self._INSERT, (self._to_row(member) for member in members))
+    
+    def update_many(self, members: Iterable[Member]) -> None:
+        """Update several existing members in a single transaction"""
+        rows = [self._to_update_row(member) for member in members]
+        with self._pool.transaction() as connection:
+            cursor = connection.executemany(self._UPDATE, rows)
+            if cursor.rowcount != len(rows):
+                raise KeyError("Member not found in update_many")
+    
+    def delete_many(self, member_ids: Iterable[str]) -> None:
+        """Delete several members in a single transaction"""
+        with self._pool.transaction() as connection:
+            connection.executemany(self._DELETE, ((member_id,) for member_id in member_ids))
+    
+    @staticmethod
+    def _to_row(member: Member) -> tuple:
+        return (member.get_id(), member.get_name(), member.get_email(), member.get_category())
+    
+    @staticmethod
+    def _to_update_row(member: Member) -> tuple:
+        return (member.get_name(), member.get_email(), member.get_category(), member.get_id())
+    
+    @staticmethod
+    def _from_row(row: tuple) -> Member:
+        return Member(row[0], row[1], row[2], row[3])
@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta
+from typing import List, Optional, Sequence
 
 from .fine_calculation_strategy import FineCalculationStrategy
 from ..python_library.loan import Loan
@@ -28,6 +29,16 @@ class StandardFineStrategy(FineCalculationStrategy):
         
         return 0.0
     
+    def calculate_fines_batch(self, loans: Sequence[Loan], loan_duration_days: int,
+                              as_of: Optional[datetime] = None) -> List[float]:
+        """Calculate fines for many loans at once using standard rates"""
+        return self._daily_rate_fines_batch(loans, loan_duration_days, as_of, self.DAILY_FINE_RATE)
+    
+    def calculate_fines_array(self, borrow_dates, loan_duration_days: int,
+                              as_of: Optional[datetime] = None):
+        """Calculate fines for a datetime64 array of borrow dates using standard rates"""
+        return self._daily_rate_fines_array(borrow_dates, loan_duration_days, as_of, self.DAILY_FINE_RATE)
+    
     def _calculate_days_overdue(self, borrow_date: datetime, loan_duration_days: int) -> int:
         """Calculate the number of days a loan is overdue"""
         current_time = datetime.now()
@@ -0,0 +1,45 @@
+import threading
+from contextlib import contextmanager
+from typing import Hashable, Iterator, List
+
+
+class StripedLock:
+    """
+    SOLUTION: Fixed pool of locks shared by an unbounded set of keys
+    
+    1. Each key maps to one of `stripes` locks by hash, so memory stays
+       constant however many books and members exist
+    2. Unrelated keys usually land on different stripes and proceed in
+       parallel; a collision only costs some extra waiting
+    3. locked() takes every stripe it needs in ascending index order, so
+       callers locking several keys can never deadlock each other
+    """
+    
+    DEFAULT_STRIPES = 256
+    
+    def __init__(self, stripes: int = DEFAULT_STRIPES):
+        if stripes < 1:
+            raise ValueError("stripes must be at least 1")
+        self._locks = [threading.Lock() for _ in range(stripes)]
+    
+    @property
+    def stripes(self) -> int:
+        return len(self._locks)
+    
+    def stripe_for(self, key: Hashable) -> int:
+        """Index of the lock guarding key"""
+        return hash(key) % len(self._locks)
+    
+    @contextmanager
+    def locked(self, *keys: Hashable) -> Iterator[None]:
+        """Hold the locks for all keys for the duration of the with-block"""
+        acquired: List[threading.Lock] = []
+        try:
+            for stripe in sorted({self.stripe_for(key) for key in keys}):
+                lock = self._locks[stripe]
+                lock.acquire()
+                acquired.append(lock)
+            yield
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
@@ -0,0 +1,217 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from .async_library_service import AsyncLibraryService
+from .async_repository_adapters import ExecutorBookRepository, ExecutorLoanRepository, ExecutorMemberRepository
+from .async_striped_lock import AsyncStripedLock
+from .improved_library_service import ImprovedLibraryService
+from .in_memory_book_repository import InMemoryBookRepository
+from .in_memory_loan_repository import InMemoryLoanRepository
+from .in_memory_member_repository import InMemoryMemberRepository
+from .sqlite_book_repository import SQLiteBookRepository
+from .sqlite_connection_pool import SQLiteConnectionPool
+from .sqlite_loan_repository import SQLiteLoanRepository
+from .sqlite_member_repository import SQLiteMemberRepository
+from .standard_fine_strategy import StandardFineStrategy
+from ..python_library.book import Book
+from ..python_library.loan import Loan
+from ..python_library.member import Member
+
+
+class AsyncLibraryServiceTest(unittest.TestCase):
+    """
+    SOLUTION: Tests that AsyncLibraryService behaves like ImprovedLibraryService
+    """
+    
+    CLIENTS = 50
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.pool = SQLiteConnectionPool(os.path.join(self.directory, "library.db"))
+    
+    def tearDown(self):
+        self.pool.close()
+        shutil.rmtree(self.directory)
+    
+    def services(self):
+        yield "in-memory", AsyncLibraryService(ExecutorBookRepository(InMemoryBookRepository(), inline=True),
+                                               ExecutorMemberRepository(InMemoryMemberRepository(), inline=True),
+                                               ExecutorLoanRepository(InMemoryLoanRepository(), inline=True),
+                                               StandardFineStrategy(), stripes=4)
+        yield "sqlite", AsyncLibraryService(ExecutorBookRepository(SQLiteBookRepository(self.pool)),
+                                            ExecutorMemberRepository(SQLiteMemberRepository(self.pool)),
+                                            ExecutorLoanRepository(SQLiteLoanRepository(self.pool)),
+                                            StandardFineStrategy(), stripes=4)
+    
+    def test_borrow_and_return(self):
+        """A borrow marks the book unavailable and a return frees it again"""
+        async def scenario(service):
+            await service.add_book(Book("book1", "The Great Gatsby", "F. Scott Fitzgerald"))
+            await service.add_member(Member("member1", "John Doe", "john@example.com"))
+            
+            result = await service.borrow_book("member1", "book1")
+            self.assertTrue(result.is_success())
+            self.assertEqual([], await service.get_available_books())
+            self.assertEqual(1, len(await service.get_member_loans("member1")))
+            
+            returned = await service.return_book(result.get_loan().get_id())
+            self.assertTrue(returned.is_success())
+            self.assertEqual(["book1"], [book.get_id() for book in await service.get_available_books()])
+            self.assertEqual([], await service.get_member_loans("member1"))
+        
+        for name, service in self.services():
+            with self.subTest(backend=name):
+                asyncio.run(scenario(service))
+    
+    def test_failures_match_improved_service(self):
+        """Validation and business-rule failures carry the synchronous service's messages"""
+        async def scenario(service):
+            await service.add_book(Book("book1", "Title", "Author"))
+            await service.add_member(Member("member1", "John Doe", "john@example.com"))
+            
+            self.assertEqual("Member ID cannot be null or empty", (await service.borrow_book("", "book1")).get_message())
+            self.assertEqual("Book ID cannot be null or empty", (await service.borrow_book("member1", " ")).get_message())
+            self.assertEqual("Member not found", (await service.borrow_book("nobody", "book1")).get_message())
+            self.assertEqual("Book not found", (await service.borrow_book("member1", "nothing")).get_message())
+            self.assertTrue((await service.borrow_book("member1", "book1")).is_success())
+            self.assertEqual("Book is not available", (await service.borrow_book("member1", "book1")).get_message())
+            
+            for index in range(2, ImprovedLibraryService.MAX_BOOKS_PER_MEMBER + 2):
+                await service.add_book(Book(f"book{index}", "Title", "Author"))
+                await service.borrow_book("member1", f"book{index}")
+            limit = await service.borrow_book("member1", f"book{ImprovedLibraryService.MAX_BOOKS_PER_MEMBER + 1}")
+            self.assertIn("maximum borrowing limit", limit.get_message())
+            
+            self.assertEqual("Loan ID cannot be null or empty", (await service.return_book("")).get_message())
+            self.assertEqual("Loan not found", (await service.return_book("missing")).get_message())
+            self.assertEqual(0.0, await service.calculate_fine("missing"))
+            self.assertFalse(await service.add_book(None))
+        
+        for name, service in self.services():
+            with self.subTest(backend=name):
+                asyncio.run(scenario(service))
+    
+    def test_last_copy_is_lent_once(self):
+        """Many coroutines race for the same book; exactly one wins"""
+        async def scenario(service):
+            await service.add_book(Book("book1", "Contended", "Author"))
+            for index in range(self.CLIENTS):
+                await service.add_member(Member(f"member{index}", f"Member {index}", f"m{index}@example.com"))
+            
+            results = await asyncio.gather(*(service.borrow_book(f"member{index}", "book1")
+                                             for index in range(self.CLIENTS)))
+            
+            self.assertEqual(1, sum(result.is_success() for result in results))
+            self.assertEqual(1, len(await service.loan_repository.find_all()))
+        
+        for name, service in self.services():
+            with self.subTest(backend=name):
+                asyncio.run(scenario(service))
+    
+    def test_title_ids_lend_each_free_copy_once(self):
+        """Coroutines borrowing a title by its ID each get a different copy until none is free"""
+        async def scenario(service):
+            await service.book_repository.save_many(Book(f"dune-{index}", "Dune", "Frank Herbert", "dune")
+                                                    for index in range(3))
+            for index in range(self.CLIENTS):
+                await service.add_member(Member(f"member{index}", f"Member {index}", f"m{index}@example.com"))
+            
+            results = await asyncio.gather(*(service.borrow_book(f"member{index}", "dune")
+                                             for index in range(self.CLIENTS)))
+            
+            lent = [result.get_loan().get_book_id() for result in results if result.is_success()]
+            self.assertEqual(["dune-0", "dune-1", "dune-2"], sorted(lent))
+            self.assertEqual({"Book is not available"},
+                             {result.get_message() for result in results if not result.is_success()})
+            
+            returned = next(result.get_loan() for result in results if result.is_success())
+            self.assertTrue((await service.return_book(returned.get_id())).is_success())
+            self.assertEqual(returned.get_book_id(),
+                             (await service.borrow_book("member0", "dune")).get_loan().get_book_id())
+            self.assertEqual("Book not found", (await service.borrow_book("member0", "dun")).get_message())
+        
+        for name, service in self.services():
+            with self.subTest(backend=name):
+                asyncio.run(scenario(service))
+    
+    def test_borrowing_limit_holds_under_concurrency(self):
+        """One member borrowing different books from many coroutines stops at the limit"""
+        async def scenario(service):
+            await service.add_member(Member("member1", "John Doe", "john@example.com"))
+            await service.book_repository.save_many(Book(f"book{index}", "Title", "Author")
+                                                    for index in range(self.CLIENTS))
+            
+            results = await asyncio.gather(*(service.borrow_book("member1", f"book{index}")
+                                             for index in range(self.CLIENTS)))
+            
+            self.assertEqual(service.MAX_BOOKS_PER_MEMBER, sum(result.is_success() for result in results))
+            self.assertEqual(service.MAX_BOOKS_PER_MEMBER, len(await service.get_member_loans("member1")))
+        
+        for name, service in self.services():
+            with self.subTest(backend=name):
+                asyncio.run(scenario(service))
+    
+    def test_overdue_loans_and_fines(self):
+        """Overdue queries and fines go through the adapted loan repository"""
+        async def scenario(service):
+            now = datetime.now()
+            await service.loan_repository.save(Loan("late", "member1", "book1", now - timedelta(days=20)))
+            await service.loan_repository.save(Loan("fresh", "member1", "book2", now - timedelta(days=1)))
+            
+            self.assertEqual(["late"], [loan.get_id() for loan in await service.get_overdue_loans(now)])
+            self.assertGreater(await service.calculate_fine("late"), 0.0)
+            self.assertEqual(0.0, await service.calculate_fine("fresh"))
+        
+        for name, service in self.services():
+            with self.subTest(backend=name):
+                asyncio.run(scenario(service))
+    
+    def test_inline_repositories_are_not_gathered(self):
+        """With every repository inline, borrows and returns await their lookups in order"""
+        _, service = next(self.services())
+        
+        async def scenario():
+            await service.add_book(Book("book1", "Title", "Author"))
+            await service.add_member(Member("member1", "John Doe", "john@example.com"))
+            result = await service.borrow_book("member1", "book1")
+            self.assertTrue(result.is_success(), result.get_message())
+            self.assertTrue((await service.return_book(result.get_loan().get_id())).is_success())
+        
+        with mock.patch.object(asyncio, 'gather', side_effect=AssertionError("lookups were gathered")):
+            asyncio.run(scenario())
+
+
+class AsyncStripedLockTest(unittest.TestCase):
+    """
+    SOLUTION: Tests for the asyncio lock stripes
+    """
+    
+    def test_rejects_zero_stripes(self):
+        with self.assertRaises(ValueError):
+            AsyncStripedLock(0)
+    
+    def test_overlapping_keys_do_not_deadlock(self):
+        """Coroutines locking the same keys in opposite orders all finish"""
+        lock = AsyncStripedLock(8)
+        entered = []
+        
+        async def worker(index, keys):
+            async with lock.locked(*keys):
+                entered.append(index)
+                await asyncio.sleep(0)
+        
+        async def scenario():
+            await asyncio.wait_for(asyncio.gather(*(worker(index, ("a", "b") if index % 2 else ("b", "a"))
+                                                    for index in range(20))), timeout=5)
+        
+        asyncio.run(scenario())
+        self.assertEqual(20, len(entered))
+
+
+if __name__ == '__main__':
+    unittest.main()
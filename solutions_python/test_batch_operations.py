@@ -0,0 +1,122 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from .hold_queue import HoldQueue
+from .improved_library_service import ImprovedLibraryService
+from .in_memory_book_repository import InMemoryBookRepository
+from .in_memory_loan_repository import InMemoryLoanRepository
+from .in_memory_member_repository import InMemoryMemberRepository
+from .sqlite_book_repository import SQLiteBookRepository
+from .sqlite_connection_pool import SQLiteConnectionPool
+from .sqlite_loan_repository import SQLiteLoanRepository
+from .sqlite_member_repository import SQLiteMemberRepository
+from .standard_fine_strategy import StandardFineStrategy
+from ..python_library.book import Book
+from ..python_library.member import Member
+
+
+class BatchOperationsTest(unittest.TestCase):
+    """
+    SOLUTION: Tests for borrow_books / return_books on every repository backend
+    """
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.pool = SQLiteConnectionPool(os.path.join(self.directory, "library.db"))
+    
+    def tearDown(self):
+        self.pool.close()
+        shutil.rmtree(self.directory)
+    
+    def services(self):
+        yield "in-memory", ImprovedLibraryService(InMemoryBookRepository(), InMemoryMemberRepository(),
+                                                  InMemoryLoanRepository(), StandardFineStrategy())
+        yield "sqlite", ImprovedLibraryService(SQLiteBookRepository(self.pool), SQLiteMemberRepository(self.pool),
+                                               SQLiteLoanRepository(self.pool), StandardFineStrategy())
+    
+    def seed(self, service):
+        service.add_member(Member("member1", "John Doe", "john@example.com"))
+        service.add_member(Member("member2", "Jane Doe", "jane@example.com"))
+        service.book_repository.save_many(Book(f"book{i}", f"Title {i}", "Author") for i in range(8))
+    
+    def test_borrow_books_matches_sequential_rules(self):
+        """Batch results follow the single-borrow rules in request order"""
+        for name, service in self.services():
+            with self.subTest(backend=name):
+                self.seed(service)
+                batch = [("member1", f"book{i}") for i in range(6)]
+                batch += [("member2", "book0"), ("unknown", "book7"), ("member2", "missing"), ("", "book7")]
+                
+                results = service.borrow_books(batch)
+                
+                self.assertTrue(all(r.is_success() for r in results[:5]))
+                self.assertIn("maximum borrowing limit", results[5].get_message())
+                self.assertEqual("Book is not available", results[6].get_message())
+                self.assertEqual("Member not found", results[7].get_message())
+                self.assertEqual("Book not found", results[8].get_message())
+                self.assertEqual("Member ID cannot be null or empty", results[9].get_message())
+                self.assertEqual(5, len(service.get_member_loans("member1")))
+                self.assertEqual(3, len(service.get_available_books()))
+    
+    def test_return_books(self):
+        """Batch returns free the books and reject unknown or repeated loans"""
+        for name, service in self.services():
+            with self.subTest(backend=name):
+                self.seed(service)
+                loans = [r.get_loan().get_id() for r in service.borrow_books([("member1", "book0"), ("member1", "book1")])]
+                
+                results = service.return_books(loans + [loans[0], "missing", None])
+                
+                self.assertEqual([True, True, False, False, False], [r.is_success() for r in results])
+                self.assertEqual("Loan not found", results[2].get_message())
+                self.assertEqual("Loan ID cannot be null or empty", results[4].get_message())
+                self.assertEqual([], service.get_member_loans("member1"))
+                self.assertEqual(8, len(service.get_available_books()))
+    
+    def test_borrow_books_rolls_back_on_write_failure(self):
+        """A failed bulk book update removes the saved loans and reports every item"""
+        book_repository = InMemoryBookRepository()
+        loan_repository = InMemoryLoanRepository()
+        service = ImprovedLibraryService(book_repository, InMemoryMemberRepository(),
+                                         loan_repository, StandardFineStrategy())
+        self.seed(service)
+        book_repository.update_many = Mock(side_effect=Exception("Database error"))
+        
+        results = service.borrow_books([("member1", "book0"), ("member1", "book1")])
+        
+        self.assertTrue(all("Failed to borrow book" in r.get_message() for r in results))
+        self.assertEqual([], loan_repository.find_all())
+        self.assertTrue(book_repository.find_by_id("book0").is_available())
+    
+    def test_return_books_changes_nothing_on_write_failure(self):
+        """A failed bulk loan delete leaves the books lent and the holds waiting"""
+        book_repository = InMemoryBookRepository()
+        loan_repository = InMemoryLoanRepository()
+        holds = HoldQueue()
+        service = ImprovedLibraryService(book_repository, InMemoryMemberRepository(),
+                                         loan_repository, StandardFineStrategy(), holds=holds)
+        self.seed(service)
+        loans = [r.get_loan().get_id() for r in service.borrow_books([("member1", "book0"), ("member1", "book1")])]
+        self.assertTrue(service.place_hold("member2", "book1").is_success())
+        loan_repository.delete_many = Mock(side_effect=Exception("Database error"))
+        
+        results = service.return_books(loans)
+        
+        self.assertTrue(all("Failed to return book" in r.get_message() for r in results))
+        self.assertEqual(2, len(service.get_member_loans("member1")))
+        self.assertFalse(book_repository.find_by_id("book0").is_available())
+        self.assertFalse(book_repository.find_by_id("book1").is_available())
+        self.assertEqual(1, holds.waiting_count("book1"))
+        
+        del loan_repository.delete_many
+        self.assertTrue(all(r.is_success() for r in service.return_books(loans)))
+        self.assertTrue(book_repository.find_by_id("book0").is_available())
+        self.assertFalse(book_repository.find_by_id("book1").is_available())
+        self.assertEqual("book1", holds.member_holds("member2")[0].get_copy_id())
+
+
+if __name__ == '__main__':
+    unittest.main()
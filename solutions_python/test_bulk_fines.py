@@ -0,0 +1,82 @@
+import unittest
+from datetime import datetime, timedelta
+
+from . import fine_calculation_strategy
+from .fine_calculation_strategy import FineCalculationStrategy
+from .improved_library_service import ImprovedLibraryService
+from .in_memory_book_repository import InMemoryBookRepository
+from .in_memory_loan_repository import InMemoryLoanRepository
+from .in_memory_member_repository import InMemoryMemberRepository
+from .standard_fine_strategy import StandardFineStrategy
+from .student_fine_strategy import StudentFineStrategy
+from ..python_library.loan import Loan
+
+
+class BulkFineCalculationTest(unittest.TestCase):
+    """
+    SOLUTION: Tests for the vectorized bulk fine calculation
+    """
+    
+    def setUp(self):
+        self.as_of = datetime(2024, 3, 1, 12, 0, 0)
+        self.loans = [
+            Loan("on_time", "member1", "book1", self.as_of - timedelta(days=3)),
+            Loan("due_now", "member1", "book2", self.as_of - timedelta(days=14)),
+            Loan("part_day", "member2", "book3", self.as_of - timedelta(days=14, hours=23)),
+            Loan("overdue", "member2", "book4", self.as_of - timedelta(days=20, hours=5)),
+            Loan("no_date", "member3", "book5", None),
+        ]
+    
+    def expected(self, strategy):
+        """Per-loan fines following the calculate_fine rules, evaluated at as_of"""
+        fines = []
+        for loan in self.loans:
+            if loan.get_borrow_date() is None:
+                fines.append(0.0)
+                continue
+            overdue = self.as_of - (loan.get_borrow_date() + timedelta(days=14))
+            fines.append(max(0, overdue.days) * strategy.DAILY_FINE_RATE if overdue > timedelta(0) else 0.0)
+        return fines
+    
+    def test_batch_matches_per_loan_rules(self):
+        """Batch fines agree with the per-loan rules evaluated at as_of"""
+        for strategy in (StandardFineStrategy(), StudentFineStrategy()):
+            with self.subTest(strategy=type(strategy).__name__):
+                self.assertEqual(self.expected(strategy), strategy.calculate_fines_batch(self.loans, 14, self.as_of))
+        self.assertEqual([0.0, 0.0, 0.0, 3.0, 0.0], StandardFineStrategy().calculate_fines_batch(self.loans, 14, self.as_of))
+    
+    @unittest.skipIf(fine_calculation_strategy.np is None, "numpy is not installed")
+    def test_array_matches_batch(self):
+        """The datetime64 path agrees with the Loan path, including the default implementation"""
+        np = fine_calculation_strategy.np
+        dates = np.array([loan.get_borrow_date() for loan in self.loans], dtype='datetime64[us]')
+        
+        class PerLoanStrategy(FineCalculationStrategy):
+            def calculate_fine(self, loan, loan_duration_days):
+                return 1.0 if loan.get_borrow_date() is not None else 0.0
+        
+        for strategy in (StandardFineStrategy(), StudentFineStrategy()):
+            with self.subTest(strategy=type(strategy).__name__):
+                fines = strategy.calculate_fines_array(dates, 14, self.as_of)
+                self.assertEqual(self.expected(strategy), fines.tolist())
+        self.assertEqual([1.0, 1.0, 1.0, 1.0, 0.0], PerLoanStrategy().calculate_fines_array(dates, 14).tolist())
+    
+    def test_empty_batch(self):
+        self.assertEqual([], StandardFineStrategy().calculate_fines_batch([], 14, self.as_of))
+    
+    def test_service_calculate_fines(self):
+        """calculate_fines maps every open loan (or the requested ones) to its fine"""
+        loan_repository = InMemoryLoanRepository()
+        loan_repository.save_many(self.loans[:4])
+        service = ImprovedLibraryService(InMemoryBookRepository(), InMemoryMemberRepository(),
+                                         loan_repository, StandardFineStrategy())
+        
+        fines = service.calculate_fines(as_of=self.as_of)
+        self.assertEqual({"on_time": 0.0, "due_now": 0.0, "part_day": 0.0, "overdue": 3.0}, fines)
+        
+        fines = service.calculate_fines(as_of=self.as_of, loan_ids=["overdue", "missing"])
+        self.assertEqual({"overdue": 3.0, "missing": 0.0}, fines)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,182 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+
+from .bulk_exporter import BulkExporter
+from .bulk_importer import BulkImporter
+from .in_memory_book_repository import InMemoryBookRepository
+from .in_memory_loan_repository import InMemoryLoanRepository
+from .in_memory_member_repository import InMemoryMemberRepository
+from .sqlite_book_repository import SQLiteBookRepository
+from .sqlite_connection_pool import SQLiteConnectionPool
+from .sqlite_loan_repository import SQLiteLoanRepository
+from .sqlite_member_repository import SQLiteMemberRepository
+
+
+class BulkImportTest(unittest.TestCase):
+    """
+    SOLUTION: Tests for streaming CSV / JSON-Lines import
+    """
+    
+    def setUp(self):
+        self.book_repository = InMemoryBookRepository()
+        self.member_repository = InMemoryMemberRepository()
+        self.loan_repository = InMemoryLoanRepository()
+        self.importer = BulkImporter(self.book_repository, self.member_repository, self.loan_repository,
+                                     batch_size=2)
+    
+    def test_csv_import_reports_bad_rows_and_keeps_the_rest(self):
+        source = io.StringIO(
+            "id,title,author,available\n"
+            "book1,Clean Code,Robert Martin,\n"
+            ",No Id,Nobody,1\n"
+            "book2,Refactoring,Martin Fowler,false\n"
+            "book3,Short Row\n"
+            "book4,Dune,Frank Herbert,maybe\n"
+            "book5,Emma,Jane Austen,yes\n"
+        )
+        result = self.importer.import_books(source, format='csv')
+        
+        self.assertFalse(result.is_success())
+        self.assertEqual(3, result.get_imported_count())
+        self.assertEqual(3, result.get_failed_count())
+        self.assertEqual([3, 5, 6], [error.line for error in result.get_errors()])
+        self.assertIn("author", result.get_errors()[1].message)
+        self.assertTrue(self.book_repository.find_by_id("book1").is_available())
+        self.assertFalse(self.book_repository.find_by_id("book2").is_available())
+        self.assertEqual("Jane Austen", self.book_repository.find_by_id("book5").get_author())
+    
+    def test_column_mapping_and_missing_columns(self):
+        source = io.StringIO("001,245$a,100$a,650$a\nocm1,Moby Dick,Herman Melville,Whales\n")
+        result = self.importer.import_books(source, format='csv',
+                                            columns={'id': '001', 'title': '245$a', 'author': '100$a'})
+        self.assertEqual(1, result.get_imported_count())
+        self.assertEqual("Moby Dick", self.book_repository.find_by_id("ocm1").get_title())
+        
+        with self.assertRaises(ValueError):
+            self.importer.import_books(io.StringIO("id,title\nbook1,Dune\n"), format='csv')
+        with self.assertRaises(ValueError):
+            self.importer.import_books(io.StringIO(""))
+    
+    def test_jsonl_loans_mark_books_lent(self):
+        self.importer.import_books(io.StringIO(
+            "id,title,author\nbook1,Dune,Frank Herbert\nbook2,Emma,Jane Austen\nbook3,Ulysses,James Joyce\n"
+        ), format='csv')
+        self.importer.import_members(io.StringIO('{"id": "member1", "name": "John", "email": "j@example.com"}\n'),
+                                     format='jsonl')
+        lines = [
+            {"id": "loan1", "member_id": "member1", "book_id": "book1", "borrow_date": "2024-01-15T10:30:00"},
+            {"id": "loan2", "member_id": "member1", "book_id": "book1", "borrow_date": "2024-01-16T10:30:00"},
+            {"id": "loan3", "member_id": "ghost", "book_id": "book2", "borrow_date": "2024-01-15T10:30:00"},
+            {"id": "loan4", "member_id": "member1", "book_id": "book2", "borrow_date": "yesterday"},
+        ]
+        source = io.StringIO("\n".join(json.dumps(line) for line in lines) + "\n\nnot json\n[1, 2]\n"
+                             '{"id": "loan5", "member_id": "member1", "book_id": "book3", '
+                             '"borrow_date": "2024-02-01T09:00:00"}\n')
+        result = self.importer.import_loans(source, format='jsonl')
+        
+        self.assertEqual(2, result.get_imported_count())
+        self.assertEqual([2, 3, 4, 6, 7], sorted(error.line for error in result.get_errors()))
+        self.assertEqual(datetime(2024, 1, 15, 10, 30), self.loan_repository.find_by_id("loan1").get_borrow_date())
+        self.assertFalse(self.book_repository.find_by_id("book1").is_available())
+        self.assertTrue(self.book_repository.find_by_id("book2").is_available())
+        self.assertFalse(self.book_repository.find_by_id("book3").is_available())
+    
+    def test_error_list_is_capped(self):
+        importer = BulkImporter(self.book_repository, max_errors=3)
+        source = io.StringIO("id,title,author\n" + ",x,y\n" * 10)
+        result = importer.import_books(source, format='csv')
+        self.assertEqual(10, result.get_failed_count())
+        self.assertEqual(3, len(result.get_errors()))
+
+
+class SQLiteBulkRoundTripTest(unittest.TestCase):
+    """
+    SOLUTION: Tests for bulk import and streaming export on SQLite
+    """
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.pool = SQLiteConnectionPool(os.path.join(self.directory, "library.db"), pool_size=2)
+        self.book_repository = SQLiteBookRepository(self.pool)
+        self.member_repository = SQLiteMemberRepository(self.pool)
+        self.loan_repository = SQLiteLoanRepository(self.pool)
+    
+    def tearDown(self):
+        self.pool.close()
+        shutil.rmtree(self.directory)
+    
+    def test_export_then_import_round_trip(self):
+        books_csv = os.path.join(self.directory, "books.csv")
+        with open(books_csv, "w", encoding="utf-8") as file:
+            file.write("id,title,author,available\n")
+            for i in range(2500):
+                file.write(f'book{i},"Title {i}, vol. é",Author {i % 7},{i % 2}\n')
+        importer = BulkImporter(self.book_repository, self.member_repository, self.loan_repository,
+                                batch_size=1000)
+        self.assertTrue(importer.import_books(books_csv).is_success())
+        importer.import_members(io.StringIO("id,name,email\nmember1,John,j@example.com\n"), format='csv')
+        importer.import_loans(io.StringIO("id,member_id,book_id,borrow_date\n"
+                                          "loan1,member1,book1,2024-03-01T08:00:00.250000\n"), format='csv')
+        
+        exporter = BulkExporter(self.book_repository, self.member_repository, self.loan_repository)
+        books_jsonl = os.path.join(self.directory, "books.jsonl")
+        loans_csv = os.path.join(self.directory, "loans.csv")
+        self.assertEqual(2500, exporter.export_books(books_jsonl))
+        self.assertEqual(1, exporter.export_loans(loans_csv))
+        
+        copy = InMemoryBookRepository()
+        result = BulkImporter(copy).import_books(books_jsonl)
+        self.assertEqual(2500, result.get_imported_count())
+        self.assertEqual([book.get_id() for book in self.book_repository.iter_all()],
+                         [book.get_id() for book in copy.find_all()])
+        self.assertEqual("Title 1, vol. é", copy.find_by_id("book1").get_title())
+        self.assertFalse(copy.find_by_id("book0").is_available())
+        self.assertFalse(copy.find_by_id("book1").is_available())
+        self.assertTrue(copy.find_by_id("book3").is_available())
+        
+        books, members, loans = InMemoryBookRepository(), InMemoryMemberRepository(), InMemoryLoanRepository()
+        importer = BulkImporter(books, members, loans)
+        importer.import_books(io.StringIO("id,title,author\nbook1,Title 1,Author 1\n"), format='csv')
+        importer.import_members(io.StringIO('{"id": "member1", "name": "John", "email": "j@example.com"}\n'),
+                                format='jsonl')
+        self.assertTrue(importer.import_loans(loans_csv).is_success())
+        self.assertEqual(datetime(2024, 3, 1, 8, 0, 0, 250000), loans.find_by_id("loan1").get_borrow_date())
+    
+    def test_full_export_imports_back(self):
+        importer = BulkImporter(self.book_repository, self.member_repository, self.loan_repository)
+        importer.import_books(io.StringIO("id,title,author\nb1,Dune,Frank Herbert\nb2,Emma,Jane Austen\n"),
+                              format='csv')
+        importer.import_members(io.StringIO("id,name,email\nm1,John,j@example.com\n"), format='csv')
+        self.assertTrue(importer.import_loans(io.StringIO("id,member_id,book_id,borrow_date\n"
+                                                          "l1,m1,b1,2024-03-01T08:00:00\n"), format='csv').is_success())
+        
+        exporter = BulkExporter(self.book_repository, self.member_repository, self.loan_repository)
+        paths = {name: os.path.join(self.directory, f"{name}.jsonl") for name in ("books", "members", "loans")}
+        exporter.export_books(paths["books"])
+        exporter.export_members(paths["members"])
+        exporter.export_loans(paths["loans"])
+        
+        books, members, loans = InMemoryBookRepository(), InMemoryMemberRepository(), InMemoryLoanRepository()
+        importer = BulkImporter(books, members, loans)
+        self.assertTrue(importer.import_books(paths["books"]).is_success())
+        self.assertTrue(importer.import_members(paths["members"]).is_success())
+        self.assertTrue(importer.import_loans(paths["loans"]).is_success())
+        # Importing the same loans again changes nothing
+        self.assertTrue(importer.import_loans(paths["loans"]).is_success())
+        self.assertEqual(["l1"], [loan.get_id() for loan in loans.find_all()])
+        self.assertFalse(books.find_by_id("b1").is_available())
+        self.assertTrue(books.find_by_id("b2").is_available())
+        
+        # A different loan on the lent book is still refused
+        result = importer.import_loans(io.StringIO("id,member_id,book_id,borrow_date\n"
+                                                   "l2,m1,b1,2024-03-02T08:00:00\n"), format='csv')
+        self.assertEqual(["Book is not available: b1"], [error.message for error in result.get_errors()])
+
+
+if __name__ == '__main__':
+    unittest.main()
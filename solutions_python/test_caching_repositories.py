@@ -0,0 +1,140 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from .caching_repositories import CachingBookRepository, CachingLoanRepository, CachingMemberRepository
+from .improved_library_service import ImprovedLibraryService
+from .lru_cache import LRUCache
+from .sqlite_book_repository import SQLiteBookRepository
+from .sqlite_connection_pool import SQLiteConnectionPool
+from .sqlite_loan_repository import SQLiteLoanRepository
+from .sqlite_member_repository import SQLiteMemberRepository
+from .standard_fine_strategy import StandardFineStrategy
+from ..python_library.book import Book
+from ..python_library.member import Member
+
+
+class LRUCacheTest(unittest.TestCase):
+    """
+    SOLUTION: Tests for the LRU/TTL cache
+    """
+    
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(1, cache.get("a"))
+        cache.put("c", 3)
+        
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(1, cache.get("a"))
+        self.assertEqual(3, cache.get("c"))
+        stats = cache.stats()
+        self.assertEqual((3, 1, 1, 0, 2), (stats.hits, stats.misses, stats.evictions, stats.expirations, stats.size))
+        self.assertAlmostEqual(0.75, stats.hit_rate)
+    
+    def test_entries_expire_after_ttl(self):
+        now = [100.0]
+        cache = LRUCache(10, ttl=5.0, clock=lambda: now[0])
+        cache.put("a", 1)
+        now[0] = 104.9
+        self.assertEqual(1, cache.get("a"))
+        now[0] = 105.0
+        self.assertEqual("gone", cache.get("a", "gone"))
+        self.assertEqual(1, cache.stats().expirations)
+        self.assertEqual(0, len(cache))
+    
+    def test_load_racing_a_write_is_dropped(self):
+        cache = LRUCache(10)
+        
+        def stale_loader(key):
+            # A write lands while the backend read is in flight
+            cache.put(key, "new")
+            return "old"
+        
+        self.assertEqual("old", cache.get_or_load("a", stale_loader))
+        self.assertEqual("new", cache.get("a"))
+        
+        cache.invalidate("a")
+        self.assertEqual("loaded", cache.get_or_load("a", lambda key: "loaded"))
+        self.assertEqual("loaded", cache.get("a"))
+
+
+class CachingRepositoryTest(unittest.TestCase):
+    """
+    SOLUTION: Tests for the caching repository decorators over SQLite
+    """
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.pool = SQLiteConnectionPool(os.path.join(self.directory, "library.db"), pool_size=2)
+        self.books = SQLiteBookRepository(self.pool)
+        self.books.save_many(Book(f"book{i}", f"Title {i}", "Author") for i in range(10))
+        self.cached_books = CachingBookRepository(self.books, capacity=4)
+    
+    def tearDown(self):
+        self.pool.close()
+        shutil.rmtree(self.directory)
+    
+    def test_reads_are_served_from_the_cache(self):
+        book = self.cached_books.find_by_id("book1")
+        self.assertIs(book, self.cached_books.find_by_id("book1"))
+        self.assertIsNone(self.cached_books.find_by_id("missing"))
+        self.assertIsNone(self.cached_books.find_by_id("missing"))
+        
+        found = self.cached_books.find_by_ids(["book1", "book2", "missing", "book3"])
+        self.assertEqual({"book1", "book2", "book3"}, set(found))
+        stats = self.cached_books.cache_stats()
+        self.assertEqual((4, 4, 0), (stats.hits, stats.misses, stats.evictions))
+        
+        # Over capacity, the least recently used entry ("book1") goes first
+        self.cached_books.find_by_id("book4")
+        self.assertEqual(1, self.cached_books.cache_stats().evictions)
+        self.cached_books.find_by_id("book1")
+        self.assertEqual(6, self.cached_books.cache_stats().misses)
+    
+    def test_writes_keep_the_cache_consistent(self):
+        self.assertIsNone(self.cached_books.find_by_id("new"))
+        self.cached_books.save(Book("new", "New", "Author"))
+        self.assertEqual("New", self.cached_books.find_by_id("new").get_title())
+        
+        book = self.cached_books.find_by_id("book1")
+        book.set_available(False)
+        self.cached_books.update(book)
+        self.assertFalse(self.books.find_by_id("book1").is_available())
+        
+        self.cached_books.delete("book1")
+        self.assertIsNone(self.cached_books.find_by_id("book1"))
+        
+        # A failed write drops the entry the caller may have changed
+        ghost = self.cached_books.find_by_id("book2")
+        self.books.delete("book2")
+        ghost.set_available(False)
+        with self.assertRaises(KeyError):
+            self.cached_books.update(ghost)
+        self.assertIsNone(self.cached_books.find_by_id("book2"))
+        
+        self.cached_books.update_many([Book("book3", "Renamed", "Author")])
+        self.cached_books.delete_many(["book4"])
+        self.assertEqual("Renamed", self.cached_books.find_by_id("book3").get_title())
+        self.assertEqual({"book3"}, set(self.cached_books.find_by_ids(["book3", "book4"])))
+    
+    def test_service_over_cached_repositories(self):
+        members = SQLiteMemberRepository(self.pool)
+        members.save(Member("member1", "John Doe", "john@example.com"))
+        loans = CachingLoanRepository(SQLiteLoanRepository(self.pool))
+        service = ImprovedLibraryService(self.cached_books, CachingMemberRepository(members), loans,
+                                         StandardFineStrategy())
+        
+        loan = service.borrow_book("member1", "book5").get_loan()
+        self.assertFalse(service.borrow_book("member1", "book5").is_success())
+        self.assertFalse(self.books.find_by_id("book5").is_available())
+        self.assertTrue(service.return_book(loan.get_id()).is_success())
+        self.assertIsNone(loans.find_by_id(loan.get_id()))
+        self.assertTrue(self.books.find_by_id("book5").is_available())
+        self.assertTrue(service.borrow_book("member1", "book5").is_success())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -31,6 +31,9 @@ class ComprehensiveLibraryServiceTest(unittest.TestCase):
         self.mock_member_repository = Mock(spec=MemberRepository)
         self.mock_loan_repository = Mock(spec=LoanRepository)
         self.mock_fine_strategy = Mock(spec=FineCalculationStrategy)
+        # No title has copies, free or lent, unless a test says so
+        self.mock_book_repository.find_free_copies.return_value = []
+        self.mock_book_repository.count_copies.return_value = 0
         
         # Create service with mocked dependencies
         self.service = ImprovedLibraryService(
@@ -161,7 +164,7 @@ class ComprehensiveLibraryServiceTest(unittest.TestCase):
         ]
         all_books[1].set_available(False)  # Make second book unavailable
         
-        self.mock_book_repository.find_all.return_value = all_books
+        self.mock_book_repository.iter_available.return_value = iter(all_books)
         
         available_books = self.service.get_available_books()
         
@@ -277,7 +280,7 @@ class ComprehensiveLibraryServiceTest(unittest.TestCase):
     
     def test_get_available_books_exception(self):
         """SOLUTION: Test exception handling in get available books"""
-        self.mock_book_repository.find_all.side_effect = Exception("Database error")
+        self.mock_book_repository.iter_available.side_effect = Exception("Database error")
         
         result = self.service.get_available_books()
         
@@ -0,0 +1,116 @@
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+from .concurrent_library_service import ConcurrentLibraryService
+from .in_memory_book_repository import InMemoryBookRepository
+from .in_memory_loan_repository import InMemoryLoanRepository
+from .in_memory_member_repository import InMemoryMemberRepository
+from .sqlite_book_repository import SQLiteBookRepository
+from .sqlite_connection_pool import SQLiteConnectionPool
+from .sqlite_loan_repository import SQLiteLoanRepository
+from .sqlite_member_repository import SQLiteMemberRepository
+from .standard_fine_strategy import StandardFineStrategy
+from .striped_lock import StripedLock
+from ..python_library.book import Book
+from ..python_library.member import Member
+
+
+class ConcurrentLibraryServiceTest(unittest.TestCase):
+    """
+    SOLUTION: Tests that concurrent borrows never lend a book twice or exceed the limit
+    """
+    
+    THREADS = 8
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.pool = SQLiteConnectionPool(os.path.join(self.directory, "library.db"))
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+    
+    def tearDown(self):
+        sys.setswitchinterval(self.switch_interval)
+        self.pool.close()
+        shutil.rmtree(self.directory)
+    
+    def services(self):
+        yield "in-memory", ConcurrentLibraryService(InMemoryBookRepository(), InMemoryMemberRepository(),
+                                                    InMemoryLoanRepository(), StandardFineStrategy(), stripes=4)
+        yield "sqlite", ConcurrentLibraryService(SQLiteBookRepository(self.pool), SQLiteMemberRepository(self.pool),
+                                                 SQLiteLoanRepository(self.pool), StandardFineStrategy(), stripes=4)
+    
+    def run_threads(self, work):
+        barrier = threading.Barrier(self.THREADS)
+        
+        def target(index):
+            barrier.wait()
+            work(index)
+        
+        threads = [threading.Thread(target=target, args=(index,)) for index in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    
+    def test_last_copy_is_lent_once(self):
+        """Every thread races for the same book; exactly one wins"""
+        for name, service in self.services():
+            with self.subTest(backend=name):
+                service.add_book(Book("book1", "Contended", "Author"))
+                for index in range(self.THREADS):
+                    service.add_member(Member(f"member{index}", f"Member {index}", f"m{index}@example.com"))
+                results = [None] * self.THREADS
+                
+                def work(index):
+                    results[index] = service.borrow_book(f"member{index}", "book1")
+                
+                self.run_threads(work)
+                
+                self.assertEqual(1, sum(result.is_success() for result in results))
+                self.assertEqual(1, len(service.loan_repository.find_all()))
+    
+    def test_borrowing_limit_holds_under_concurrency(self):
+        """One member borrowing different books from every thread stops at the limit"""
+        for name, service in self.services():
+            with self.subTest(backend=name):
+                service.add_member(Member("member1", "John Doe", "john@example.com"))
+                for index in range(self.THREADS * 2):
+                    service.add_book(Book(f"book{index}", f"Title {index}", "Author"))
+                
+                def work(index):
+                    for book in (index, index + self.THREADS):
+                        service.borrow_book("member1", f"book{book}")
+                
+                self.run_threads(work)
+                
+                loans = service.get_member_loans("member1")
+                self.assertEqual(service.MAX_BOOKS_PER_MEMBER, len(loans))
+                returns = service.return_books([loan.get_id() for loan in loans])
+                self.assertTrue(all(result.is_success() for result in returns))
+                self.assertEqual(self.THREADS * 2, len(service.get_available_books()))
+
+
+class StripedLockTest(unittest.TestCase):
+    """
+    SOLUTION: Tests for lock striping
+    """
+    
+    def test_locked_releases_every_stripe(self):
+        locks = StripedLock(stripes=8)
+        keys = [("book", f"book{i}") for i in range(20)]
+        with locks.locked(*keys):
+            pass
+        with self.assertRaises(ValueError):
+            with locks.locked(*keys):
+                raise ValueError("released on error too")
+        self.assertTrue(all(lock.acquire(blocking=False) for lock in locks._locks))
+        with self.assertRaises(ValueError):
+            StripedLock(stripes=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from .improved_library_service import ImprovedLibraryService
+from .in_memory_book_repository import InMemoryBookRepository
+from .in_memory_loan_repository import InMemoryLoanRepository
+from .in_memory_member_repository import InMemoryMemberRepository
+from .sqlite_book_repository import SQLiteBookRepository
+from .sqlite_connection_pool import SQLiteConnectionPool
+from .sqlite_loan_repository import SQLiteLoanRepository
+from .sqlite_member_repository import SQLiteMemberRepository
+from .standard_fine_strategy import StandardFineStrategy
+from ..python_library.loan import Loan
+
+
+class DueDateQueryTest(unittest.TestCase):
+    """
+    SOLUTION: Tests for overdue / next-due queries on every repository backend
+    """
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.pool = SQLiteConnectionPool(os.path.join(self.directory, "library.db"))
+        self.as_of = datetime(2024, 3, 1, 12, 0, 0)
+    
+    def tearDown(self):
+        self.pool.close()
+        shutil.rmtree(self.directory)
+    
+    def services(self):
+        yield "in-memory", ImprovedLibraryService(InMemoryBookRepository(), InMemoryMemberRepository(),
+                                                  InMemoryLoanRepository(), StandardFineStrategy())
+        yield "sqlite", ImprovedLibraryService(SQLiteBookRepository(self.pool), SQLiteMemberRepository(self.pool),
+                                               SQLiteLoanRepository(self.pool), StandardFineStrategy())
+    
+    def seed(self, service):
+        # Due dates relative to as_of: 6 days ago, 1 day ago, in 2 hours, in 30 hours, in 10 days
+        for loan_id, days_ago in (("a", 20), ("b", 15), ("c", 14 - 2 / 24), ("d", 14 - 30 / 24), ("e", 4)):
+            service.loan_repository.save(Loan(loan_id, "member1", f"book_{loan_id}", self.as_of - timedelta(days=days_ago)))
+    
+    def test_due_date_queries(self):
+        for name, service in self.services():
+            with self.subTest(backend=name):
+                self.seed(service)
+                
+                self.assertEqual(["a", "b"], [l.get_id() for l in service.get_overdue_loans(self.as_of)])
+                self.assertEqual(["c"], [l.get_id() for l in service.get_loans_due_within(as_of=self.as_of)])
+                self.assertEqual(["c", "d"], [l.get_id() for l in service.get_loans_due_within(timedelta(days=2), self.as_of)])
+                self.assertEqual(["a", "b", "c"], [l.get_id() for l in service.next_due(3)])
+                self.assertEqual([], service.next_due(0))
+                
+                service.loan_repository.delete("a")
+                self.assertEqual(["b"], [l.get_id() for l in service.get_overdue_loans(self.as_of)])
+
+
+if __name__ == '__main__':
+    unittest.main()
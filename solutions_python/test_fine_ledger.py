@@ -0,0 +1,112 @@
+import unittest
+from datetime import datetime, timedelta
+
+from .fine_ledger import FineLedger
+from .improved_library_service import ImprovedLibraryService
+from .in_memory_book_repository import InMemoryBookRepository
+from .in_memory_loan_repository import InMemoryLoanRepository
+from .in_memory_member_repository import InMemoryMemberRepository
+from .standard_fine_strategy import StandardFineStrategy
+from .student_fine_strategy import StudentFineStrategy
+from ..python_library.book import Book
+from ..python_library.loan import Loan
+from ..python_library.member import Member
+
+
+class FineLedgerTest(unittest.TestCase):
+    """
+    SOLUTION: Tests for the materialized fine ledger
+    """
+    
+    def setUp(self):
+        self.start = datetime(2024, 1, 1, 12, 0)
+        self.ledger = FineLedger(StandardFineStrategy(), 14, as_of=self.start)
+    
+    def test_accrual_matches_the_strategy(self):
+        loans = [Loan(f"loan{i}", f"member{i % 2}", f"book{i}", self.start + timedelta(days=i)) for i in range(4)]
+        for loan in loans:
+            self.ledger.open_loan(loan)
+        
+        self.assertEqual(0, self.ledger.accrue(self.start + timedelta(days=14)))
+        self.assertEqual(0.0, self.ledger.get_member_total_fine("member0"))
+        
+        as_of = self.start + timedelta(days=20, hours=1)
+        self.assertEqual(4, self.ledger.accrue(as_of))
+        expected = StandardFineStrategy().calculate_fines_batch(loans, 14, as_of)
+        self.assertEqual(expected, [self.ledger.get_loan_fine(loan.get_id()) for loan in loans])
+        self.assertEqual(expected[0] + expected[2], self.ledger.get_member_total_fine("member0"))
+        self.assertEqual(expected[1] + expected[3], self.ledger.get_member_total_fine("member1"))
+        self.assertEqual(as_of, self.ledger.watermark)
+        
+        with self.assertRaises(ValueError):
+            self.ledger.accrue(self.start)
+    
+    def test_return_freezes_the_fine(self):
+        self.ledger.open_loan(Loan("loan1", "member1", "book1", self.start))
+        self.ledger.accrue(self.start + timedelta(days=20))
+        self.assertEqual(3.0, self.ledger.get_member_total_fine("member1"))
+        self.assertEqual(3.0, self.ledger.get_member_open_fine("member1"))
+        
+        self.assertEqual(4.0, self.ledger.close_loan("loan1", self.start + timedelta(days=22)))
+        self.ledger.accrue(self.start + timedelta(days=60))
+        self.assertEqual(4.0, self.ledger.get_member_total_fine("member1"))
+        self.assertEqual(0.0, self.ledger.get_member_open_fine("member1"))
+        self.assertEqual(4.0, self.ledger.get_loan_fine("loan1"))
+        
+        # Returned before the due date: nothing owed, and its heap entry is skipped later
+        self.ledger.open_loan(Loan("loan2", "member2", "book2", self.start + timedelta(days=60)))
+        self.assertEqual(0.0, self.ledger.close_loan("loan2", self.start + timedelta(days=61)))
+        self.ledger.accrue(self.start + timedelta(days=100))
+        self.assertEqual(0.0, self.ledger.get_member_total_fine("member2"))
+    
+    def test_only_recent_frozen_fines_are_kept_per_loan(self):
+        ledger = FineLedger(StandardFineStrategy(), 14, as_of=self.start, frozen_capacity=2)
+        for i in range(3):
+            ledger.open_loan(Loan(f"loan{i}", "member1", f"book{i}", self.start))
+        for i in range(3):
+            self.assertEqual(3.0, ledger.close_loan(f"loan{i}", self.start + timedelta(days=20)))
+        
+        self.assertEqual([0.0, 3.0, 3.0], [ledger.get_loan_fine(f"loan{i}") for i in range(3)])
+        self.assertEqual(9.0, ledger.get_member_total_fine("member1"))
+        self.assertEqual(2, len(ledger._frozen))
+    
+    def test_loans_already_overdue_are_priced_on_open(self):
+        ledger = FineLedger(StudentFineStrategy(), 14, as_of=self.start + timedelta(days=30))
+        ledger.open_loan(Loan("loan1", "member1", "book1", self.start))
+        self.assertEqual(4.0, ledger.get_member_total_fine("member1"))
+        
+        self.assertFalse(ledger.accrue_if_stale(self.start + timedelta(days=30, hours=23)))
+        self.assertTrue(ledger.accrue_if_stale(self.start + timedelta(days=31)))
+        self.assertEqual(4.25, ledger.get_member_total_fine("member1"))
+    
+    def test_service_keeps_the_ledger_in_step(self):
+        books, members, loans = InMemoryBookRepository(), InMemoryMemberRepository(), InMemoryLoanRepository()
+        members.save(Member("member1", "John Doe", "john@example.com"))
+        for i in range(3):
+            books.save(Book(f"book{i}", f"Title {i}", "Author"))
+        old = Loan("old", "member1", "book0", datetime.now() - timedelta(days=24))
+        loans.save(old)
+        books.find_by_id("book0").set_available(False)
+        
+        strategy = StandardFineStrategy()
+        plain = ImprovedLibraryService(books, members, loans, strategy)
+        ledger = FineLedger(strategy, ImprovedLibraryService.LOAN_DURATION_DAYS, loans.find_all())
+        service = ImprovedLibraryService(books, members, loans, strategy, ledger)
+        
+        self.assertEqual(5.0, service.get_member_open_fine("member1"))
+        self.assertEqual(plain.get_member_open_fine("member1"), service.get_member_open_fine("member1"))
+        
+        loan = service.borrow_book("member1", "book1").get_loan()
+        self.assertEqual(0.0, ledger.get_loan_fine(loan.get_id()))
+        self.assertEqual(plain.get_member_open_fine("member1"), service.get_member_open_fine("member1"))
+        self.assertTrue(service.return_book("old").is_success())
+        self.assertTrue(service.return_books([loan.get_id()])[0].is_success())
+        
+        # Both configurations drop returned loans; only the ledger keeps their fines owed
+        self.assertEqual(0.0, service.get_member_open_fine("member1"))
+        self.assertEqual(plain.get_member_open_fine("member1"), service.get_member_open_fine("member1"))
+        self.assertEqual(5.0, ledger.get_member_total_fine("member1"))
+        self.assertEqual(0.0, service.get_member_open_fine("nobody"))
+
+if __name__ == '__main__':
+    unittest.main()
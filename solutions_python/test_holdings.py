@@ -0,0 +1,146 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from .bulk_exporter import BulkExporter
+from .bulk_importer import BulkImporter
+from .improved_library_service import ImprovedLibraryService
+from .in_memory_book_repository import InMemoryBookRepository
+from .in_memory_loan_repository import InMemoryLoanRepository
+from .in_memory_member_repository import InMemoryMemberRepository
+from .mmap_book_repository import MmapBookRepository
+from .sqlite_book_repository import SQLiteBookRepository
+from .sqlite_connection_pool import SQLiteConnectionPool
+from .sqlite_loan_repository import SQLiteLoanRepository
+from .sqlite_member_repository import SQLiteMemberRepository
+from .standard_fine_strategy import StandardFineStrategy
+from ..python_library.book import Book
+from ..python_library.member import Member
+
+
+def dune_copies(count):
+    """The first copy carries the title ID itself, like a catalog that grew from one copy"""
+    return [Book("dune" if i == 0 else f"dune-{i}", "Dune", "Frank Herbert", "dune") for i in range(count)]
+
+
+class HoldingsRepositoryTest(unittest.TestCase):
+    """
+    SOLUTION: Tests for free-copy lookup and title counts on every backend
+    """
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.pool = SQLiteConnectionPool(os.path.join(self.directory, "library.db"), pool_size=2)
+    
+    def tearDown(self):
+        self.pool.close()
+        shutil.rmtree(self.directory)
+    
+    def repositories(self):
+        books = dune_copies(4) + [Book("book1", "Emma", "Jane Austen")]
+        mmap_path = os.path.join(self.directory, "books.bin")
+        MmapBookRepository.write_catalog(mmap_path, books)
+        repositories = {'in-memory': InMemoryBookRepository(), 'sqlite': SQLiteBookRepository(self.pool),
+                        'mmap': MmapBookRepository(mmap_path)}
+        for name in ('in-memory', 'sqlite'):
+            for book in books:
+                repositories[name].save(book)
+        return repositories
+    
+    def test_free_copies_and_title_counts(self):
+        for name, repository in self.repositories().items():
+            with self.subTest(backend=name):
+                copies = repository.find_free_copies("dune", 10)
+                self.assertEqual({"dune", "dune-1", "dune-2", "dune-3"}, {book.get_id() for book in copies})
+                self.assertEqual(1, len(repository.find_free_copies("dune")))
+                self.assertEqual(["book1"], [book.get_id() for book in repository.find_free_copies("book1", 5)])
+                self.assertEqual([], repository.find_free_copies("missing"))
+                self.assertEqual((4, 1, 0), (repository.count_copies("dune"), repository.count_copies("book1"),
+                                             repository.count_copies("missing")))
+                
+                for book in copies[:3]:
+                    book.set_available(False)
+                    repository.update(book)
+                self.assertEqual([copies[3].get_id()],
+                                 [book.get_id() for book in repository.find_free_copies("dune", 10)])
+                
+                titles = sorted(repository.available_titles())
+                self.assertEqual([("book1", "Emma", "Jane Austen", 1, 1), ("dune", "Dune", "Frank Herbert", 1, 4)],
+                                 titles)
+                
+                repository.delete(copies[3].get_id())
+                self.assertEqual([], repository.find_free_copies("dune"))
+                self.assertEqual(["book1"], [title.title_id for title in repository.available_titles()])
+                if name == 'mmap':
+                    repository.close()
+    
+    def test_bulk_round_trip_keeps_title_ids(self):
+        books = InMemoryBookRepository()
+        for book in dune_copies(3) + [Book("book1", "Emma", "Jane Austen")]:
+            books.save(book)
+        exported = io.StringIO()
+        self.assertEqual(4, BulkExporter(books).export_books(exported, format='csv'))
+        
+        copy = SQLiteBookRepository(self.pool)
+        self.assertTrue(BulkImporter(copy).import_books(io.StringIO(exported.getvalue()), format='csv').is_success())
+        self.assertEqual(["dune", "dune", "dune", "book1"], [book.get_title_id() for book in copy.iter_all()])
+        self.assertEqual(3, len(copy.find_free_copies("dune", 5)))
+
+
+class TitleBorrowTest(unittest.TestCase):
+    """
+    SOLUTION: Tests for borrowing by title ID through ImprovedLibraryService
+    """
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.pool = SQLiteConnectionPool(os.path.join(self.directory, "library.db"), pool_size=2)
+    
+    def tearDown(self):
+        self.pool.close()
+        shutil.rmtree(self.directory)
+    
+    def services(self):
+        repositories = {
+            'in-memory': (InMemoryBookRepository(), InMemoryMemberRepository(), InMemoryLoanRepository()),
+            'sqlite': (SQLiteBookRepository(self.pool), SQLiteMemberRepository(self.pool),
+                       SQLiteLoanRepository(self.pool)),
+        }
+        for name, (books, members, loans) in repositories.items():
+            for book in dune_copies(3):
+                books.save(book)
+            for i in range(1, 4):
+                members.save(Member(f"member{i}", f"Member {i}", f"member{i}@example.com"))
+            yield name, ImprovedLibraryService(books, members, loans, StandardFineStrategy())
+    
+    def test_borrow_by_title_lends_each_copy_once(self):
+        for name, service in self.services():
+            with self.subTest(backend=name):
+                lent = [service.borrow_book(f"member{i}", "dune") for i in range(1, 4)]
+                self.assertTrue(all(result.is_success() for result in lent))
+                self.assertEqual({"dune", "dune-1", "dune-2"}, {result.get_loan().get_book_id() for result in lent})
+                self.assertEqual("Book is not available", service.borrow_book("member1", "dune").get_message())
+                self.assertEqual([], service.get_available_titles())
+                
+                service.return_book(lent[1].get_loan().get_id())
+                self.assertEqual([("dune", "Dune", "Frank Herbert", 1, 3)], service.get_available_titles())
+                self.assertTrue(service.borrow_book("member2", "dune").is_success())
+    
+    def test_batch_borrow_spreads_over_copies(self):
+        for name, service in self.services():
+            with self.subTest(backend=name):
+                # The copy requested by its own ID is not handed out again for the title
+                batch = [("member1", "dune-1"), ("member2", "dune"), ("member3", "dune"), ("member3", "dune")]
+                results = service.borrow_books(batch)
+                
+                self.assertEqual([True, True, True, False], [result.is_success() for result in results])
+                self.assertEqual({"dune", "dune-1", "dune-2"},
+                                 {result.get_loan().get_book_id() for result in results[:3]})
+                self.assertEqual("Book is not available", results[3].get_message())
+                self.assertEqual([], service.book_repository.find_free_copies("dune"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,253 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from . import improved_library_service
+from .concurrent_library_service import ConcurrentLibraryService
+from .hold import Hold
+from .hold_queue import HoldQueue
+from .improved_library_service import ImprovedLibraryService
+from .in_memory_book_repository import InMemoryBookRepository
+from .in_memory_loan_repository import InMemoryLoanRepository
+from .in_memory_member_repository import InMemoryMemberRepository
+from .sqlite_book_repository import SQLiteBookRepository
+from .sqlite_connection_pool import SQLiteConnectionPool
+from .sqlite_loan_repository import SQLiteLoanRepository
+from .sqlite_member_repository import SQLiteMemberRepository
+from .standard_fine_strategy import StandardFineStrategy
+from ..python_library.book import Book
+from ..python_library.member import Member
+
+
+class HoldQueueTest(unittest.TestCase):
+    """
+    SOLUTION: Tests for hold ordering, lazy cancellation, expiry and notifications
+    """
+    
+    def setUp(self):
+        self.holds = HoldQueue(pickup_window=timedelta(days=2))
+        self.now = datetime(2024, 3, 1, 9, 0)
+    
+    def test_priority_then_first_come_first_served(self):
+        first = self.holds.place("member1", "dune", now=self.now)
+        second = self.holds.place("member2", "dune", now=self.now)
+        urgent = self.holds.place("member3", "dune", priority=1, now=self.now)
+        with self.assertRaises(ValueError):
+            self.holds.place("member1", "dune")
+        
+        served = [self.holds.handoff("dune", f"copy{i}", self.now) for i in range(3)]
+        self.assertEqual([urgent, first, second], served)
+        self.assertIsNone(self.holds.handoff("dune", "copy3", self.now))
+        self.assertEqual(("copy1", self.now + timedelta(days=2)), (first.get_copy_id(), first.get_ready_until()))
+        self.assertEqual(Hold.READY, first.get_status())
+    
+    def test_cancelled_holds_are_skipped_and_compacted(self):
+        holds = [self.holds.place(f"member{i}", "bestseller", now=self.now) for i in range(10_000)]
+        for hold in holds[:9_000]:
+            self.assertIs(hold, self.holds.cancel(hold.get_id()))
+        self.assertIsNone(self.holds.cancel(holds[0].get_id()))
+        self.assertEqual(1_000, self.holds.waiting_count("bestseller"))
+        # Rebuilt once most entries were cancelled, so the heap holds little more than the live holds
+        self.assertLess(len(self.holds._queues["bestseller"]), 2 * 1_000)
+        
+        served = self.holds.handoff("bestseller", "copy1", self.now)
+        self.assertIs(holds[9_000], served)
+        self.holds.cancel(holds[9_001].get_id())
+        self.assertIs(holds[9_002], self.holds.handoff("bestseller", "copy2", self.now))
+        self.assertEqual(997, self.holds.waiting_count("bestseller"))
+        self.assertEqual([served], self.holds.member_holds("member9000"))
+    
+    def test_unclaimed_holds_expire(self):
+        notified = []
+        self.holds.subscribe(notified.append)
+        picked_up = self.holds.place("member1", "dune", now=self.now)
+        unclaimed = self.holds.place("member2", "dune", now=self.now)
+        self.holds.handoff("dune", "copy1", self.now)
+        self.holds.handoff("dune", "copy2", self.now + timedelta(hours=1))
+        self.assertIs(picked_up, self.holds.fulfil(picked_up.get_id()))
+        
+        self.assertEqual([], self.holds.expire(self.now + timedelta(days=1)))
+        self.assertEqual([unclaimed], self.holds.expire(self.now + timedelta(days=3)))
+        self.assertEqual(Hold.EXPIRED, unclaimed.get_status())
+        self.assertIsNone(self.holds.find("member2", "dune"))
+        self.assertEqual(0, len(self.holds))
+        # Ready twice, then the expiry; a fulfilled hold is not announced
+        self.assertEqual([picked_up, unclaimed, unclaimed], notified)
+    
+    def test_async_queue_receives_ready_holds(self):
+        async def scenario():
+            queue = self.holds.async_queue()
+            hold = self.holds.place("member1", "dune")
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.holds.handoff, "dune", "copy1")
+            received = await asyncio.wait_for(queue.get(), timeout=5)
+            self.holds.unsubscribe(queue)
+            return hold, received
+        
+        hold, received = asyncio.run(scenario())
+        self.assertIs(hold, received)
+        self.assertTrue(received.is_ready())
+
+
+class ServiceHoldTest(unittest.TestCase):
+    """
+    SOLUTION: Tests for holds through ImprovedLibraryService and ConcurrentLibraryService
+    """
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.pool = SQLiteConnectionPool(os.path.join(self.directory, "library.db"), pool_size=2)
+    
+    def tearDown(self):
+        self.pool.close()
+        shutil.rmtree(self.directory)
+    
+    def services(self):
+        repositories = {
+            'in-memory': (InMemoryBookRepository(), InMemoryMemberRepository(), InMemoryLoanRepository()),
+            'sqlite': (SQLiteBookRepository(self.pool), SQLiteMemberRepository(self.pool),
+                       SQLiteLoanRepository(self.pool)),
+        }
+        for name, (books, members, loans) in repositories.items():
+            books.save(Book("book1", "Emma", "Jane Austen"))
+            for i in range(1, 3):
+                books.save(Book(f"dune-{i}", "Dune", "Frank Herbert", "dune"))
+            for i in range(1, 5):
+                members.save(Member(f"member{i}", f"Member {i}", f"member{i}@example.com"))
+            service_class = ConcurrentLibraryService if name == 'sqlite' else ImprovedLibraryService
+            yield name, service_class(books, members, loans, StandardFineStrategy(), holds=HoldQueue())
+    
+    def test_return_hands_the_copy_to_the_next_hold(self):
+        for name, service in self.services():
+            with self.subTest(backend=name):
+                notified = []
+                service.holds.subscribe(notified.append)
+                loan = service.borrow_book("member1", "book1").get_loan()
+                hold = service.place_hold("member2", "book1").get_hold()
+                self.assertEqual("Hold placed", service.place_hold("member3", "book1").get_message())
+                self.assertEqual("Member already has a hold on this book",
+                                 service.place_hold("member2", "book1").get_message())
+                
+                self.assertTrue(service.return_book(loan.get_id()).is_success())
+                self.assertEqual([hold], notified)
+                self.assertEqual("book1", hold.get_copy_id())
+                self.assertNotIn("book1", [book.get_id() for book in service.get_available_books()])
+                self.assertEqual("Book is not available", service.borrow_book("member3", "book1").get_message())
+                
+                result = service.borrow_book("member2", "book1")
+                self.assertTrue(result.is_success())
+                self.assertEqual(Hold.FULFILLED, hold.get_status())
+                self.assertEqual([], service.get_member_holds("member2"))
+                self.assertEqual(1, len(service.get_member_holds("member3")))
+    
+    def test_title_holds_and_cancellation(self):
+        for name, service in self.services():
+            with self.subTest(backend=name):
+                # A copy on the shelf is set aside at once
+                first = service.place_hold("member1", "dune")
+                self.assertEqual("Hold ready for pickup", first.get_message())
+                second = service.place_hold("member2", "dune-2").get_hold()
+                self.assertTrue(second.is_ready())
+                self.assertEqual([], service.book_repository.find_free_copies("dune"))
+                waiting = service.place_hold("member3", "dune").get_hold()
+                self.assertEqual(Hold.WAITING, waiting.get_status())
+                
+                # Cancelling a ready hold passes its copy down the queue, then back to the shelf
+                self.assertTrue(service.cancel_hold(first.get_hold().get_id()).is_success())
+                self.assertEqual(first.get_hold().get_copy_id(), waiting.get_copy_id())
+                self.assertTrue(service.cancel_hold(second.get_id()).is_success())
+                self.assertEqual([second.get_copy_id()],
+                                 [book.get_id() for book in service.book_repository.find_free_copies("dune", 5)])
+                self.assertEqual("Hold not found", service.cancel_hold(second.get_id()).get_message())
+                
+                results = service.borrow_books([("member3", "dune"), ("member4", "dune"), ("member1", "dune")])
+                self.assertEqual([waiting.get_copy_id(), second.get_copy_id()],
+                                 [result.get_loan().get_book_id() for result in results[:2]])
+                self.assertEqual("Book is not available", results[2].get_message())
+                self.assertEqual(Hold.FULFILLED, waiting.get_status())
+                self.assertEqual("Book not found", service.place_hold("member1", "missing").get_message())
+    
+    def test_expired_holds_pass_the_copy_on(self):
+        for name, service in self.services():
+            with self.subTest(backend=name):
+                unclaimed = service.place_hold("member1", "book1").get_hold()
+                waiting = service.place_hold("member2", "book1").get_hold()
+                self.assertEqual(0, service.expire_holds())
+                
+                later = unclaimed.get_ready_until() + timedelta(seconds=1)
+                self.assertEqual(1, service.expire_holds(later))
+                self.assertEqual(Hold.EXPIRED, unclaimed.get_status())
+                self.assertEqual("book1", waiting.get_copy_id())
+                self.assertEqual(1, service.expire_holds(waiting.get_ready_until()))
+                self.assertTrue(service.book_repository.find_by_id("book1").is_available())
+    
+    def test_batch_calls_expire_due_holds_first(self):
+        class ThreeDaysLater(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return datetime.now(tz) + timedelta(days=3)
+        
+        for name, service in self.services():
+            with self.subTest(backend=name):
+                set_aside = service.place_hold("member1", "dune").get_hold()
+                lent = service.borrow_book("member4", "dune").get_loan()
+                waiting = service.place_hold("member2", "dune").get_hold()
+                with mock.patch.object(improved_library_service, 'datetime', ThreeDaysLater):
+                    self.assertTrue(service.return_books([lent.get_id()])[0].is_success())
+                # The expired hold's copy went to member2 before the returned one came back
+                self.assertEqual(Hold.EXPIRED, set_aside.get_status())
+                self.assertEqual(set_aside.get_copy_id(), waiting.get_copy_id())
+                self.assertTrue(service.book_repository.find_by_id(lent.get_book_id()).is_available())
+                
+                unclaimed = service.place_hold("member1", "book1").get_hold()
+                with mock.patch.object(improved_library_service, 'datetime', ThreeDaysLater):
+                    self.assertTrue(service.borrow_books([("member3", "book1")])[0].is_success())
+                self.assertEqual(Hold.EXPIRED, unclaimed.get_status())
+    
+    def test_concurrent_expiry_takes_the_title_stripe(self):
+        books, members, loans = InMemoryBookRepository(), InMemoryMemberRepository(), InMemoryLoanRepository()
+        books.save(Book("book1", "Emma", "Jane Austen"))
+        books.save(Book("book2", "Dune", "Frank Herbert"))
+        for i in range(1, 4):
+            members.save(Member(f"member{i}", f"Member {i}", f"member{i}@example.com"))
+        service = ConcurrentLibraryService(books, members, loans, StandardFineStrategy(), holds=HoldQueue())
+        unclaimed = service.place_hold("member1", "book1").get_hold()
+        waiting = service.place_hold("member2", "book1").get_hold()
+        
+        later = unclaimed.get_ready_until() + timedelta(seconds=1)
+        expiry = threading.Thread(target=service.expire_holds, args=(later,))
+        with service._locks.locked(service._book_key("book1")):
+            expiry.start()
+            expiry.join(0.2)
+            self.assertTrue(expiry.is_alive())
+            self.assertIsNone(waiting.get_copy_id())
+        expiry.join(5)
+        self.assertEqual("book1", waiting.get_copy_id())
+        
+        # Lazy expiry runs before a borrow takes its stripes, so with one stripe for everything
+        # a hold on another title expiring during the borrow cannot deadlock it
+        single = ConcurrentLibraryService(books, members, InMemoryLoanRepository(), StandardFineStrategy(),
+                                          stripes=1, holds=HoldQueue(pickup_window=timedelta(0)))
+        self.assertTrue(single.place_hold("member3", "book2").get_hold().is_ready())
+        borrow = threading.Thread(target=single.borrow_book, args=("member3", "book1"))
+        borrow.start()
+        borrow.join(5)
+        self.assertFalse(borrow.is_alive())
+        self.assertTrue(books.find_by_id("book2").is_available())
+    
+    def test_holds_need_a_queue(self):
+        books, members, loans = InMemoryBookRepository(), InMemoryMemberRepository(), InMemoryLoanRepository()
+        service = ImprovedLibraryService(books, members, loans, StandardFineStrategy())
+        self.assertEqual("Holds are not enabled", service.place_hold("member1", "book1").get_message())
+        self.assertEqual("Hold ID cannot be null or empty", service.cancel_hold(" ").get_message())
+        self.assertEqual([], service.get_member_holds("member1"))
+        self.assertEqual(0, service.expire_holds())
+
+
+if __name__ == '__main__':
+    unittest.main()
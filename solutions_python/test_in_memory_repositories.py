@@ -0,0 +1,106 @@
+import unittest
+from datetime import datetime
+
+from .improved_library_service import ImprovedLibraryService
+from .in_memory_book_repository import InMemoryBookRepository
+from .in_memory_loan_repository import InMemoryLoanRepository
+from .in_memory_member_repository import InMemoryMemberRepository
+from .standard_fine_strategy import StandardFineStrategy
+from ..python_library.book import Book
+from ..python_library.loan import Loan
+from ..python_library.member import Member
+
+
+class InMemoryRepositoryTest(unittest.TestCase):
+    """
+    SOLUTION: Tests for the in-memory repositories and their secondary indexes
+    """
+    
+    def setUp(self):
+        self.book_repository = InMemoryBookRepository()
+        self.member_repository = InMemoryMemberRepository()
+        self.loan_repository = InMemoryLoanRepository()
+    
+    def test_book_availability_index(self):
+        """Availability index follows save/update/delete"""
+        book1 = Book("book1", "Title 1", "Author 1")
+        book2 = Book("book2", "Title 2", "Author 2")
+        self.book_repository.save(book1)
+        self.book_repository.save(book2)
+        self.assertEqual(2, self.book_repository.count_available())
+        
+        book1.set_available(False)
+        self.book_repository.update(book1)
+        self.assertEqual(["book2"], [b.get_id() for b in self.book_repository.find_available()])
+        
+        self.book_repository.delete("book2")
+        self.assertEqual([], self.book_repository.find_available())
+        self.assertIsNone(self.book_repository.find_by_id("book2"))
+    
+    def test_iter_available_pagination(self):
+        """iter_available pages through the availability set only"""
+        for i in range(10):
+            book = Book(f"book{i}", f"Title {i}", "Author")
+            book.set_available(i % 2 == 0)
+            self.book_repository.save(book)
+        
+        self.assertEqual(["book4", "book6"], [b.get_id() for b in self.book_repository.iter_available(2, 2)])
+        self.assertEqual(["book8"], [b.get_id() for b in self.book_repository.iter_available(4)])
+        self.assertEqual([], list(self.book_repository.iter_available(0, 0)))
+    
+    def test_update_missing_entity_raises(self):
+        """Updating an entity that was never saved is an error"""
+        with self.assertRaises(KeyError):
+            self.book_repository.update(Book("missing", "Title", "Author"))
+        with self.assertRaises(KeyError):
+            self.member_repository.update(Member("missing", "Name", "email@example.com"))
+        with self.assertRaises(KeyError):
+            self.loan_repository.update(Loan("missing", "member1", "book1", datetime.now()))
+    
+    def test_loan_member_and_book_indexes(self):
+        """Member and book indexes follow save/update/delete"""
+        loan1 = Loan("loan1", "member1", "book1", datetime.now())
+        loan2 = Loan("loan2", "member1", "book2", datetime.now())
+        self.loan_repository.save(loan1)
+        self.loan_repository.save(loan2)
+        
+        self.assertEqual(["loan1", "loan2"], [l.get_id() for l in self.loan_repository.find_by_member_id("member1")])
+        self.assertEqual(2, self.loan_repository.count_by_member_id("member1"))
+        self.assertIs(loan2, self.loan_repository.find_by_book_id("book2"))
+        
+        self.loan_repository.delete("loan1")
+        self.assertEqual(1, self.loan_repository.count_by_member_id("member1"))
+        self.assertIsNone(self.loan_repository.find_by_book_id("book1"))
+        self.assertEqual([], self.loan_repository.find_by_member_id("unknown"))
+    
+    def test_loan_update_reindexes_mutated_loan(self):
+        """Updating a loan mutated in place moves it between index entries"""
+        loan = Loan("loan1", "member1", "book1", datetime.now())
+        self.loan_repository.save(loan)
+        
+        loan.member_id = "member2"
+        self.loan_repository.update(loan)
+        
+        self.assertEqual([], self.loan_repository.find_by_member_id("member1"))
+        self.assertEqual([loan], self.loan_repository.find_by_member_id("member2"))
+    
+    def test_service_borrow_limit_and_return(self):
+        """ImprovedLibraryService runs end to end on the in-memory repositories"""
+        service = ImprovedLibraryService(self.book_repository, self.member_repository,
+                                         self.loan_repository, StandardFineStrategy())
+        service.add_member(Member("member1", "John Doe", "john@example.com"))
+        for i in range(6):
+            service.add_book(Book(f"book{i}", f"Title {i}", "Author"))
+        
+        results = [service.borrow_book("member1", f"book{i}") for i in range(6)]
+        self.assertTrue(all(r.is_success() for r in results[:5]))
+        self.assertIn("maximum borrowing limit", results[5].get_message())
+        self.assertEqual(1, len(service.get_available_books()))
+        
+        self.assertTrue(service.return_book(results[0].get_loan().get_id()).is_success())
+        self.assertEqual(4, len(service.get_member_loans("member1")))
+        self.assertEqual(2, len(service.get_available_books()))
+
+
+if __name__ == '__main__':
+    unittest.main()
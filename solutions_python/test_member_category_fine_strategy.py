@@ -0,0 +1,124 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+from . import fine_calculation_strategy
+from .daily_rate_fine_strategy import DailyRateFineStrategy
+from .improved_library_service import ImprovedLibraryService
+from .in_memory_book_repository import InMemoryBookRepository
+from .in_memory_loan_repository import InMemoryLoanRepository
+from .in_memory_member_repository import InMemoryMemberRepository
+from .member_category_fine_strategy import MemberCategoryFineStrategy
+from .sqlite_connection_pool import SQLiteConnectionPool
+from .sqlite_member_repository import SQLiteMemberRepository
+from .standard_fine_strategy import StandardFineStrategy
+from .student_fine_strategy import StudentFineStrategy
+from ..python_library.book import Book
+from ..python_library.loan import Loan
+from ..python_library.member import Member
+
+
+class MemberCategoryFineStrategyTest(unittest.TestCase):
+    """
+    SOLUTION: Tests for per-member fine strategy dispatch
+    """
+    
+    def setUp(self):
+        self.members = InMemoryMemberRepository()
+        self.members.save(Member("member1", "John Doe", "john@example.com"))
+        self.members.save(Member("member2", "Jane Roe", "jane@example.com", "student"))
+        self.members.save(Member("member3", "Sam Poe", "sam@example.com", "staff"))
+        self.members.save(Member("member4", "Ann Loe", "ann@example.com", "alumni"))
+        self.strategy = MemberCategoryFineStrategy(
+            self.members, {'student': StudentFineStrategy(), 'staff': DailyRateFineStrategy(0.0)},
+            StandardFineStrategy())
+        self.as_of = datetime(2024, 2, 1)
+        # Ten days overdue as of as_of
+        self.borrowed = self.as_of - timedelta(days=24)
+    
+    def test_fines_follow_the_member_category(self):
+        loans = [Loan(f"loan{i}", f"member{i}", f"book{i}", self.borrowed) for i in range(1, 6)]
+        fines = self.strategy.calculate_fines_batch(loans, 14, self.as_of)
+        
+        # Public and unknown categories or members use the default
+        self.assertEqual([5.0, 2.5, 0.0, 5.0, 5.0], fines)
+        self.assertIsInstance(self.strategy.strategy_for_member("member2"), StudentFineStrategy)
+        self.assertEqual([], self.strategy.calculate_fines_batch([], 14, self.as_of))
+        
+        loan = Loan("loan", "member2", "book", datetime.now() - timedelta(days=24))
+        self.assertEqual(2.5, self.strategy.calculate_fine(loan, 14))
+    
+    def test_members_are_resolved_once_per_batch(self):
+        members = Mock(wraps=self.members)
+        strategy = MemberCategoryFineStrategy.from_rates(members, {'student': 0.25, 'staff': 0.1},
+                                                         StandardFineStrategy())
+        loans = [Loan(f"loan{i}", f"member{i % 4 + 1}", f"book{i}", self.borrowed) for i in range(100)]
+        
+        fines = strategy.calculate_fines_batch(loans, 14, self.as_of)
+        self.assertEqual([5.0, 2.5, 1.0, 5.0] * 25, fines)
+        strategy.calculate_fines_batch(loans, 14, self.as_of)
+        strategy.calculate_fine(loans[0], 14)
+        self.assertEqual(1, members.find_by_ids.call_count)
+        members.find_by_id.assert_not_called()
+        
+        # A category change is picked up after invalidate
+        self.members.save(Member("member1", "John Doe", "john@example.com", "staff"))
+        self.assertEqual(5.0, strategy.calculate_fines_batch(loans[:1], 14, self.as_of)[0])
+        strategy.invalidate("member1")
+        self.assertEqual(1.0, strategy.calculate_fines_batch(loans[:1], 14, self.as_of)[0])
+    
+    @unittest.skipIf(fine_calculation_strategy.np is None, "numpy is not installed")
+    def test_array_fines_follow_the_member_category(self):
+        np = fine_calculation_strategy.np
+        member_ids = [f"member{i % 5 + 1}" for i in range(10)]
+        loans = [Loan(f"loan{i}", member_id, f"book{i}", self.borrowed) for i, member_id in enumerate(member_ids)]
+        dates = np.array([loan.get_borrow_date() for loan in loans], dtype='datetime64[us]')
+        
+        fines = self.strategy.calculate_fines_array(dates, 14, self.as_of, member_ids)
+        self.assertEqual(self.strategy.calculate_fines_batch(loans, 14, self.as_of), fines.tolist())
+        self.assertEqual([2.5, 2.5], self.strategy.calculate_fines_array(dates[:2], 14, self.as_of,
+                                                                         ["member2", "member2"]).tolist())
+        with self.assertRaises(TypeError):
+            self.strategy.calculate_fines_array(dates, 14, self.as_of)
+    
+    def test_service_uses_one_strategy_for_all_members(self):
+        books, loans = InMemoryBookRepository(), InMemoryLoanRepository()
+        for i in range(2):
+            books.save(Book(f"book{i}", f"Title {i}", "Author"))
+        service = ImprovedLibraryService(books, self.members, loans, self.strategy)
+        first = service.borrow_book("member1", "book0").get_loan()
+        second = service.borrow_book("member2", "book1").get_loan()
+        
+        as_of = datetime.now() + timedelta(days=24)
+        self.assertEqual({first.get_id(): 5.0, second.get_id(): 2.5}, service.calculate_fines(as_of))
+
+
+class MemberCategoryPersistenceTest(unittest.TestCase):
+    """
+    SOLUTION: Tests for storing the member category in SQLite
+    """
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "library.db")
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+    
+    def test_category_round_trips(self):
+        with SQLiteConnectionPool(self.path) as pool:
+            members = SQLiteMemberRepository(pool)
+            members.save(Member("member1", "John Doe", "john@example.com", "student"))
+            members.save(Member("member2", "Jane Roe", "jane@example.com"))
+            self.assertEqual("student", members.find_by_id("member1").get_category())
+            self.assertEqual(Member.DEFAULT_CATEGORY, members.find_by_id("member2").get_category())
+            
+            members.update(Member("member2", "Jane Roe", "jane@example.com", "staff"))
+            self.assertEqual(["student", "staff"], [member.get_category() for member in members.iter_all()])
+
+
+if __name__ == '__main__':
+    unittest.main()
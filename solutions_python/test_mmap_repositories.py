@@ -0,0 +1,112 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from .catalog_file import CatalogFile
+from .improved_library_service import ImprovedLibraryService
+from .in_memory_loan_repository import InMemoryLoanRepository
+from .mmap_book_repository import MmapBookRepository
+from .mmap_member_repository import MmapMemberRepository
+from .standard_fine_strategy import StandardFineStrategy
+from ..python_library.book import Book
+from ..python_library.member import Member
+
+
+class CatalogFileTest(unittest.TestCase):
+    """
+    SOLUTION: Tests for the memory-mapped catalog format
+    """
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "catalog.bin")
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+    
+    def test_lookup_and_scan(self):
+        rows = [((f"id{i}", f"Title {i} é", ""), i % 2) for i in range(1000)]
+        self.assertEqual(1000, CatalogFile.write(self.path, rows, 3))
+        
+        with CatalogFile(self.path) as catalog:
+            self.assertEqual(1000, len(catalog))
+            self.assertEqual((("id417", "Title 417 é", ""), 1), catalog.get("id417"))
+            self.assertIsNone(catalog.get("id1000"))
+            self.assertNotIn("missing", catalog)
+            self.assertEqual(rows, list(catalog))
+    
+    def test_empty_catalog(self):
+        CatalogFile.write(self.path, [], 3)
+        with CatalogFile(self.path) as catalog:
+            self.assertEqual(0, len(catalog))
+            self.assertIsNone(catalog.get("id1"))
+            self.assertEqual([], list(catalog))
+    
+    def test_rejects_duplicates_and_foreign_files(self):
+        with self.assertRaises(ValueError):
+            CatalogFile.write(self.path, [(("id1", "a"), 0), (("id1", "b"), 0)], 2)
+        self.assertFalse(os.path.exists(self.path))
+        
+        with open(self.path, 'wb') as file:
+            file.write(b"not a catalog at all, just some bytes")
+        with self.assertRaises(ValueError):
+            CatalogFile(self.path)
+
+
+class MmapRepositoryTest(unittest.TestCase):
+    """
+    SOLUTION: Tests for the lazily materializing repositories
+    """
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.books_path = os.path.join(self.directory, "books.bin")
+        self.members_path = os.path.join(self.directory, "members.bin")
+        MmapBookRepository.write_catalog(self.books_path, (Book(f"book{i}", f"Title {i}", "Author")
+                                                           for i in range(100)))
+        MmapMemberRepository.write_catalog(self.members_path, [Member("member1", "John Doe", "john@example.com")])
+        self.books = MmapBookRepository(self.books_path)
+        self.members = MmapMemberRepository(self.members_path)
+    
+    def tearDown(self):
+        self.books.close()
+        self.members.close()
+        shutil.rmtree(self.directory)
+    
+    def test_overlay_writes(self):
+        book = self.books.find_by_id("book7")
+        self.assertIs(book, self.books.find_by_id("book7"))
+        self.assertEqual("Title 7", book.get_title())
+        
+        self.books.save(Book("new", "New Title", "Author"))
+        self.books.delete("book3")
+        self.books.delete("book3")
+        self.assertIsNone(self.books.find_by_id("book3"))
+        self.assertEqual(100, len(self.books))
+        with self.assertRaises(KeyError):
+            self.books.update(Book("book3", "Gone", "Author"))
+        
+        ids = [book.get_id() for book in self.books.find_all()]
+        self.assertEqual(100, len(ids))
+        self.assertNotIn("book3", ids)
+        self.assertEqual("new", ids[-1])
+    
+    def test_service_over_mmap_repositories(self):
+        service = ImprovedLibraryService(self.books, self.members, InMemoryLoanRepository(), StandardFineStrategy())
+        result = service.borrow_book("member1", "book42")
+        self.assertTrue(result.is_success())
+        self.assertFalse(self.books.find_by_id("book42").is_available())
+        self.assertEqual(99, len(service.get_available_books()))
+        self.assertEqual("book0", next(self.books.iter_available(0, 1)).get_id())
+        
+        # Folding the overlay into a new catalog keeps the change
+        compacted = os.path.join(self.directory, "books2.bin")
+        MmapBookRepository.write_catalog(compacted, self.books.iter_all())
+        with CatalogFile(compacted) as catalog:
+            self.assertEqual(0, catalog.get("book42")[1])
+            self.assertEqual(1, catalog.get("book41")[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+from .improved_library_service import ImprovedLibraryService
+from .in_memory_book_repository import InMemoryBookRepository
+from .in_memory_loan_repository import InMemoryLoanRepository
+from .in_memory_member_repository import InMemoryMemberRepository
+from .daily_rate_fine_strategy import DailyRateFineStrategy
+from .loan_aggregations import LoanAggregation, LoanFines
+from .loan_chunk import LoanChunk
+from .member_category_fine_strategy import MemberCategoryFineStrategy
+from .nightly_job_runner import NightlyJobRunner
+from .sqlite_connection_pool import SQLiteConnectionPool
+from .sqlite_loan_repository import SQLiteLoanRepository
+from .sqlite_member_repository import SQLiteMemberRepository
+from .standard_fine_strategy import StandardFineStrategy
+from .student_fine_strategy import StudentFineStrategy
+from ..python_library.columnar_store import NO_DATE
+from ..python_library.loan import Loan
+from ..python_library.member import Member
+
+
+class BooksPerShelf(LoanAggregation):
+    """Loans per book ID prefix: a custom job, defined at module level so workers can unpickle it"""
+    
+    def empty(self):
+        return Counter()
+    
+    def map_chunk(self, chunk):
+        return Counter(book_id.split("-")[0] for book_id in chunk.book_ids)
+    
+    def merge(self, result, chunk, partial):
+        result.update(partial)
+        return result
+
+
+class LoanChunkTest(unittest.TestCase):
+    """
+    SOLUTION: Tests for the columnar loan chunk encoding
+    """
+    
+    def test_round_trip(self):
+        loans = [
+            Loan("loan1", "member1", "book1", datetime(2024, 3, 1, 9, 30, 0, 123456)),
+            Loan("loan-two", "member2", "book2", None),
+            Loan("löan3", "member1", "", datetime(1969, 12, 31, 23, 0)),
+        ]
+        chunk = pickle.loads(pickle.dumps(LoanChunk.encode(loans)))
+        self.assertEqual(3, len(chunk))
+        self.assertEqual(["member1", "member2"], chunk.members)
+        self.assertEqual(array('I', [0, 1, 0]), chunk.member_index)
+        self.assertEqual(NO_DATE, chunk.borrow_micros[1])
+        self.assertEqual([(loan.get_id(), loan.get_member_id(), loan.get_book_id(), loan.get_borrow_date())
+                          for loan in loans],
+                         [(loan.get_id(), loan.get_member_id(), loan.get_book_id(), loan.get_borrow_date())
+                          for loan in chunk.loans()])
+        self.assertEqual(loans[2].get_borrow_date(), chunk.loan(2).get_borrow_date())
+    
+    def test_smaller_than_pickled_loans(self):
+        loans = [Loan(f"loan{i:06}", f"member{i // 5}", f"book{i:06}", datetime(2024, 3, 1) + timedelta(seconds=i))
+                 for i in range(10_000)]
+        self.assertLess(len(pickle.dumps(LoanChunk.encode(loans))), len(pickle.dumps(loans)))
+        self.assertEqual(0, len(LoanChunk.encode([])))
+
+
+class NightlyJobRunnerTest(unittest.TestCase):
+    """
+    SOLUTION: Tests that the process-pool jobs agree with the single-process service
+    """
+    
+    def setUp(self):
+        self.as_of = datetime(2024, 3, 1, 12, 0)
+        self.loans = InMemoryLoanRepository()
+        self.loans.save_many(Loan(f"loan{i}", f"member{i % 37}", f"shelf{i % 3}-book{i}",
+                                  self.as_of - timedelta(hours=7 * i) if i % 50 else None)
+                             for i in range(500))
+        self.service = ImprovedLibraryService(InMemoryBookRepository(), InMemoryMemberRepository(),
+                                              self.loans, StudentFineStrategy())
+    
+    def test_nightly_jobs_match_the_service(self):
+        for workers in (0, 2):
+            with self.subTest(workers=workers):
+                runner = NightlyJobRunner(self.loans, workers=workers, chunk_size=64)
+                report = runner.run_nightly(StudentFineStrategy(), as_of=self.as_of)
+                self.assertEqual(self.service.calculate_fines(as_of=self.as_of), report['fines'])
+                self.assertEqual([loan.get_id() for loan in self.service.get_overdue_loans(self.as_of)],
+                                 report['overdue'])
+                self.assertEqual(Counter(loan.get_member_id() for loan in self.loans.find_all()),
+                                 report['member_loan_counts'])
+    
+    def test_custom_job_on_a_shared_executor(self):
+        with ProcessPoolExecutor(2) as executor:
+            runner = NightlyJobRunner(self.loans, workers=2, chunk_size=100)
+            for _ in range(2):
+                result = runner.run({'shelves': BooksPerShelf()}, executor)
+                self.assertEqual({'shelf0': 167, 'shelf1': 167, 'shelf2': 166}, result['shelves'])
+        self.assertEqual({'shelves': Counter()},
+                         NightlyJobRunner(InMemoryLoanRepository(), workers=0).run({'shelves': BooksPerShelf()}))
+        with self.assertRaises(ValueError):
+            NightlyJobRunner(self.loans, chunk_size=0)
+    
+    def test_sqlite_repository(self):
+        directory = tempfile.mkdtemp()
+        pool = SQLiteConnectionPool(os.path.join(directory, "library.db"))
+        try:
+            dated = [loan for loan in self.loans.find_all() if loan.get_borrow_date() is not None]
+            loans = SQLiteLoanRepository(pool)
+            loans.save_many(dated)
+            report = NightlyJobRunner(loans, workers=2, chunk_size=128).run_nightly(StandardFineStrategy(),
+                                                                                  as_of=self.as_of)
+            fines = StandardFineStrategy().calculate_fines_batch(dated, 14, self.as_of)
+            self.assertEqual({loan.get_id(): fine for loan, fine in zip(dated, fines)}, report['fines'])
+            self.assertEqual(len(dated), sum(report['member_loan_counts'].values()))
+        finally:
+            pool.close()
+            shutil.rmtree(directory)
+    
+    def test_category_strategy_over_sqlite_members(self):
+        directory = tempfile.mkdtemp()
+        pool = SQLiteConnectionPool(os.path.join(directory, "library.db"))
+        try:
+            members = SQLiteMemberRepository(pool)
+            categories = ["public", "student", "staff"]
+            for i in range(37):
+                members.save(Member(f"member{i}", f"Member {i}", f"member{i}@example.com", categories[i % 3]))
+            strategy = MemberCategoryFineStrategy.from_rates(members, {'student': 0.25, 'staff': 0.0},
+                                                             DailyRateFineStrategy(0.5))
+            dated = [loan for loan in self.loans.find_all() if loan.get_borrow_date() is not None]
+            expected = dict(zip([loan.get_id() for loan in dated],
+                                strategy.calculate_fines_batch(dated, 14, self.as_of)))
+            
+            # The job sent with a chunk carries the chunk's members' strategies, not the repository
+            chunk = LoanChunk.encode(dated[:64])
+            shipped = LoanFines(strategy, 14, self.as_of).for_chunk(chunk)
+            self.assertLess(len(pickle.dumps(shipped)), 4096)
+            
+            runner = NightlyJobRunner(self.loans, workers=2, chunk_size=64)
+            fines = runner.run_nightly(strategy, 14, self.as_of)['fines']
+            self.assertEqual(expected, {loan_id: fines[loan_id] for loan_id in expected})
+            self.assertGreater(len(set(expected.values())), 2)
+        finally:
+            pool.close()
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
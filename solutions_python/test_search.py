@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from .improved_library_service import ImprovedLibraryService
+from .in_memory_book_repository import InMemoryBookRepository
+from .in_memory_loan_repository import InMemoryLoanRepository
+from .in_memory_member_repository import InMemoryMemberRepository
+from .searchable_book_repository import SearchableBookRepository
+from .sqlite_book_repository import SQLiteBookRepository
+from .sqlite_connection_pool import SQLiteConnectionPool
+from .sqlite_loan_repository import SQLiteLoanRepository
+from .sqlite_member_repository import SQLiteMemberRepository
+from .standard_fine_strategy import StandardFineStrategy
+from ..python_library.book import Book
+from ..python_library.member import Member
+
+
+class SearchTest(unittest.TestCase):
+    """
+    SOLUTION: Tests for search_books with and without a SearchableBookRepository
+    """
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.pool = SQLiteConnectionPool(os.path.join(self.directory, "library.db"))
+    
+    def tearDown(self):
+        self.pool.close()
+        shutil.rmtree(self.directory)
+    
+    def services(self):
+        for name, books, members, loans in [
+            ("in-memory", InMemoryBookRepository(), InMemoryMemberRepository(), InMemoryLoanRepository()),
+            ("sqlite", SQLiteBookRepository(self.pool), SQLiteMemberRepository(self.pool), SQLiteLoanRepository(self.pool)),
+        ]:
+            # book0 exists before the index is built, the rest are added through it
+            books.save(Book("book0", "Dune", "Frank Herbert"))
+            yield f"{name}-scan", ImprovedLibraryService(books, members, loans, StandardFineStrategy())
+            books.save(Book("book0", "Dune", "Frank Herbert"))
+            yield f"{name}-indexed", ImprovedLibraryService(SearchableBookRepository(books), members, loans,
+                                                            StandardFineStrategy())
+    
+    def test_search_books_on_every_backend(self):
+        """Scanning and indexed repositories return the same ranked results, title matches first"""
+        for name, service in self.services():
+            with self.subTest(backend=name):
+                service.add_member(Member("member1", "John Doe", "john@example.com"))
+                service.book_repository.save_many([
+                    Book("book1", "Children of Dune", "Frank Herbert"),
+                    Book("book2", "Frankenstein", "Mary Shelley"),
+                    Book("book3", "Dune Messiah", "Frank Herbert"),
+                ])
+                service.borrow_book("member1", "book3")
+                
+                self.assertEqual(["book2", "book0", "book1", "book3"], [b.get_id() for b in service.search_books("fran")])
+                self.assertEqual(["book0", "book1"], [b.get_id() for b in service.search_books("dune herb", available_only=True)])
+                self.assertEqual(["book0"], [b.get_id() for b in service.search_books("dune", limit=1)])
+                self.assertEqual([], service.search_books("   "))
+                
+                service.book_repository.delete("book0")
+                service.book_repository.update(Book("book1", "Children", "Frank Herbert"))
+                self.assertEqual(["book3"], [b.get_id() for b in service.search_books("dune")])
+                service.book_repository.delete_many(["book1", "book2", "book3"])
+    
+    def test_suggest(self):
+        """The searchable repository autocompletes the most common words first"""
+        books = SearchableBookRepository(InMemoryBookRepository())
+        books.save_many([Book("b1", "Dune", "Herbert"), Book("b2", "Dune Messiah", "Herbert"), Book("b3", "Dunwich", "Lovecraft")])
+        
+        self.assertEqual(["dune", "dunwich"], books.suggest("dun"))
+        self.assertEqual([], books.suggest("xyz"))
+
+
+if __name__ == '__main__':
+    unittest.main()
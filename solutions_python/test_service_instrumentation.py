@@ -0,0 +1,150 @@
+import json
+import threading
+import unittest
+
+from .improved_library_service import ImprovedLibraryService
+from .in_memory_book_repository import InMemoryBookRepository
+from .in_memory_loan_repository import InMemoryLoanRepository
+from .in_memory_member_repository import InMemoryMemberRepository
+from .service_instrumentation import ServiceInstrumentation
+from .service_metrics import ServiceMetrics
+from .standard_fine_strategy import StandardFineStrategy
+from ..python_library.book import Book
+from ..python_library.member import Member
+
+
+class ServiceMetricsTest(unittest.TestCase):
+    """
+    SOLUTION: Tests for the metrics registry and its exports
+    """
+    
+    def test_histograms_counters_and_exports(self):
+        metrics = ServiceMetrics(buckets=(0.001, 0.01), slow_threshold=0.005)
+        metrics.observe("borrow_book", 0.0005)
+        metrics.observe("borrow_book", 0.001)
+        metrics.observe("borrow_book", 0.02, detail=("member1", "book1"))
+        metrics.count_result("borrow_book", False, "Failed to borrow book: disk I/O error")
+        metrics.count_result("borrow_book", False, "Failed to borrow book: database is locked")
+        metrics.count_error("loan_repository.save", OSError("disk I/O error"))
+        
+        snapshot = json.loads(metrics.to_json())
+        latency = snapshot['latency']['borrow_book']
+        self.assertEqual(3, latency['count'])
+        self.assertEqual([['0.001', 2], ['0.01', 2], ['+Inf', 3]], latency['buckets'])
+        self.assertEqual(0.001, latency['p50_seconds'])
+        self.assertIsNone(latency['p99_seconds'])
+        # Exception text is dropped from the label, so both failures share one counter
+        self.assertEqual([{'operation': 'borrow_book', 'outcome': 'failure',
+                           'message': 'Failed to borrow book', 'count': 2}], snapshot['results'])
+        self.assertEqual("('member1', 'book1')", metrics.slow_operations()[0].detail)
+        
+        text = metrics.to_prometheus()
+        self.assertIn('library_operation_seconds_bucket{operation="borrow_book",le="0.001"} 2', text)
+        self.assertIn('library_operation_seconds_count{operation="borrow_book"} 3', text)
+        self.assertIn('library_errors_total{operation="loan_repository.save",exception="OSError"} 1', text)
+        
+        metrics.reset()
+        self.assertEqual({}, metrics.snapshot()['latency'])
+    
+    def test_threads_record_into_one_snapshot(self):
+        metrics = ServiceMetrics()
+        record = metrics.recorder("find_by_id")
+        
+        def work():
+            for _ in range(1000):
+                record(0.00002)
+            metrics.count_result("borrow_book", True, "Book borrowed successfully")
+        
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        snapshot = metrics.snapshot()
+        self.assertEqual(4000, snapshot['latency']['find_by_id']['count'])
+        self.assertAlmostEqual(0.08, snapshot['latency']['find_by_id']['sum_seconds'])
+        self.assertEqual(4, snapshot['results'][0]['count'])
+    
+    def test_exited_threads_are_folded_into_one_shard(self):
+        metrics = ServiceMetrics()
+        record = metrics.recorder("find_by_id")
+        for _ in range(5):
+            thread = threading.Thread(target=record, args=(0.00002,))
+            thread.start()
+            thread.join()
+        
+        self.assertEqual(5, metrics.snapshot()['latency']['find_by_id']['count'])
+        self.assertEqual(1, len(metrics._shards))
+        record(0.00002)
+        self.assertEqual(6, metrics.snapshot()['latency']['find_by_id']['count'])
+        self.assertEqual(2, len(metrics._shards))
+        
+        metrics.reset()
+        self.assertEqual({}, metrics.snapshot()['latency'])
+
+
+class ServiceInstrumentationTest(unittest.TestCase):
+    """
+    SOLUTION: Tests for instrumenting a live service
+    """
+    
+    def setUp(self):
+        self.books = InMemoryBookRepository()
+        self.members = InMemoryMemberRepository()
+        self.members.save(Member("member1", "John Doe", "john@example.com"))
+        self.books.save(Book("book1", "Title", "Author"))
+        self.service = ImprovedLibraryService(self.books, self.members, InMemoryLoanRepository(),
+                                              StandardFineStrategy())
+        self.instrumentation = ServiceInstrumentation(self.service, ServiceMetrics(slow_threshold=0.0))
+    
+    def test_times_methods_and_repository_calls(self):
+        with self.instrumentation as instrumentation:
+            loan = self.service.borrow_book("member1", "book1").get_loan()
+            self.service.borrow_book("member1", "book1")
+            self.service.borrow_book("", "book1")
+            self.service.return_books([loan.get_id(), "missing"])
+        
+        snapshot = instrumentation.metrics.snapshot()
+        for operation in ("borrow_book", "validate_borrow_request", "member_repository.find_by_id",
+                          "book_repository.find_by_id", "loan_repository.find_by_member_id",
+                          "loan_repository.save", "book_repository.update", "return_books"):
+            self.assertIn(operation, snapshot['latency'])
+        self.assertEqual(3, snapshot['latency']['borrow_book']['count'])
+        results = {(result['operation'], result['message']): result['count'] for result in snapshot['results']}
+        self.assertEqual({("borrow_book", "Book borrowed successfully"): 1,
+                          ("borrow_book", "Book is not available"): 1,
+                          ("borrow_book", "Member ID cannot be null or empty"): 1,
+                          ("return_books", "Book returned successfully"): 1,
+                          ("return_books", "Loan not found"): 1}, results)
+        self.assertTrue(instrumentation.metrics.slow_operations())
+    
+    def test_counts_swallowed_repository_errors(self):
+        def broken_save(loan):
+            raise OSError("disk I/O error")
+        
+        self.service.loan_repository.save = broken_save
+        with self.instrumentation:
+            result = self.service.borrow_book("member1", "book1")
+        
+        self.assertFalse(result.is_success())
+        snapshot = self.instrumentation.metrics.snapshot()
+        self.assertEqual([{'operation': 'loan_repository.save', 'exception': 'OSError', 'count': 1}],
+                         snapshot['errors'])
+        self.assertEqual("Failed to borrow book", snapshot['results'][0]['message'])
+    
+    def test_disable_restores_the_service(self):
+        self.instrumentation.enable()
+        self.assertTrue(self.instrumentation.enabled)
+        self.assertIsNot(self.books, self.service.book_repository)
+        self.instrumentation.disable()
+        
+        self.assertFalse(self.instrumentation.enabled)
+        self.assertIs(self.books, self.service.book_repository)
+        self.assertNotIn("borrow_book", vars(self.service))
+        self.service.borrow_book("member1", "book1")
+        self.assertEqual({}, self.instrumentation.metrics.snapshot()['latency'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+import functools
+import shutil
+import tempfile
+import unittest
+
+from .improved_library_service import ImprovedLibraryService
+from .in_memory_book_repository import InMemoryBookRepository
+from .in_memory_loan_repository import InMemoryLoanRepository
+from .in_memory_member_repository import InMemoryMemberRepository
+from .sharded_library_service import ShardedLibraryService, in_memory_shard, sqlite_shard
+from .standard_fine_strategy import StandardFineStrategy
+from ..python_library.book import Book
+from ..python_library.member import Member
+
+
+class _BrokenBorrows:
+    """Wraps a shard's service so that its borrow_books raises"""
+    
+    def __init__(self, service):
+        self._service = service
+    
+    def __getattr__(self, name):
+        return getattr(self._service, name)
+    
+    def borrow_books(self, batch):
+        raise RuntimeError("disk full")
+
+
+def _shard_1_fails_borrows(shard: int):
+    service = in_memory_shard(shard)
+    return _BrokenBorrows(service) if shard == 1 else service
+
+
+class _FullBookRepository(InMemoryBookRepository):
+    def save_many(self, books):
+        raise RuntimeError("disk full")
+
+
+class _FullMemberRepository(InMemoryMemberRepository):
+    def save_many(self, members):
+        raise RuntimeError("disk full")
+
+
+def _shard_1_fails_saves(shard: int):
+    if shard != 1:
+        return in_memory_shard(shard)
+    return ImprovedLibraryService(_FullBookRepository(), _FullMemberRepository(), InMemoryLoanRepository(),
+                                  StandardFineStrategy())
+
+
+def _every_shard_fails_saves(shard: int):
+    return ImprovedLibraryService(_FullBookRepository(), _FullMemberRepository(), InMemoryLoanRepository(),
+                                  StandardFineStrategy())
+
+
+class ShardedLibraryServiceTest(unittest.TestCase):
+    """
+    SOLUTION: Tests for routing, loan IDs and the borrowing limit across shard processes
+    """
+    
+    def setUp(self):
+        self.service = ShardedLibraryService(3)
+        self.addCleanup(self.service.close)
+        self.assertEqual(20, self.service.add_books(Book(f"book{i}", f"Title {i}", "Author") for i in range(20)))
+        self.assertEqual(2, self.service.add_members([Member("member1", "Alice", "alice@example.com"),
+                                                     Member("member2", "Bob", "bob@example.com")]))
+    
+    def test_borrow_and_return_across_shards(self):
+        results = self.service.borrow_books([("member1", f"book{i}") for i in range(4)])
+        self.assertTrue(all(result.is_success() for result in results))
+        shards = {result.get_loan().get_id().split(":")[0] for result in results}
+        self.assertGreater(len(shards), 1)
+        self.assertEqual({f"book{i}" for i in range(4)},
+                         {loan.get_book_id() for loan in self.service.get_member_loans("member1")})
+        self.assertEqual("Book is not available", self.service.borrow_book("member2", "book0").get_message())
+        
+        loan_id = results[0].get_loan().get_id()
+        self.assertEqual(0.0, self.service.calculate_fine(loan_id))
+        self.assertTrue(self.service.return_book(loan_id).is_success())
+        self.assertEqual("Loan not found", self.service.return_book(loan_id).get_message())
+        self.assertEqual(3, self.service.get_member_loan_count("member1"))
+        self.assertTrue(self.service.borrow_book("member2", "book0").is_success())
+    
+    def test_borrowing_limit_counts_loans_on_every_shard(self):
+        results = self.service.borrow_books([("member1", f"book{i}") for i in range(7)])
+        self.assertEqual([True] * 5 + [False] * 2, [result.is_success() for result in results])
+        self.assertEqual("Member has reached maximum borrowing limit of 5 books", results[5].get_message())
+        
+        # A refused borrow gives its reservation back
+        self.assertEqual("Member not found", self.service.borrow_book("nobody", "book10").get_message())
+        self.assertEqual(0, self.service.get_member_loan_count("nobody"))
+        self.assertEqual("Book not found", self.service.borrow_book("member2", "missing").get_message())
+        self.assertEqual(0, self.service.get_member_loan_count("member2"))
+        
+        self.service.return_books([results[0].get_loan().get_id()])
+        self.assertTrue(self.service.borrow_book("member1", "book5").is_success())
+    
+    def test_invalid_ids(self):
+        self.assertEqual("Member ID cannot be null or empty", self.service.borrow_book(" ", "book1").get_message())
+        self.assertEqual("Book ID cannot be null or empty", self.service.borrow_book("member1", "").get_message())
+        for loan_id in ("", "unprefixed", "7:abc", "x:abc", "1:"):
+            self.assertFalse(self.service.return_book(loan_id).is_success())
+            self.assertEqual(0.0, self.service.calculate_fine(loan_id))
+        self.assertEqual([], self.service.get_member_loans(""))
+    
+    def test_copies_of_a_title_share_a_shard(self):
+        self.service.add_books(Book(f"dune-{i}", "Dune", "Frank Herbert", "dune") for i in range(6))
+        results = self.service.borrow_books([("member1", "dune"), ("member1", "dune-5"), ("member2", "dune")])
+        self.assertTrue(all(result.is_success() for result in results))
+        self.assertEqual(1, len({result.get_loan().get_id().split(":")[0] for result in results}))
+        self.assertEqual(3, len({result.get_loan().get_book_id() for result in results}))
+    
+    def test_a_failing_shard_keeps_the_other_shards_loans(self):
+        with ShardedLibraryService(3, _shard_1_fails_borrows) as service:
+            service.add_books(Book(f"book{i}", f"Title {i}", "Author") for i in range(10))
+            service.add_member(Member("member1", "Alice", "alice@example.com"))
+            book_ids = [f"book{i}" for i in range(10)]
+            working = [book_id for book_id in book_ids if service._shard_of(book_id) != 1][:3]
+            failing = [book_id for book_id in book_ids if service._shard_of(book_id) == 1][:2]
+            self.assertEqual((3, 2), (len(working), len(failing)))
+            batch = [("member1", book_id) for book_id in working + failing]
+            
+            results = service.borrow_books(batch)
+            self.assertEqual([True] * 3 + [False] * 2, [result.is_success() for result in results])
+            self.assertEqual("Failed to borrow book: disk full", results[3].get_message())
+            self.assertEqual(3, service.get_member_loan_count("member1"))
+            self.assertEqual(set(working),
+                             {loan.get_book_id() for loan in service.get_member_loans("member1")})
+            
+            # The shard still answers other calls, and the pipes are still in step
+            self.assertTrue(service.return_book(results[0].get_loan().get_id()).is_success())
+            self.assertEqual(2, service.get_member_loan_count("member1"))
+    
+    def test_a_failing_shard_keeps_the_other_shards_saves(self):
+        with ShardedLibraryService(3, _shard_1_fails_saves) as service:
+            books = [Book(f"book{i}", f"Title {i}", "Author") for i in range(10)]
+            saved = [book.get_id() for book in books if service._shard_of(book.get_id()) != 1]
+            self.assertEqual(len(saved), service.add_books(books))
+            lost = next(book for book in books if service._shard_of(book.get_id()) == 1)
+            self.assertFalse(service.add_book(lost))
+            
+            with self.assertRaisesRegex(RuntimeError, r"not on shards \[1\]: disk full"):
+                service.add_members([Member("member1", "Alice", "alice@example.com")])
+            # The shards that saved the member serve it
+            self.assertTrue(service.borrow_book("member1", saved[0]).is_success())
+    
+    def test_members_saved_nowhere_count_zero(self):
+        with ShardedLibraryService(2, _every_shard_fails_saves) as service:
+            self.assertEqual(0, service.add_members([Member("member1", "Alice", "alice@example.com")]))
+            self.assertEqual(0, service.add_books([Book("book1", "Title 1", "Author")]))
+    
+    def test_sqlite_shards_survive_a_restart(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        factory = functools.partial(sqlite_shard, directory)
+        with ShardedLibraryService(2, factory) as service:
+            service.add_books(Book(f"dune-{i}", "Dune", "Frank Herbert", "dune") for i in range(3))
+            service.add_books(Book(f"book{i}", f"Title {i}", "Author") for i in range(5))
+            service.add_member(Member("member1", "Alice", "alice@example.com"))
+            loan_ids = [result.get_loan().get_id()
+                        for result in service.borrow_books([("member1", f"book{i}") for i in range(4)])]
+        
+        with ShardedLibraryService(2, factory) as service:
+            self.assertEqual(4, service.get_member_loan_count("member1"))
+            self.assertTrue(service.borrow_book("member1", "dune-2").is_success())
+            self.assertFalse(service.borrow_book("member1", "book4").is_success())
+            self.assertTrue(service.return_book(loan_ids[0]).is_success())
+            self.assertTrue(service.borrow_book("member1", "book4").is_success())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+
+from .improved_library_service import ImprovedLibraryService
+from .sqlite_book_repository import SQLiteBookRepository
+from .sqlite_connection_pool import SQLiteConnectionPool
+from .sqlite_loan_repository import SQLiteLoanRepository
+from .sqlite_member_repository import SQLiteMemberRepository
+from .standard_fine_strategy import StandardFineStrategy
+from ..python_library.book import Book
+from ..python_library.loan import Loan
+from ..python_library.loan_id_generator import LoanIdGenerator
+from ..python_library.member import Member
+
+
+class SQLiteRepositoryTest(unittest.TestCase):
+    """
+    SOLUTION: Tests for the SQLite-backed repositories
+    """
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.database = os.path.join(self.directory, "library.db")
+        self.pool = SQLiteConnectionPool(self.database, pool_size=2)
+        self.book_repository = SQLiteBookRepository(self.pool)
+        self.member_repository = SQLiteMemberRepository(self.pool)
+        self.loan_repository = SQLiteLoanRepository(self.pool)
+    
+    def tearDown(self):
+        self.pool.close()
+        shutil.rmtree(self.directory)
+    
+    def test_wal_mode_and_indexes(self):
+        """Schema uses WAL journaling and indexes loans by member and book"""
+        with self.pool.connection() as connection:
+            mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+            indexes = {row[1] for row in connection.execute("PRAGMA index_list(loans)")}
+        self.assertEqual("wal", mode)
+        self.assertIn("idx_loans_member_id", indexes)
+        self.assertIn("idx_loans_book_id", indexes)
+    
+    def test_book_round_trip(self):
+        """Books keep their availability across save/update"""
+        book = Book("book1", "Title", "Author")
+        self.book_repository.save(book)
+        book.set_available(False)
+        self.book_repository.update(book)
+        
+        stored = self.book_repository.find_by_id("book1")
+        self.assertEqual("Title", stored.get_title())
+        self.assertFalse(stored.is_available())
+        
+        self.book_repository.delete("book1")
+        self.assertIsNone(self.book_repository.find_by_id("book1"))
+        with self.assertRaises(KeyError):
+            self.book_repository.update(book)
+    
+    def test_iter_available_streams_pages(self):
+        """Available books are streamed in rowid order across page boundaries"""
+        self.book_repository.STREAM_PAGE_SIZE = 3
+        books = [Book(f"book{i}", f"Title {i}", "Author") for i in range(12)]
+        for i, book in enumerate(books):
+            book.set_available(i % 3 != 0)
+        self.book_repository.save_many(books)
+        
+        expected = [b.get_id() for b in books if b.is_available()]
+        self.assertEqual(expected, [b.get_id() for b in self.book_repository.iter_available()])
+        self.assertEqual(expected[1:6], [b.get_id() for b in self.book_repository.iter_available(1, 5)])
+        self.assertEqual([], list(self.book_repository.iter_available(20)))
+    
+    def test_loan_round_trip(self):
+        """Loans keep their borrow date and are found by member and book"""
+        borrow_date = datetime(2024, 1, 2, 3, 4, 5)
+        self.loan_repository.save(Loan("loan1", "member1", "book1", borrow_date))
+        self.loan_repository.save(Loan("loan2", "member1", "book2", borrow_date))
+        
+        self.assertEqual(borrow_date, self.loan_repository.find_by_id("loan1").get_borrow_date())
+        self.assertEqual(["loan1", "loan2"], [l.get_id() for l in self.loan_repository.find_by_member_id("member1")])
+        self.assertEqual("loan2", self.loan_repository.find_by_book_id("book2").get_id())
+    
+    def test_generated_loan_ids_are_stored_as_keys(self):
+        """Generated IDs live in the integer key alone; other IDs keep their text"""
+        borrow_date = datetime(2024, 1, 2, 3, 4, 5)
+        generator = LoanIdGenerator(node_id=3)
+        generated = [Loan(generator.next_id(), "member1", f"book{i}", borrow_date) for i in range(3)]
+        text_ids = [Loan("loan1", "member1", "bookA", borrow_date), Loan("loan2", "member2", "bookB", borrow_date)]
+        self.loan_repository.save_many(generated[:2] + text_ids)
+        self.loan_repository.save(generated[2])
+        self.loan_repository.save(Loan("loan1", "member1", "bookC", borrow_date))   # upsert, same key
+        
+        with self.pool.connection() as connection:
+            rows = connection.execute("SELECT key, id FROM loans ORDER BY key").fetchall()
+        self.assertEqual([(1, "loan1"), (2, "loan2")] + [(LoanIdGenerator.decode(loan.get_id()), None)
+                                                        for loan in generated], rows)
+        expected = ["loan1", "loan2"] + [loan.get_id() for loan in generated]
+        self.assertEqual(expected, [loan.get_id() for loan in self.loan_repository.iter_all()])
+        self.assertEqual("bookC", self.loan_repository.find_by_id("loan1").get_book_id())
+        self.assertEqual(set(expected[1:4]), set(self.loan_repository.find_by_ids(expected[1:4] + ["missing"])))
+        
+        self.loan_repository.update_many([Loan(expected[2], "member1", "book0", datetime(2024, 2, 1)), text_ids[1]])
+        self.assertEqual(datetime(2024, 2, 1), self.loan_repository.find_by_id(expected[2]).get_borrow_date())
+        self.loan_repository.delete_many([expected[2], "loan2"])
+        self.assertEqual(["loan1"] + expected[3:], [loan.get_id() for loan in self.loan_repository.find_all()])
+    
+    def test_service_runs_unchanged_and_persists(self):
+        """ImprovedLibraryService works on SQLite and state survives reopening"""
+        service = ImprovedLibraryService(self.book_repository, self.member_repository,
+                                         self.loan_repository, StandardFineStrategy())
+        service.add_member(Member("member1", "John Doe", "john@example.com"))
+        service.add_book(Book("book1", "Title", "Author"))
+        result = service.borrow_book("member1", "book1")
+        self.assertTrue(result.is_success())
+        self.assertEqual("Book is not available", service.borrow_book("member1", "book1").get_message())
+        self.pool.close()
+        
+        self.pool = SQLiteConnectionPool(self.database)
+        reopened = ImprovedLibraryService(SQLiteBookRepository(self.pool), SQLiteMemberRepository(self.pool),
+                                          SQLiteLoanRepository(self.pool), StandardFineStrategy())
+        self.assertEqual(1, len(reopened.get_member_loans("member1")))
+        self.assertTrue(reopened.return_book(result.get_loan().get_id()).is_success())
+        self.assertEqual(1, len(reopened.get_available_books()))
+
+
+if __name__ == '__main__':
+    unittest.main()